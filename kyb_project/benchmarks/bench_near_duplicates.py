@@ -0,0 +1,89 @@
+"""
+Benchmark MinHash LSH near-duplicate clustering.
+
+Builds a synthetic batch with lightly edited copies of earlier reviews
+injected (dropped or added words, changed case and punctuation), then reports
+clustering time at increasing batch sizes, the share of injected copies
+(similar enough to their source to qualify) that were clustered, and the pairwise-comparison time the LSH index avoids (measured on a
+small sample and extrapolated quadratically).
+
+Usage:
+    python benchmarks/bench_near_duplicates.py [--reviews 50000] [--copies 0.05]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+PROJECT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, PROJECT_DIR)
+sys.path.insert(0, os.path.dirname(__file__))
+
+from review_corpus import synthetic_reviews
+from cpapp.services.review_lsh import MIN_SHINGLES, MinHashLSH, jaccard, shingles
+from cpapp.services.review_scoring_system import ReviewScorer
+
+FILLERS = ["the", "really", "very", "so", "in town", "here", "also"]
+
+
+def edited_copy(rng, text):
+    """A lightly edited copy, as posted by review farms"""
+    words = text.split()
+    if len(words) > 4 and rng.random() < 0.5:
+        del words[rng.randrange(len(words))]
+    else:
+        words.insert(rng.randrange(len(words) + 1), rng.choice(FILLERS))
+    copy = " ".join(words)
+    copy = copy.lower() if rng.random() < 0.5 else copy.upper()
+    return copy.rstrip(".!") + rng.choice(["", "!!", ".", " :)"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--reviews', type=int, default=50000, help='Number of synthetic reviews')
+    parser.add_argument('--copies', type=float, default=0.05, help='Share of reviews replaced by edited copies')
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    texts = [review['review_text'] for review in synthetic_reviews(args.reviews, duplicate_rate=0.0)]
+    injected = {}
+    for i in sorted(rng.sample(range(1, len(texts)), int(len(texts) * args.copies))):
+        source = rng.randrange(i)
+        texts[i] = edited_copy(rng, texts[source])
+        injected[i] = source
+
+    scorer = ReviewScorer()
+    normalized = [scorer._normalize_text(text) for text in texts]
+    index = MinHashLSH()
+
+    for size in sorted({len(texts) // 5, len(texts) // 2, len(texts)}):
+        start = time.perf_counter()
+        clusters = index.clusters(normalized[:size])
+        elapsed = time.perf_counter() - start
+        print(f'{size:>7,} reviews: {elapsed:6.2f}s ({size / elapsed:,.0f} reviews/s), '
+              f'{len({c for c in clusters if c})} clusters')
+
+    index_sets = {i: shingles(normalized[i]) for pair in injected.items() for i in pair}
+    reachable = [
+        i for i, source in injected.items()
+        if min(len(index_sets[i]), len(index_sets[source])) >= MIN_SHINGLES
+        and jaccard(index_sets[i], index_sets[source]) >= index.threshold
+    ]
+    caught = sum(1 for i in reachable if clusters[i] is not None)
+    print(f'Injected copies above the similarity threshold: {len(reachable)}/{len(injected)}, '
+          f'caught {caught} ({caught / max(len(reachable), 1):.1%})')
+
+    sample = [shingles(text) for text in normalized[:2000]]
+    start = time.perf_counter()
+    for i, a in enumerate(sample):
+        for b in sample[:i]:
+            jaccard(a, b)
+    elapsed = time.perf_counter() - start
+    estimate = elapsed * (len(texts) / len(sample)) ** 2
+    print(f'Pairwise comparison: {elapsed:.2f}s for {len(sample):,} reviews, ~{estimate:,.0f}s estimated for {len(texts):,}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""
+Benchmark the pooled Outscraper client against a local stub server.
+
+Starts a threaded HTTP stub that answers like the reviews endpoint (and
+rate limits every Nth request with 429 + Retry-After), then sends the same
+sustained load through:
+
+- one new connection per request (requests.get, as the client used to)
+- the shared OutscraperMapsReviewsAPI client (keep-alive pool, retries)
+
+and reports requests per second, failed requests and retries. A final run
+checks that the client-side rate limiter holds the configured rate.
+
+Usage:
+    python benchmarks/bench_outscraper_client.py [--requests 2000] [--threads 8] [--throttle-every 50]
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+PROJECT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, PROJECT_DIR)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'kyb_project.settings')
+
+from cpapp.services.Google_review_out_scraper import OutscraperMapsReviewsAPI
+from cpapp.services.throttling import RateLimiter
+
+BODY = json.dumps({"data": [{"place_id": "stub", "reviews_data": [{"review_text": "Great clinic"}] * 20}]}).encode()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are written separately; Nagle would stall keep-alive connections
+    disable_nagle_algorithm = True
+    throttle_every = 0
+    counter = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        with StubHandler.lock:
+            StubHandler.counter += 1
+            throttled = self.throttle_every and StubHandler.counter % self.throttle_every == 0
+        if throttled:
+            self.send_response(429)
+            self.send_header('Retry-After', '0')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+def run(label, call, total, threads):
+    StubHandler.counter = 0
+    failures = 0
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        for ok in pool.map(lambda _: call(), range(total)):
+            failures += not ok
+    elapsed = time.perf_counter() - start
+    retries = StubHandler.counter - total
+    print(f'{label:<28} {total / elapsed:>8,.0f} req/s  failed {failures:>4}  retries {retries:>4}')
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=2000, help='Requests per run')
+    parser.add_argument('--threads', type=int, default=8, help='Concurrent callers')
+    parser.add_argument('--throttle-every', type=int, default=50, help='Answer every Nth request with 429 (0 disables)')
+    parser.add_argument('--rate', type=float, default=200.0, help='Client-side rate for the rate limiter check')
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    StubHandler.throttle_every = args.throttle_every
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f'http://127.0.0.1:{server.server_port}/maps/reviews-v3'
+
+    def unpooled():
+        response = requests.get(base_url, headers={'X-API-KEY': 'stub'}, params={'query': 'stub', 'async': 'false'})
+        return response.status_code == 200 and 'data' in response.json()
+
+    client = OutscraperMapsReviewsAPI('stub', rate_limiter=RateLimiter(0), pool_size=args.threads)
+    client.BASE_URL = base_url
+
+    def pooled():
+        return 'data' in client.get_reviews('stub', async_request=False)
+
+    run('new connection per request', unpooled, args.requests, args.threads)
+    run('pooled client', pooled, args.requests, args.threads)
+
+    limited = OutscraperMapsReviewsAPI('stub', rate_limiter=RateLimiter(args.rate), pool_size=args.threads)
+    limited.BASE_URL = base_url
+    total = int(args.rate * 2)
+    elapsed = run(f'pooled client @ {args.rate:g}/s', lambda: 'data' in limited.get_reviews('stub', async_request=False), total, args.threads)
+    print(f'Rate limit held: {total / elapsed <= args.rate * 1.05}')
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
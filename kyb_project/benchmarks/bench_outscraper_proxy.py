@@ -0,0 +1,147 @@
+"""
+Benchmark the raw proxy mode of the Outscraper views on a large result.
+
+Generates a ~20 MB reviews response at runtime, serves it from a local stub
+of the Outscraper API, and fetches it through OutscraperReviewsResultsView:
+
+- parsed: the client parses the body, DRF re-renders it to JSON
+- raw:    the upstream bytes are streamed through (?raw=true)
+
+and reports time to first byte, total time and peak Python memory
+(tracemalloc) of each mode. Both modes must return the same JSON document.
+
+Usage:
+    python benchmarks/bench_outscraper_proxy.py [--size-mb 20] [--runs 3]
+"""
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PROJECT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, PROJECT_DIR)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'kyb_project.settings')
+os.environ.setdefault('OUTSCRAPER_API_KEY', 'stub')
+
+import django
+
+django.setup()
+
+from rest_framework.test import APIRequestFactory
+
+from cpapp.api.outscraper_reviews.views import OutscraperReviewsResultsView
+from cpapp.services.Google_review_out_scraper import get_outscraper_client
+from cpapp.services.throttling import RateLimiter
+
+
+def make_fixture(size_mb):
+    """An Outscraper results body of about size_mb megabytes"""
+    review = {
+        "review_id": "",
+        "author_title": "Patient",
+        "review_text": "The doctor explained the treatment clearly and the staff were helpful. " * 4,
+        "review_rating": 5,
+        "review_datetime_utc": "01/15/2024 10:30:00",
+        "review_timestamp": 1705314600,
+        "review_likes": 0,
+        "review_pagination_id": "",
+    }
+    review_bytes = len(json.dumps(dict(review, review_id="r00000", review_pagination_id="p00000"))) + 2
+    count = int(size_mb * 1_000_000 / review_bytes)
+    reviews = [dict(review, review_id=f"r{i}", review_pagination_id=f"p{i}") for i in range(count)]
+    body = json.dumps({"id": "req-1", "status": "Success", "data": [{"place_id": "stub", "name": "Clinic", "reviews_data": reviews}]})
+    return body.encode()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    body = b''
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(self.body)))
+        self.end_headers()
+        view = memoryview(self.body)
+        for start in range(0, len(view), 256 * 1024):
+            self.wfile.write(view[start:start + 256 * 1024])
+
+    def log_message(self, *args):
+        pass
+
+
+def fetch(view, factory, raw, keep_body=True):
+    """(time to first byte, total time, body) of one request through the view
+
+    Without keep_body the streamed chunks are dropped as a client socket
+    would, and the body is returned as None.
+    """
+    request = factory.get('/api/outscraper_reviews/results/req-1/', {'raw': 'true'} if raw else {})
+    start = time.perf_counter()
+    response = view(request, request_id='req-1')
+    if raw:
+        chunks = iter(response.streaming_content)
+        first = next(chunks)
+        first_byte = time.perf_counter()
+        if keep_body:
+            body = first + b''.join(chunks)
+        else:
+            body = None
+            for _ in chunks:
+                pass
+        response.close()
+    else:
+        body = response.render().content
+        first_byte = time.perf_counter()
+    return first_byte - start, time.perf_counter() - start, body
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size-mb', type=float, default=20.0, help='Size of the generated result body')
+    parser.add_argument('--runs', type=int, default=3, help='Timed runs per mode')
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    StubHandler.body = make_fixture(args.size_mb)
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    client = get_outscraper_client()
+    client.RESULTS_URL = f'http://127.0.0.1:{server.server_port}/requests/{{request_id}}'
+    client.rate_limiter = RateLimiter(0)
+    view = OutscraperReviewsResultsView.as_view()
+    factory = APIRequestFactory()
+    print(f'Fixture: {len(StubHandler.body) / 1e6:.1f} MB')
+
+    bodies = {}
+    for raw in (False, True):
+        label = 'raw' if raw else 'parsed'
+        timings = []
+        for _ in range(args.runs):
+            first_byte, total, bodies[label] = fetch(view, factory, raw)
+            timings.append((first_byte, total))
+        tracemalloc.start()
+        fetch(view, factory, raw, keep_body=False)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(
+            f'{label:<7} first byte {statistics.median(t[0] for t in timings) * 1000:>8.1f} ms'
+            f'  total {statistics.median(t[1] for t in timings) * 1000:>8.1f} ms'
+            f'  peak memory {peak / 1e6:>7.1f} MB'
+        )
+    print(f"Same document: {json.loads(bodies['parsed']) == json.loads(bodies['raw'])}")
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""
+Throughput benchmark for ReviewScorer feature matching.
+
+Compares the per-feature scans the scorer used to run (phrase loops with a
+.lower() per keyword and uncompiled re.IGNORECASE searches) with the compiled
+ReviewMatcher on synthetic reviews, checks both find the same hits, and
+reports end-to-end score_reviews throughput.
+
+Usage:
+    python benchmarks/bench_review_matcher.py [--reviews 100000]
+"""
+
+import argparse
+import logging
+import os
+import re
+import sys
+import time
+
+PROJECT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, PROJECT_DIR)
+sys.path.insert(0, os.path.dirname(__file__))
+
+from review_corpus import synthetic_reviews
+from cpapp.services import review_matcher
+from cpapp.services.review_matcher import EMOTIONAL_PATTERNS, SPECIFICITY_PATTERNS
+from cpapp.services.review_scoring_system import ReviewScorer
+
+
+def naive_features(scorer, text):
+    """Feature extraction as previously done: one scan per phrase and per pattern"""
+    text = str(text) if text else ""
+    lower = text.lower()
+    generic = sum(1 for phrase in scorer.generic_phrases if phrase.lower() in lower)
+    negative = frozenset(k for k in scorer.negative_keywords if k.lower() in lower)
+    specificity = sum(1 for p in SPECIFICITY_PATTERNS.values() if re.search(p, lower, re.IGNORECASE))
+    emotional = sum(1 for p in EMOTIONAL_PATTERNS.values() if re.search(p, lower, re.IGNORECASE))
+    return generic, negative, specificity, emotional
+
+
+def matcher_features(scorer, text):
+    hits = scorer.matcher.scan(text)
+    return (
+        len(hits.generic_phrases),
+        hits.negative_keywords,
+        scorer.matcher.specificity_hits(hits.text_lower),
+        scorer.matcher.emotional_hits(hits.text_lower),
+    )
+
+
+def timed(label, func, texts):
+    start = time.perf_counter()
+    results = [func(text) for text in texts]
+    elapsed = time.perf_counter() - start
+    print(f'{label:<28} {len(texts) / elapsed:>12,.0f} reviews/s ({elapsed:.2f}s)')
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--reviews', type=int, default=100000, help='Number of synthetic reviews')
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    reviews = synthetic_reviews(args.reviews)
+    texts = [review['review_text'] for review in reviews]
+    scorer = ReviewScorer()
+    print(f'Aho-Corasick backend: {"pyahocorasick" if review_matcher.ahocorasick else "substring scan"}')
+
+    naive = timed('per-feature scans', lambda t: naive_features(scorer, t), texts)
+    compiled = timed('ReviewMatcher', lambda t: matcher_features(scorer, t), texts)
+    mismatches = sum(1 for a, b in zip(naive, compiled) if a != b)
+    print(f'Feature mismatches: {mismatches}')
+
+    start = time.perf_counter()
+    scorer.score_reviews(reviews)
+    elapsed = time.perf_counter() - start
+    print(f'{"score_reviews end to end":<28} {len(reviews) / elapsed:>12,.0f} reviews/s ({elapsed:.2f}s)')
+
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark the process-parallel review scoring mode.
+
+Scores the same synthetic batch with ReviewScorer.score_reviews and
+ReviewScorer.score_reviews_parallel, checks the outputs are identical and
+reports reviews per second for both.
+
+Usage:
+    python benchmarks/bench_review_parallel.py [--reviews 50000] [--workers 4] [--tokenizer nltk]
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+PROJECT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, PROJECT_DIR)
+sys.path.insert(0, os.path.dirname(__file__))
+
+from review_corpus import synthetic_reviews
+from cpapp.services.review_scoring_system import ReviewScorer
+
+
+def timed(label, func, reviews):
+    start = time.perf_counter()
+    result = func(reviews)
+    elapsed = time.perf_counter() - start
+    print(f'{label:<22} {len(reviews) / elapsed:>10,.0f} reviews/s ({elapsed:.2f}s)')
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--reviews', type=int, default=50000, help='Number of synthetic reviews')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Worker processes')
+    parser.add_argument('--tokenizer', choices=('nltk', 'fast'), default='nltk', help='ReviewScorer tokenizer mode')
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    reviews = synthetic_reviews(args.reviews)
+    scorer = ReviewScorer(tokenizer=args.tokenizer)
+    scorer.score_reviews(reviews[:10])  # load the tokenizer and LSH index outside the timing
+
+    sequential = timed('score_reviews', scorer.score_reviews, reviews)
+    parallel = timed(
+        f'parallel ({args.workers} workers)',
+        lambda batch: scorer.score_reviews_parallel(batch, workers=args.workers, min_reviews=0),
+        reviews
+    )
+    identical = json.dumps(sequential) == json.dumps(parallel)
+    print(f'Outputs identical: {identical}')
+    if not identical:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
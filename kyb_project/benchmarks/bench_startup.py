@@ -0,0 +1,72 @@
+"""
+Startup benchmark for the review scoring modules.
+
+Measures, in fresh interpreters, the cost of importing the modules loaded at
+URL configuration time and of constructing a ReviewScorer, and fails when a
+budget is exceeded.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 5] [--import-budget-ms 150]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+PROJECT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+MEASURE = """
+import sys, time
+sys.path.insert(0, {project_dir!r})
+start = time.perf_counter()
+import {module}
+imported = time.perf_counter()
+from cpapp.services.review_scoring_system import ReviewScorer
+ReviewScorer()
+constructed = time.perf_counter()
+print(imported - start, constructed - imported, int('nltk' in sys.modules))
+"""
+
+MODULES = [
+    'cpapp.services.review_scoring_system',
+    'cpapp.services.review_scorer_integration',
+]
+
+
+def measure(module, runs):
+    import_times, construct_times, nltk_loaded = [], [], 0
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, '-c', MEASURE.format(project_dir=PROJECT_DIR, module=module)],
+            capture_output=True, text=True, check=True, cwd=PROJECT_DIR
+        ).stdout.split()
+        import_times.append(float(output[0]) * 1000)
+        construct_times.append(float(output[1]) * 1000)
+        nltk_loaded += int(output[2])
+    return statistics.median(import_times), statistics.median(construct_times), nltk_loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5, help='Fresh interpreters per module')
+    parser.add_argument('--import-budget-ms', type=float, default=150.0, help='Maximum median import time')
+    parser.add_argument('--construct-budget-ms', type=float, default=5.0, help='Maximum median ReviewScorer() time')
+    args = parser.parse_args()
+
+    failed = False
+    for module in MODULES:
+        import_ms, construct_ms, nltk_loaded = measure(module, args.runs)
+        print(f'{module}: import {import_ms:.1f} ms, ReviewScorer() {construct_ms:.2f} ms, '
+              f'nltk imported in {nltk_loaded}/{args.runs} runs')
+        if import_ms > args.import_budget_ms or construct_ms > args.construct_budget_ms or nltk_loaded:
+            failed = True
+
+    if failed:
+        print('Startup budget exceeded')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark ReviewScorer tokenizer modes.
+
+Times score_reviews with tokenizer='nltk' and tokenizer='fast' and reports
+how closely the fast content quality scores agree with NLTK on the fixture
+corpus (cpapp/tests/fixtures/review_corpus.json) and on synthetic reviews.
+
+When the NLTK punkt data is not installed the NLTK side runs the same
+pipeline as word_tokenize (punkt sentence splitting, then NLTK's word
+tokenizer) with an untrained punkt model, i.e. without the English
+abbreviation list.
+
+Usage:
+    python benchmarks/bench_tokenizer.py [--reviews 20000]
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+PROJECT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, PROJECT_DIR)
+sys.path.insert(0, os.path.dirname(__file__))
+
+from review_corpus import synthetic_reviews
+from cpapp.services import review_scoring_system
+from cpapp.services.review_scoring_system import (
+    FAST_TOKENIZER_MAX_QUALITY_DIFF, FAST_TOKENIZER_MEAN_QUALITY_DIFF, ReviewScorer
+)
+
+FIXTURE = os.path.join(PROJECT_DIR, 'cpapp', 'tests', 'fixtures', 'review_corpus.json')
+
+
+def nltk_scorer():
+    scorer = ReviewScorer(tokenizer='nltk')
+    try:
+        review_scoring_system._load_nltk_tokenizer()
+    except LookupError:
+        from nltk.tokenize import NLTKWordTokenizer
+        from nltk.tokenize.punkt import PunktSentenceTokenizer
+
+        print('NLTK punkt data not installed: using an untrained punkt sentence splitter')
+        sentences, words = PunktSentenceTokenizer(), NLTKWordTokenizer()
+        scorer._tokenize = lambda text: [w for s in sentences.tokenize(text) for w in words.tokenize(s)]
+    return scorer
+
+
+def agreement(label, reviews, reference, fast):
+    diffs = [
+        abs(fast.analyze_content_quality(r['review_text']) - reference.analyze_content_quality(r['review_text']))
+        for r in reviews
+    ]
+    mean = sum(diffs) / len(diffs)
+    exact = sum(1 for d in diffs if d < 1e-9) / len(diffs)
+    print(f'{label:<10} quality diff max {max(diffs):.4f} mean {mean:.4f}, identical {exact:.1%}')
+    return max(diffs), mean
+
+
+def throughput(label, scorer, reviews):
+    start = time.perf_counter()
+    scorer.score_reviews(reviews)
+    elapsed = time.perf_counter() - start
+    print(f'{label:<10} {len(reviews) / elapsed:>10,.0f} reviews/s ({elapsed:.2f}s)')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--reviews', type=int, default=20000, help='Number of synthetic reviews to time')
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    with open(FIXTURE, encoding='utf-8') as f:
+        fixture = json.load(f)
+    reviews = synthetic_reviews(args.reviews)
+    reference, fast = nltk_scorer(), ReviewScorer(tokenizer='fast')
+
+    fixture_max, fixture_mean = agreement('fixture', fixture, reference, fast)
+    agreement('synthetic', reviews[:2000], reference, fast)
+    print(f'tolerance  max {FAST_TOKENIZER_MAX_QUALITY_DIFF} mean {FAST_TOKENIZER_MEAN_QUALITY_DIFF}')
+
+    throughput('nltk', nltk_scorer(), reviews)
+    throughput('fast', ReviewScorer(tokenizer='fast'), reviews)
+
+    if fixture_max > FAST_TOKENIZER_MAX_QUALITY_DIFF or fixture_mean > FAST_TOKENIZER_MEAN_QUALITY_DIFF:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+"""Synthetic Google review corpus shared by the review scoring benchmarks."""
+
+import random
+from datetime import datetime, timedelta
+
+OPENINGS = [
+    "Visited the clinic", "I went to see the doctor", "We took my father", "Dr Sharma treated me",
+    "Booked an appointment", "My experience here", "Came in for a consultation", "Had a check-up",
+]
+BODIES = [
+    "on Monday morning and the staff were polite", "for a root canal treatment", "after a referral from a friend",
+    "and waited 20 minutes in the waiting area", "the diagnosis was clear and the prescription worked",
+    "the receptionist Priya was helpful", "the room was clean and the lobby was comfortable",
+    "at 5pm for a follow up", "and paid $30 for the visit", "last week for a test",
+    "the doctor explained the procedure in detail", "they were rude and unprofessional",
+    "worst experience, total waste of money", "I felt the treatment was rushed", "I was impressed and satisfied",
+]
+GENERIC = [
+    "Best doctor", "Highly recommend", "Very good", "Great service", "Nice staff", "Excellent doctor",
+    "good experience", "highly recommended", "very professional", "friendly staff",
+]
+CLOSINGS = ["Thanks!", "Would recommend.", "Avoid this place.", "Thank you doctor.", "", "Will visit again.", "?"]
+
+
+def synthetic_reviews(count: int, seed: int = 42, duplicate_rate: float = 0.05):
+    """Build Outscraper-shaped review dicts with a mix of generic, detailed, negative and duplicate reviews"""
+    rng = random.Random(seed)
+    now = datetime.now()
+    reviews = []
+    for i in range(count):
+        if reviews and rng.random() < duplicate_rate:
+            text = rng.choice(reviews)["review_text"]
+        elif rng.random() < 0.3:
+            text = ". ".join(rng.sample(GENERIC, rng.randint(1, 4)))
+        else:
+            parts = [f"{rng.choice(OPENINGS)} {rng.choice(BODIES)}" for _ in range(rng.randint(1, 4))]
+            text = ". ".join(parts) + ". " + rng.choice(CLOSINGS)
+        review_date = now - timedelta(days=rng.randint(0, 720), seconds=rng.randint(0, 86400))
+        reviews.append({
+            "review_id": f"r{i}",
+            "author_title": f"Reviewer {i}",
+            "review_text": text,
+            "review_rating": rng.randint(1, 5),
+            "review_datetime_utc": review_date.strftime("%m/%d/%Y %H:%M:%S"),
+        })
+    return reviews
@@ -1,7 +1,8 @@
 from django.urls import path
-from .views import LocationAnalysisByCoordinatesView, LocationAnalysisByAddressView
+from .views import LocationAnalysisByCoordinatesView, LocationAnalysisByAddressView, GeoIQSchedulerStatsView
 
 urlpatterns = [
     path('location/coordinates/', LocationAnalysisByCoordinatesView.as_view(), name='location-analysis-coordinates'),
     path('location/address/', LocationAnalysisByAddressView.as_view(), name='location-analysis-address'),
+    path('scheduler/', GeoIQSchedulerStatsView.as_view(), name='geoiq-scheduler-stats'),
 ]
\ No newline at end of file
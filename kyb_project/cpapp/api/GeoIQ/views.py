@@ -1,7 +1,7 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from cpapp.services.GeoIQ import GeoIQService
+from cpapp.services.geoiq_scheduler import get_geoiq_scheduler
 from .serializers import LocationCoordinatesSerializer, LocationAddressSerializer
 
 class LocationAnalysisByCoordinatesView(APIView):
@@ -14,9 +14,8 @@ class LocationAnalysisByCoordinatesView(APIView):
             longitude = serializer.validated_data['lng']
             radius = serializer.validated_data.get('radius', 1000)
             
-            geoiq_service = GeoIQService()
             try:
-                analysis = geoiq_service.analyze_location(
+                analysis = get_geoiq_scheduler().analyze_location(
                     latitude=latitude,
                     longitude=longitude,
                     radius=radius
@@ -41,9 +40,8 @@ class LocationAnalysisByAddressView(APIView):
             pincode = serializer.validated_data.get('pincode')
             radius = serializer.validated_data.get('radius', 1000)
             
-            geoiq_service = GeoIQService()
             try:
-                analysis = geoiq_service.analyze_location(
+                analysis = get_geoiq_scheduler().analyze_location(
                     address=address,
                     pincode=pincode,
                     radius=radius
@@ -55,4 +53,17 @@ class LocationAnalysisByAddressView(APIView):
                     status=status.HTTP_500_INTERNAL_SERVER_ERROR
                 )
         
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
\ No newline at end of file
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class GeoIQSchedulerStatsView(APIView):
+    """API endpoint reporting GeoIQ scheduler queue depth, wait times and budget"""
+    
+    def get(self, request):
+        try:
+            return Response(get_geoiq_scheduler().stats(), status=status.HTTP_200_OK)
+        except Exception as e:
+            return Response(
+                {'error': str(e)}, 
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
\ No newline at end of file
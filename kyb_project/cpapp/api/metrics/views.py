@@ -0,0 +1,13 @@
+from django.http import HttpResponse
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from cpapp.services import metrics
+
+
+class MetricsView(APIView):
+    """API endpoint exposing in-process metrics (Prometheus text format, or JSON with ?format=json)"""
+    
+    def get(self, request):
+        if request.query_params.get('format') == 'json':
+            return Response(metrics.snapshot())
+        return HttpResponse(metrics.render_prometheus(), content_type='text/plain; version=0.0.4')
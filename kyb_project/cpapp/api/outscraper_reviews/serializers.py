@@ -23,6 +23,11 @@ class OutscraperReviewsSerializer(serializers.Serializer):
     async_request = serializers.BooleanField(default=True, required=False)
     ui = serializers.BooleanField(default=False, required=False)
     webhook = serializers.URLField(required=False, allow_null=True)
+    raw = serializers.BooleanField(
+        default=False,
+        required=False,
+        help_text="Stream Outscraper's response body through unchanged instead of the parsed result"
+    )
 
 class CustomSearchSerializer(serializers.Serializer):
     """
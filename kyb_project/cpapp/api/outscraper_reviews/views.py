@@ -1,148 +1,236 @@
-from rest_framework.views import APIView
-from rest_framework.response import Response
-from rest_framework import status
-from rest_framework.permissions import IsAuthenticated
-from typing import Dict, Any, List, Optional
-from ...services.Google_review_out_scraper import OutscraperMapsReviewsAPI
-from .serializers import OutscraperReviewsSerializer, CustomSearchSerializer
-import os
-import logging
-from dotenv import load_dotenv
-
-load_dotenv()
-
-logger = logging.getLogger(__name__)
-
-class OutscraperReviewsView(APIView):
-    """
-    API endpoint for retrieving Google Maps reviews using Outscraper
-    """
-    
-    
-    def post(self, request) -> Response:
-        try:
-            serializer = OutscraperReviewsSerializer(data=request.data)
-            if not serializer.is_valid():
-                return Response(
-                    serializer.errors,
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-            
-            # Get API key from environment variables
-            api_key = os.getenv("OUTSCRAPER_API_KEY") or os.getenv("VITE_OUTSCRAPER_API_KEY")
-            if not api_key:
-                return Response(
-                    {"error": "OUTSCRAPER_API_KEY not found in environment variables"},
-                    status=status.HTTP_500_INTERNAL_SERVER_ERROR
-                )
-            
-            client = OutscraperMapsReviewsAPI(api_key=api_key)
-            response = client.get_reviews(**serializer.validated_data)
-            
-            return Response(response, status=status.HTTP_200_OK)
-            
-        except Exception as e:
-            return Response(
-                {"error": str(e)},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
-
-class OutscraperReviewsResultsView(APIView):
-    """
-    API endpoint for retrieving results of an async Outscraper reviews request
-    """
-   
-    
-    def get(self, request, request_id: str) -> Response:
-        try:
-            # Get API key from environment variables
-            api_key = os.getenv("OUTSCRAPER_API_KEY") or os.getenv("VITE_OUTSCRAPER_API_KEY")
-            if not api_key:
-                return Response(
-                    {"error": "OUTSCRAPER_API_KEY not found in environment variables"},
-                    status=status.HTTP_500_INTERNAL_SERVER_ERROR
-                )
-            
-            client = OutscraperMapsReviewsAPI(api_key=api_key)
-            response = client.get_results(request_id)
-            return Response(response, status=status.HTTP_200_OK)
-            
-        except Exception as e:
-            return Response(
-                {"error": str(e)},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
-
-class CustomSearchView(APIView):
-    """
-    API endpoint for simplified search using Outscraper Google Reviews API
-    """
-    
-    def post(self, request) -> Response:
-        try:
-            logger.info(f"CustomSearchView received request: {request.data}")
-            
-            serializer = CustomSearchSerializer(data=request.data)
-            if not serializer.is_valid():
-                logger.error(f"Invalid request data: {serializer.errors}")
-                return Response(
-                    {"error": f"Invalid request data: {serializer.errors}"},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-            
-            # Get API key from environment variables
-            api_key = os.getenv("OUTSCRAPER_API_KEY") or os.getenv("VITE_OUTSCRAPER_API_KEY")
-            logger.debug(f"API key present: {bool(api_key)}")
-            
-            if not api_key:
-                logger.error("OUTSCRAPER_API_KEY not found in environment variables")
-                return Response(
-                    {"error": "OUTSCRAPER_API_KEY not found in environment variables. Please configure the API key."},
-                    status=status.HTTP_500_INTERNAL_SERVER_ERROR
-                )
-            
-            # Extract data from the serializer
-            query = serializer.validated_data["query"]
-            reviews_limit = serializer.validated_data["reviews_limit"]
-            
-            logger.info(f"Processing search for query: '{query}' with reviews_limit: {reviews_limit}")
-            
-            # Set up parameters for OutScraper API
-            params = {
-                "query": query,
-                "reviews_limit": reviews_limit,
-                "sort": "most_relevant",
-                "language": "en",
-                "async_request": False
-            }
-            
-            client = OutscraperMapsReviewsAPI(api_key=api_key)
-            logger.debug("Calling Outscraper API...")
-            
-            try:
-                response = client.get_reviews(**params)
-                logger.info(f"Received response from Outscraper API: {type(response)}")
-                logger.debug(f"Response details: {response}")
-                
-                # Check if response contains data
-                if not response or (isinstance(response, dict) and not response.get('data') and not response.get('results')):
-                    logger.warning(f"Empty response received: {response}")
-                    return Response(
-                        {"error": "No results found for your query. Please try a different search term."},
-                        status=status.HTTP_404_NOT_FOUND
-                    )
-                
-                return Response(response, status=status.HTTP_200_OK)
-            except Exception as api_error:
-                logger.exception(f"Error from Outscraper API: {str(api_error)}")
-                return Response(
-                    {"error": f"Outscraper API error: {str(api_error)}"},
-                    status=status.HTTP_500_INTERNAL_SERVER_ERROR
-                )
-            
-        except Exception as e:
-            logger.exception(f"Unhandled exception in CustomSearchView: {str(e)}")
-            return Response(
-                {"error": f"Server error: {str(e)}"},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from typing import Dict, Any, List, Optional
+from ...services.Google_review_out_scraper import get_outscraper_client
+from ...services.response_cache import ResponseCache
+from .serializers import OutscraperReviewsSerializer, CustomSearchSerializer
+import os
+import re
+import logging
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Upstream bytes forwarded per chunk in raw proxy mode
+PROXY_CHUNK_SIZE = 64 * 1024
+
+# Custom search results, shared by identical searches in this process
+search_cache = ResponseCache(
+    ttl=getattr(settings, 'CUSTOM_SEARCH_CACHE_SECONDS', 900),
+    maxsize=getattr(settings, 'CUSTOM_SEARCH_CACHE_SIZE', 256),
+    wait_timeout=getattr(settings, 'CUSTOM_SEARCH_WAIT_SECONDS', None)
+)
+
+# Place IDs (ChIJ...) and URLs are case-sensitive, so such queries are not case-folded
+CASE_SENSITIVE_QUERY = re.compile(r'^(?:[\w-]{20,}|https?://\S+)$')
+
+
+def search_cache_key(params: Dict[str, Any]) -> tuple:
+    """Cache key of a custom search: whitespace-insensitive query (case-insensitive unless an ID or URL), limit, sort and language"""
+    query = ' '.join(str(params['query']).split())
+    if not CASE_SENSITIVE_QUERY.match(query):
+        query = query.casefold()
+    return (query, params['reviews_limit'], params['sort'], params['language'].lower())
+
+
+def has_results(response: Any) -> bool:
+    """Whether an Outscraper response holds results (errors and empty results are not cached)"""
+    return isinstance(response, dict) and 'error' not in response and bool(response.get('data') or response.get('results'))
+
+
+def wants_raw(value) -> bool:
+    """Whether a raw query parameter asks for the raw proxy mode"""
+    return str(value).lower() in ('1', 'true', 'yes')
+
+
+def proxy_response(upstream) -> StreamingHttpResponse:
+    """
+    Stream an unread upstream response to the client as it arrives
+    
+    The body is forwarded chunk by chunk (chunked transfer, no
+    Content-Length) without being parsed or re-serialized, with the
+    upstream status and content type. The upstream connection is released
+    when the body has been sent or the client goes away.
+    """
+    def body():
+        try:
+            yield from upstream.iter_content(chunk_size=PROXY_CHUNK_SIZE)
+        finally:
+            upstream.close()
+    
+    return StreamingHttpResponse(
+        body(),
+        status=upstream.status_code,
+        content_type=upstream.headers.get('Content-Type', 'application/json')
+    )
+
+
+class OutscraperReviewsView(APIView):
+    """
+    API endpoint for retrieving Google Maps reviews using Outscraper
+    
+    With "raw": true Outscraper's response body is streamed through unchanged.
+    """
+    
+    
+    def post(self, request) -> Response:
+        try:
+            serializer = OutscraperReviewsSerializer(data=request.data)
+            if not serializer.is_valid():
+                return Response(
+                    serializer.errors,
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            
+            # Get API key from environment variables
+            api_key = os.getenv("OUTSCRAPER_API_KEY") or os.getenv("VITE_OUTSCRAPER_API_KEY")
+            if not api_key:
+                return Response(
+                    {"error": "OUTSCRAPER_API_KEY not found in environment variables"},
+                    status=status.HTTP_500_INTERNAL_SERVER_ERROR
+                )
+            
+            client = get_outscraper_client(api_key)
+            params = dict(serializer.validated_data)
+            if params.pop('raw'):
+                return proxy_response(client.open_reviews(**params))
+            response = client.get_reviews(**params)
+            
+            return Response(response, status=status.HTTP_200_OK)
+            
+        except Exception as e:
+            return Response(
+                {"error": str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+class OutscraperReviewsResultsView(APIView):
+    """
+    API endpoint for retrieving results of an async Outscraper reviews request
+    
+    ?raw=true streams Outscraper's response body through unchanged.
+    """
+   
+    
+    def get(self, request, request_id: str) -> Response:
+        try:
+            # Get API key from environment variables
+            api_key = os.getenv("OUTSCRAPER_API_KEY") or os.getenv("VITE_OUTSCRAPER_API_KEY")
+            if not api_key:
+                return Response(
+                    {"error": "OUTSCRAPER_API_KEY not found in environment variables"},
+                    status=status.HTTP_500_INTERNAL_SERVER_ERROR
+                )
+            
+            client = get_outscraper_client(api_key)
+            if wants_raw(request.query_params.get('raw')):
+                return proxy_response(client.open_results(request_id))
+            response = client.get_results(request_id)
+            return Response(response, status=status.HTTP_200_OK)
+            
+        except Exception as e:
+            return Response(
+                {"error": str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+class CustomSearchView(APIView):
+    """
+    API endpoint for simplified search using Outscraper Google Reviews API
+    
+    Results are cached for CUSTOM_SEARCH_CACHE_SECONDS and concurrent
+    identical searches share one upstream call. The response's cache_age
+    (and Age header) is the age in seconds of a cached or shared result,
+    0 for a fresh one.
+    """
+    
+    def post(self, request) -> Response:
+        try:
+            logger.info(f"CustomSearchView received request: {request.data}")
+            
+            serializer = CustomSearchSerializer(data=request.data)
+            if not serializer.is_valid():
+                logger.error(f"Invalid request data: {serializer.errors}")
+                return Response(
+                    {"error": f"Invalid request data: {serializer.errors}"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            
+            # Get API key from environment variables
+            api_key = os.getenv("OUTSCRAPER_API_KEY") or os.getenv("VITE_OUTSCRAPER_API_KEY")
+            logger.debug(f"API key present: {bool(api_key)}")
+            
+            if not api_key:
+                logger.error("OUTSCRAPER_API_KEY not found in environment variables")
+                return Response(
+                    {"error": "OUTSCRAPER_API_KEY not found in environment variables. Please configure the API key."},
+                    status=status.HTTP_500_INTERNAL_SERVER_ERROR
+                )
+            
+            # Extract data from the serializer
+            query = serializer.validated_data["query"]
+            reviews_limit = serializer.validated_data["reviews_limit"]
+            
+            logger.info(f"Processing search for query: '{query}' with reviews_limit: {reviews_limit}")
+            
+            # Set up parameters for OutScraper API
+            params = {
+                "query": query,
+                "reviews_limit": reviews_limit,
+                "sort": "most_relevant",
+                "language": "en",
+                "async_request": False
+            }
+            
+            client = get_outscraper_client(api_key)
+            logger.debug("Calling Outscraper API...")
+            
+            try:
+                response, cache_age = search_cache.get_or_fetch(
+                    search_cache_key(params),
+                    lambda: client.get_reviews(**params),
+                    cacheable=has_results
+                )
+                if cache_age is None:
+                    logger.info(f"Received response from Outscraper API: {type(response)}")
+                    logger.debug(f"Response details: {response}")
+                else:
+                    logger.info(f"Served search for '{query}' from cache (age {cache_age:.1f}s)")
+                
+                # Check if response contains data
+                if not response or (isinstance(response, dict) and not response.get('data') and not response.get('results')):
+                    logger.warning(f"Empty response received: {response}")
+                    return Response(
+                        {"error": "No results found for your query. Please try a different search term."},
+                        status=status.HTTP_404_NOT_FOUND
+                    )
+                
+                cache_age = round(cache_age or 0.0, 1)
+                if isinstance(response, dict):
+                    response = {**response, "cache_age": cache_age}
+                return Response(response, status=status.HTTP_200_OK, headers={"Age": str(int(cache_age))})
+            except TimeoutError as e:
+                logger.warning(f"Search for '{query}' waited too long for an identical search: {str(e)}")
+                return Response(
+                    {"error": "An identical search is still running. Please retry shortly."},
+                    status=status.HTTP_504_GATEWAY_TIMEOUT
+                )
+            except Exception as api_error:
+                logger.exception(f"Error from Outscraper API: {str(api_error)}")
+                return Response(
+                    {"error": f"Outscraper API error: {str(api_error)}"},
+                    status=status.HTTP_500_INTERNAL_SERVER_ERROR
+                )
+            
+        except Exception as e:
+            logger.exception(f"Unhandled exception in CustomSearchView: {str(e)}")
+            return Response(
+                {"error": f"Server error: {str(e)}"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
             ) 
\ No newline at end of file
@@ -55,7 +55,15 @@ class ScoreResponseSerializer(serializers.Serializer):
     created_at = serializers.DateTimeField()
 
 
-class ReviewScoringRequestSerializer(serializers.Serializer):
+class ReviewResponseOptionsSerializer(serializers.Serializer):
+    """Projection and pagination options of scored-review responses"""
+    fields = serializers.CharField(required=False, allow_blank=True, help_text="Comma-separated review fields to return, e.g. review_text,review_score,scoring_factors")
+    page_size = serializers.IntegerField(required=False, min_value=1, max_value=1000, help_text="Scored reviews per page (enables cursor pagination)")
+    cursor = serializers.CharField(required=False, allow_blank=True, help_text="next_cursor of the previous page")
+    summary_only = serializers.BooleanField(default=False, help_text="Return only the aggregates, without scored reviews")
+
+
+class ReviewScoringRequestSerializer(ReviewResponseOptionsSerializer):
     """Serializer for review scoring requests"""
     query = serializers.CharField(help_text="Search query or place ID to fetch reviews for")
     reviews_limit = serializers.IntegerField(default=20, help_text="Maximum number of reviews to fetch per place")
@@ -66,6 +74,34 @@ class ReviewScoringRequestSerializer(serializers.Serializer):
     )
     language = serializers.CharField(default="en", help_text="Language code for results")
     async_request = serializers.BooleanField(default=True, help_text="Whether to use asynchronous request processing")
+    incremental = serializers.BooleanField(default=False, help_text="Fetch and score only reviews newer than the stored ones for this place")
+
+    def validate(self, data):
+        # A later page of a fresh request would fetch and score every review again
+        if data.get('cursor') and not data.get('incremental'):
+            raise serializers.ValidationError({
+                'cursor': "Pages after the first are read from stored results: pass cursor with incremental, "
+                          "or when checking the status of an async request"
+            })
+        return data
+
+
+class ReviewPortfolioRequestSerializer(serializers.Serializer):
+    """Serializer for portfolio review checks of many places"""
+    queries = serializers.ListField(
+        child=serializers.CharField(),
+        min_length=1,
+        max_length=5000,
+        help_text="Search queries or place IDs of the places to check"
+    )
+    reviews_limit = serializers.IntegerField(default=20, help_text="Maximum number of reviews to fetch per place")
+    sort = serializers.ChoiceField(
+        choices=["most_relevant", "newest", "highest_rating", "lowest_rating"],
+        default="most_relevant",
+        help_text="Sorting method for reviews"
+    )
+    language = serializers.CharField(default="en", help_text="Language code for results")
+    async_request = serializers.BooleanField(default=True, help_text="Whether to use asynchronous request processing")
 
 
  
\ No newline at end of file
@@ -1,12 +1,14 @@
 from django.urls import path
 from .views import (
     SearchAPIView, ScoreAPIView, 
-    ReviewScoringAPIView
+    ReviewScoringAPIView, ReviewScoringWebhookAPIView, ReviewPortfolioAPIView
 )
 
 urlpatterns = [
     path('search/', SearchAPIView.as_view(), name='api-search'),
     path('score/', ScoreAPIView.as_view(), name='api-score'),
     path('review-scoring/', ReviewScoringAPIView.as_view(), name='api-review-scoring'),
+    path('review-webhook/', ReviewScoringWebhookAPIView.as_view(), name='api-review-webhook'),
+    path('review-portfolio/', ReviewPortfolioAPIView.as_view(), name='api-review-portfolio'),
     
 ] 
\ No newline at end of file
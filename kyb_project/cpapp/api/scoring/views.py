@@ -1,8 +1,8 @@
+from django.conf import settings
 from django.utils import timezone
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, serializers
-from django.db.models import Q
 import logging
 import os
 import json
@@ -16,22 +16,31 @@ from cpapp.models.google_map_data import GoogleMapData
 from cpapp.models.practor_new import NewPractoDoctor
 from cpapp.services.scoring_engine import DoctorScoringEngine
 from cpapp.services.review_scorer_integration import ReviewAnalysisService
+from cpapp.services.review_jobs import create_job, mark_job_due, new_webhook_token, webhook_url
+from cpapp.services.review_response import parse_fields, shape_review_response
+from cpapp.services.search_index import decode_cursor, encode_cursor, search
+from cpapp.models.review_job import ReviewScoringJob
 from .serializers import (
     DoctorSearchSerializer, ClinicSearchSerializer,
     ScoreRequestSerializer, ScoreResponseSerializer,
-    ReviewScoringRequestSerializer
+    ReviewScoringRequestSerializer, ReviewResponseOptionsSerializer,
+    ReviewPortfolioRequestSerializer
 )
 from dotenv import load_dotenv
 
 load_dotenv()
 # Define serializers inline for this view since they were removed from imports
-class ReviewCheckStatusSerializer(serializers.Serializer):
+class ReviewCheckStatusSerializer(ReviewResponseOptionsSerializer):
     """Serializer for checking the status of a review scoring request"""
     request_id = serializers.CharField(help_text="ID of the asynchronous request to check")
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Results per source in a page of search results
+SEARCH_PAGE_SIZE = 10
+SEARCH_MAX_PAGE_SIZE = 50
+
 
 class SearchAPIView(APIView):
     """API endpoint for searching doctors and clinics"""
@@ -46,216 +55,26 @@ class SearchAPIView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        results = []
-        
-        # Search for doctors
-        if entity_type in ['all', 'doctor']:
-            # Search PractoDoctor
-            practo_doctors = PractoDoctor.objects.filter(
-                Q(name__icontains=query) | 
-                Q(speciality__icontains=query)
-            )[:10]
-            
-            for doctor in practo_doctors:
-                results.append({
-                    'id': doctor.id,
-                    'name': doctor.name,
-                    'source': 'practo',
-                    'speciality': doctor.speciality,
-                    'location': doctor.location,
-                    'experience': doctor.experience,
-                    'qualification': doctor.detailed_qualifications,
-                    'rating': doctor.recommendation_percent,
-                    'url': doctor.doctor_url,
-                    'address': doctor.doctor_address,
-                    'phone': doctor.contact_number
-                })
-            
-            # Search JustDialDoctor
-            jd_doctors = JustDialDoctor.objects.filter(
-                Q(doctor_name__icontains=query) | 
-                Q(category__icontains=query)
-            )[:10]
-            
-            for doctor in jd_doctors:
-                results.append({
-                    'id': doctor.id,
-                    'name': doctor.doctor_name,
-                    'source': 'justdial',
-                    'speciality': doctor.category,
-                    'location': doctor.location,
-                    'experience': doctor.experience,
-                    'qualification': doctor.qualification,
-                    'rating': doctor.rating,
-                    'phone': doctor.phone_number,
-                    'registration': doctor.registration,
-                    'address': doctor.clinic_address,
-                    'url': doctor.detail_url
-                })
-            
-            # Search NMCDoctor
-            nmc_doctors = NMCDoctor.objects.filter(
-                Q(firstName__icontains=query) | 
-                Q(lastName__icontains=query)
-            )[:10]
-            
-            for doctor in nmc_doctors:
-                full_name = f"{doctor.firstName} {doctor.lastName if doctor.lastName else ''}"
-                results.append({
-                    'id': doctor.id,
-                    'name': full_name.strip(),
-                    'source': 'nmc',
-                    'speciality': 'Verified Doctor',
-                    'location': doctor.address,
-                    'experience': '',
-                    'qualification': doctor.doctorDegree,
-                    'rating': '',
-                    'registration': doctor.registrationNo,
-                })
-                
-            # Search NMCDentalDoctor
-            from cpapp.models.nmc_dental import NMCDentalDoctor
-            nmc_dental_doctors = NMCDentalDoctor.objects.filter(
-                Q(full_name__icontains=query) | 
-                Q(qualification__icontains=query)
-            )[:10]
-            
-            for doctor in nmc_dental_doctors:
-                results.append({
-                    'id': doctor.id,
-                    'name': doctor.full_name,
-                    'source': 'nmc_dental',
-                    'speciality': 'Dentist',
-                    'location': doctor.state_medical_council.replace(' State Dental Council', '').strip() if hasattr(doctor, 'state_medical_council') else '',
-                    'experience': '',
-                    'qualification': doctor.qualification,
-                    'rating': '',
-                    'registration': doctor.registration_number,
-                })
-            
-            # Search BajajDoctor
-            bajaj_doctors = BajajDoctor.objects.filter(
-                Q(name__icontains=query) | 
-                Q(specialities__icontains=query)
-            )[:10]
-            
-            for doctor in bajaj_doctors:
-                results.append({
-                    'id': doctor.id,
-                    'name': doctor.name,
-                    'source': 'bajaj',
-                    'speciality': doctor.specialities,
-                    'location': doctor.clinic_address,
-                    'experience': doctor.experience,
-                    'qualification': doctor.qualifications,
-                    'rating': doctor.rating_percent,
-                    'rating_count': doctor.rating_count,
-                    'address': doctor.clinic_address,
-                    'clinic_name': doctor.clinic_name,
-                    'hpr_id': doctor.hpr_id
-                })
-                
-            # Search SaveinDoctor
-            savein_doctors = SaveinDoctor.objects.filter(
-                Q(name__icontains=query) | 
-                Q(doctor_name__icontains=query) |
-                Q(specialization__icontains=query)
-            )[:10]
-            
-            for doctor in savein_doctors:
-                results.append({
-                    'id': doctor.id,
-                    'name': doctor.doctor_name,
-                    'source': 'savein',
-                    'speciality': doctor.specialization,
-                    'location': doctor.location,
-                    'experience': doctor.experience,
-                    'qualification': doctor.qualification,
-                    'rating': doctor.rating,
-                    'rating_count': doctor.reviews_count,
-                    'address': doctor.address,
-                    'consultation_fee': doctor.consultation_fee,
-                    'price_category': doctor.price_category,
-                    'services': doctor.services
-                })
-            
-            # Search NewPractoDoctor
-            new_practo_doctors = NewPractoDoctor.objects.filter(
-                Q(doctor_name__icontains=query) | 
-                Q(specialization__icontains=query)
-            )[:10]
-            
-            for doctor in new_practo_doctors:
-                try:
-                    clinic_address = ""
-                    
-                    # Use the clinic_data property instead of handling raw data
-                    if hasattr(doctor, 'clinic_data'):
-                        clinic_data = doctor.clinic_data
-                        if isinstance(clinic_data, dict):
-                            clinic_address = clinic_data.get('address', '')
-                    
-                    results.append({
-                        'id': doctor.id,
-                        'name': doctor.doctor_name,
-                        'source': 'new_practo',
-                        'speciality': doctor.specialization,
-                        'location': doctor.location,
-                        'experience': doctor.experience,
-                        'qualification': doctor.qualification,
-                        'rating': doctor.rating,
-                        'rating_count': doctor.rating_count,
-                        'address': clinic_address,
-                        'services': doctor.services,
-                        'education': doctor.education,
-                        'registration': doctor.registration,
-                    })
-                except Exception as e:
-                    logger.error(f"Error processing NewPractoDoctor {doctor.id}: {str(e)}")
+        try:
+            page_size = int(request.query_params.get('page_size', SEARCH_PAGE_SIZE))
+            cursor = request.query_params.get('cursor')
+            cursor = decode_cursor(cursor) if cursor else None
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        if not 1 <= page_size <= SEARCH_MAX_PAGE_SIZE:
+            return Response(
+                {"error": f"page_size must be between 1 and {SEARCH_MAX_PAGE_SIZE}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         
-        # Search for clinics
-        if entity_type in ['all', 'clinic']:
-            # Search JustDialClinic
-            jd_clinics = JustDialClinic.objects.filter(
-                Q(name__icontains=query) | 
-                Q(category__icontains=query)
-            )[:10]
-            
-            for clinic in jd_clinics:
-                results.append({
-                    'id': clinic.id,
-                    'name': clinic.name,
-                    'source': 'justdial',
-                    'category': clinic.category,
-                    'speciality': clinic.category,
-                    'location': clinic.address,
-                    'rating': clinic.rating,
-                    'address': clinic.address
-                })
-            
-            # Search GoogleMapData
-            logger.info(f"Searching GoogleMapData for query: {query}")
-            google_map_results = GoogleMapData.objects.filter(
-                Q(name__icontains=query) | 
-                Q(category__icontains=query) |
-                Q(full_address__icontains=query)
-            )[:10]
-            
-            logger.info(f"Found {google_map_results.count()} GoogleMapData results")
-            
-            for place in google_map_results:
-                results.append({
-                    'id': place.id,
-                    'name': place.name,
-                    'source': 'googlemap',
-                    'category': place.category,
-                    'type': place.type,
-                    'location': place.full_address,
-                    'address': place.full_address,
-                    'rating': place.rating,
-                    'rating_count': place.reviews,
-                    'verified': place.verified
-                })
+        found = search(
+            query,
+            entity_type,
+            per_source=page_size,
+            timeout=getattr(settings, 'SEARCH_SOURCE_TIMEOUT_SECONDS', 0),
+            cursor=cursor
+        )
+        results = found.results
         
         # Serialize based on entity type
         if entity_type == 'doctor':
@@ -270,12 +89,31 @@ class SearchAPIView(APIView):
             doctor_serializer = DoctorSearchSerializer(doctor_results, many=True)
             clinic_serializer = ClinicSearchSerializer(clinic_results, many=True)
             
-            return Response({
+            body = {
                 'doctors': doctor_serializer.data,
-                'clinics': clinic_serializer.data
-            })
+                'clinics': clinic_serializer.data,
+                'partial': found.partial,
+                'next_cursor': encode_cursor(found.next_cursor)
+            }
+            if settings.DEBUG:
+                body['timings'] = found.timings
+            return self.search_response(body, found)
         
-        return Response(serializer.data)
+        return self.search_response(serializer.data, found)
+
+    def search_response(self, body, found):
+        """Response flagging a partial search and the next page, with per-source timings in debug mode"""
+        response = Response(body)
+        if found.partial:
+            response['X-Search-Partial'] = 'true'
+        if found.next_cursor:
+            response['X-Next-Cursor'] = encode_cursor(found.next_cursor)
+        if settings.DEBUG and found.timings:
+            response['Server-Timing'] = ', '.join(
+                f'{label};dur={ms:.1f}' if ms is not None else f'{label};desc="left out"'
+                for label, ms in found.timings.items()
+            )
+        return response
 
 
 class ScoreAPIView(APIView):
@@ -306,8 +144,6 @@ class ScoreAPIView(APIView):
                 try:
                     entity = PractoDoctor.objects.get(id=entity_id)
                     name = entity.name
-                    # Ensure we have complete data for scoring
-                    entity.refresh_from_db()
                 except PractoDoctor.DoesNotExist:
                     return Response(
                         {"error": "Doctor not found"},
@@ -316,8 +152,6 @@ class ScoreAPIView(APIView):
             elif source == 'justdial':
                 try:
                     entity = JustDialDoctor.objects.get(id=entity_id)
-                    # Ensure we have complete data for scoring
-                    entity.refresh_from_db()
                     name = entity.doctor_name
                 except JustDialDoctor.DoesNotExist:
                     return Response(
@@ -327,8 +161,6 @@ class ScoreAPIView(APIView):
             elif source == 'nmc':
                 try:
                     entity = NMCDoctor.objects.get(id=entity_id)
-                    # Ensure we have complete data for scoring
-                    entity.refresh_from_db()
                     name = f"{entity.firstName} {entity.lastName if entity.lastName else ''}".strip()
                 except NMCDoctor.DoesNotExist:
                     return Response(
@@ -339,8 +171,6 @@ class ScoreAPIView(APIView):
                 from cpapp.models.nmc_dental import NMCDentalDoctor
                 try:
                     entity = NMCDentalDoctor.objects.get(id=entity_id)
-                    # Ensure we have complete data for scoring
-                    entity.refresh_from_db()
                     name = entity.full_name
                 except NMCDentalDoctor.DoesNotExist:
                     return Response(
@@ -350,8 +180,6 @@ class ScoreAPIView(APIView):
             elif source == 'bajaj':
                 try:
                     entity = BajajDoctor.objects.get(id=entity_id)
-                    # Ensure we have complete data for scoring
-                    entity.refresh_from_db()
                     name = entity.name
                 except BajajDoctor.DoesNotExist:
                     return Response(
@@ -361,8 +189,6 @@ class ScoreAPIView(APIView):
             elif source == 'savein':
                 try:
                     entity = SaveinDoctor.objects.get(id=entity_id)
-                    # Ensure we have complete data for scoring
-                    entity.refresh_from_db()
                     name = entity.name or entity.doctor_name
                 except SaveinDoctor.DoesNotExist:
                     return Response(
@@ -372,8 +198,6 @@ class ScoreAPIView(APIView):
             elif source == 'new_practo':
                 try:
                     entity = NewPractoDoctor.objects.get(id=entity_id)
-                    # Ensure we have complete data for scoring
-                    entity.refresh_from_db()
                     name = entity.doctor_name
                 except NewPractoDoctor.DoesNotExist:
                     return Response(
@@ -395,8 +219,6 @@ class ScoreAPIView(APIView):
             if source == 'justdial':
                 try:
                     entity = JustDialClinic.objects.get(id=entity_id)
-                    # Ensure we have complete data for scoring
-                    entity.refresh_from_db()
                     name = entity.name
                 except JustDialClinic.DoesNotExist:
                     return Response(
@@ -406,8 +228,6 @@ class ScoreAPIView(APIView):
             elif source == 'googlemap':
                 try:
                     entity = GoogleMapData.objects.get(id=entity_id)
-                    # Ensure we have complete data for scoring
-                    entity.refresh_from_db()
                     name = entity.name
                 except GoogleMapData.DoesNotExist:
                     return Response(
@@ -449,6 +269,20 @@ class ScoreAPIView(APIView):
 class ReviewScoringAPIView(APIView):
     """API endpoint for scoring Google reviews from Outscraper API"""
     
+    @staticmethod
+    def shaped_response(result, options):
+        """Apply the request's projection and pagination options to a scored-review result"""
+        try:
+            return Response(shape_review_response(
+                result,
+                fields=parse_fields(options.get('fields')),
+                page_size=options.get('page_size'),
+                cursor=options.get('cursor') or None,
+                summary_only=options.get('summary_only', False)
+            ))
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    
     def post(self, request):
         """
         Submit a review scoring request.
@@ -485,9 +319,13 @@ class ReviewScoringAPIView(APIView):
         sort = serializer.validated_data.get('sort', 'most_relevant')
         language = serializer.validated_data.get('language', 'en')
         async_request = serializer.validated_data.get('async_request', True)
+        incremental = serializer.validated_data.get('incremental', False)
+        # Copy only the review fields the response will contain
+        fields = () if serializer.validated_data['summary_only'] else parse_fields(serializer.validated_data.get('fields'))
         
         # Fetch and score reviews
         logger.info(f"Fetching and scoring reviews for: {query} with limit: {reviews_limit}")
+        webhook_token = new_webhook_token() if async_request and not incremental else ''
         
         try:
             # Process the reviews
@@ -496,7 +334,10 @@ class ReviewScoringAPIView(APIView):
                 reviews_limit=reviews_limit,
                 sort=sort,
                 language=language,
-                async_request=async_request
+                async_request=async_request,
+                incremental=incremental,
+                webhook=webhook_url(webhook_token) or None,
+                fields=fields
             )
             
             logger.info(f"Received review processing result: {type(result)}")
@@ -511,8 +352,9 @@ class ReviewScoringAPIView(APIView):
                     status=status.HTTP_404_NOT_FOUND
                 )
             
-            # Handle async requests
+            # Handle async requests: the run_review_jobs worker scores them server-side
             if async_request and result.get("status") == "pending":
+                create_job(result.get("request_id"), query=query, webhook_token=webhook_token)
                 return Response({
                     "status": "pending",
                     "request_id": result.get("request_id"),
@@ -520,7 +362,7 @@ class ReviewScoringAPIView(APIView):
                 })
             
             # Return the scored reviews
-            return Response(result)
+            return self.shaped_response(result, serializer.validated_data)
             
         except Exception as e:
             logger.exception(f"Error processing reviews: {str(e)}")
@@ -532,6 +374,9 @@ class ReviewScoringAPIView(APIView):
     def get(self, request):
         """
         Check the status of an asynchronous review scoring request.
+        
+        Reads the job row the run_review_jobs worker completes; a poll never
+        calls Outscraper.
         """
         serializer = ReviewCheckStatusSerializer(data=request.query_params)
         
@@ -543,69 +388,23 @@ class ReviewScoringAPIView(APIView):
             
         request_id = serializer.validated_data['request_id']
         
-        # Get API key from environment or settings
-        api_key = os.getenv("OUTSCRAPER_API_KEY") or os.getenv("VITE_OUTSCRAPER_API_KEY")
-        if not api_key:
-            return Response(
-                {"error": "Outscraper API key not configured"},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
-            
-        # Initialize the review analysis service
-        review_service = ReviewAnalysisService(api_key)
-        
         try:
-            # Get results for the request
-            result = review_service.get_review_results(request_id)
+            job = ReviewScoringJob.objects.filter(request_id=request_id).values('status', 'result').first()
+            if job is None:
+                # Requests submitted elsewhere are handed to the worker on first check
+                create_job(request_id)
+                job = {'status': ReviewScoringJob.PENDING, 'result': None}
             
             # If the request is still processing
-            if result.get("status") == "pending":
+            if job['status'] == ReviewScoringJob.PENDING:
                 return Response({
                     "status": "pending",
                     "request_id": request_id,
                     "message": "Review fetching still in progress."
                 })
-                
-            # If completed, score the reviews
-            if result.get("status") == "finished" and "data" in result:
-                reviews_data = []
-                for place_data in result["data"]:
-                    if "reviews_data" in place_data and place_data["reviews_data"]:
-                        reviews_data.extend(place_data["reviews_data"])
-                
-                # Score the reviews
-                if reviews_data:
-                    scored_reviews = review_service.score_reviews(reviews_data)
-                    
-                    # Calculate statistics
-                    total_reviews = len(scored_reviews)
-                    genuine_reviews = sum(1 for r in scored_reviews if r['review_score'] > 0)
-                    fake_reviews = total_reviews - genuine_reviews
-                    avg_score = sum(r['review_score'] for r in scored_reviews) / total_reviews if total_reviews > 0 else 0
-                    
-                    return Response({
-                        "status": "completed",
-                        "request_id": request_id,
-                        "total_reviews": total_reviews,
-                        "genuine_reviews": genuine_reviews,
-                        "fake_reviews": fake_reviews,
-                        "average_score": round(avg_score, 2),
-                        "scored_reviews": scored_reviews
-                    })
-                else:
-                    return Response({
-                        "status": "completed",
-                        "request_id": request_id,
-                        "message": "No reviews found for this query.",
-                        "scored_reviews": []
-                    })
             
-            # Handle failed requests
-            return Response({
-                "status": "error",
-                "message": "Failed to retrieve review results.",
-                "response": result
-            })
+            # Completed or failed: the stored final response
+            return self.shaped_response(job['result'], serializer.validated_data)
             
         except Exception as e:
             logger.error(f"Error checking review status: {str(e)}")
@@ -613,4 +412,71 @@ class ReviewScoringAPIView(APIView):
                 {"error": f"Error checking review status: {str(e)}"},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
-        
\ No newline at end of file
+
+
+class ReviewScoringWebhookAPIView(APIView):
+    """Outscraper callback for finished asynchronous review requests"""
+    
+    def post(self, request):
+        """
+        Schedule the finished request's job for an immediate poll by the worker.
+        
+        The job's secret token is passed in the webhook URL registered with the request.
+        """
+        request_id = request.data.get('id') if hasattr(request.data, 'get') else None
+        token = request.query_params.get('token', '')
+        if not request_id or not mark_job_due(str(request_id), token):
+            return Response({"error": "Unknown review scoring job"}, status=status.HTTP_404_NOT_FOUND)
+        return Response({"status": "accepted", "request_id": request_id})
+
+
+class ReviewPortfolioAPIView(APIView):
+    """API endpoint for checking the reviews of many places at once"""
+    
+    def post(self, request):
+        """
+        Submit a portfolio review check.
+        
+        Packs the queries into as few multi-query Outscraper requests as
+        possible and returns per-place aggregates. Async batches are scored by
+        the run_review_jobs worker; check each batch's request_id with
+        GET /api/scoring/review-scoring/.
+        """
+        serializer = ReviewPortfolioRequestSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(
+                {"error": f"Invalid request data: {serializer.errors}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        api_key = os.getenv("OUTSCRAPER_API_KEY") or os.getenv("VITE_OUTSCRAPER_API_KEY")
+        if not api_key:
+            logger.error("Outscraper API key not configured")
+            return Response(
+                {"error": "Outscraper API key not configured. Please set the OUTSCRAPER_API_KEY environment variable."},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+        
+        data = serializer.validated_data
+        async_request = data['async_request']
+        # One token authenticates the webhook of every batch of this portfolio
+        webhook_token = new_webhook_token() if async_request else ''
+        
+        try:
+            result = ReviewAnalysisService(api_key).process_portfolio(
+                queries=data['queries'],
+                reviews_limit=data['reviews_limit'],
+                sort=data['sort'],
+                language=data['language'],
+                async_request=async_request,
+                webhook=webhook_url(webhook_token) or None
+            )
+            for batch in result.get("batches", []):
+                create_job(batch["request_id"], webhook_token=webhook_token, queries=batch["queries"])
+            return Response(result)
+        except Exception as e:
+            logger.exception(f"Error processing review portfolio: {str(e)}")
+            return Response(
+                {"error": f"Error processing review portfolio: {str(e)}"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
@@ -1,6 +1,15 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
 
 
 class CpappConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'cpapp'
+
+    def ready(self):
+        from cpapp.services.search_index import SEARCH_SOURCES, index_saved_entity, unindex_deleted_entity
+
+        # Keep the search index in step with the source tables
+        for model in dict.fromkeys(source.model for source in SEARCH_SOURCES):
+            post_save.connect(index_saved_entity, sender=model)
+            post_delete.connect(unindex_deleted_entity, sender=model)
@@ -3,6 +3,7 @@ import datetime
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 from cpapp.models import JustDialClinic
+from cpapp.services.search_index import SearchIndexWriter
 
 
 class Command(BaseCommand):
@@ -41,7 +42,7 @@ class Command(BaseCommand):
         self.stdout.write(self.style.SUCCESS(f'Using database: kyb_db'))
         
         try:
-            with open(csv_file, 'r', encoding='utf-8') as file:
+            with open(csv_file, 'r', encoding='utf-8') as file, SearchIndexWriter('clinic', 'justdial') as search_index:
                 reader = csv.DictReader(file)
                 clinics_created = 0
                 clinics_updated = 0
@@ -75,6 +76,7 @@ class Command(BaseCommand):
                             category=cleaned_data['category'],
                             defaults=cleaned_data
                         )
+                        search_index.add(clinic)
                         
                         if created:
                             clinics_created += 1
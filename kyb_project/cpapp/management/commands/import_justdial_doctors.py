@@ -3,6 +3,7 @@ import datetime
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 from cpapp.models import JustDialDoctor
+from cpapp.services.search_index import SearchIndexWriter
 
 
 class Command(BaseCommand):
@@ -30,7 +31,7 @@ class Command(BaseCommand):
         self.stdout.write(self.style.SUCCESS(f'Starting import from {csv_file}'))
         
         try:
-            with open(csv_file, 'r', encoding='utf-8-sig') as file:
+            with open(csv_file, 'r', encoding='utf-8-sig') as file, SearchIndexWriter('doctor', 'justdial') as search_index:
                 reader = csv.DictReader(file)
                 doctors_created = 0
                 doctors_updated = 0
@@ -78,6 +79,7 @@ class Command(BaseCommand):
                             clinic_address=cleaned_data['clinic_address'],
                             defaults=cleaned_data
                         )
+                        search_index.add(doctor)
                         
                         if created:
                             doctors_created += 1
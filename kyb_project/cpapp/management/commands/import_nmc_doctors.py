@@ -1,5 +1,6 @@
 from django.core.management.base import BaseCommand
 from cpapp.models.nmc import NMCDoctor
+from cpapp.services.search_index import SearchIndexWriter
 import csv
 from datetime import datetime
 from django.utils.timezone import make_aware
@@ -16,7 +17,7 @@ class Command(BaseCommand):
         dry_run = kwargs['dry_run']
         
         try:
-            with open(csv_path, 'r', encoding='utf-8-sig') as csvfile:
+            with open(csv_path, 'r', encoding='utf-8-sig') as csvfile, SearchIndexWriter('doctor', 'nmc') as search_index:
                 # Read sample and detect format
                 sample = csvfile.read(2048)
                 csvfile.seek(0)
@@ -67,6 +68,7 @@ class Command(BaseCommand):
                                 'smc_id': row.get('smc_id'),
                             }
                         )
+                        search_index.add(doctor)
                         
                         if created and not dry_run:
                             self.stdout.write(f'Created doctor ID {doctor.doctor_id}')
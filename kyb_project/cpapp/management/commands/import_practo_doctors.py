@@ -2,6 +2,7 @@ import csv
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 from cpapp.models import PractoDoctor
+from cpapp.services.search_index import SearchIndexWriter
 
 class Command(BaseCommand):
     help = 'Import Practo doctors data from CSV file into kyb_db database'
@@ -37,7 +38,7 @@ class Command(BaseCommand):
         self.stdout.write(self.style.SUCCESS(f'Using database: kyb_db'))
         
         try:
-            with open(csv_file, 'r', encoding='utf-8') as file:
+            with open(csv_file, 'r', encoding='utf-8') as file, SearchIndexWriter('doctor', 'practo') as search_index:
                 reader = csv.DictReader(file)
                 doctors_created = 0
                 doctors_updated = 0
@@ -73,6 +74,7 @@ class Command(BaseCommand):
                             doctor_url=cleaned_data['doctor_url'],
                             defaults=cleaned_data
                         )
+                        search_index.add(doctor)
                         
                         if created:
                             doctors_created += 1
@@ -0,0 +1,178 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from cpapp.models.google_map_data import GoogleMapData
+from cpapp.models.justdial import JustDialClinic, JustDialDoctor
+from cpapp.models.location_score import LocationScore
+from cpapp.models.practo import PractoDoctor
+from cpapp.services.location_store import (
+    location_key, parse_coordinate, store_location_analysis, link_entity_location
+)
+from cpapp.services.geoiq_scheduler import BATCH, get_geoiq_scheduler
+from cpapp.services.throttling import RateLimiter
+
+
+# (entity_type, model, address field, pincode field, latitude field, longitude field)
+SOURCES = {
+    'googlemap': [
+        ('clinic', GoogleMapData, 'full_address', 'postal_code', 'latitude', 'longitude'),
+    ],
+    'justdial': [
+        ('clinic', JustDialClinic, 'address', None, None, None),
+        ('doctor', JustDialDoctor, 'clinic_address', None, None, None),
+    ],
+    'practo': [
+        ('doctor', PractoDoctor, 'doctor_address', None, None, None),
+    ],
+}
+
+
+class Command(BaseCommand):
+    help = 'Precompute GeoIQ location scores for every entity of a source so scoring needs no live GeoIQ call'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--source', required=True, choices=sorted(SOURCES.keys()), help='Entity source to precompute')
+        parser.add_argument('--workers', type=int, default=4, help='Number of concurrent GeoIQ requests')
+        parser.add_argument('--rate', type=float, default=5.0, help='Maximum GeoIQ requests per second')
+        parser.add_argument('--batch-size', type=int, default=500, help='Entities read per checkpointed batch')
+        parser.add_argument('--limit', type=int, default=None, help='Limit the number of entities to process (for testing)')
+        parser.add_argument('--checkpoint', type=str, default=None, help='Path of the checkpoint file')
+        parser.add_argument('--restart', action='store_true', help='Ignore the checkpoint and start from the first entity')
+        parser.add_argument('--refresh', action='store_true', help='Refetch locations that are already stored')
+
+    def load_checkpoint(self, path):
+        """Load checkpoint state from disk"""
+        if not os.path.exists(path):
+            return {}
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                return json.load(file)
+        except (ValueError, OSError) as e:
+            self.stdout.write(self.style.WARNING(f'Could not read checkpoint {path}: {str(e)}'))
+            return {}
+
+    def save_checkpoint(self, path, state):
+        """Atomically write checkpoint state to disk"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump(state, file, indent=2)
+        os.replace(tmp_path, path)
+
+    def entity_location(self, row, address_field, pincode_field, lat_field, lng_field):
+        """Extract (key, latitude, longitude, address, pincode) for an entity row"""
+        latitude = parse_coordinate(row.get(lat_field)) if lat_field else None
+        longitude = parse_coordinate(row.get(lng_field)) if lng_field else None
+        if latitude is None or longitude is None:
+            latitude = longitude = None
+        address = (row.get(address_field) or '').strip()
+        pincode = (row.get(pincode_field) or '').strip() if pincode_field else ''
+        key = location_key(latitude, longitude, address, pincode)
+        return key, latitude, longitude, address, pincode
+
+    def fetch_location(self, scheduler, limiter, latitude, longitude, address, pincode):
+        """Fetch a single location analysis in the scheduler's batch lane, respecting the rate limit"""
+        limiter.acquire()
+        if latitude is not None and longitude is not None:
+            return scheduler.analyze_location(latitude=latitude, longitude=longitude, priority=BATCH)
+        return scheduler.analyze_location(address=address, pincode=pincode or None, priority=BATCH)
+
+    def handle(self, *args, **options):
+        source = options['source']
+        batch_size = options['batch_size']
+        limit = options['limit']
+        checkpoint_path = options['checkpoint'] or os.path.join(
+            settings.BASE_DIR, f'precompute_locations_{source}.checkpoint.json'
+        )
+
+        try:
+            scheduler = get_geoiq_scheduler()
+        except Exception as e:
+            raise CommandError(f'GeoIQ service initialization failed: {str(e)}')
+
+        limiter = RateLimiter(options['rate'])
+        state = {} if options['restart'] else self.load_checkpoint(checkpoint_path)
+
+        self.stdout.write(self.style.SUCCESS(f'Precomputing locations for source: {source}'))
+        self.stdout.write(f'Checkpoint file: {checkpoint_path}')
+
+        processed = 0
+        with ThreadPoolExecutor(max_workers=options['workers']) as pool:
+            for entity_type, model, address_field, pincode_field, lat_field, lng_field in SOURCES[source]:
+                checkpoint_name = f'{source}:{entity_type}'
+                progress = state.setdefault(checkpoint_name, {'last_id': 0, 'fetched': 0, 'linked': 0, 'failed': 0})
+                value_fields = ['id', address_field] + [f for f in (pincode_field, lat_field, lng_field) if f]
+
+                self.stdout.write(f'Processing {model.__name__} from id > {progress["last_id"]}')
+
+                while limit is None or processed < limit:
+                    take = batch_size if limit is None else min(batch_size, limit - processed)
+                    rows = list(
+                        model.objects.filter(id__gt=progress['last_id'])
+                        .order_by('id')
+                        .values(*value_fields)[:take]
+                    )
+                    if not rows:
+                        break
+
+                    # Group entities by unique location so each location is fetched once
+                    entities_by_key = {}
+                    location_args = {}
+                    for row in rows:
+                        key, latitude, longitude, address, pincode = self.entity_location(
+                            row, address_field, pincode_field, lat_field, lng_field
+                        )
+                        if not key:
+                            continue
+                        entities_by_key.setdefault(key, []).append(row['id'])
+                        location_args.setdefault(key, (latitude, longitude, address, pincode))
+
+                    stored = {} if options['refresh'] else {
+                        location.location_key: location
+                        for location in LocationScore.objects.filter(location_key__in=list(location_args))
+                    }
+
+                    futures = {
+                        pool.submit(self.fetch_location, scheduler, limiter, *location_args[key]): key
+                        for key in location_args if key not in stored
+                    }
+                    for future in as_completed(futures):
+                        key = futures[future]
+                        latitude, longitude, address, pincode = location_args[key]
+                        try:
+                            analysis = future.result()
+                            stored[key] = store_location_analysis(
+                                key, analysis, latitude=latitude, longitude=longitude,
+                                address=address, pincode=pincode
+                            )
+                            progress['fetched'] += 1
+                        except Exception as e:
+                            progress['failed'] += 1
+                            self.stdout.write(self.style.WARNING(f'Warning fetching location {key}: {str(e)}'))
+
+                    for key, entity_ids in entities_by_key.items():
+                        if key not in stored:
+                            continue
+                        for entity_id in entity_ids:
+                            link_entity_location(entity_type, source, entity_id, stored[key])
+                            progress['linked'] += 1
+
+                    processed += len(rows)
+                    progress['last_id'] = rows[-1]['id']
+                    self.save_checkpoint(checkpoint_path, state)
+                    self.stdout.write(
+                        f'{model.__name__}: up to id {progress["last_id"]} - '
+                        f'{progress["fetched"]} fetched, {progress["linked"]} linked, {progress["failed"]} failed'
+                    )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'\nPrecompute completed:\n'
+                f'- Entities processed this run: {processed}\n'
+                + ''.join(
+                    f'- {name}: {p["fetched"]} locations fetched, {p["linked"]} entities linked, {p["failed"]} failed\n'
+                    for name, p in state.items()
+                )
+            )
+        )
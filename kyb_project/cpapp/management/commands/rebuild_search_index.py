@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from cpapp.models import SearchDocument
+from cpapp.services.search_index import SEARCH_SOURCES, SearchIndexWriter
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the unified doctor and clinic search index from the source tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--source',
+            action='append',
+            default=None,
+            help='Only rebuild this source, e.g. practo or justdial (repeatable; default: all)'
+        )
+        parser.add_argument('--batch-size', type=int, default=2000, help='Documents written per query')
+
+    def handle(self, *args, **options):
+        sources = SEARCH_SOURCES
+        if options['source']:
+            sources = [source for source in SEARCH_SOURCES if source.source in options['source']]
+            if not sources:
+                raise CommandError(f"Unknown source: {', '.join(options['source'])}")
+
+        for source in sources:
+            started_at = timezone.now()
+            with SearchIndexWriter(source.entity_type, source.source, options['batch_size']) as writer:
+                for entity in source.entities().iterator(chunk_size=options['batch_size']):
+                    writer.add(entity)
+
+            # Documents not rewritten by this run belong to deleted entities
+            deleted, _ = SearchDocument.objects.filter(
+                entity_type=source.entity_type,
+                source=source.source,
+                updated_at__lt=started_at
+            ).delete()
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f'{source.source} {source.entity_type}s: {writer.written} indexed, {deleted} removed'
+                )
+            )
@@ -0,0 +1,72 @@
+import time
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from cpapp.models.location_score import LocationScore
+from cpapp.services.location_features import get_feature_store
+
+
+class Command(BaseCommand):
+    help = 'Re-apply the location-score rules to every stored location using the columnar feature store (no GeoIQ calls)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rebuild', action='store_true', help='Rebuild the feature store from LocationScore before rescoring')
+        parser.add_argument('--dry-run', action='store_true', help='Report changed locations without updating LocationScore')
+        parser.add_argument('--batch-size', type=int, default=2000, help='Rows per read and bulk update batch')
+
+    def sync_store(self, store, batch_size):
+        """Copy GeoIQ variables fetched since the last sync into the feature store"""
+        started_at = timezone.now()
+        queryset = LocationScore.objects.order_by('id')
+        if store.synced_at:
+            queryset = queryset.filter(fetched_at__gte=store.synced_at)
+
+        written = store.upsert_many(
+            queryset.values_list('location_key', 'raw_variables').iterator(chunk_size=batch_size),
+            chunk_size=batch_size
+        )
+        store.synced_at = started_at.isoformat()
+        store.flush()
+        return written
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        store = get_feature_store()
+        if options['rebuild']:
+            store.reset()
+
+        start = time.perf_counter()
+        synced = self.sync_store(store, batch_size)
+        self.stdout.write(f'Synced {synced} locations into the feature store ({len(store)} total) '
+                          f'in {time.perf_counter() - start:.2f}s')
+
+        start = time.perf_counter()
+        keys, points, categories = store.score_all()
+        self.stdout.write(f'Scored {len(keys)} locations in {time.perf_counter() - start:.3f}s')
+
+        new_scores = {key: (int(p), str(c)) for key, p, c in zip(keys, points, categories)}
+        # Points take few distinct values, so changed rows are updated per (points, category) group
+        changed = {}
+        category_counts = {}
+        current = LocationScore.objects.values_list('id', 'location_key', 'points', 'category')
+        for location_id, key, points_value, category in current.iterator(chunk_size=batch_size):
+            score = new_scores.get(key)
+            if score is None:
+                continue
+            category_counts[score[1]] = category_counts.get(score[1], 0) + 1
+            if (points_value, category) != score:
+                changed.setdefault(score, []).append(location_id)
+
+        if not options['dry_run']:
+            for (points_value, category), ids in changed.items():
+                for i in range(0, len(ids), batch_size):
+                    LocationScore.objects.filter(id__in=ids[i:i + batch_size]).update(
+                        points=points_value, category=category
+                    )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'\nRescore completed{" (dry run)" if options["dry_run"] else ""}:\n'
+                f'- Locations changed: {sum(len(ids) for ids in changed.values())}\n'
+                + ''.join(f'- {category}: {count}\n' for category, count in sorted(category_counts.items()))
+            )
+        )
@@ -0,0 +1,35 @@
+import os
+import time
+from django.core.management.base import BaseCommand, CommandError
+from cpapp.services.review_jobs import LEASE_LOST, claim_due_jobs, process_job
+from cpapp.services.review_scorer_integration import ReviewAnalysisService
+
+
+class Command(BaseCommand):
+    help = 'Poll Outscraper for pending review scoring jobs, score finished requests once and store the results'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Process the jobs due now and exit')
+        parser.add_argument('--batch-size', type=int, default=10, help='Jobs claimed per poll')
+        parser.add_argument('--interval', type=float, default=2.0, help='Seconds to sleep when no job is due')
+
+    def handle(self, *args, **options):
+        api_key = os.getenv("OUTSCRAPER_API_KEY") or os.getenv("VITE_OUTSCRAPER_API_KEY")
+        if not api_key:
+            raise CommandError('Outscraper API key not configured. Please set the OUTSCRAPER_API_KEY environment variable.')
+        service = ReviewAnalysisService(api_key)
+
+        self.stdout.write(self.style.SUCCESS('Review job worker started'))
+        try:
+            while True:
+                jobs = claim_due_jobs(options['batch_size'])
+                for job in jobs:
+                    status = process_job(job, service)
+                    if status not in ('pending', LEASE_LOST):
+                        self.stdout.write(f'{job.request_id}: {status} after {job.attempts} polls')
+                if options['once'] and len(jobs) < options['batch_size']:
+                    break
+                if not jobs:
+                    time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING('Review job worker stopped'))
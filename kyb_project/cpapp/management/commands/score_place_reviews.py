@@ -0,0 +1,31 @@
+import json
+import os
+from django.core.management.base import BaseCommand, CommandError
+from cpapp.services.review_scorer_integration import ReviewAnalysisService
+
+
+class Command(BaseCommand):
+    help = 'Fetch every review of a place page by page and print the aggregates of their scores'
+
+    def add_arguments(self, parser):
+        parser.add_argument('query', help='Search query or place ID')
+        parser.add_argument('--max-reviews', type=int, default=None, help='Maximum number of reviews (default: all)')
+        parser.add_argument('--page-size', type=int, default=100, help='Reviews per Outscraper request')
+        parser.add_argument('--sort', default='most_relevant', help='Sort method for reviews')
+        parser.add_argument('--language', default='en', help='Language code for reviews')
+        parser.add_argument('--max-bytes', type=int, default=None, help='Budget for the Outscraper response bytes')
+
+    def handle(self, *args, **options):
+        api_key = os.getenv("OUTSCRAPER_API_KEY") or os.getenv("VITE_OUTSCRAPER_API_KEY")
+        if not api_key:
+            raise CommandError('Outscraper API key not configured. Please set the OUTSCRAPER_API_KEY environment variable.')
+
+        result = ReviewAnalysisService(api_key).score_all_reviews(
+            options['query'],
+            max_reviews=options['max_reviews'],
+            page_size=options['page_size'],
+            sort=options['sort'],
+            language=options['language'],
+            max_bytes=options['max_bytes']
+        )
+        self.stdout.write(json.dumps(result, indent=2))
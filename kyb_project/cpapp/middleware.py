@@ -0,0 +1,64 @@
+import logging
+import random
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from cpapp.services import metrics
+from cpapp.services.query_profile import QueryProfile, activate
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetMiddleware:
+    """
+    Profiles the database queries of each request.
+
+    Adds the query count, total DB time, duplicate count and slowest query
+    time as Server-Timing headers, logs a sample of request profiles, and
+    warns when an endpoint runs more queries than its budget
+    (QUERY_BUDGETS by URL name, else QUERY_BUDGET_DEFAULT).
+
+    Queries the concurrent search fan-out runs on its pool threads are
+    counted too: the profile is the request's current profile, which the
+    fan-out installs on each pool thread's connection.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not getattr(settings, 'QUERY_PROFILE_ENABLED', True):
+            return self.get_response(request)
+
+        profile = QueryProfile()
+        with ExitStack() as stack:
+            stack.enter_context(activate(profile))
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(profile))
+            response = self.get_response(request)
+
+        endpoint = request.resolver_match.url_name if request.resolver_match else None
+        endpoint = endpoint or 'unresolved'
+        budget = getattr(settings, 'QUERY_BUDGETS', {}).get(endpoint, getattr(settings, 'QUERY_BUDGET_DEFAULT', None))
+        metrics.observe('http_request_db_queries', profile.count, endpoint=endpoint)
+        metrics.observe('http_request_db_seconds', profile.total_seconds, endpoint=endpoint)
+
+        if getattr(settings, 'QUERY_PROFILE_HEADERS', True):
+            timing = profile.server_timing()
+            if response.has_header('Server-Timing'):
+                timing = f"{response['Server-Timing']}, {timing}"
+            response['Server-Timing'] = timing
+
+        over_budget = budget is not None and profile.count > budget
+        if over_budget:
+            metrics.increment('http_request_db_budget_exceeded_total', endpoint=endpoint)
+            logger.warning(
+                f"Query budget exceeded: {request.method} {request.path} ({endpoint}) ran "
+                f"{profile.count} queries, budget {budget}: {profile.summary()}"
+            )
+        elif random.random() < getattr(settings, 'QUERY_PROFILE_LOG_SAMPLE_RATE', 0):
+            logger.info(f"Query profile: {request.method} {request.path} ({endpoint}) {profile.summary()}")
+        return response
@@ -0,0 +1,49 @@
+# Generated by Django 4.2.20 on 2026-10-18 23:10
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cpapp', '0005_newpractodoctor'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LocationScore',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('location_key', models.CharField(max_length=64, unique=True)),
+                ('latitude', models.FloatField(blank=True, null=True)),
+                ('longitude', models.FloatField(blank=True, null=True)),
+                ('address', models.TextField(blank=True)),
+                ('postal_code', models.CharField(blank=True, max_length=20)),
+                ('radius', models.IntegerField(default=1000)),
+                ('category', models.CharField(max_length=20)),
+                ('points', models.IntegerField(default=0)),
+                ('raw_variables', models.JSONField(blank=True, default=dict)),
+                ('fetched_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'db_table': 'Cpapp_location_score',
+            },
+        ),
+        migrations.CreateModel(
+            name='EntityLocation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('entity_type', models.CharField(max_length=20)),
+                ('source', models.CharField(max_length=50)),
+                ('entity_id', models.IntegerField()),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('location', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='entities', to='cpapp.locationscore')),
+            ],
+            options={
+                'db_table': 'Cpapp_entity_location',
+                'unique_together': {('entity_type', 'source', 'entity_id')},
+            },
+        ),
+    ]
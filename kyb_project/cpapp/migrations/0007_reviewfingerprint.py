@@ -0,0 +1,46 @@
+# Generated by Django 4.2.20 on 2026-10-18 23:45
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cpapp', '0006_locationscore_entitylocation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReviewFingerprintBand',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('band_hash', models.BigIntegerField()),
+                ('hash_prefix', models.SmallIntegerField()),
+                ('text_hash', models.BigIntegerField()),
+                ('place_id', models.CharField(max_length=255)),
+            ],
+            options={
+                'db_table': 'Cpapp_review_fingerprint_band',
+                'indexes': [models.Index(fields=['hash_prefix', 'band_hash'], name='review_fp_band_prefix_idx')],
+                'unique_together': {('band_hash', 'text_hash', 'place_id')},
+            },
+        ),
+        migrations.CreateModel(
+            name='ReviewFingerprint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('text_hash', models.BigIntegerField()),
+                ('hash_prefix', models.SmallIntegerField()),
+                ('place_id', models.CharField(max_length=255)),
+                ('author_id', models.CharField(blank=True, max_length=255)),
+                ('review_id', models.CharField(blank=True, max_length=255)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'db_table': 'Cpapp_review_fingerprint',
+                'indexes': [models.Index(fields=['hash_prefix', 'text_hash'], name='review_fp_prefix_hash_idx')],
+                'unique_together': {('text_hash', 'place_id', 'author_id')},
+            },
+        ),
+    ]
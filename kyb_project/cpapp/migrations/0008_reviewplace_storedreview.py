@@ -0,0 +1,56 @@
+# Generated by Django 4.2.20 on 2026-10-18 23:52
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cpapp', '0007_reviewfingerprint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReviewPlace',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('place_id', models.CharField(max_length=255, unique=True)),
+                ('reviews_id', models.CharField(blank=True, max_length=255)),
+                ('query', models.CharField(blank=True, db_index=True, max_length=500)),
+                ('name', models.CharField(blank=True, max_length=500)),
+                ('last_review_timestamp', models.BigIntegerField(blank=True, null=True)),
+                ('negative_keyword_prevalence', models.JSONField(blank=True, default=dict)),
+                ('any_recent', models.BooleanField(default=False)),
+                ('review_count', models.IntegerField(default=0)),
+                ('genuine_reviews', models.IntegerField(default=0)),
+                ('score_sum', models.FloatField(default=0)),
+                ('reviews_seen_at_other_places', models.IntegerField(default=0)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('refreshed_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'db_table': 'Cpapp_review_place',
+            },
+        ),
+        migrations.CreateModel(
+            name='StoredReview',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('review_id', models.CharField(max_length=255)),
+                ('review_text', models.TextField(blank=True)),
+                ('review_timestamp', models.BigIntegerField(blank=True, null=True)),
+                ('review_data', models.JSONField(blank=True, default=dict)),
+                ('review_score', models.FloatField()),
+                ('scoring_factors', models.JSONField(blank=True, default=dict)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('place', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reviews', to='cpapp.reviewplace')),
+            ],
+            options={
+                'db_table': 'Cpapp_stored_review',
+                'indexes': [models.Index(fields=['place', 'review_timestamp'], name='stored_review_place_ts_idx')],
+                'unique_together': {('place', 'review_id')},
+            },
+        ),
+    ]
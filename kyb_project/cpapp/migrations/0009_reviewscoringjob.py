@@ -0,0 +1,34 @@
+# Generated by Django 4.2.20 on 2026-10-18 23:54
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cpapp', '0008_reviewplace_storedreview'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReviewScoringJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('request_id', models.CharField(max_length=255, unique=True)),
+                ('query', models.CharField(blank=True, max_length=500)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('completed', 'Completed'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('webhook_token', models.CharField(blank=True, max_length=64)),
+                ('next_poll_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('attempts', models.IntegerField(default=0)),
+                ('result', models.JSONField(blank=True, null=True)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'Cpapp_review_scoring_job',
+                'indexes': [models.Index(fields=['status', 'next_poll_at'], name='review_job_due_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.20 on 2026-10-19 00:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cpapp', '0009_reviewscoringjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reviewscoringjob',
+            name='queries',
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
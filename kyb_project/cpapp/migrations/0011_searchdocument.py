@@ -0,0 +1,35 @@
+# Generated by Django 4.2.20 on 2026-10-19 00:11
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+import django.core.serializers.json
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cpapp', '0010_reviewscoringjob_queries'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('entity_type', models.CharField(max_length=20)),
+                ('source', models.CharField(max_length=50)),
+                ('entity_id', models.IntegerField()),
+                ('search_text', models.TextField()),
+                ('result', models.JSONField(default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'db_table': 'Cpapp_search_document',
+                'indexes': [django.contrib.postgres.indexes.GinIndex(fields=['search_text'], name='search_document_trgm_idx', opclasses=['gin_trgm_ops'])],
+                'unique_together': {('entity_type', 'source', 'entity_id')},
+            },
+        ),
+    ]
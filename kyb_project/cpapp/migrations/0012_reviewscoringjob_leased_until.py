@@ -0,0 +1,18 @@
+# Generated by Django 4.2.20 on 2026-10-19 00:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cpapp', '0011_searchdocument'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reviewscoringjob',
+            name='leased_until',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
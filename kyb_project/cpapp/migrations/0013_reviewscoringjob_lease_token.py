@@ -0,0 +1,18 @@
+# Generated by Django 4.2.20 on 2026-10-19 00:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cpapp', '0012_reviewscoringjob_leased_until'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reviewscoringjob',
+            name='lease_token',
+            field=models.CharField(blank=True, max_length=32),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Band hashes are derived from MinHash signatures, whose permutations changed;
+# stored bands would never match new ones. Places record them again when rescored.
+
+from django.db import migrations
+
+
+def clear_bands(apps, schema_editor):
+    apps.get_model('cpapp', 'ReviewFingerprintBand').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cpapp', '0013_reviewscoringjob_lease_token'),
+    ]
+
+    operations = [
+        migrations.RunPython(clear_bands, migrations.RunPython.noop),
+    ]
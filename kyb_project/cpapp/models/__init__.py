@@ -2,5 +2,12 @@ from cpapp.models.nmc import NMCDoctor
 from cpapp.models.practo import PractoDoctor
 from cpapp.models.justdial import JustDialClinic, JustDialDoctor
 from cpapp.models.practor_new import NewPractoDoctor
+from cpapp.models.location_score import LocationScore, EntityLocation
+from cpapp.models.review_fingerprint import ReviewFingerprint, ReviewFingerprintBand
+from cpapp.models.review_store import ReviewPlace, StoredReview
+from cpapp.models.review_job import ReviewScoringJob
+from cpapp.models.search_document import SearchDocument
 
-__all__ = ['PractoDoctor', 'JustDialClinic', 'JustDialDoctor', 'NMCDoctor', 'NewPractoDoctor']
+__all__ = ['PractoDoctor', 'JustDialClinic', 'JustDialDoctor', 'NMCDoctor', 'NewPractoDoctor',
+           'LocationScore', 'EntityLocation', 'ReviewFingerprint', 'ReviewFingerprintBand',
+           'ReviewPlace', 'StoredReview', 'ReviewScoringJob', 'SearchDocument']
@@ -0,0 +1,42 @@
+from django.db import models
+from django.utils import timezone
+
+
+class LocationScore(models.Model):
+    """Model for storing precomputed GeoIQ location analysis, one row per unique location"""
+    location_key = models.CharField(max_length=64, unique=True)
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+    address = models.TextField(blank=True)
+    postal_code = models.CharField(max_length=20, blank=True)
+    radius = models.IntegerField(default=1000)
+    category = models.CharField(max_length=20)
+    points = models.IntegerField(default=0)
+    raw_variables = models.JSONField(default=dict, blank=True)
+
+    # Metadata
+    fetched_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.location_key} - {self.category} ({self.points}/30)"
+
+    class Meta:
+        db_table = 'Cpapp_location_score'
+
+
+class EntityLocation(models.Model):
+    """Links a scored doctor or clinic to its precomputed location"""
+    entity_type = models.CharField(max_length=20)
+    source = models.CharField(max_length=50)
+    entity_id = models.IntegerField()
+    location = models.ForeignKey(LocationScore, on_delete=models.CASCADE, related_name='entities')
+
+    # Metadata
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.source} {self.entity_type} {self.entity_id} -> {self.location.location_key}"
+
+    class Meta:
+        db_table = 'Cpapp_entity_location'
+        unique_together = ('entity_type', 'source', 'entity_id')
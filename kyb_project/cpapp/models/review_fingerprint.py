@@ -0,0 +1,48 @@
+from django.db import models
+from django.utils import timezone
+
+
+class ReviewFingerprint(models.Model):
+    """
+    Normalized-text hash of a review seen at a place, kept across scoring runs
+
+    hash_prefix is the top bits of text_hash. Every lookup filters on it, so
+    the table can be list-partitioned on hash_prefix as it grows without any
+    query changes.
+    """
+    text_hash = models.BigIntegerField()
+    hash_prefix = models.SmallIntegerField()
+    place_id = models.CharField(max_length=255)
+    author_id = models.CharField(max_length=255, blank=True)
+    review_id = models.CharField(max_length=255, blank=True)
+
+    # Metadata
+    created_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.text_hash:x} @ {self.place_id}"
+
+    class Meta:
+        db_table = 'Cpapp_review_fingerprint'
+        unique_together = ('text_hash', 'place_id', 'author_id')
+        indexes = [
+            models.Index(fields=['hash_prefix', 'text_hash'], name='review_fp_prefix_hash_idx'),
+        ]
+
+
+class ReviewFingerprintBand(models.Model):
+    """MinHash LSH band of a review fingerprint, for finding edited copies across places"""
+    band_hash = models.BigIntegerField()
+    hash_prefix = models.SmallIntegerField()
+    text_hash = models.BigIntegerField()
+    place_id = models.CharField(max_length=255)
+
+    def __str__(self):
+        return f"{self.band_hash:x} -> {self.text_hash:x} @ {self.place_id}"
+
+    class Meta:
+        db_table = 'Cpapp_review_fingerprint_band'
+        unique_together = ('band_hash', 'text_hash', 'place_id')
+        indexes = [
+            models.Index(fields=['hash_prefix', 'band_hash'], name='review_fp_band_prefix_idx'),
+        ]
@@ -0,0 +1,52 @@
+from django.db import models
+from django.utils import timezone
+
+
+class ReviewScoringJob(models.Model):
+    """
+    An asynchronous Outscraper review request scored server-side
+
+    The run_review_jobs worker polls Outscraper for due jobs (or is told by
+    the webhook that a job finished), scores the reviews once and stores the
+    final response in result, so status checks are a single row read.
+    """
+    PENDING = 'pending'
+    COMPLETED = 'completed'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (COMPLETED, 'Completed'),
+        (FAILED, 'Failed'),
+    ]
+
+    request_id = models.CharField(max_length=255, unique=True)
+    query = models.CharField(max_length=500, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=PENDING)
+    webhook_token = models.CharField(max_length=64, blank=True)
+    # Portfolio batches: the queries of the multi-query request, scored per query
+    queries = models.JSONField(default=list, blank=True)
+
+    # Polling schedule
+    next_poll_at = models.DateTimeField(default=timezone.now)
+    attempts = models.IntegerField(default=0)
+    # Set while a worker holds the job; the webhook leaves leased jobs alone
+    leased_until = models.DateTimeField(null=True, blank=True)
+    # Identifies the holder's claim: its updates apply only while the lease is still its own
+    lease_token = models.CharField(max_length=32, blank=True)
+
+    # Final API response, or the reason the job failed
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+
+    # Metadata
+    created_at = models.DateTimeField(default=timezone.now)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.request_id} ({self.status})"
+
+    class Meta:
+        db_table = 'Cpapp_review_scoring_job'
+        indexes = [
+            models.Index(fields=['status', 'next_poll_at'], name='review_job_due_idx'),
+        ]
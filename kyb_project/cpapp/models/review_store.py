@@ -0,0 +1,63 @@
+from django.db import models
+from django.utils import timezone
+
+
+class ReviewPlace(models.Model):
+    """
+    A Google place whose reviews have been fetched and scored
+
+    Holds the refresh watermark (newest stored review timestamp), the batch
+    statistics new reviews are scored against, and running aggregates so a
+    refresh only has to add the new reviews.
+    """
+    place_id = models.CharField(max_length=255, unique=True)
+    reviews_id = models.CharField(max_length=255, blank=True)
+    query = models.CharField(max_length=500, blank=True, db_index=True)
+    name = models.CharField(max_length=500, blank=True)
+
+    # Refresh watermark: epoch seconds of the newest stored review
+    last_review_timestamp = models.BigIntegerField(null=True, blank=True)
+
+    # Batch statistics
+    negative_keyword_prevalence = models.JSONField(default=dict, blank=True)
+    any_recent = models.BooleanField(default=False)
+
+    # Aggregates
+    review_count = models.IntegerField(default=0)
+    genuine_reviews = models.IntegerField(default=0)
+    score_sum = models.FloatField(default=0)
+    reviews_seen_at_other_places = models.IntegerField(default=0)
+
+    # Metadata
+    created_at = models.DateTimeField(default=timezone.now)
+    refreshed_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.name or self.place_id} ({self.review_count} reviews)"
+
+    class Meta:
+        db_table = 'Cpapp_review_place'
+
+
+class StoredReview(models.Model):
+    """A scored review of a ReviewPlace"""
+    place = models.ForeignKey(ReviewPlace, on_delete=models.CASCADE, related_name='reviews')
+    review_id = models.CharField(max_length=255)
+    review_text = models.TextField(blank=True)
+    review_timestamp = models.BigIntegerField(null=True, blank=True)
+    review_data = models.JSONField(default=dict, blank=True)
+    review_score = models.FloatField()
+    scoring_factors = models.JSONField(default=dict, blank=True)
+
+    # Metadata
+    created_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.review_id} @ {self.place.place_id}: {self.review_score}"
+
+    class Meta:
+        db_table = 'Cpapp_stored_review'
+        unique_together = ('place', 'review_id')
+        indexes = [
+            models.Index(fields=['place', 'review_timestamp'], name='stored_review_place_ts_idx'),
+        ]
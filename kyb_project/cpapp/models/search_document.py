@@ -0,0 +1,33 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils import timezone
+
+
+class SearchDocument(models.Model):
+    """
+    One searchable doctor or clinic of any source
+
+    Denormalized from the source tables on every save and delete, by the
+    importers and by the rebuild_search_index command. search_text holds the lowercased searched
+    columns under a pg_trgm GIN index, so a substring search is one indexed query
+    over every source; result is the search result of the entity.
+    """
+    entity_type = models.CharField(max_length=20)
+    source = models.CharField(max_length=50)
+    entity_id = models.IntegerField()
+    search_text = models.TextField()
+    result = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+
+    # Metadata
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.source} {self.entity_type} {self.entity_id}"
+
+    class Meta:
+        db_table = 'Cpapp_search_document'
+        unique_together = ('entity_type', 'source', 'entity_id')
+        indexes = [
+            GinIndex(fields=['search_text'], opclasses=['gin_trgm_ops'], name='search_document_trgm_idx'),
+        ]
@@ -5,6 +5,8 @@ from django.conf import settings
 from typing import List, Dict, Union, Optional
 from dotenv import load_dotenv
 import os
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
+from .location_features import LOCATION_VARIABLES, score_location
 
 load_dotenv()
 
@@ -33,11 +35,22 @@ class GeoIQService:
             'Content-Type': 'application/json'
         }
         
+        # Bound every upstream call and stop calling GeoIQ while it is failing
+        self.timeout = (
+            getattr(settings, 'GEOIQ_CONNECT_TIMEOUT', 3.05),
+            getattr(settings, 'GEOIQ_READ_TIMEOUT', 10)
+        )
+        self.circuit_breaker = CircuitBreaker(
+            'geoiq',
+            failure_threshold=getattr(settings, 'GEOIQ_BREAKER_FAILURE_THRESHOLD', 5),
+            recovery_timeout=getattr(settings, 'GEOIQ_BREAKER_RECOVERY_TIMEOUT', 30)
+        )
+        
         # Test API connection
         try:
             # Simple ping to check connectivity - we'll just check the status without fetching data
             test_url = f"{self.base_url}/ping"
-            response = requests.get(test_url, headers=self.headers)
+            response = requests.get(test_url, headers=self.headers, timeout=self.timeout)
             if response.status_code == 200:
                 print(f"✅ GeoIQ API Connection Successful")
             else:
@@ -55,6 +68,30 @@ class GeoIQService:
         except Exception as e:
             print(f"⚠️ GeoIQ API Connection Error: {str(e)}")
         
+    def _post(self, endpoint: str, payload: Dict) -> requests.Response:
+        """
+        POST to GeoIQ through the circuit breaker
+        
+        Timeouts, connection errors and 5xx responses count as failures.
+        
+        Raises:
+            CircuitOpenError: If the circuit is open and no probe is allowed
+        """
+        if not self.circuit_breaker.allow_request():
+            raise CircuitOpenError(
+                f"GeoIQ circuit is open, next probe in {self.circuit_breaker.retry_after() or 0:.1f}s"
+            )
+        try:
+            response = requests.post(endpoint, headers=self.headers, json=payload, timeout=self.timeout)
+        except requests.exceptions.RequestException:
+            self.circuit_breaker.record_failure()
+            raise
+        if response.status_code >= 500:
+            self.circuit_breaker.record_failure()
+        else:
+            self.circuit_breaker.record_success()
+        return response
+    
     def get_location_data_by_coordinates(
         self, 
         latitude: float, 
@@ -167,7 +204,7 @@ class GeoIQService:
         }
         
         try:
-            response = requests.post(endpoint, headers=self.headers, json=payload)
+            response = self._post(endpoint, payload)
             
             # Check for auth errors specifically
             if response.status_code == 401 or response.status_code == 403:
@@ -349,7 +386,7 @@ class GeoIQService:
             payload["pincode"] = pincode
         
         try:
-            response = requests.post(endpoint, headers=self.headers, json=payload)
+            response = self._post(endpoint, payload)
             
             # Check for auth errors specifically
             if response.status_code == 401 or response.status_code == 403:
@@ -438,80 +475,7 @@ class GeoIQService:
             Dict: Comprehensive location analysis
         """
         # Top 50 variables that are most valuable for location analysis
-        variables = [
-            # Property and rent data
-            "p_retail_rppsfa", 
-            "residence_arpsf", 
-            "retail_rppsfa", 
-            "d_residence_rppsfa", 
-            "d_comm_rppsfa",
-            
-            # Neighborhood income data
-            "w_pop_tt", 
-            "w_hh_income_5l_above_perc", 
-            "w_hh_income_10l_above_perc", 
-            "w_hh_income_20l_above_perc",
-            
-            # Household assets data
-            "avail_assets_car_jeep_van",
-            
-            # Retail and commercial data
-            "p_retail_gc_np", 
-            "p_restaurant_rt_np", 
-            "p_dist_sm", 
-            "br_v2shoppingmart_ct",
-            
-            # Office buildings data
-            "o_land_bl", 
-            "p_work_of_np_pincode",
-            
-            # Income tax data
-            "secc_p_hh_pay_it_pt_r",
-            
-            # High-end restaurants
-            "br_restaurant_ch_nt",
-            
-            # Healthcare Facilities
-            "br_apollohospitals_ct", 
-            "br_maxhealthcare_ct", 
-            "br_fortishealthcare_ct", 
-            "br_medantathemedicity_ct", 
-            "br_clovedental_ct",
-            
-            # Retail & Lifestyle
-            "br_lifestyle_ct", 
-            "br_shoppersstop_ct", 
-            "br_pantaloons_ct", 
-            "br_westside_ct", 
-            "br_central_ct", 
-            "br_maxfashion_ct",
-            
-            # Luxury Brands
-            "br_zara_ct", 
-            "br_miniso_ct", 
-            "br_calvinklein_ct", 
-            "br_tommyhilfiger_ct",
-            
-            # Jewelry
-            "br_tanishq_ct", 
-            "br_kalyanjewellers_ct",
-            
-            # Fitness
-            "br_cult_ct", 
-            "br_goldsgym_ct", 
-            "br_anytimefitness_ct", 
-            "br_gym_ch_nt",
-            
-            # Entertainment
-            "br_pvrcinemas_ct", 
-            "br_inoxleisurelimited_ct",
-            
-            # Sports
-            "br_nike_ct", 
-            "br_adidas_ct", 
-            "br_puma_ct", 
-            "br_decathlon_ct"
-        ]
+        variables = LOCATION_VARIABLES
         
         # Get raw data from GeoIQ
         if latitude is not None and longitude is not None:
@@ -612,116 +576,10 @@ class GeoIQService:
             "raw_data": raw_data  # Include raw data for reference if needed
         }
         
-        # Calculate location score using the enhanced algorithm (matching the scoring engine)
-        # Income indicators
-        avg_income_5l = raw_data.get('w_hh_income_5l_above_perc', 0)
-        avg_income_10l = raw_data.get('w_hh_income_10l_above_perc', 0)
-        avg_income_20l = raw_data.get('w_hh_income_20l_above_perc', 0)
-        income_tax_payers = raw_data.get('secc_p_hh_pay_it_pt_r', 0)
-
-        # Commercial indicators
-        retail_density = raw_data.get('p_retail_gc_np', 0)
-        restaurant_density = raw_data.get('p_restaurant_rt_np', 0)
-        retail_rent = raw_data.get('p_retail_rppsfa', 0)
-
-        # Lifestyle indicators
-        high_end_restaurants = raw_data.get('br_restaurant_ch_nt', 0)
-        fitness_centers = (
-            raw_data.get('br_anytimefitness_ct', 0) + 
-            raw_data.get('br_cult_ct', 0) + 
-            raw_data.get('br_goldsgym_ct', 0)
-        )
-        entertainment = (
-            raw_data.get('br_pvrcinemas_ct', 0) + 
-            raw_data.get('br_inoxleisurelimited_ct', 0)
-        )
-
-        # Premium retail presence
-        premium_retail = (
-            raw_data.get('br_lifestyle_ct', 0) + 
-            raw_data.get('br_shoppersstop_ct', 0) + 
-            raw_data.get('br_zara_ct', 0) + 
-            raw_data.get('br_miniso_ct', 0) + 
-            raw_data.get('br_tanishq_ct', 0) + 
-            raw_data.get('br_calvinklein_ct', 0) + 
-            raw_data.get('br_tommyhilfiger_ct', 0)
-        )
-
-        # Healthcare indicators
-        healthcare_facilities = (
-            raw_data.get('br_apollohospitals_ct', 0) + 
-            raw_data.get('br_maxhealthcare_ct', 0) + 
-            raw_data.get('br_fortishealthcare_ct', 0) + 
-            raw_data.get('br_medantathemedicity_ct', 0)
-        )
-
-        # Calculate location score points (max 30 points)
-        location_points = 0
-
-        # Income indicators (0-10 points)
-        if avg_income_10l > 25 or avg_income_20l > 10:
-            location_points += 10
-        elif avg_income_10l > 15 or avg_income_5l > 30:
-            location_points += 7
-        elif avg_income_5l > 20 or income_tax_payers > 15:
-            location_points += 4
-
-        # Commercial viability (0-7 points)
-        if retail_density > 20 or retail_rent > 150:
-            location_points += 7
-        elif retail_density > 10 or retail_rent > 100:
-            location_points += 4
-        elif retail_density > 5 or restaurant_density > 10:
-            location_points += 2
-
-        # Premium establishments (0-8 points)
-        if premium_retail >= 5 or high_end_restaurants > 0.5:
-            location_points += 8
-        elif premium_retail >= 3 or fitness_centers >= 3:
-            location_points += 5
-        elif premium_retail >= 1 or fitness_centers >= 1:
-            location_points += 2
-
-        # Healthcare ecosystem (0-5 points)
-        if healthcare_facilities >= 3:
-            location_points += 5
-        elif healthcare_facilities >= 1:
-            location_points += 3
-
-        # Determine location category based on points
-        if location_points >= 20:
-            location_category = "Prime"
-        elif location_points >= 12:
-            location_category = "Medium"
-        else:
-            location_category = "Poor"
-
-        # Add location score to analysis
-        analysis["location_score"] = {
-            "points": location_points,
-            "max_points": 30,
-            "category": location_category,
-            "factors": {
-                "income_indicators": {
-                    "avg_income_5l_percent": avg_income_5l,
-                    "avg_income_10l_percent": avg_income_10l,
-                    "avg_income_20l_percent": avg_income_20l,
-                    "income_tax_payers_percent": income_tax_payers
-                },
-                "commercial_indicators": {
-                    "retail_density": retail_density,
-                    "restaurant_density": restaurant_density,
-                    "retail_rent": retail_rent
-                },
-                "premium_indicators": {
-                    "premium_retail_count": premium_retail,
-                    "high_end_restaurants": high_end_restaurants,
-                    "fitness_centers": fitness_centers,
-                    "entertainment_venues": entertainment
-                },
-                "healthcare_facilities": healthcare_facilities
-            }
-        }
+        # Calculate location score with the shared location-score kernel
+        analysis["location_score"] = score_location(raw_data)
+        location_points = analysis["location_score"]["points"]
+        location_category = analysis["location_score"]["category"]
 
         # Print full response for debugging
         logger.info(f"GeoIQ Analysis - Location Category: {location_category} (Score: {location_points}/30)")
@@ -1,27 +1,121 @@
 # outscraper_maps_api.py
 
 import requests
-from typing import Dict, List, Union, Optional, Any
+from requests.adapters import HTTPAdapter
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, NamedTuple, Tuple, Union, Optional, Any
+import functools
+import itertools
+import json
 import logging
 import os
+import threading
+import time
+
+from .throttling import RateLimiter
 
 logger = logging.getLogger(__name__)
 
+# Responses retried with backoff (rate limited or transient server errors)
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def retry_after_seconds(response: requests.Response) -> Optional[float]:
+    """Delay requested by a Retry-After header (seconds or HTTP date), if any"""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+@functools.lru_cache(maxsize=None)
+def incremental_json():
+    """The optional ijson module, imported on first use (None when not installed)"""
+    try:
+        import ijson
+    except ImportError:  # pragma: no cover - optional incremental parsing
+        return None
+    return ijson
+
+
+class ByteBudgetExceeded(Exception):
+    """Raised by iter_reviews when the responses exceed its byte budget"""
+
+
+class ReviewPage(NamedTuple):
+    """One page of a place's reviews fetched by iter_reviews"""
+    number: int
+    place: Dict[str, Any]         # Place fields of the page, without reviews_data
+    reviews: List[Dict[str, Any]]
+    pagination_id: Optional[str]  # Resumes after this page (None on the last page)
+    bytes_read: int               # Response bytes read so far, this page included
+
+
+class _BudgetReader:
+    """File-like view of a streamed response body that counts the bytes read against a budget"""
+    
+    def __init__(self, raw, bytes_read: int = 0, max_bytes: Optional[int] = None):
+        self.raw = raw
+        self.bytes_read = bytes_read
+        self.max_bytes = max_bytes
+    
+    def read(self, size: int = 65536) -> bytes:
+        if size == 0:
+            # Parsers probe the stream type with read(0)
+            return b""
+        chunk = self.raw.read(size if size and size > 0 else 65536)
+        self.bytes_read += len(chunk)
+        if self.max_bytes is not None and self.bytes_read > self.max_bytes:
+            raise ByteBudgetExceeded(f"Review responses exceeded the byte budget of {self.max_bytes}")
+        return chunk
+    
+    def read_all(self) -> bytes:
+        return b"".join(iter(self.read, b""))
+
+
 class OutscraperMapsReviewsAPI:
     """
     A client for the Outscraper Google Maps Reviews API (v3)
     Documentation: https://api.app.outscraper.com/maps/reviews-v3
+    
+    Requests go through one pooled keep-alive session with connect/read
+    timeouts, a client-side rate limit, and bounded exponential backoff on
+    connection errors, 429 and 5xx responses (honouring Retry-After). Use
+    get_outscraper_client() to share one client per process.
     """
     
     BASE_URL = "https://api.app.outscraper.com/maps/reviews-v3"
+    RESULTS_URL = "https://api.app.outscraper.com/requests/{request_id}"
     
-    def __init__(self, api_key: str):
+    def __init__(self,
+                 api_key: str,
+                 timeout: Optional[Tuple[float, float]] = None,
+                 max_retries: Optional[int] = None,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 pool_size: Optional[int] = None):
         """
         Initialize with your Outscraper API key
         
         Args:
             api_key: Your Outscraper API key
+            timeout: (connect, read) timeouts in seconds (default: OUTSCRAPER_CONNECT_TIMEOUT, OUTSCRAPER_READ_TIMEOUT)
+            max_retries: Retries of a failed request (default: OUTSCRAPER_MAX_RETRIES)
+            rate_limiter: Limiter shared by the client's requests (default: OUTSCRAPER_RATE_LIMIT per second)
+            pool_size: Keep-alive connections kept open (default: OUTSCRAPER_POOL_SIZE)
         """
+        from django.conf import settings
+        
         # Log API key initialization (safely)
         logger.debug(f"Initializing OutscraperMapsReviewsAPI with key length: {len(api_key) if api_key else 0}")
         
@@ -42,6 +136,108 @@ class OutscraperMapsReviewsAPI:
             "X-API-KEY": api_key,
             "Accept": "application/json"
         }
+        
+        self.timeout = timeout or (
+            getattr(settings, 'OUTSCRAPER_CONNECT_TIMEOUT', 3.05),
+            getattr(settings, 'OUTSCRAPER_READ_TIMEOUT', 120)
+        )
+        self.max_retries = max_retries if max_retries is not None else getattr(settings, 'OUTSCRAPER_MAX_RETRIES', 3)
+        self.backoff = getattr(settings, 'OUTSCRAPER_BACKOFF_SECONDS', 0.5)
+        self.max_backoff = getattr(settings, 'OUTSCRAPER_MAX_BACKOFF_SECONDS', 30)
+        self.rate_limiter = rate_limiter or RateLimiter(getattr(settings, 'OUTSCRAPER_RATE_LIMIT', 10))
+        
+        pool_size = pool_size or getattr(settings, 'OUTSCRAPER_POOL_SIZE', 10)
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+    
+    def _get(self, url: str, params: Optional[Dict[str, Any]] = None, stream: bool = False) -> requests.Response:
+        """
+        GET through the pooled session, rate limited and retried
+        
+        Connection errors, 429 and 5xx responses are retried up to max_retries
+        times, waiting Retry-After or an exponential backoff (both capped at
+        max_backoff). Read timeouts are not retried: a slow synchronous
+        request would be billed again. The last response is returned
+        whatever its status; with stream=True its body is not read yet and
+        the caller must close it.
+        
+        Raises:
+            requests.exceptions.RequestException: If the last attempt fails to connect or times out
+        """
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire()
+            try:
+                response = self.session.get(url, params=params, timeout=self.timeout, stream=stream)
+            except requests.exceptions.ConnectionError as e:
+                if attempt >= self.max_retries:
+                    raise
+                delay = self.backoff * 2 ** attempt
+                reason = str(e)
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                    return response
+                delay = retry_after_seconds(response)
+                if delay is None:
+                    delay = self.backoff * 2 ** attempt
+                reason = f"HTTP {response.status_code}"
+                response.close()
+            delay = min(delay, self.max_backoff)
+            logger.warning(f"Outscraper request failed ({reason}), retry {attempt + 1}/{self.max_retries} in {delay:.1f}s")
+            time.sleep(delay)
+    
+    @staticmethod
+    def _reviews_params(query: Union[str, List[str]],
+                        reviews_limit: int = 100,
+                        reviews_query: Optional[str] = None,
+                        limit: int = 1,
+                        sort: str = "most_relevant",
+                        last_pagination_id: Optional[str] = None,
+                        start: Optional[int] = None,
+                        cutoff: Optional[int] = None,
+                        cutoff_rating: Optional[int] = None,
+                        ignore_empty: bool = False,
+                        source: Optional[str] = None,
+                        language: str = "en",
+                        region: Optional[str] = None,
+                        fields: Optional[str] = None,
+                        async_request: bool = True,
+                        ui: bool = False,
+                        webhook: Optional[str] = None) -> Dict[str, Any]:
+        """Query parameters of a reviews request (see get_reviews)"""
+        params = {
+            "query": query,
+            "reviewsLimit": reviews_limit,
+            "limit": limit,
+            "sort": sort,
+            "ignoreEmpty": str(ignore_empty).lower(),
+            "language": language,
+            "async": str(async_request).lower(),
+            "ui": str(ui).lower()
+        }
+        
+        # Add optional parameters if provided
+        if reviews_query:
+            params["reviewsQuery"] = reviews_query
+        if last_pagination_id:
+            params["lastPaginationId"] = last_pagination_id
+        if start:
+            params["start"] = start
+        if cutoff:
+            params["cutoff"] = cutoff
+        if cutoff_rating:
+            params["cutoffRating"] = cutoff_rating
+        if source:
+            params["source"] = source
+        if region:
+            params["region"] = region
+        if fields:
+            params["fields"] = fields
+        if webhook:
+            params["webhook"] = webhook
+        return params
     
     def get_reviews(self, 
                    query: Union[str, List[str]], 
@@ -93,40 +289,14 @@ class OutscraperMapsReviewsAPI:
             logger.error(error_msg)
             return {"error": error_msg, "status": "error"}
             
-        params = {
-            "query": query,
-            "reviewsLimit": reviews_limit,
-            "limit": limit,
-            "sort": sort,
-            "ignoreEmpty": str(ignore_empty).lower(),
-            "language": language,
-            "async": str(async_request).lower(),
-            "ui": str(ui).lower()
-        }
-        
-        # Add optional parameters if provided
-        if reviews_query:
-            params["reviewsQuery"] = reviews_query
-        if last_pagination_id:
-            params["lastPaginationId"] = last_pagination_id
-        if start:
-            params["start"] = start
-        if cutoff:
-            params["cutoff"] = cutoff
-        if cutoff_rating:
-            params["cutoffRating"] = cutoff_rating
-        if source:
-            params["source"] = source
-        if region:
-            params["region"] = region
-        if fields:
-            params["fields"] = fields
-        if webhook:
-            params["webhook"] = webhook
+        params = self._reviews_params(
+            query, reviews_limit, reviews_query, limit, sort, last_pagination_id, start, cutoff,
+            cutoff_rating, ignore_empty, source, language, region, fields, async_request, ui, webhook
+        )
             
         try:
             logger.debug(f"Making request to Outscraper API with params: {params}")
-            response = requests.get(self.BASE_URL, headers=self.headers, params=params)
+            response = self._get(self.BASE_URL, params=params)
             
             # Log response status and details
             logger.debug(f"Response status code: {response.status_code}")
@@ -158,6 +328,129 @@ class OutscraperMapsReviewsAPI:
             logger.exception(f"Unexpected error in get_reviews: {str(e)}")
             return {"error": f"Unexpected error: {str(e)}", "status": "error"}
     
+    def iter_reviews(self,
+                     query: str,
+                     max_reviews: Optional[int] = None,
+                     page_size: int = 100,
+                     sort: str = "most_relevant",
+                     cutoff: Optional[int] = None,
+                     language: str = "en",
+                     max_bytes: Optional[int] = None,
+                     cancel: Optional[threading.Event] = None) -> Iterator[ReviewPage]:
+        """
+        Fetch all reviews of a place page by page, following review pagination
+        
+        Each page is a synchronous request for page_size reviews after the
+        last review of the previous page (lastPaginationId). Responses are
+        streamed and, with ijson installed, parsed incrementally, so memory
+        stays proportional to one page. Pages are yielded as they arrive;
+        fetching stops after max_reviews reviews, on the last page, when
+        cancel is set (checked before each request) or when the generator
+        is closed.
+        
+        Args:
+            query: Search query or place id (the first place found is paginated)
+            max_reviews: Maximum number of reviews in total (None = all)
+            page_size: Reviews per request
+            sort: Sorting method for reviews
+            cutoff: Cut-off timestamp for reviews (oldest review date)
+            language: Language code for results
+            max_bytes: Budget for the response bytes of all pages (None = unlimited)
+            cancel: Event that stops the fetch once set
+            
+        Yields:
+            ReviewPage per page, in order
+            
+        Raises:
+            ByteBudgetExceeded: If the responses exceed max_bytes; the page
+                being read is dropped
+            requests.exceptions.RequestException: If a page request fails
+        """
+        params = {
+            "query": query,
+            "reviewsLimit": page_size,
+            "limit": 1,
+            "sort": sort,
+            "language": language,
+            "async": "false"
+        }
+        if cutoff:
+            params["cutoff"] = cutoff
+        
+        fetched = 0
+        bytes_read = 0
+        pagination_id = None
+        for number in itertools.count(1):
+            if cancel is not None and cancel.is_set():
+                logger.info(f"Review fetch for {query} cancelled after {fetched} reviews")
+                return
+            if max_reviews is not None:
+                if fetched >= max_reviews:
+                    return
+                # reviewsLimit=0 would mean every review
+                params["reviewsLimit"] = min(page_size, max_reviews - fetched)
+            if pagination_id:
+                params["lastPaginationId"] = pagination_id
+            
+            response = self._get(self.BASE_URL, params=dict(params), stream=True)
+            with response:
+                response.raise_for_status()
+                response.raw.decode_content = True
+                reader = _BudgetReader(response.raw, bytes_read, max_bytes)
+                place = self._first_place(reader)
+                bytes_read = reader.bytes_read
+            
+            reviews = place.pop("reviews_data", None) or []
+            fetched += len(reviews)
+            next_id = reviews[-1].get("review_pagination_id") if reviews else None
+            last = (
+                not next_id or next_id == pagination_id or len(reviews) < params["reviewsLimit"]
+                or (max_reviews is not None and fetched >= max_reviews)
+            )
+            pagination_id = next_id
+            yield ReviewPage(number, place, reviews, None if last else pagination_id, bytes_read)
+            if last:
+                logger.info(f"Fetched {fetched} reviews for {query} in {number} pages ({bytes_read} bytes)")
+                return
+    
+    @staticmethod
+    def _first_place(reader: _BudgetReader) -> Dict[str, Any]:
+        """First place of a streamed reviews response ({} when there is none)"""
+        ijson = incremental_json()
+        if ijson is not None:
+            places = ijson.items(reader, "data.item", use_float=True)
+            place = next(places, None)
+        else:
+            data = json.loads(reader.read_all()).get("data") or []
+            place = data[0] if data else None
+        # A multi-query response nests the places of each query
+        if isinstance(place, list):
+            place = place[0] if place else None
+        return place or {}
+    
+    def open_reviews(self, **kwargs) -> requests.Response:
+        """
+        Send a reviews request and return the upstream response unread
+        
+        For proxying the body as it arrives; the caller must close the
+        response. Takes the arguments of get_reviews.
+        
+        Raises:
+            requests.exceptions.RequestException: If the request fails to connect or times out
+        """
+        return self._get(self.BASE_URL, params=self._reviews_params(**kwargs), stream=True)
+    
+    def open_results(self, request_id: str) -> requests.Response:
+        """
+        Request the results of an async request and return the upstream response unread
+        
+        The caller must close the response.
+        
+        Raises:
+            requests.exceptions.RequestException: If the request fails to connect or times out
+        """
+        return self._get(self.RESULTS_URL.format(request_id=request_id), stream=True)
+    
     def get_results(self, request_id: str) -> Dict[str, Any]:
         """
         Retrieve results for a previously submitted asynchronous request.
@@ -173,11 +466,11 @@ class OutscraperMapsReviewsAPI:
             logger.error(error_msg)
             return {"error": error_msg, "status": "error"}
             
-        url = f"https://api.app.outscraper.com/requests/{request_id}"
+        url = self.RESULTS_URL.format(request_id=request_id)
         
         try:
             logger.info(f"Getting results for request ID: {request_id}")
-            response = requests.get(url, headers=self.headers)
+            response = self._get(url)
             
             # Handle HTTP errors properly
             if response.status_code >= 400:
@@ -198,4 +491,27 @@ class OutscraperMapsReviewsAPI:
             return {"error": f"Request error: {str(e)}", "status": "error"}
         except Exception as e:
             logger.exception(f"Unexpected error in get_results: {str(e)}")
-            return {"error": f"Unexpected error: {str(e)}", "status": "error"}
\ No newline at end of file
+            return {"error": f"Unexpected error: {str(e)}", "status": "error"}
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_outscraper_client(api_key: Optional[str] = None) -> OutscraperMapsReviewsAPI:
+    """
+    Return the process-wide Outscraper client for an API key
+    
+    Every caller shares its connection pool and rate limiter.
+    
+    Args:
+        api_key: Outscraper API key (default: OUTSCRAPER_API_KEY / VITE_OUTSCRAPER_API_KEY)
+    """
+    api_key = api_key or os.getenv("OUTSCRAPER_API_KEY") or os.getenv("VITE_OUTSCRAPER_API_KEY") or ""
+    client = _clients.get(api_key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(api_key)
+            if client is None:
+                client = _clients[api_key] = OutscraperMapsReviewsAPI(api_key)
+    return client
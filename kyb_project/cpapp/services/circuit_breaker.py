@@ -0,0 +1,131 @@
+import logging
+import threading
+import time
+from typing import Optional
+
+from cpapp.services import metrics
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is refused because the circuit is open"""
+
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker.
+
+    - closed: calls pass through; `failure_threshold` consecutive failures open the circuit
+    - open: calls are refused until `recovery_timeout` seconds have passed
+    - half_open: up to `half_open_max_calls` probe calls are let through; a
+      success closes the circuit, a failure opens it again
+
+    State transitions are exported as metrics (circuit_breaker_state gauge and
+    circuit_breaker_transitions_total counter).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1
+    ):
+        """
+        Args:
+            name (str): Breaker name used in logs and metrics
+            failure_threshold (int): Consecutive failures that open the circuit
+            recovery_timeout (float): Seconds to stay open before probing
+            half_open_max_calls (int): Concurrent probe calls allowed while half open
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._lock = threading.Lock()
+        metrics.set_gauge("circuit_breaker_state", STATE_VALUES[CLOSED], breaker=name)
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def is_open(self) -> bool:
+        """True while calls are being refused outright (no probe slot either)"""
+        with self._lock:
+            self._maybe_half_open()
+            return self._state == OPEN or (
+                self._state == HALF_OPEN and self._probes >= self.half_open_max_calls
+            )
+
+    def allow_request(self) -> bool:
+        """Reserve permission for one call; callers must then record its outcome"""
+        with self._lock:
+            self._maybe_half_open()
+            if self._state == CLOSED:
+                return True
+            if self._state == HALF_OPEN and self._probes < self.half_open_max_calls:
+                self._probes += 1
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            if self._state != CLOSED:
+                self._transition(CLOSED)
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN or (
+                self._state == CLOSED and self._failures >= self.failure_threshold
+            ):
+                self._opened_at = time.monotonic()
+                self._transition(OPEN)
+
+    def retry_after(self) -> Optional[float]:
+        """Seconds until the next probe is allowed (None unless open)"""
+        with self._lock:
+            if self._state != OPEN:
+                return None
+            return max(0.0, self._opened_at + self.recovery_timeout - time.monotonic())
+
+    def _maybe_half_open(self):
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+            self._transition(HALF_OPEN)
+
+    def _transition(self, new_state: str):
+        old_state = self._state
+        self._state = new_state
+        self._probes = 0
+        logger.warning(f"Circuit breaker '{self.name}' {old_state} -> {new_state} (failures: {self._failures})")
+        metrics.set_gauge("circuit_breaker_state", STATE_VALUES[new_state], breaker=self.name)
+        metrics.increment(
+            "circuit_breaker_transitions_total",
+            breaker=self.name, from_state=old_state, to_state=new_state
+        )
+
+    def snapshot(self) -> dict:
+        """Current state for status endpoints"""
+        with self._lock:
+            self._maybe_half_open()
+            return {
+                "name": self.name,
+                "state": self._state,
+                "consecutive_failures": self._failures,
+                "failure_threshold": self.failure_threshold,
+                "recovery_timeout": self.recovery_timeout,
+            }
@@ -0,0 +1,456 @@
+"""
+GeoIQ request scheduler.
+
+Sits in front of GeoIQService so that every caller in the process shares one
+quota. Requests are queued in priority lanes (interactive ahead of batch),
+identical in-flight requests are coalesced into one upstream call, and a
+per-minute and per-day token bucket caps upstream usage. When the budget
+cannot serve an interactive request in time, the scheduler answers with the
+last cached or stored result for the location, the usual category for its
+pincode, or a default category, flagged as degraded.
+
+While the GeoIQ circuit breaker is open, interactive requests are answered
+immediately from memory (cache, pincode default or default category) without
+queueing or touching the database.
+"""
+
+import heapq
+import itertools
+import logging
+import math
+import threading
+import time
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Callable, Dict, Optional
+
+from cpapp.services import metrics
+from cpapp.services.circuit_breaker import CircuitOpenError
+from cpapp.services.location_store import extract_pincode, location_key
+from cpapp.services.throttling import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = 0
+BATCH = 1
+LANES = {INTERACTIVE: "interactive", BATCH: "batch"}
+
+
+class GeoIQBudgetExceeded(Exception):
+    """Raised to batch callers when the GeoIQ budget cannot serve a request"""
+
+
+class _Job:
+    """A queued GeoIQ request shared by every caller asking for the same location"""
+
+    def __init__(self, key, kwargs, priority, seq):
+        self.key = key
+        self.kwargs = kwargs
+        self.priority = priority
+        self.seq = seq
+        self.future = Future()
+        self.enqueued_at = time.monotonic()
+        self.deadline = None        # Latest queue deadline of its callers (inf when one waits indefinitely)
+        self.waiters = 0
+        self.started = False
+        # Set once the upstream call starts or the job ends without one
+        self.dispatched = threading.Event()
+        self.future.add_done_callback(lambda _: self.dispatched.set())
+
+
+def _stored_location_lookup(key: str) -> Optional[Dict]:
+    """Load a precomputed location analysis from the LocationScore table"""
+    try:
+        from cpapp.models.location_score import LocationScore
+        location = LocationScore.objects.filter(location_key=key).first()
+    except Exception as e:
+        logger.warning(f"Stored location lookup failed for {key}: {str(e)}")
+        return None
+    if not location:
+        return None
+    return {
+        "location_score": {
+            "points": location.points,
+            "max_points": 30,
+            "category": location.category,
+        },
+        "raw_data": location.raw_variables or {},
+    }
+
+
+def _stored_pincode_categories() -> Dict[str, Dict[str, int]]:
+    """Count stored location categories per pincode"""
+    from django.db.models import Count
+    from cpapp.models.location_score import LocationScore
+
+    counts: Dict[str, Dict[str, int]] = {}
+    rows = (
+        LocationScore.objects.exclude(postal_code="")
+        .values("postal_code", "category")
+        .annotate(n=Count("id"))
+    )
+    for row in rows:
+        counts.setdefault(row["postal_code"], {})[row["category"]] = row["n"]
+    return counts
+
+
+class GeoIQScheduler:
+    """Quota-aware, priority-ordered, coalescing front for GeoIQService"""
+
+    def __init__(
+        self,
+        service,
+        per_minute: int = 60,
+        per_day: int = 5000,
+        workers: int = 2,
+        interactive_max_wait: float = 2.0,
+        batch_reserve: float = 0.2,
+        fallback_category: str = "Poor",
+        cache_size: int = 1024,
+        stored_lookup: Optional[Callable[[str], Optional[Dict]]] = None
+    ):
+        """
+        Args:
+            service: GeoIQService (or any object with analyze_location)
+            per_minute (int): Upstream calls allowed per minute
+            per_day (int): Upstream calls allowed per day
+            workers (int): Concurrent upstream calls
+            interactive_max_wait (float): Seconds an interactive caller waits before degrading
+            batch_reserve (float): Fraction of the per-minute budget batch jobs may not use
+            fallback_category (str): Category returned when nothing is cached or stored
+            cache_size (int): Recent analyses kept in memory for degraded answers
+            stored_lookup (callable, optional): key -> analysis dict for stored locations
+        """
+        self.service = service
+        self.minute_bucket = TokenBucket(per_minute, 60)
+        self.day_bucket = TokenBucket(per_day, 86400)
+        self.interactive_max_wait = interactive_max_wait
+        self.batch_reserve_tokens = per_minute * batch_reserve
+        self.fallback_category = fallback_category
+        self.cache_size = cache_size
+        self.stored_lookup = stored_lookup or _stored_location_lookup
+
+        self._heap = []
+        self._jobs: Dict = {}
+        self._cond = threading.Condition()
+        self._seq = itertools.count()
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._pincode_categories: Dict[str, Counter] = {}
+        self._wait_times = {lane: deque(maxlen=1000) for lane in LANES}
+        self._counts = {
+            "submitted": 0, "coalesced": 0, "upstream": 0,
+            "degraded": 0, "errors": 0, "abandoned": 0,
+        }
+
+        self._threads = []
+        for i in range(max(1, workers)):
+            thread = threading.Thread(target=self._worker, name=f"geoiq-scheduler-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def analyze_location(
+        self,
+        latitude: Optional[float] = None,
+        longitude: Optional[float] = None,
+        address: Optional[str] = None,
+        pincode: Optional[str] = None,
+        radius: int = 1000,
+        priority: int = INTERACTIVE,
+        max_wait: Optional[float] = None
+    ) -> Dict:
+        """
+        Schedule a GeoIQService.analyze_location call
+
+        Args:
+            latitude, longitude, address, pincode, radius: Passed to analyze_location
+            priority (int): INTERACTIVE or BATCH
+            max_wait (float, optional): Seconds to wait for a budget slot; interactive
+                requests default to interactive_max_wait, batch requests wait indefinitely.
+                Once the upstream call has started it is waited for under the GeoIQ
+                client's own timeouts.
+
+        Returns:
+            Dict: Location analysis. Degraded answers carry "degraded": True,
+            "degraded_reason" and "fallback_source".
+
+        Raises:
+            GeoIQBudgetExceeded: For batch requests the budget cannot serve
+        """
+        key = location_key(latitude, longitude, address, pincode)
+        if not key:
+            raise ValueError("Either coordinates or address must be provided")
+        job_key = (key, radius)
+        lane = LANES[priority]
+        pincode = pincode or extract_pincode(address)
+
+        breaker = getattr(self.service, "circuit_breaker", None)
+        if breaker is not None and breaker.is_open():
+            if priority == BATCH:
+                raise CircuitOpenError("GeoIQ circuit is open")
+            return self._fallback(key, "circuit_open", lane, pincode=pincode, fast=True)
+
+        if priority == INTERACTIVE:
+            max_wait = self.interactive_max_wait if max_wait is None else max_wait
+
+        with self._cond:
+            self._counts["submitted"] += 1
+            job = self._jobs.get(job_key)
+            if job is not None:
+                self._counts["coalesced"] += 1
+                metrics.increment("geoiq_scheduler_requests_total", lane=lane, outcome="coalesced")
+                # An interactive caller joining a queued batch job promotes it
+                if priority < job.priority and not job.started:
+                    job.priority = priority
+                    heapq.heappush(self._heap, (job.priority, job.seq, job))
+            else:
+                job = _Job(job_key, {
+                    "latitude": latitude, "longitude": longitude,
+                    "address": address, "pincode": pincode or None, "radius": radius,
+                }, priority, next(self._seq))
+                self._jobs[job_key] = job
+                heapq.heappush(self._heap, (job.priority, job.seq, job))
+            # The job stays queued as long as any of its callers is willing to wait
+            deadline = math.inf if max_wait is None else time.monotonic() + max_wait
+            job.deadline = deadline if job.deadline is None else max(job.deadline, deadline)
+            job.waiters += 1
+            self._update_queue_gauges()
+            self._cond.notify()
+
+        try:
+            if not job.dispatched.wait(timeout=max_wait):
+                raise FutureTimeoutError()
+            return job.future.result()
+        except FutureTimeoutError:
+            logger.warning(f"GeoIQ request for {key} waited more than {max_wait}s for a slot, using fallback")
+            return self._fallback(key, "queue_timeout", lane, pincode=pincode)
+        except GeoIQBudgetExceeded:
+            if priority == BATCH:
+                raise
+            return self._fallback(key, "quota_exhausted", lane, pincode=pincode)
+        except CircuitOpenError:
+            if priority == BATCH:
+                raise
+            return self._fallback(key, "circuit_open", lane, pincode=pincode, fast=True)
+        except Exception as e:
+            if priority == BATCH:
+                raise
+            logger.warning(f"GeoIQ request for {key} failed, using fallback: {str(e)}")
+            return self._fallback(key, "upstream_error", lane, pincode=pincode)
+        finally:
+            with self._cond:
+                job.waiters -= 1
+
+    def _budget_wait(self, priority: int) -> float:
+        """Seconds until the budget can serve a request in this lane"""
+        reserve = self.batch_reserve_tokens if priority == BATCH else 0
+        return max(self.minute_bucket.wait_time(1 + reserve), self.day_bucket.wait_time(1))
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                while not self._heap:
+                    self._cond.wait()
+                priority, seq, job = heapq.heappop(self._heap)
+                if job.started or priority != job.priority:
+                    # Stale entry left behind by a promotion
+                    continue
+                if job.waiters == 0 and job.deadline is not None and time.monotonic() > job.deadline:
+                    # Every caller already gave up on this request
+                    self._drop(job)
+                    self._counts["abandoned"] += 1
+                    metrics.increment("geoiq_scheduler_requests_total", lane=LANES[priority], outcome="abandoned")
+                    job.future.set_exception(GeoIQBudgetExceeded("abandoned"))
+                    continue
+
+                wait = self._budget_wait(priority)
+                if wait > 0:
+                    if job.deadline is not None and time.monotonic() + wait > job.deadline:
+                        self._drop(job)
+                        job.future.set_exception(GeoIQBudgetExceeded(f"budget exhausted, next slot in {wait:.1f}s"))
+                        continue
+                    # Put it back and wait for tokens; a higher priority job may arrive meanwhile
+                    heapq.heappush(self._heap, (priority, seq, job))
+                    self._cond.wait(timeout=min(wait, 1.0))
+                    continue
+
+                self.minute_bucket.try_consume()
+                self.day_bucket.try_consume()
+                job.started = True
+                job.dispatched.set()
+                self._update_queue_gauges()
+
+            self._run(job)
+
+    def _run(self, job: _Job):
+        lane = LANES[job.priority]
+        waited = time.monotonic() - job.enqueued_at
+        self._wait_times[job.priority].append(waited)
+        metrics.observe("geoiq_scheduler_wait_seconds", waited, lane=lane)
+        try:
+            result = self.service.analyze_location(**job.kwargs)
+            self._remember(job.key[0], result, job.kwargs["pincode"])
+            with self._cond:
+                self._counts["upstream"] += 1
+            metrics.increment("geoiq_scheduler_requests_total", lane=lane, outcome="upstream")
+            job.future.set_result(result)
+        except Exception as e:
+            with self._cond:
+                self._counts["errors"] += 1
+            metrics.increment("geoiq_scheduler_requests_total", lane=lane, outcome="error")
+            job.future.set_exception(e)
+        finally:
+            with self._cond:
+                self._drop(job)
+
+    def _drop(self, job: _Job):
+        if self._jobs.get(job.key) is job:
+            del self._jobs[job.key]
+
+    def _remember(self, key: str, analysis: Dict, pincode: Optional[str] = None):
+        with self._cache_lock:
+            self._cache[key] = analysis
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+            category = analysis.get("location_score", {}).get("category")
+            if pincode and category:
+                self._pincode_categories.setdefault(pincode, Counter())[category] += 1
+
+    def seed_pincode_defaults(self, counts: Dict[str, Dict[str, int]]):
+        """
+        Load per-pincode category counts used for pincode defaults
+
+        Args:
+            counts (dict): pincode -> {category: number of locations}
+        """
+        with self._cache_lock:
+            for pincode, categories in counts.items():
+                self._pincode_categories.setdefault(pincode, Counter()).update(categories)
+
+    def pincode_default(self, pincode: Optional[str]) -> Optional[str]:
+        """Most common known category for a pincode"""
+        if not pincode:
+            return None
+        with self._cache_lock:
+            categories = self._pincode_categories.get(pincode)
+            if not categories:
+                return None
+            return categories.most_common(1)[0][0]
+
+    def _fallback(
+        self,
+        key: str,
+        reason: str,
+        lane: str,
+        pincode: Optional[str] = None,
+        fast: bool = False
+    ) -> Dict:
+        """
+        Answer from the memory cache, the stored location table, the pincode
+        default, or the default category
+
+        With fast=True (circuit open) the stored location table is skipped so
+        the answer is served from memory only.
+        """
+        with self._cache_lock:
+            cached = self._cache.get(key)
+        stored = None
+        if cached is None and not fast:
+            stored = self.stored_lookup(key)
+
+        if cached is not None:
+            analysis, source = dict(cached), "cache"
+        elif stored is not None:
+            analysis, source = stored, "stored"
+        else:
+            category = self.pincode_default(pincode)
+            source = "pincode_default" if category else "default"
+            analysis = {
+                "location_score": {"points": 0, "max_points": 30, "category": category or self.fallback_category},
+                "raw_data": {},
+            }
+
+        analysis["degraded"] = True
+        analysis["degraded_reason"] = reason
+        analysis["fallback_source"] = source
+        with self._cond:
+            self._counts["degraded"] += 1
+        metrics.increment("geoiq_scheduler_requests_total", lane=lane, outcome="degraded")
+        return analysis
+
+    def _update_queue_gauges(self):
+        depth = self._queue_depth()
+        for lane, name in LANES.items():
+            metrics.set_gauge("geoiq_scheduler_queue_depth", depth[name], lane=name)
+
+    def _queue_depth(self) -> Dict[str, int]:
+        depth = {name: 0 for name in LANES.values()}
+        for job in self._jobs.values():
+            if not job.started:
+                depth[LANES[job.priority]] += 1
+        return depth
+
+    def stats(self) -> Dict:
+        """Queue depth, wait times, budget and outcome counters"""
+        def summarize(samples):
+            if not samples:
+                return {"count": 0, "avg": 0.0, "p95": 0.0, "max": 0.0}
+            ordered = sorted(samples)
+            return {
+                "count": len(ordered),
+                "avg": round(sum(ordered) / len(ordered), 4),
+                "p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 4),
+                "max": round(ordered[-1], 4),
+            }
+
+        breaker = getattr(self.service, "circuit_breaker", None)
+        with self._cond:
+            return {
+                "queue_depth": self._queue_depth(),
+                "in_flight": sum(1 for job in self._jobs.values() if job.started),
+                "budget": {
+                    "minute_tokens": round(self.minute_bucket.tokens, 2),
+                    "minute_capacity": self.minute_bucket.capacity,
+                    "day_tokens": round(self.day_bucket.tokens, 2),
+                    "day_capacity": self.day_bucket.capacity,
+                },
+                "wait_seconds": {name: summarize(list(self._wait_times[lane])) for lane, name in LANES.items()},
+                "counts": dict(self._counts),
+                "circuit_breaker": breaker.snapshot() if breaker is not None else None,
+            }
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_geoiq_scheduler() -> GeoIQScheduler:
+    """
+    Return the process-wide scheduler, creating the GeoIQService on first use
+
+    Raises:
+        ValueError: If the GeoIQ service is not configured
+    """
+    global _scheduler
+    if _scheduler is not None:
+        return _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            from django.conf import settings
+            from .GeoIQ import GeoIQService
+
+            _scheduler = GeoIQScheduler(
+                GeoIQService(),
+                per_minute=getattr(settings, 'GEOIQ_BUDGET_PER_MINUTE', 60),
+                per_day=getattr(settings, 'GEOIQ_BUDGET_PER_DAY', 5000),
+                workers=getattr(settings, 'GEOIQ_SCHEDULER_WORKERS', 2),
+                interactive_max_wait=getattr(settings, 'GEOIQ_INTERACTIVE_MAX_WAIT', 2.0),
+                batch_reserve=getattr(settings, 'GEOIQ_BATCH_RESERVE', 0.2),
+                fallback_category=getattr(settings, 'GEOIQ_FALLBACK_CATEGORY', 'Poor'),
+            )
+            try:
+                _scheduler.seed_pincode_defaults(_stored_pincode_categories())
+            except Exception as e:
+                logger.warning(f"Could not load pincode default categories: {str(e)}")
+    return _scheduler
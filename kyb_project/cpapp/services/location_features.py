@@ -0,0 +1,407 @@
+"""
+GeoIQ location features and the location-score kernel.
+
+The location-point rules live here once and are evaluated on a matrix of
+GeoIQ variables (one row per location, one column per variable), so the same
+kernel scores a single live GeoIQ answer or every stored location at once.
+
+LocationFeatureStore keeps fetched variables as a float32 NumPy memmap with a
+JSON sidecar mapping location keys to rows, so re-thresholding after a rule
+change needs no database scan of JSON payloads and no API calls.
+"""
+
+import json
+import logging
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Variables requested from GeoIQ for every location
+LOCATION_VARIABLES = [
+    # Property and rent data
+    "p_retail_rppsfa",
+    "residence_arpsf",
+    "retail_rppsfa",
+    "d_residence_rppsfa",
+    "d_comm_rppsfa",
+
+    # Neighborhood income data
+    "w_pop_tt",
+    "w_hh_income_5l_above_perc",
+    "w_hh_income_10l_above_perc",
+    "w_hh_income_20l_above_perc",
+
+    # Household assets data
+    "avail_assets_car_jeep_van",
+
+    # Retail and commercial data
+    "p_retail_gc_np",
+    "p_restaurant_rt_np",
+    "p_dist_sm",
+    "br_v2shoppingmart_ct",
+
+    # Office buildings data
+    "o_land_bl",
+    "p_work_of_np_pincode",
+
+    # Income tax data
+    "secc_p_hh_pay_it_pt_r",
+
+    # High-end restaurants
+    "br_restaurant_ch_nt",
+
+    # Healthcare Facilities
+    "br_apollohospitals_ct",
+    "br_maxhealthcare_ct",
+    "br_fortishealthcare_ct",
+    "br_medantathemedicity_ct",
+    "br_clovedental_ct",
+
+    # Retail & Lifestyle
+    "br_lifestyle_ct",
+    "br_shoppersstop_ct",
+    "br_pantaloons_ct",
+    "br_westside_ct",
+    "br_central_ct",
+    "br_maxfashion_ct",
+
+    # Luxury Brands
+    "br_zara_ct",
+    "br_miniso_ct",
+    "br_calvinklein_ct",
+    "br_tommyhilfiger_ct",
+
+    # Jewelry
+    "br_tanishq_ct",
+    "br_kalyanjewellers_ct",
+
+    # Fitness
+    "br_cult_ct",
+    "br_goldsgym_ct",
+    "br_anytimefitness_ct",
+    "br_gym_ch_nt",
+
+    # Entertainment
+    "br_pvrcinemas_ct",
+    "br_inoxleisurelimited_ct",
+
+    # Sports
+    "br_nike_ct",
+    "br_adidas_ct",
+    "br_puma_ct",
+    "br_decathlon_ct"
+]
+
+COLUMN_INDEX = {name: i for i, name in enumerate(LOCATION_VARIABLES)}
+
+FITNESS_VARIABLES = ["br_anytimefitness_ct", "br_cult_ct", "br_goldsgym_ct"]
+ENTERTAINMENT_VARIABLES = ["br_pvrcinemas_ct", "br_inoxleisurelimited_ct"]
+PREMIUM_RETAIL_VARIABLES = [
+    "br_lifestyle_ct", "br_shoppersstop_ct", "br_zara_ct", "br_miniso_ct",
+    "br_tanishq_ct", "br_calvinklein_ct", "br_tommyhilfiger_ct",
+]
+HEALTHCARE_VARIABLES = [
+    "br_apollohospitals_ct", "br_maxhealthcare_ct",
+    "br_fortishealthcare_ct", "br_medantathemedicity_ct",
+]
+
+MAX_LOCATION_POINTS = 30
+PRIME_MIN_POINTS = 20
+MEDIUM_MIN_POINTS = 12
+CATEGORIES = np.array(["Poor", "Medium", "Prime"])
+
+
+def to_matrix(rows: Iterable[Dict], dtype=np.float64) -> np.ndarray:
+    """
+    Convert GeoIQ raw variable dicts into a feature matrix
+
+    Missing or non-numeric values become 0, matching raw_data.get(name, 0).
+    """
+    rows = list(rows)
+    matrix = np.zeros((len(rows), len(LOCATION_VARIABLES)), dtype=dtype)
+    for r, raw in enumerate(rows):
+        for name, value in (raw or {}).items():
+            column = COLUMN_INDEX.get(name)
+            if column is None or value is None:
+                continue
+            try:
+                matrix[r, column] = float(value)
+            except (TypeError, ValueError):
+                continue
+    return matrix
+
+
+def location_factors(matrix: np.ndarray) -> Dict[str, np.ndarray]:
+    """Derive the factor columns the location rules are written against"""
+    def col(name):
+        return matrix[:, COLUMN_INDEX[name]]
+
+    def total(names):
+        return matrix[:, [COLUMN_INDEX[name] for name in names]].sum(axis=1)
+
+    return {
+        "avg_income_5l": col("w_hh_income_5l_above_perc"),
+        "avg_income_10l": col("w_hh_income_10l_above_perc"),
+        "avg_income_20l": col("w_hh_income_20l_above_perc"),
+        "income_tax_payers": col("secc_p_hh_pay_it_pt_r"),
+        "retail_density": col("p_retail_gc_np"),
+        "restaurant_density": col("p_restaurant_rt_np"),
+        "retail_rent": col("p_retail_rppsfa"),
+        "high_end_restaurants": col("br_restaurant_ch_nt"),
+        "fitness_centers": total(FITNESS_VARIABLES),
+        "entertainment": total(ENTERTAINMENT_VARIABLES),
+        "premium_retail": total(PREMIUM_RETAIL_VARIABLES),
+        "healthcare_facilities": total(HEALTHCARE_VARIABLES),
+    }
+
+
+def score_matrix(matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized location-score kernel
+
+    Args:
+        matrix (np.ndarray): Feature matrix with columns in LOCATION_VARIABLES order
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Points (0-30) and category per row
+    """
+    f = location_factors(matrix)
+
+    # Income indicators (0-10 points)
+    income = np.select(
+        [
+            (f["avg_income_10l"] > 25) | (f["avg_income_20l"] > 10),
+            (f["avg_income_10l"] > 15) | (f["avg_income_5l"] > 30),
+            (f["avg_income_5l"] > 20) | (f["income_tax_payers"] > 15),
+        ],
+        [10, 7, 4], default=0
+    )
+
+    # Commercial viability (0-7 points)
+    commercial = np.select(
+        [
+            (f["retail_density"] > 20) | (f["retail_rent"] > 150),
+            (f["retail_density"] > 10) | (f["retail_rent"] > 100),
+            (f["retail_density"] > 5) | (f["restaurant_density"] > 10),
+        ],
+        [7, 4, 2], default=0
+    )
+
+    # Premium establishments (0-8 points)
+    premium = np.select(
+        [
+            (f["premium_retail"] >= 5) | (f["high_end_restaurants"] > 0.5),
+            (f["premium_retail"] >= 3) | (f["fitness_centers"] >= 3),
+            (f["premium_retail"] >= 1) | (f["fitness_centers"] >= 1),
+        ],
+        [8, 5, 2], default=0
+    )
+
+    # Healthcare ecosystem (0-5 points)
+    healthcare = np.select(
+        [f["healthcare_facilities"] >= 3, f["healthcare_facilities"] >= 1],
+        [5, 3], default=0
+    )
+
+    points = (income + commercial + premium + healthcare).astype(np.int16)
+    categories = CATEGORIES[(points >= MEDIUM_MIN_POINTS).astype(np.int8) + (points >= PRIME_MIN_POINTS)]
+    return points, categories
+
+
+def score_location(raw_data: Dict) -> Dict:
+    """
+    Score one GeoIQ answer with the shared kernel
+
+    Returns:
+        Dict: points, max_points, category and the factors used
+    """
+    matrix = to_matrix([raw_data])
+    points, categories = score_matrix(matrix)
+    f = {name: float(values[0]) for name, values in location_factors(matrix).items()}
+    return {
+        "points": int(points[0]),
+        "max_points": MAX_LOCATION_POINTS,
+        "category": str(categories[0]),
+        "factors": {
+            "income_indicators": {
+                "avg_income_5l_percent": f["avg_income_5l"],
+                "avg_income_10l_percent": f["avg_income_10l"],
+                "avg_income_20l_percent": f["avg_income_20l"],
+                "income_tax_payers_percent": f["income_tax_payers"]
+            },
+            "commercial_indicators": {
+                "retail_density": f["retail_density"],
+                "restaurant_density": f["restaurant_density"],
+                "retail_rent": f["retail_rent"]
+            },
+            "premium_indicators": {
+                "premium_retail_count": f["premium_retail"],
+                "high_end_restaurants": f["high_end_restaurants"],
+                "fitness_centers": f["fitness_centers"],
+                "entertainment_venues": f["entertainment"]
+            },
+            "healthcare_facilities": f["healthcare_facilities"]
+        }
+    }
+
+
+class LocationFeatureStore:
+    """
+    Columnar store of GeoIQ variables on disk
+
+    <path>/features.f32 is a float32 memmap of shape (capacity, len(columns));
+    <path>/index.json holds the column names, the capacity, the time of the
+    last sync from LocationScore and the location key of every row.
+
+    float32 keeps 7 significant digits, so a variable sitting exactly on a
+    rule threshold can differ from the float64 scalar path in the last digit.
+    """
+
+    DATA_FILE = "features.f32"
+    INDEX_FILE = "index.json"
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): Directory holding the store
+
+        Raises:
+            ValueError: If the store was built with a different variable list
+        """
+        self.path = path
+        self.columns = list(LOCATION_VARIABLES)
+        self.keys: List[str] = []
+        self.rows: Dict[str, int] = {}
+        self.capacity = 0
+        self.synced_at: Optional[str] = None
+        self._data = None
+
+        index_path = os.path.join(path, self.INDEX_FILE)
+        if os.path.exists(index_path):
+            with open(index_path, "r", encoding="utf-8") as file:
+                index = json.load(file)
+            if index["columns"] != self.columns:
+                raise ValueError(f"Feature store at {path} has different columns, rebuild it")
+            self.keys = index["keys"]
+            self.capacity = index["capacity"]
+            self.synced_at = index.get("synced_at")
+            self.rows = {key: i for i, key in enumerate(self.keys)}
+            if self.capacity:
+                self._data = np.memmap(
+                    self._data_path(), dtype=np.float32, mode="r+",
+                    shape=(self.capacity, len(self.columns))
+                )
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _data_path(self) -> str:
+        return os.path.join(self.path, self.DATA_FILE)
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """Feature matrix of all stored rows (a view on the memmap)"""
+        if self._data is None:
+            return np.zeros((0, len(self.columns)), dtype=np.float32)
+        return self._data[:len(self.keys)]
+
+    def _grow(self, needed: int):
+        if needed <= self.capacity:
+            return
+        capacity = max(needed, self.capacity * 2, 1024)
+        os.makedirs(self.path, exist_ok=True)
+        if self._data is not None:
+            self._data.flush()
+            del self._data
+        with open(self._data_path(), "ab") as file:
+            file.truncate(capacity * len(self.columns) * 4)
+        self._data = np.memmap(
+            self._data_path(), dtype=np.float32, mode="r+",
+            shape=(capacity, len(self.columns))
+        )
+        self.capacity = capacity
+
+    def upsert_many(self, items: Iterable[Tuple[str, Dict]], chunk_size: int = 10000) -> int:
+        """
+        Insert or overwrite rows for (location_key, raw_variables) pairs
+
+        Returns:
+            int: Number of rows written
+        """
+        written = 0
+        chunk = []
+        for item in items:
+            chunk.append(item)
+            if len(chunk) >= chunk_size:
+                written += self._write_chunk(chunk)
+                chunk = []
+        if chunk:
+            written += self._write_chunk(chunk)
+        return written
+
+    def upsert(self, key: str, raw_variables: Dict):
+        self.upsert_many([(key, raw_variables)])
+
+    def _write_chunk(self, chunk: List[Tuple[str, Dict]]) -> int:
+        new_keys = [key for key, _ in chunk if key not in self.rows]
+        self._grow(len(self.keys) + len(new_keys))
+        for key in new_keys:
+            if key not in self.rows:
+                self.rows[key] = len(self.keys)
+                self.keys.append(key)
+        rows = np.fromiter((self.rows[key] for key, _ in chunk), dtype=np.int64, count=len(chunk))
+        self._data[rows] = to_matrix((raw for _, raw in chunk), dtype=np.float32)
+        return len(chunk)
+
+    def row(self, key: str) -> Optional[np.ndarray]:
+        """Feature vector for a location key"""
+        index = self.rows.get(key)
+        return None if index is None else self.matrix[index]
+
+    def score_all(self) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """Run the location-score kernel over every stored location"""
+        points, categories = score_matrix(self.matrix)
+        return self.keys, points, categories
+
+    def reset(self):
+        """Drop every row so the store can be rebuilt from scratch"""
+        if self._data is not None:
+            del self._data
+            self._data = None
+        for name in (self.DATA_FILE, self.INDEX_FILE):
+            path = os.path.join(self.path, name)
+            if os.path.exists(path):
+                os.remove(path)
+        self.keys = []
+        self.rows = {}
+        self.capacity = 0
+        self.synced_at = None
+
+    def flush(self):
+        """Persist the memmap and the key index"""
+        os.makedirs(self.path, exist_ok=True)
+        if self._data is not None:
+            self._data.flush()
+        index_path = os.path.join(self.path, self.INDEX_FILE)
+        tmp_path = f"{index_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump({
+                "columns": self.columns,
+                "capacity": self.capacity,
+                "synced_at": self.synced_at,
+                "keys": self.keys,
+            }, file)
+        os.replace(tmp_path, index_path)
+
+
+def get_feature_store() -> LocationFeatureStore:
+    """Open the feature store configured in settings"""
+    from django.conf import settings
+
+    path = getattr(settings, 'LOCATION_FEATURE_STORE_PATH', None) or os.path.join(
+        settings.BASE_DIR, 'location_features'
+    )
+    return LocationFeatureStore(path)
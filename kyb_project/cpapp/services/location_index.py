@@ -0,0 +1,183 @@
+"""
+Spatial index over stored GeoIQ locations.
+
+A uniform lat/lng grid maps each cell to the stored locations inside it, so a
+nearest-neighbour query only measures haversine distance to the handful of
+points in the cells around the query. New locations are added incrementally:
+store_location_analysis adds them to this process's index and every process
+picks up rows stored by other processes through a periodic id-watermark
+refresh.
+"""
+
+import logging
+import math
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_M = 6371000.0
+METERS_PER_DEGREE = 111320.0
+
+
+def haversine_m(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance in meters"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lng2 - lng1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(a)))
+
+
+class GridIndex:
+    """Uniform grid of (latitude, longitude, location_id) points"""
+
+    def __init__(self, cell_size_m: float = 500.0):
+        """
+        Args:
+            cell_size_m (float): Cell edge in meters of latitude
+        """
+        self.cell_deg = cell_size_m / METERS_PER_DEGREE
+        self._cells: Dict[Tuple[int, int], List[Tuple[float, float, int]]] = {}
+        self._points: Dict[int, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._points)
+
+    def _cell(self, latitude: float, longitude: float) -> Tuple[int, int]:
+        return int(math.floor(latitude / self.cell_deg)), int(math.floor(longitude / self.cell_deg))
+
+    def add(self, location_id: int, latitude: float, longitude: float):
+        """Add or move a location"""
+        with self._lock:
+            previous = self._points.get(location_id)
+            if previous == (latitude, longitude):
+                return
+            if previous is not None:
+                cell = self._cells.get(self._cell(*previous), [])
+                cell[:] = [p for p in cell if p[2] != location_id]
+            self._points[location_id] = (latitude, longitude)
+            self._cells.setdefault(self._cell(latitude, longitude), []).append((latitude, longitude, location_id))
+
+    def nearest(
+        self,
+        latitude: float,
+        longitude: float,
+        max_distance_m: float
+    ) -> Optional[Tuple[int, float]]:
+        """
+        Find the closest location within max_distance_m
+
+        Returns:
+            Tuple[int, float]: (location_id, distance in meters), or None
+        """
+        lat_cells = int(math.ceil(max_distance_m / METERS_PER_DEGREE / self.cell_deg))
+        # A degree of longitude shrinks with cos(latitude), so search more columns
+        cos_lat = max(math.cos(math.radians(min(abs(latitude) + self.cell_deg * lat_cells, 89.0))), 0.01)
+        lng_cells = int(math.ceil(max_distance_m / (METERS_PER_DEGREE * cos_lat) / self.cell_deg))
+        row, col = self._cell(latitude, longitude)
+
+        best = None
+        with self._lock:
+            for r in range(row - lat_cells, row + lat_cells + 1):
+                for c in range(col - lng_cells, col + lng_cells + 1):
+                    for lat, lng, location_id in self._cells.get((r, c), ()):
+                        distance = haversine_m(latitude, longitude, lat, lng)
+                        if distance <= max_distance_m and (best is None or distance < best[1]):
+                            best = (location_id, distance)
+        return best
+
+
+class LocationIndex(GridIndex):
+    """Grid index over LocationScore rows that have coordinates"""
+
+    def __init__(self, cell_size_m: float = 500.0, refresh_interval: float = 60.0):
+        """
+        Args:
+            cell_size_m (float): Cell edge in meters
+            refresh_interval (float): Seconds between checks for rows stored by other processes
+        """
+        super().__init__(cell_size_m)
+        self.refresh_interval = refresh_interval
+        self._max_id = 0
+        self._refreshed_at = None
+        self._refresh_lock = threading.Lock()
+
+    def refresh(self, force: bool = False) -> int:
+        """
+        Load LocationScore rows stored since the last refresh
+
+        Returns:
+            int: Number of locations added
+        """
+        if (not force and self._refreshed_at is not None
+                and time.monotonic() - self._refreshed_at < self.refresh_interval):
+            return 0
+        if not self._refresh_lock.acquire(blocking=False):
+            return 0
+        try:
+            from cpapp.models.location_score import LocationScore
+
+            rows = (
+                LocationScore.objects
+                .filter(id__gt=self._max_id, latitude__isnull=False, longitude__isnull=False)
+                .order_by('id')
+                .values_list('id', 'latitude', 'longitude')
+            )
+            added = 0
+            for location_id, latitude, longitude in rows.iterator(chunk_size=5000):
+                self.add(location_id, latitude, longitude)
+                self._max_id = max(self._max_id, location_id)
+                added += 1
+            self._refreshed_at = time.monotonic()
+            if added:
+                logger.info(f"Location index loaded {added} locations ({len(self)} total)")
+            return added
+        finally:
+            self._refresh_lock.release()
+
+    def nearest_location(self, latitude: float, longitude: float, max_distance_m: float):
+        """
+        Find the closest stored location within max_distance_m
+
+        Returns:
+            Tuple[LocationScore, float]: Location and distance in meters, or None
+        """
+        from cpapp.models.location_score import LocationScore
+
+        try:
+            self.refresh()
+        except Exception as e:
+            logger.warning(f"Location index refresh failed: {str(e)}")
+        match = self.nearest(latitude, longitude, max_distance_m)
+        if match is None:
+            return None
+        location = LocationScore.objects.filter(id=match[0]).first()
+        return (location, match[1]) if location else None
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_location_index(create: bool = True) -> Optional[LocationIndex]:
+    """
+    Return the process-wide location index
+
+    Args:
+        create (bool): Build the index if it does not exist yet
+    """
+    global _index
+    if _index is not None or not create:
+        return _index
+    with _index_lock:
+        if _index is None:
+            from django.conf import settings
+
+            _index = LocationIndex(
+                cell_size_m=getattr(settings, 'LOCATION_INDEX_CELL_SIZE_M', 500),
+                refresh_interval=getattr(settings, 'LOCATION_INDEX_REFRESH_SECONDS', 60),
+            )
+    return _index
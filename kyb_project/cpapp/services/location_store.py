@@ -0,0 +1,159 @@
+import hashlib
+import logging
+import re
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PINCODE_PATTERN = re.compile(r'(?<!\d)([1-9]\d{2}\s?\d{3})(?!\d)')
+
+
+def parse_coordinate(value) -> Optional[float]:
+    """Parse a stored latitude/longitude (GoogleMapData keeps them as text)"""
+    if value is None or value == '':
+        return None
+    try:
+        return float(str(value).strip())
+    except (ValueError, TypeError):
+        return None
+
+
+def normalize_address(address: str) -> str:
+    """Normalize an address so that trivially different spellings share a key"""
+    if not address:
+        return ""
+    normalized = re.sub(r'[^\w\s]', ' ', str(address).lower())
+    return re.sub(r'\s+', ' ', normalized).strip()
+
+
+def extract_pincode(address: str) -> str:
+    """Pull a 6-digit Indian pincode out of a free-text address"""
+    if not address:
+        return ""
+    match = PINCODE_PATTERN.search(str(address))
+    return match.group(1).replace(' ', '') if match else ""
+
+
+def geocoded_coordinates(analysis: Dict) -> Tuple[Optional[float], Optional[float]]:
+    """Coordinates GeoIQ returned for an address lookup, if any"""
+    raw_data = analysis.get("raw_data") or {}
+    for lat_name, lng_name in (("lat", "lng"), ("latitude", "longitude")):
+        latitude = parse_coordinate(raw_data.get(lat_name))
+        longitude = parse_coordinate(raw_data.get(lng_name))
+        if latitude is not None and longitude is not None:
+            return latitude, longitude
+    return None, None
+
+
+def location_key(
+    latitude: Optional[float] = None,
+    longitude: Optional[float] = None,
+    address: Optional[str] = None,
+    pincode: Optional[str] = None
+) -> Optional[str]:
+    """
+    Build the unique key a location is stored under
+
+    Coordinates are preferred and rounded to 5 decimals (~1m). Otherwise the
+    normalized address (plus pincode) is hashed.
+
+    Returns:
+        str: Location key, or None if there is nothing to key on
+    """
+    if latitude is not None and longitude is not None:
+        return f"geo:{latitude:.5f},{longitude:.5f}"
+
+    normalized = normalize_address(address)
+    if not normalized:
+        return None
+    if pincode:
+        normalized = f"{normalized}|{str(pincode).strip()}"
+    return f"addr:{hashlib.sha1(normalized.encode('utf-8')).hexdigest()}"
+
+
+def get_entity_location(entity_type: str, source: str, entity_id):
+    """
+    Fetch the precomputed location linked to a doctor or clinic
+
+    Returns:
+        LocationScore: Stored location, or None if it was never precomputed
+    """
+    from cpapp.models.location_score import EntityLocation
+
+    if entity_id is None:
+        return None
+    link = (
+        EntityLocation.objects
+        .select_related('location')
+        .filter(entity_type=entity_type, source=source, entity_id=entity_id)
+        .first()
+    )
+    return link.location if link else None
+
+
+def get_location_by_address(address: str):
+    """Fetch a precomputed location by address key"""
+    from cpapp.models.location_score import LocationScore
+
+    key = location_key(address=address)
+    if not key:
+        return None
+    return LocationScore.objects.filter(location_key=key).first()
+
+
+def store_location_analysis(
+    key: str,
+    analysis: Dict,
+    latitude: Optional[float] = None,
+    longitude: Optional[float] = None,
+    address: str = "",
+    pincode: str = "",
+    radius: int = 1000
+):
+    """
+    Store the result of GeoIQService.analyze_location under a location key
+
+    Returns:
+        LocationScore: The created or updated row
+    """
+    from django.utils import timezone
+    from cpapp.models.location_score import LocationScore
+    from cpapp.services.location_index import get_location_index
+
+    if latitude is None or longitude is None:
+        latitude, longitude = geocoded_coordinates(analysis)
+
+    location_score = analysis.get("location_score", {})
+    location, _ = LocationScore.objects.update_or_create(
+        location_key=key,
+        defaults={
+            'latitude': latitude,
+            'longitude': longitude,
+            'address': address or "",
+            'postal_code': pincode or extract_pincode(address),
+            'radius': radius,
+            'category': location_score.get("category", "Poor"),
+            'points': location_score.get("points", 0),
+            'raw_variables': analysis.get("raw_data", {}),
+            'fetched_at': timezone.now(),
+        }
+    )
+
+    # Keep this process's spatial index current; other processes refresh from the table
+    index = get_location_index(create=False)
+    if index is not None and latitude is not None and longitude is not None:
+        index.add(location.id, latitude, longitude)
+    return location
+
+
+def link_entity_location(entity_type: str, source: str, entity_id, location):
+    """Point a doctor or clinic at a stored location"""
+    from django.utils import timezone
+    from cpapp.models.location_score import EntityLocation
+
+    EntityLocation.objects.update_or_create(
+        entity_type=entity_type,
+        source=source,
+        entity_id=entity_id,
+        defaults={'location': location, 'updated_at': timezone.now()}
+    )
@@ -0,0 +1,89 @@
+"""
+In-process metrics registry.
+
+Keeps counters, gauges and summaries for the current worker process and
+renders them in the Prometheus text exposition format.
+"""
+
+import threading
+from typing import Dict, Tuple
+
+_lock = threading.Lock()
+_counters: Dict[Tuple[str, Tuple], float] = {}
+_gauges: Dict[Tuple[str, Tuple], float] = {}
+_summaries: Dict[Tuple[str, Tuple], list] = {}
+
+
+def _key(name: str, labels: Dict) -> Tuple[str, Tuple]:
+    return name, tuple(sorted(labels.items()))
+
+
+def increment(name: str, value: float = 1, **labels):
+    """Increase a counter"""
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def set_gauge(name: str, value: float, **labels):
+    """Set a gauge to the current value"""
+    with _lock:
+        _gauges[_key(name, labels)] = value
+
+
+def observe(name: str, value: float, **labels):
+    """Record an observation (e.g. a duration) in a count/sum/max summary"""
+    key = _key(name, labels)
+    with _lock:
+        summary = _summaries.setdefault(key, [0, 0.0, 0.0])
+        summary[0] += 1
+        summary[1] += value
+        summary[2] = max(summary[2], value)
+
+
+def snapshot() -> Dict:
+    """Return a copy of all metrics as plain dictionaries"""
+    def fmt(key):
+        name, labels = key
+        if not labels:
+            return name
+        return name + "{" + ",".join(f'{k}="{v}"' for k, v in labels) + "}"
+
+    with _lock:
+        return {
+            "counters": {fmt(k): v for k, v in _counters.items()},
+            "gauges": {fmt(k): v for k, v in _gauges.items()},
+            "summaries": {
+                fmt(k): {"count": s[0], "sum": s[1], "max": s[2]}
+                for k, s in _summaries.items()
+            },
+        }
+
+
+def render_prometheus() -> str:
+    """Render all metrics in the Prometheus text exposition format"""
+    def labels_str(labels, extra=None):
+        items = list(labels) + (list(extra) if extra else [])
+        if not items:
+            return ""
+        return "{" + ",".join(f'{k}="{v}"' for k, v in items) + "}"
+
+    lines = []
+    with _lock:
+        for (name, labels), value in sorted(_counters.items()):
+            lines.append(f"{name}{labels_str(labels)} {value}")
+        for (name, labels), value in sorted(_gauges.items()):
+            lines.append(f"{name}{labels_str(labels)} {value}")
+        for (name, labels), (count, total, maximum) in sorted(_summaries.items()):
+            lines.append(f"{name}_count{labels_str(labels)} {count}")
+            lines.append(f"{name}_sum{labels_str(labels)} {total}")
+            lines.append(f"{name}_max{labels_str(labels)} {maximum}")
+    return "\n".join(lines) + "\n"
+
+
+def reset():
+    """Clear all metrics (used by tests)"""
+    with _lock:
+        _counters.clear()
+        _gauges.clear()
+        _summaries.clear()
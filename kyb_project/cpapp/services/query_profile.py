@@ -0,0 +1,110 @@
+"""
+Per-request database query profile.
+
+QueryProfile is a connection execute wrapper (see
+django.db.connection.execute_wrapper) that records the count, total time,
+identical repeats and slowest statement of the queries it sees. Repeats are
+found by SQL and a hash of the parameters, so a profile holds each distinct
+statement once and no parameter values.
+QueryBudgetMiddleware installs one around every request and makes it the
+current profile, so work the request hands to other threads (the search
+fan-out) can install it on their own connections too.
+"""
+
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+
+def params_hash(params) -> int:
+    """Hash of a query's parameters"""
+    if isinstance(params, list):
+        params = tuple(params)
+    try:
+        return hash(params)
+    except TypeError:
+        # Unhashable values (lists, dicts) inside the parameters
+        return hash(repr(params))
+
+
+class QueryProfile:
+    """Queries run through the connections this wrapper is installed on, from any thread"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total_seconds = 0.0
+        self.slowest_seconds = 0.0
+        self.slowest_sql: Optional[str] = None
+        self.batches = 0
+        self._statements = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.record(sql, params, time.perf_counter() - started, many)
+
+    def record(self, sql: str, params, seconds: float, many: bool = False):
+        # executemany batches (bulk writes) are counted but never compared:
+        # hashing every row of a batch would cost more than profiling is worth
+        statement = None if many else (sql, params_hash(params))
+        with self._lock:
+            self.count += 1
+            self.total_seconds += seconds
+            if statement is None:
+                self.batches += 1
+            else:
+                self._statements[statement] += 1
+            if self.slowest_sql is None or seconds > self.slowest_seconds:
+                self.slowest_seconds = seconds
+                self.slowest_sql = sql
+
+    @property
+    def duplicates(self) -> int:
+        """Queries that repeated an earlier query with the same SQL and parameters"""
+        return self.count - self.batches - len(self._statements)
+
+    def duplicated(self, limit: int = 3) -> List[Tuple[str, int]]:
+        """(sql, times run) of the most repeated identical queries"""
+        return [(sql, times) for (sql, _), times in self._statements.most_common(limit) if times > 1]
+
+    def server_timing(self) -> str:
+        """Server-Timing header value of the profile"""
+        metrics = [f'db;dur={self.total_seconds * 1000:.1f};desc="{self.count} queries, {self.duplicates} duplicate"']
+        if self.count:
+            metrics.append(f'db-slowest;dur={self.slowest_seconds * 1000:.1f}')
+        return ', '.join(metrics)
+
+    def summary(self) -> Dict:
+        """Profile as a plain dictionary for logs"""
+        return {
+            'queries': self.count,
+            'db_ms': round(self.total_seconds * 1000, 1),
+            'duplicates': self.duplicates,
+            'duplicated': [{'sql': sql[:500], 'times': times} for sql, times in self.duplicated()],
+            'slowest_ms': round(self.slowest_seconds * 1000, 1),
+            'slowest_sql': (self.slowest_sql or '')[:500],
+        }
+
+
+_current = ContextVar('query_profile', default=None)
+
+
+def current_profile() -> Optional[QueryProfile]:
+    """Profile of the request being served, or None outside a profiled request"""
+    return _current.get()
+
+
+@contextmanager
+def activate(profile: QueryProfile):
+    """Make profile the current profile for the duration of the block"""
+    token = _current.set(profile)
+    try:
+        yield profile
+    finally:
+        _current.reset(token)
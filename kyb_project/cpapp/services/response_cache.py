@@ -0,0 +1,171 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """
+    Thread-safe in-process cache with a time to live.
+
+    Entries expire `ttl` seconds after they were stored; beyond `maxsize`
+    entries the least recently used one is evicted.
+    """
+
+    def __init__(self, ttl: float, maxsize: int = 256):
+        """
+        Args:
+            ttl (float): Seconds an entry stays fresh (0 or less disables caching)
+            maxsize (int): Maximum number of entries
+        """
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Tuple[Any, float]]:
+        """
+        Look up a fresh entry.
+
+        Returns:
+            tuple: (value, age in seconds), or None when missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, stored_at = entry
+            age = time.monotonic() - stored_at
+            if age >= self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value, age
+
+    def set(self, key: Hashable, value: Any):
+        """Store a value (no-op when caching is disabled)"""
+        if self.ttl <= 0 or self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (value, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key.
+
+    While a call for a key is running, other callers with that key wait for
+    it and receive its result (or its exception) instead of calling again.
+    """
+
+    def __init__(self, wait_timeout: Optional[float] = None):
+        """
+        Args:
+            wait_timeout (float): Seconds a caller waits for another caller's call
+                before giving up with TimeoutError (None waits until it finishes)
+        """
+        self.wait_timeout = wait_timeout
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Call fn once for all concurrent callers with this key.
+
+        Returns:
+            tuple: (result, shared) where shared is True for callers that
+            waited for another caller's call
+
+        Raises:
+            TimeoutError: If another caller's call outlasts wait_timeout
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            if not flight.done.wait(self.wait_timeout):
+                raise TimeoutError(f"Gave up after {self.wait_timeout}s waiting for a concurrent call")
+            if flight.error is not None:
+                raise flight.error
+            return flight.result, True
+
+        try:
+            flight.result = fn()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+        return flight.result, False
+
+
+class ResponseCache:
+    """
+    TTL cache in front of a slow call, with concurrent misses coalesced.
+
+    A key is fetched by at most one caller at a time; callers arriving
+    during the fetch share its result, and results accepted by `cacheable`
+    are then served from the cache until they expire.
+    """
+
+    def __init__(self, ttl: float, maxsize: int = 256, wait_timeout: Optional[float] = None):
+        """
+        Args:
+            ttl (float): Seconds a result is served from the cache (0 or less disables caching)
+            maxsize (int): Maximum number of cached results
+            wait_timeout (float): Seconds a caller waits for a concurrent fetch (see SingleFlight)
+        """
+        self.cache = TTLCache(ttl, maxsize)
+        self.flights = SingleFlight(wait_timeout)
+
+    def get_or_fetch(
+        self,
+        key: Hashable,
+        fetch: Callable[[], Any],
+        cacheable: Callable[[Any], bool] = lambda result: True
+    ) -> Tuple[Any, Optional[float]]:
+        """
+        Return the cached result for key, or fetch it.
+
+        Returns:
+            tuple: (result, age) where age is the seconds since the result was
+            fetched for a cached or shared result, and None for a fresh fetch
+        """
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        def fetch_and_store():
+            # Another caller may have stored the result while this one waited for the lock
+            cached = self.cache.get(key)
+            if cached is not None:
+                value, age = cached
+                return value, time.monotonic() - age, False
+            result = fetch()
+            if cacheable(result):
+                self.cache.set(key, result)
+            return result, time.monotonic(), True
+
+        (result, fetched_at, fresh), shared = self.flights.do(key, fetch_and_store)
+        if fresh and not shared:
+            return result, None
+        return result, max(time.monotonic() - fetched_at, 0.0)
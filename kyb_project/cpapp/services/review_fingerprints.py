@@ -0,0 +1,239 @@
+"""
+Persistent cross-place review fingerprints.
+
+Every scored review is reduced to a 64-bit hash of its normalized text and
+four MinHash LSH band hashes, stored with the place it was posted at. A new
+batch is looked up against the stored fingerprints before it is recorded, so
+the same fabricated text posted at other clinics is reported as "seen at N
+other places": exact copies match on the text hash, lightly edited copies on
+at least MIN_BAND_MATCHES band hashes.
+
+Reviews shorter than MIN_WORDS are not fingerprinted: texts such as "Good" or
+"Nice doctor" are posted independently at thousands of places and say
+nothing about copying.
+
+Lookups are indexed point queries on (hash_prefix, hash), so their cost does
+not depend on how many fingerprints have been stored, and return at most
+MAX_PLACES_PER_HASH places per hash, so a widely copied text costs the same
+as any other.
+"""
+
+import hashlib
+import logging
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Fingerprints are spread over this many hash_prefix partitions (top 10 bits)
+PARTITION_BITS = 10
+# LSH bands stored per review (BAND_ROWS MinHash values each)
+BANDS = 4
+BAND_ROWS = 4
+# Bands an edited copy must share with a stored review (~2% false matches at 0.5 similarity)
+MIN_BAND_MATCHES = 2
+# Values per IN (...) clause, below SQLite's variable limit
+QUERY_CHUNK_SIZE = 500
+# Reviews with fewer words are too generic to fingerprint
+MIN_WORDS = 6
+# Places read per stored hash; seen_at_other_places saturates here
+MAX_PLACES_PER_HASH = 100
+
+
+def hash64(data: bytes) -> int:
+    """Signed 64-bit hash (fits a BigIntegerField)"""
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'big', signed=True)
+
+
+def hash_prefix(value: int) -> int:
+    """Partition of a 64-bit hash"""
+    return (value & 0xFFFFFFFFFFFFFFFF) >> (64 - PARTITION_BITS)
+
+
+def _chunks(values: Sequence, size: int = QUERY_CHUNK_SIZE):
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def match_places(
+    text_hashes: List[Optional[int]],
+    band_hashes: List[List[int]],
+    exact: Dict[int, Set[str]],
+    band_matches: Dict[int, Set[Tuple[int, str]]]
+) -> List[Set[str]]:
+    """
+    Places each review was seen at, from stored fingerprint matches
+
+    Args:
+        text_hashes: Text hash per review
+        band_hashes: Band hashes per review
+        exact: Stored places per text hash
+        band_matches: Stored (text_hash, place) pairs per band hash
+
+    Returns:
+        List[Set[str]]: Places with an exact copy or a stored review sharing
+        at least MIN_BAND_MATCHES bands
+    """
+    places = []
+    for text_hash, hashes in zip(text_hashes, band_hashes):
+        seen = set(exact.get(text_hash, ()))
+        shared = defaultdict(int)
+        for band_hash in hashes:
+            for match in band_matches.get(band_hash, ()):
+                shared[match] += 1
+        seen.update(place for (_, place), count in shared.items() if count >= MIN_BAND_MATCHES)
+        places.append(seen)
+    return places
+
+
+class ReviewFingerprintIndex:
+    """Checks batches of reviews against, and adds them to, the fingerprint tables"""
+
+    def __init__(self, batch_size: int = 1000):
+        """
+        Args:
+            batch_size (int): Rows per bulk insert
+        """
+        self.batch_size = batch_size
+        self._lsh = None
+
+    def fingerprints(self, normalized_texts: Sequence[str]):
+        """
+        Text and band hashes of normalized review texts
+
+        Returns:
+            Tuple[List[Optional[int]], List[List[int]]]: Text hash per review (None
+            for texts shorter than MIN_WORDS) and band hashes per review (empty for
+            reviews too short for near-duplicate matching)
+        """
+        from .review_lsh import MIN_SHINGLES, MinHashLSH, shingles
+
+        if self._lsh is None:
+            self._lsh = MinHashLSH(num_perm=BANDS * BAND_ROWS, bands=BANDS)
+
+        long_enough = [len(text.split()) >= MIN_WORDS for text in normalized_texts]
+        text_hashes = [
+            hash64(text.encode('utf-8')) if fingerprinted else None
+            for text, fingerprinted in zip(normalized_texts, long_enough)
+        ]
+        sets = [shingles(text) if fingerprinted else frozenset() for text, fingerprinted in zip(normalized_texts, long_enough)]
+        banded = [i for i, shingle_set in enumerate(sets) if len(shingle_set) >= MIN_SHINGLES]
+        band_hashes = [[] for _ in normalized_texts]
+        if banded:
+            signatures = self._lsh.signatures([sets[i] for i in banded])
+            for i, signature in zip(banded, signatures):
+                band_hashes[i] = [
+                    hash64(bytes([band]) + signature[band * BAND_ROWS:(band + 1) * BAND_ROWS].tobytes())
+                    for band in range(BANDS)
+                ]
+        return text_hashes, band_hashes
+
+    def lookup(self, place_id: str, text_hashes: List[Optional[int]], band_hashes: List[List[int]]) -> List[Set[str]]:
+        """
+        Other places each review has been seen at
+
+        Returns:
+            List[Set[str]]: Place ids per review, excluding place_id (up to
+            MAX_PLACES_PER_HASH from each matched hash)
+        """
+        from django.db.models import F, Window
+        from django.db.models.functions import DenseRank, RowNumber
+
+        from cpapp.models.review_fingerprint import ReviewFingerprint, ReviewFingerprintBand
+
+        exact = defaultdict(set)
+        wanted = sorted({h for h in text_hashes if h is not None})
+        for chunk in _chunks(wanted):
+            rows = (
+                ReviewFingerprint.objects
+                .filter(hash_prefix__in={hash_prefix(h) for h in chunk}, text_hash__in=chunk)
+                .exclude(place_id=place_id)
+                .annotate(place_rank=Window(DenseRank(), partition_by=[F('text_hash')], order_by=F('place_id').asc()))
+                .filter(place_rank__lte=MAX_PLACES_PER_HASH)
+                .values_list('text_hash', 'place_id')
+                .distinct()
+            )
+            for text_hash, other_place in rows:
+                exact[text_hash].add(other_place)
+
+        band_matches = defaultdict(set)
+        wanted = sorted({h for hashes in band_hashes for h in hashes})
+        for chunk in _chunks(wanted):
+            rows = (
+                ReviewFingerprintBand.objects
+                .filter(hash_prefix__in={hash_prefix(h) for h in chunk}, band_hash__in=chunk)
+                .exclude(place_id=place_id)
+                .annotate(match_rank=Window(RowNumber(), partition_by=[F('band_hash')], order_by=F('place_id').asc()))
+                .filter(match_rank__lte=MAX_PLACES_PER_HASH)
+                .values_list('band_hash', 'text_hash', 'place_id')
+            )
+            for band_hash, text_hash, other_place in rows:
+                band_matches[band_hash].add((text_hash, other_place))
+
+        return match_places(text_hashes, band_hashes, exact, band_matches)
+
+    def record(
+        self,
+        place_id: str,
+        reviews: Sequence[Dict[str, Any]],
+        text_hashes: List[Optional[int]],
+        band_hashes: List[List[int]]
+    ):
+        """Store the fingerprints of a place's reviews (already stored rows are skipped)"""
+        from cpapp.models.review_fingerprint import ReviewFingerprint, ReviewFingerprintBand
+
+        fingerprints = {}
+        bands = {}
+        for review, text_hash, hashes in zip(reviews, text_hashes, band_hashes):
+            if text_hash is None:
+                continue
+            author_id = str(review.get('author_id') or review.get('author_link') or review.get('author_title') or '')[:255]
+            fingerprints[(text_hash, author_id)] = ReviewFingerprint(
+                text_hash=text_hash,
+                hash_prefix=hash_prefix(text_hash),
+                place_id=place_id,
+                author_id=author_id,
+                review_id=str(review.get('review_id') or '')[:255],
+            )
+            for band_hash in hashes:
+                bands[(band_hash, text_hash)] = ReviewFingerprintBand(
+                    band_hash=band_hash,
+                    hash_prefix=hash_prefix(band_hash),
+                    text_hash=text_hash,
+                    place_id=place_id,
+                )
+        ReviewFingerprint.objects.bulk_create(fingerprints.values(), batch_size=self.batch_size, ignore_conflicts=True)
+        ReviewFingerprintBand.objects.bulk_create(bands.values(), batch_size=self.batch_size, ignore_conflicts=True)
+
+    def check_and_record(
+        self,
+        place_id: str,
+        reviews: Sequence[Dict[str, Any]],
+        normalized_texts: Sequence[str]
+    ) -> List[int]:
+        """
+        Count the other places each review was seen at, then store the batch
+
+        Args:
+            place_id (str): Place the reviews were posted at
+            reviews (List[Dict]): Review dicts (author_id and review_id are stored)
+            normalized_texts (List[str]): Review texts normalized with ReviewScorer._normalize_text
+
+        Returns:
+            List[int]: Number of other places per review
+        """
+        text_hashes, band_hashes = self.fingerprints(normalized_texts)
+        places = self.lookup(place_id, text_hashes, band_hashes)
+        self.record(place_id, reviews, text_hashes, band_hashes)
+        return [len(other_places) for other_places in places]
+
+
+_index = None
+
+
+def get_fingerprint_index() -> ReviewFingerprintIndex:
+    """Return the process-wide fingerprint index"""
+    global _index
+    if _index is None:
+        _index = ReviewFingerprintIndex()
+    return _index
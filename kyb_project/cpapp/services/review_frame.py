@@ -0,0 +1,202 @@
+"""
+Columnar batch scoring for ReviewScorer.
+
+score_reviews_columnar loads a batch of reviews into a pandas frame, parses every
+timestamp once with a vectorized parser, computes the duplicate, generic,
+negative, recency and content quality features as columns and applies the
+ReviewScorer rules as NumPy array expressions. The output is identical to
+ReviewScorer.score_reviews, down to the int/float type of clamped scores.
+
+Only the text features that need a tokenizer or the phrase matcher
+(content quality and phrase hits) are still computed per distinct review
+text.
+"""
+
+import logging
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .review_scoring_system import near_duplicate_flags, project_review
+
+logger = logging.getLogger(__name__)
+
+TIMESTAMP_FORMAT = "%m/%d/%Y %H:%M:%S"
+
+
+def build_review_frame(scorer, reviews: List[Dict[str, Any]]) -> pd.DataFrame:
+    """
+    Load reviews into a frame with one column per scoring feature
+
+    Args:
+        scorer (ReviewScorer): Scorer providing the matcher, tokenizer and recency threshold
+        reviews (List[Dict]): Review dicts as returned by Outscraper
+
+    Returns:
+        pd.DataFrame: Columns text, is_duplicate, duplicate_cluster, near_duplicate,
+        generic_score, negative_score, is_recent and content_quality, in review order
+    """
+    texts = [review.get('review_text', '') for review in reviews]
+    stamps = [review.get('review_timestamp') or review.get('review_datetime_utc') for review in reviews]
+    # Text features depend only on the text, so identical reviews are analysed once
+    keys = [text if isinstance(text, str) else (type(text), repr(text)) for text in texts]
+    features = {}
+    for key, text in zip(keys, texts):
+        if key not in features:
+            text_hits = scorer.matcher.scan(text)
+            features[key] = (text_hits, scorer.analyze_content_quality(text, text_hits))
+    hits, quality = zip(*(features[key] for key in keys))
+
+    frame = pd.DataFrame({'text': pd.Series(texts, dtype=object)})
+    has_text = np.array([bool(text) for text in texts], dtype=bool)
+
+    # Duplicates: every occurrence of a normalized text after the first
+    normalized = (
+        pd.Series([str(text) if text else "" for text in texts], dtype=object)
+        .str.lower()
+        .str.replace(r'[^\w\s]', '', regex=True)
+        .str.replace(r'\s+', ' ', regex=True)
+        .str.strip()
+    )
+    frame['is_duplicate'] = normalized.duplicated(keep='first')
+    clusters = scorer.near_duplicate_clusters(normalized.tolist())
+    frame['duplicate_cluster'] = pd.Series(clusters, dtype=object)
+    frame['near_duplicate'] = near_duplicate_flags(clusters)
+
+    # Generic phrases: empty reviews count as fully generic
+    generic_count = np.array([len(h.generic_phrases) for h in hits], dtype=float)
+    frame['generic_score'] = np.where(has_text, np.minimum(generic_count / 5, 1.0), 1.0)
+
+    # Negative keywords: a keyword found in a quarter of the batch is a full penalty
+    prevalence = Counter()
+    for h in hits:
+        prevalence.update(h.negative_keywords)
+    total = len(reviews)
+    common = {keyword for keyword, count in prevalence.items() if total and count / total >= 0.25}
+    negative_count = np.array([len(h.negative_keywords) for h in hits], dtype=float)
+    common_found = np.array([bool(common) and not common.isdisjoint(h.negative_keywords) for h in hits], dtype=bool)
+    frame['negative_score'] = np.where(
+        has_text & common_found, 1.0,
+        np.where(has_text, np.minimum(negative_count / 3, 1.0), 0.0)
+    )
+
+    frame['is_recent'] = recent_mask(stamps, scorer.recency_threshold)
+    frame['content_quality'] = np.array(quality, dtype=float)
+    return frame
+
+
+def recent_mask(stamps: List[Any], recency_threshold: int) -> np.ndarray:
+    """
+    Vectorized ReviewScorer.is_recent
+
+    Int timestamps are epoch seconds and strings use TIMESTAMP_FORMAT; empty,
+    unparseable and other values are not recent.
+    """
+    cutoff = datetime.now() - timedelta(days=30 * recency_threshold)
+    is_int = np.array([isinstance(s, int) and bool(s) for s in stamps], dtype=bool)
+    is_str = np.array([isinstance(s, str) and bool(s) for s in stamps], dtype=bool)
+
+    recent = np.zeros(len(stamps), dtype=bool)
+    if is_int.any():
+        epochs = np.array([s if ok else 0 for s, ok in zip(stamps, is_int)], dtype=np.int64)
+        recent |= is_int & (epochs >= cutoff.timestamp())
+    if is_str.any():
+        parsed = pd.to_datetime(
+            pd.Series([s if ok else None for s, ok in zip(stamps, is_str)], dtype=object),
+            format=TIMESTAMP_FORMAT, errors='coerce'
+        )
+        unparsed = is_str & parsed.isna().to_numpy()
+        if unparsed.any():
+            logger.warning(f"Could not parse {int(unparsed.sum())} review timestamps")
+        recent |= is_str & (parsed >= pd.Timestamp(cutoff)).to_numpy()
+    return recent
+
+
+def score_review_frame(frame: pd.DataFrame) -> np.ndarray:
+    """
+    Apply the ReviewScorer rules to a feature frame
+
+    Returns:
+        np.ndarray: Unrounded, unclamped scores
+    """
+    generic = frame['generic_score'].to_numpy()
+    negative = frame['negative_score'].to_numpy()
+    quality = frame['content_quality'].to_numpy(dtype=float)
+    duplicate = frame['is_duplicate'].to_numpy() | frame['near_duplicate'].to_numpy()
+    recent = frame['is_recent'].to_numpy()
+
+    # Same operation order as calculate_review_score, so floats match bit for bit
+    score = 5.0 - generic * 5
+    score = np.where(recent, score, score - 3)
+    quality_boost = np.where(quality > 0.7, quality * 5 + 2, quality * 5)
+    score = np.where(negative > 0, -negative * 10, score + quality_boost)
+    return np.where(duplicate, 5.0 - 10, score)
+
+
+def clamp_scores(scores: np.ndarray) -> List[Any]:
+    """
+    Clamp to 1..10 (genuine) or -10..0 (fake) and round to one decimal
+
+    Boundary values come back as ints, as the builtin max/min clamp in
+    calculate_review_score returns its int bound.
+    """
+    clamped = np.where(scores > 0, np.clip(scores, 1, 10), np.clip(scores, -10, 0))
+    int_bound = (scores >= 10) | ((scores > 0) & (scores <= 1)) | (scores == 0) | (scores <= -10)
+    return [
+        int(value) if bound else round(value, 1)
+        for value, bound in zip(clamped.tolist(), int_bound.tolist())
+    ]
+
+
+def score_reviews_columnar(
+    scorer,
+    reviews: List[Dict[str, Any]],
+    fields: Optional[Sequence[str]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Columnar equivalent of ReviewScorer.score_reviews
+
+    Args:
+        scorer (ReviewScorer): Scorer whose rules are used (it is not modified)
+        reviews (List[Dict]): Review dicts as returned by Outscraper
+        fields (List[str]): Review fields copied into the results (all by default)
+
+    Returns:
+        List[Dict]: Copies of the reviews with review_score and scoring_factors
+    """
+    if not reviews:
+        return []
+
+    frame = build_review_frame(scorer, reviews)
+    any_recent = bool(frame['is_recent'].any())
+    scores = clamp_scores(score_review_frame(frame)) if any_recent else [-10] * len(reviews)
+
+    columns = zip(
+        frame['is_duplicate'].tolist(),
+        frame['generic_score'].tolist(),
+        frame['negative_score'].tolist(),
+        frame['is_recent'].tolist(),
+        frame['content_quality'].tolist(),
+        frame['near_duplicate'].tolist(),
+        frame['duplicate_cluster'].tolist(),
+    )
+    scored_reviews = []
+    for review, score, factors in zip(reviews, scores, columns):
+        duplicate, generic, negative, recent, quality, near_duplicate, cluster = factors
+        scored_review = project_review(review, fields)
+        scored_review['review_score'] = score
+        scored_review['scoring_factors'] = {
+            'is_duplicate': duplicate,
+            'generic_score': round(generic, 2),
+            'negative_score': round(negative, 2),
+            'is_recent': recent,
+            'content_quality': round(quality, 2),
+            'near_duplicate': near_duplicate,
+            'duplicate_cluster': cluster,
+            'global_recency': any_recent,
+        }
+        scored_reviews.append(scored_review)
+    return scored_reviews
@@ -0,0 +1,224 @@
+"""
+Server-side scoring of asynchronous Outscraper review requests.
+
+Submitting an async review request creates a ReviewScoringJob. The
+run_review_jobs worker claims due jobs, polls Outscraper's get_results once
+per due job with exponential backoff (or immediately after Outscraper's
+webhook reports the request finished), scores the reviews once and stores
+the final API response on the job. Status checks then read that row and
+never reach Outscraper themselves.
+"""
+
+import logging
+import secrets
+from datetime import timedelta
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from cpapp.models.review_job import ReviewScoringJob
+
+logger = logging.getLogger(__name__)
+
+# Outscraper request statuses
+FINISHED_STATUSES = ('finished', 'success')
+PENDING_STATUSES = ('pending',)
+
+# A claimed job is hidden from other workers for this long (renewed when its poll starts)
+LEASE_SECONDS = 300
+# process_job result for a job whose lease passed to another worker
+LEASE_LOST = 'lease_lost'
+
+
+def webhook_url(token: str) -> str:
+    """Callback URL for Outscraper, or "" when no public base URL is configured"""
+    base_url = getattr(settings, 'REVIEW_JOB_WEBHOOK_BASE_URL', '')
+    if not base_url or not token:
+        return ''
+    return f"{base_url.rstrip('/')}/api/scoring/review-webhook/?token={token}"
+
+
+def new_webhook_token() -> str:
+    """Secret that authenticates Outscraper's callback for one job"""
+    return secrets.token_urlsafe(32)
+
+
+def create_job(request_id: str, query: str = '', webhook_token: str = '', queries: Optional[List[str]] = None) -> ReviewScoringJob:
+    """
+    Register an Outscraper request for server-side scoring (once per request id)
+
+    A portfolio batch passes its queries; its result is then scored per query.
+    """
+    job, _ = ReviewScoringJob.objects.get_or_create(
+        request_id=request_id,
+        defaults={'query': (query or ', '.join(queries or []))[:500], 'webhook_token': webhook_token, 'queries': queries or []},
+    )
+    return job
+
+
+def poll_delay(attempts: int) -> float:
+    """Seconds until the next poll of a job still pending after `attempts` polls"""
+    base = getattr(settings, 'REVIEW_JOB_POLL_SECONDS', 5.0)
+    return min(base * 2 ** max(attempts - 1, 0), getattr(settings, 'REVIEW_JOB_MAX_POLL_SECONDS', 60.0))
+
+
+def mark_job_due(request_id: str, token: str) -> bool:
+    """
+    Schedule a webhook-reported job for an immediate poll; False for unknown jobs or tokens
+
+    A job a worker currently holds is left alone: bringing its poll forward
+    would let a second worker claim it while the first is still scoring it.
+    The holding worker reschedules it after its own poll.
+    """
+    if not token:
+        return False
+    jobs = ReviewScoringJob.objects.filter(request_id=request_id, webhook_token=token, status=ReviewScoringJob.PENDING)
+    if not jobs.exists():
+        return False
+    now = timezone.now()
+    jobs.filter(Q(leased_until__isnull=True) | Q(leased_until__lte=now)).update(next_poll_at=now)
+    return True
+
+
+def claim_due_jobs(limit: int = 10) -> List[ReviewScoringJob]:
+    """
+    Claim pending jobs whose poll is due
+
+    Each job is claimed with a conditional update that moves its next poll
+    LEASE_SECONDS ahead and records the lease under a new lease_token, so
+    concurrent workers (and the webhook) never hand the same job to a second
+    worker. process_job renews the lease before polling and only saves while
+    the token is still the job's.
+    """
+    now = timezone.now()
+    due = ReviewScoringJob.objects.filter(status=ReviewScoringJob.PENDING, next_poll_at__lte=now).order_by('next_poll_at')
+    lease = now + timedelta(seconds=LEASE_SECONDS)
+    claimed = []
+    for job in due[:limit]:
+        token = secrets.token_hex(16)
+        won = (
+            ReviewScoringJob.objects
+            .filter(pk=job.pk, status=ReviewScoringJob.PENDING, next_poll_at=job.next_poll_at)
+            .update(next_poll_at=lease, leased_until=lease, lease_token=token)
+        )
+        if won:
+            job.next_poll_at = lease
+            job.leased_until = lease
+            job.lease_token = token
+            claimed.append(job)
+    return claimed
+
+
+def renew_lease(job: ReviewScoringJob) -> bool:
+    """Extend a claimed job's lease by LEASE_SECONDS; False if another worker holds it now"""
+    lease = timezone.now() + timedelta(seconds=LEASE_SECONDS)
+    renewed = (
+        ReviewScoringJob.objects
+        .filter(pk=job.pk, status=ReviewScoringJob.PENDING, lease_token=job.lease_token)
+        .update(next_poll_at=lease, leased_until=lease)
+    )
+    if renewed:
+        job.next_poll_at = job.leased_until = lease
+    return bool(renewed)
+
+
+def completed_response(service, request_id: str, results: Dict[str, Any], queries: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Score a finished Outscraper result into the API response (per query for portfolio batches)"""
+    if queries:
+        return {
+            "status": "completed",
+            "request_id": request_id,
+            **service.score_portfolio(queries, results["data"] or [])
+        }
+    reviews_data, place_ids = service.collect_reviews(results["data"] or [], default_place=request_id)
+    if not reviews_data:
+        return {
+            "status": "completed",
+            "request_id": request_id,
+            "message": "No reviews found for this query.",
+            "scored_reviews": []
+        }
+    scored_reviews = service.score_reviews(reviews_data, place_ids)
+    return {
+        "status": "completed",
+        "request_id": request_id,
+        **service.summarize(scored_reviews),
+        "scored_reviews": scored_reviews
+    }
+
+
+def process_job(job: ReviewScoringJob, service) -> str:
+    """
+    Poll Outscraper once for a claimed job
+
+    A finished request is scored and stored as completed. A pending request
+    (or a failed poll) is rescheduled with backoff until
+    REVIEW_JOB_MAX_ATTEMPTS polls; any other outcome fails the job.
+
+    A job whose lease expired while earlier jobs of its batch were processed
+    and was claimed by another worker is left to that worker: the lease is
+    renewed before polling, and the outcome is only saved if the lease is
+    still this claim's.
+
+    Args:
+        job (ReviewScoringJob): Job returned by claim_due_jobs
+        service (ReviewAnalysisService): Service used to fetch and score the reviews
+
+    Returns:
+        str: The job's new status, or LEASE_LOST if another worker holds it
+    """
+    if not renew_lease(job):
+        logger.warning(f"Review job {job.request_id} was claimed by another worker, skipping it")
+        return LEASE_LOST
+    job.attempts += 1
+    try:
+        results = service.get_review_results(job.request_id)
+    except Exception as e:
+        results = {"status": "error", "error": str(e)}
+    status = str(results.get("status", "")).lower()
+
+    try:
+        if status in FINISHED_STATUSES and "data" in results:
+            job.result = completed_response(service, job.request_id, results, job.queries)
+            job.status = ReviewScoringJob.COMPLETED
+        elif (status in PENDING_STATUSES or "error" in results) and job.attempts < getattr(settings, 'REVIEW_JOB_MAX_ATTEMPTS', 60):
+            if "error" in results:
+                logger.warning(f"Polling review job {job.request_id} failed: {results['error']}")
+            job.next_poll_at = timezone.now() + timedelta(seconds=poll_delay(job.attempts))
+        else:
+            job.status = ReviewScoringJob.FAILED
+            if "error" in results:
+                job.error = str(results["error"])
+            elif status in PENDING_STATUSES:
+                job.error = f"Outscraper request still pending after {job.attempts} polls"
+            else:
+                job.error = f"Outscraper request status: {results.get('status')}"
+            job.result = {
+                "status": "error",
+                "message": "Failed to retrieve review results.",
+                "response": results
+            }
+    except Exception as e:
+        logger.exception(f"Error scoring review job {job.request_id}: {str(e)}")
+        job.status = ReviewScoringJob.FAILED
+        job.error = str(e)
+        job.result = {"status": "error", "message": f"Error scoring reviews: {str(e)}"}
+
+    if job.status != ReviewScoringJob.PENDING:
+        job.completed_at = timezone.now()
+    saved = (
+        ReviewScoringJob.objects
+        .filter(pk=job.pk, lease_token=job.lease_token)
+        .update(
+            status=job.status, attempts=job.attempts, next_poll_at=job.next_poll_at, leased_until=None,
+            lease_token='', result=job.result, error=job.error, completed_at=job.completed_at
+        )
+    )
+    if not saved:
+        logger.warning(f"Review job {job.request_id} lost its lease while polling, discarding this poll's outcome")
+        return LEASE_LOST
+    job.leased_until, job.lease_token = None, ''
+    logger.info(f"Review job {job.request_id}: {job.status} after {job.attempts} polls")
+    return job.status
@@ -0,0 +1,238 @@
+"""
+MinHash LSH near-duplicate clustering for review batches.
+
+Each review is reduced to a set of shingles (character 4-grams for short
+reviews, word bigrams otherwise) and a MinHash signature. Signatures are split into bands;
+reviews sharing a band bucket are candidates. Within a bucket each review is
+paired with the bucket's first review and its nearest neighbours in signature
+order, and a pair joins a cluster only if its exact shingle Jaccard similarity
+meets the threshold. Every distinct review is hashed once and compared with a
+bounded number of reviews per band, so a batch is clustered in roughly linear
+time instead of the O(n^2) of pairwise fuzzy matching.
+"""
+
+import zlib
+from collections import Counter
+from typing import Callable, List, Optional, Sequence
+
+import numpy as np
+
+# Reviews with fewer shingles than this are left to exact duplicate detection
+MIN_SHINGLES = 3
+# Reviews shorter than this many words are shingled by character n-gram, longer ones by word pair
+SHORT_REVIEW_WORDS = 12
+# Character n-gram length of short reviews. Unlike single words, 4-grams keep word order:
+# "very good doctor" and "doctor is very good" stay below the 0.7 threshold while an
+# edited copy such as "best doctor in the town" of "best doctor in town" clusters
+SHORT_REVIEW_NGRAM = 4
+# Reviews hashed per vectorized block (bounds the signature scratch memory)
+BLOCK_SIZE = 1024
+
+# Pairs whose MinHash similarity estimate is this far below the threshold are
+# skipped without an exact comparison (about 2.5 standard errors at 64 permutations)
+ESTIMATE_SLACK = 0.15
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+
+
+def shingles(normalized_text: str) -> frozenset:
+    """Shingles of a normalized review (see ReviewScorer._normalize_text)"""
+    words = normalized_text.split()
+    if len(words) < SHORT_REVIEW_WORDS:
+        # Padded so the first and last words get their own boundary n-grams
+        padded = f" {' '.join(words)} "
+        return frozenset(padded[i:i + SHORT_REVIEW_NGRAM] for i in range(len(padded) - SHORT_REVIEW_NGRAM + 1))
+    return frozenset(f"{a} {b}" for a, b in zip(words, words[1:]))
+
+
+def jaccard(a: frozenset, b: frozenset) -> float:
+    """Jaccard similarity of two shingle sets"""
+    if not a and not b:
+        return 1.0
+    common = len(a & b)
+    return common / (len(a) + len(b) - common)
+
+
+def bucket_pairs(keys: np.ndarray, rank: np.ndarray, window: int):
+    """
+    Candidate pairs of one LSH band
+
+    Rows of a bucket are ordered by `rank` (the rows' position in signature
+    order), so reviews that agree on more hash values sit next to each other,
+    and each row is paired with the `window` rows before it and with the
+    bucket's first row.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Row indices of both reviews of each pair
+    """
+    _, first_rows, bucket = np.unique(keys, return_index=True, return_inverse=True)
+    order = np.lexsort((rank, bucket))
+    lefts = [first_rows[bucket]]
+    rights = [np.arange(len(keys))]
+    for offset in range(1, window + 1):
+        same_bucket = bucket[order[offset:]] == bucket[order[:-offset]]
+        lefts.append(order[:-offset][same_bucket])
+        rights.append(order[offset:][same_bucket])
+    left, right = np.concatenate(lefts), np.concatenate(rights)
+    distinct = left != right
+    return left[distinct], right[distinct]
+
+
+class MinHashLSH:
+    """Clusters near-duplicate reviews in a batch"""
+
+    def __init__(self, threshold: float = 0.7, num_perm: int = 64, bands: int = 16, window: int = 2, seed: int = 1):
+        """
+        Args:
+            threshold (float): Minimum shingle Jaccard similarity of near-duplicates
+            num_perm (int): MinHash signature length
+            bands (int): LSH bands; num_perm / bands rows each. 16 x 4 makes pairs
+                at the 0.7 threshold candidates with ~99% probability
+            window (int): Neighbours each review is compared with per band
+            seed (int): Seed of the hash permutations (fixed, so clusters are stable)
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.window = window
+        # Coefficients span the whole field: with small ones a * x + b rarely wraps
+        # mod p, the permutations all order shingles alike and the estimate is biased
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, int(_MERSENNE_PRIME), size=num_perm, dtype=np.int64).astype(np.uint64)
+        self._b = rng.randint(0, int(_MERSENNE_PRIME), size=num_perm, dtype=np.int64).astype(np.uint64)
+
+    def signatures(self, shingle_sets: Sequence[frozenset]) -> np.ndarray:
+        """
+        MinHash signatures, one row per shingle set (sets must be non-empty)
+
+        Returns:
+            np.ndarray: uint64 array of shape (len(shingle_sets), num_perm)
+        """
+        result = np.empty((len(shingle_sets), self.num_perm), dtype=np.uint64)
+        for start in range(0, len(shingle_sets), BLOCK_SIZE):
+            block = shingle_sets[start:start + BLOCK_SIZE]
+            hashes = np.fromiter(
+                (zlib.crc32(s.encode('utf-8')) for shingle_set in block for s in shingle_set),
+                dtype=np.uint64
+            )
+            offsets = np.cumsum([0] + [len(shingle_set) for shingle_set in block[:-1]])
+            # (a * x + b) mod p for every permutation and shingle (the product wraps
+            # at 2 ** 64, as in datasketch), then the min per review
+            permuted = (np.outer(self._a, hashes) + self._b[:, None]) % _MERSENNE_PRIME
+            result[start:start + len(block)] = np.minimum.reduceat(permuted, offsets, axis=1).T
+        return result
+
+    def clusters(self, normalized_texts: Sequence[str]) -> List[Optional[int]]:
+        """
+        Cluster near-duplicate reviews
+
+        Args:
+            normalized_texts: Normalized review texts, in batch order
+
+        Returns:
+            List[Optional[int]]: Cluster id per review (1, 2, ... in order of each
+            cluster's first review), None for reviews without near-duplicates
+        """
+        # Identical texts are hashed once and always share a cluster
+        unique_index = {}
+        text_ids = [unique_index.setdefault(text, len(unique_index)) for text in normalized_texts]
+        sets = [shingles(text) for text in unique_index]
+        candidates = [i for i, shingle_set in enumerate(sets) if len(shingle_set) >= MIN_SHINGLES]
+        return self.signature_clusters(
+            text_ids, len(sets), candidates, self.signatures([sets[i] for i in candidates]),
+            similar=lambda a, b: jaccard(sets[a], sets[b]) >= self.threshold
+        )
+
+    def signature_clusters(
+        self,
+        text_ids: Sequence[int],
+        distinct: int,
+        candidates: Sequence[int],
+        signatures: np.ndarray,
+        similar: Optional[Callable[[int, int], bool]] = None
+    ) -> List[Optional[int]]:
+        """
+        Cluster near-duplicate reviews from the signatures of their distinct texts
+
+        Args:
+            text_ids: Distinct text id (0 .. distinct - 1) per review, in batch order
+            distinct: Number of distinct texts
+            candidates: Ids of the distinct texts with at least MIN_SHINGLES shingles
+            signatures: Signature per candidate (self.signatures, or its low 32 bits)
+            similar: Exact check of a pair of distinct text ids. Without it a pair
+                joins a cluster when its MinHash estimate meets the threshold
+
+        Returns:
+            List[Optional[int]]: As clusters
+        """
+        parent = list(range(distinct))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        candidates = np.asarray(candidates, dtype=np.int64)
+        if len(candidates) > 1:
+            rank = np.empty(len(candidates), dtype=np.int64)
+            rank[np.lexsort(signatures.T[::-1])] = np.arange(len(candidates))
+            pairs = []
+            for band in range(self.bands):
+                band_rows = np.ascontiguousarray(signatures[:, band * self.rows:(band + 1) * self.rows])
+                keys = band_rows.view(np.dtype((np.void, band_rows.dtype.itemsize * self.rows))).ravel()
+                left, right = bucket_pairs(keys, rank, self.window)
+                pairs.append(np.minimum(left, right) * len(candidates) + np.maximum(left, right))
+            pairs = np.unique(np.concatenate(pairs))
+            left, right = pairs // len(candidates), pairs % len(candidates)
+            # The share of equal signature values estimates the Jaccard similarity;
+            # only plausible pairs get the exact set comparison, most similar first
+            estimate = (signatures[left] == signatures[right]).mean(axis=1)
+            cutoff = self.threshold if similar is None else self.threshold - ESTIMATE_SLACK
+            plausible = np.flatnonzero(estimate >= cutoff)
+            plausible = plausible[np.argsort(-estimate[plausible], kind='stable')]
+            for a, b in zip(candidates[left[plausible]].tolist(), candidates[right[plausible]].tolist()):
+                root_a, root_b = find(a), find(b)
+                if root_a != root_b and (similar is None or similar(a, b)):
+                    parent[max(root_a, root_b)] = min(root_a, root_b)
+
+        roots = [find(text_id) for text_id in text_ids]
+        sizes = Counter(roots)
+        cluster_ids = {}
+        return [
+            cluster_ids.setdefault(root, len(cluster_ids) + 1) if sizes[root] > 1 else None
+            for root in roots
+        ]
+
+
+class StreamingSignatures:
+    """
+    MinHash signatures of the distinct texts of a review stream, clustered once it ends
+
+    Each distinct text costs one fixed-size signature (low 32 bits of each
+    value, 4 * num_perm bytes) instead of the text itself. Without the texts
+    pairs are judged on the signature estimate, so borderline pairs can
+    cluster differently than with MinHashLSH.clusters.
+    """
+
+    def __init__(self, index: MinHashLSH):
+        self.index = index
+        self.distinct = 0
+        self.candidates = []
+        self.blocks = []
+
+    def add(self, normalized_texts: Sequence[str]) -> None:
+        """Add texts not seen before; they get the next distinct text ids in order"""
+        sets = [shingles(text) for text in normalized_texts]
+        positions = [i for i, shingle_set in enumerate(sets) if len(shingle_set) >= MIN_SHINGLES]
+        self.candidates.extend(self.distinct + i for i in positions)
+        self.blocks.append(self.index.signatures([sets[i] for i in positions]).astype(np.uint32))
+        self.distinct += len(normalized_texts)
+
+    def clusters(self, text_ids: Sequence[int]) -> List[Optional[int]]:
+        """Cluster the stream's reviews by the distinct text id of each"""
+        signatures = np.concatenate(self.blocks) if self.blocks else np.empty((0, self.index.num_perm), dtype=np.uint32)
+        return self.index.signature_clusters(text_ids, self.distinct, self.candidates, signatures)
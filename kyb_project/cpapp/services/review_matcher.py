@@ -0,0 +1,101 @@
+"""
+Compiled keyword and marker matcher for review scoring.
+
+ReviewMatcher is built once per ReviewScorer and returns every feature hit of
+a review from a single call: generic phrases and negative keywords through one
+Aho-Corasick automaton (pyahocorasick when installed, otherwise a substring
+scan over the pre-lowered phrase list), and the specificity and emotional
+markers through precompiled patterns run on the already-lowercased text.
+"""
+
+import re
+from typing import FrozenSet, Iterable, NamedTuple
+
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - optional speedup
+    ahocorasick = None
+
+# Details that indicate an authentic review
+SPECIFICITY_PATTERNS = {
+    'dates': r'\b(?:on|in|at|during)\s+(?:january|february|march|april|may|june|july|august|september|october|november|december|monday|tuesday|wednesday|thursday|friday|saturday|sunday)\b',
+    'time_references': r'\b(?:morning|afternoon|evening|night|today|yesterday|last\s+week|last\s+month|last\s+year)\b',
+    'location_details': r'\b(?:room|office|building|floor|desk|chair|waiting\s+area|lobby|bathroom)\b',
+    'staff_references': r'\b(?:doctor|nurse|staff|receptionist|assistant|technician)\s+(?:\w+)\b',
+    'medical_terms': r'\b(?:procedure|treatment|surgery|appointment|consultation|check-up|test|diagnosis|prescription|medication)\b',
+    'specific_times': r'\b(?:\d+(?::\d+)?)\s*(?:am|pm|hour|minute|second)\b',
+    'cost_mentions': r'\$\d+(?:\.\d+)?|\d+\s+dollars',
+}
+
+# Emotional language and personal experience markers
+EMOTIONAL_PATTERNS = {
+    'first_person': r'\b(?:i|we|my|our)\b',
+    'experiential_verbs': r'\b(?:feel|felt|feeling|experienced|noticed|saw|heard|thought)\b',
+    'emotional_states': r'\b(?:happy|satisfied|pleased|impressed|disappointed|frustrated|angry|upset|worried|concerned)\b',
+    'gratitude': r'\b(?:thanks|thank\s+you|grateful|appreciate|appreciated|helped|recommend|recommended)\b',
+    'punctuation': r'[!?]',
+}
+
+
+class ReviewHits(NamedTuple):
+    """Feature hits for one review"""
+    text_lower: str
+    generic_phrases: FrozenSet[str]
+    negative_keywords: FrozenSet[str]
+
+
+class PhraseMatcher:
+    """Finds which of a fixed set of phrases occur (as substrings) in a text"""
+
+    def __init__(self, phrases: Iterable[str]):
+        self.phrases = tuple(dict.fromkeys(phrase.lower() for phrase in phrases))
+        self._automaton = None
+        if ahocorasick is not None and self.phrases:
+            automaton = ahocorasick.Automaton()
+            for phrase in self.phrases:
+                automaton.add_word(phrase, phrase)
+            automaton.make_automaton()
+            self._automaton = automaton
+
+    def find(self, text_lower: str) -> FrozenSet[str]:
+        """Return the phrases found in already-lowercased text"""
+        if self._automaton is not None:
+            return frozenset(phrase for _, phrase in self._automaton.iter(text_lower))
+        return frozenset(phrase for phrase in self.phrases if phrase in text_lower)
+
+
+class ReviewMatcher:
+    """All keyword, phrase and marker matching for ReviewScorer"""
+
+    def __init__(self, generic_phrases: Iterable[str], negative_keywords: Iterable[str]):
+        self.generic_phrases = frozenset(phrase.lower() for phrase in generic_phrases)
+        self.negative_keywords = frozenset(keyword.lower() for keyword in negative_keywords)
+        self.phrases = PhraseMatcher(list(generic_phrases) + list(negative_keywords))
+        self.specificity_patterns = {name: re.compile(p) for name, p in SPECIFICITY_PATTERNS.items()}
+        self.emotional_patterns = {name: re.compile(p) for name, p in EMOTIONAL_PATTERNS.items()}
+
+    def scan(self, text) -> ReviewHits:
+        """Lowercase a review once and collect its phrase and keyword hits"""
+        text_lower = str(text).lower() if text else ""
+        found = self.phrases.find(text_lower) if text_lower else frozenset()
+        return ReviewHits(
+            text_lower=text_lower,
+            generic_phrases=found & self.generic_phrases,
+            negative_keywords=found & self.negative_keywords,
+        )
+
+    def specificity_hits(self, text_lower: str) -> int:
+        """Number of specificity marker types present"""
+        return sum(1 for pattern in self.specificity_patterns.values() if pattern.search(text_lower))
+
+    def emotional_hits(self, text_lower: str) -> int:
+        """Number of emotional marker types present"""
+        return sum(1 for pattern in self.emotional_patterns.values() if pattern.search(text_lower))
+
+
+def marker_score(hits: int, weight: float = 0.15) -> float:
+    """Marker score as accumulated by the original scorer (repeated addition, capped at 1.0)"""
+    score = 0.0
+    for _ in range(hits):
+        score += weight
+    return min(score, 1.0)
@@ -0,0 +1,73 @@
+"""
+Batching of portfolio review checks into multi-query Outscraper requests.
+
+Outscraper's reviews endpoint takes a repeated query parameter, so one
+request can fetch the reviews of many places. batch_queries packs a
+portfolio's queries into as few requests as the query count and URL length
+limits allow, and split_by_query fans a combined response back out to the
+places found for each query.
+"""
+
+from typing import Any, Dict, Iterable, List
+from urllib.parse import quote_plus
+
+
+def batch_queries(queries: Iterable[str], max_queries: int = 250, max_bytes: int = 6000) -> List[List[str]]:
+    """
+    Split queries into request batches, dropping blanks and repeats
+
+    Args:
+        queries: Search queries or place ids, in portfolio order
+        max_queries: Queries per request
+        max_bytes: URL-encoded size of a request's query parameters; a
+            single query longer than this gets a batch of its own
+
+    Returns:
+        List of batches, in portfolio order
+    """
+    batches = []
+    batch, size = [], 0
+    for query in dict.fromkeys(query.strip() for query in queries if query and query.strip()):
+        query_bytes = len('&query=') + len(quote_plus(query))
+        if batch and (len(batch) >= max_queries or size + query_bytes > max_bytes):
+            batches.append(batch)
+            batch, size = [], 0
+        batch.append(query)
+        size += query_bytes
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def split_by_query(queries: List[str], places_data: List[Any]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Places of a multi-query response, per query
+
+    Results nested per query (a list per query) are matched by position.
+    Flat place results are matched by the query Outscraper echoes on each
+    place, or by position when every query returned exactly one place.
+
+    Args:
+        queries: The queries of the request, in request order
+        places_data: The "data" list of the Outscraper response
+
+    Returns:
+        Dict of query -> its places (empty for queries with no result)
+    """
+    by_query = {query: [] for query in queries}
+    places_data = places_data or []
+    if places_data and all(isinstance(item, list) for item in places_data):
+        for query, places in zip(queries, places_data):
+            by_query[query].extend(place for place in places if isinstance(place, dict))
+        return by_query
+
+    places = [place for place in places_data if isinstance(place, dict)]
+    if places and all(place.get('query') in by_query for place in places):
+        for place in places:
+            by_query[place['query']].append(place)
+    elif len(places) == len(queries):
+        for query, place in zip(queries, places):
+            by_query[query].append(place)
+    elif len(queries) == 1:
+        by_query[queries[0]].extend(places)
+    return by_query
@@ -0,0 +1,88 @@
+"""
+Projection and cursor pagination of scored-review API responses.
+
+A scored-review response carries batch aggregates plus the scored_reviews
+list. shape_review_response reduces it to what the client asked for: only
+the aggregates (summary_only), only some review fields (fields), and/or one
+page of reviews starting at an opaque cursor (page_size, cursor).
+"""
+
+import base64
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def parse_fields(value: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """Review fields from a comma-separated list; None (every field) when empty"""
+    if not value:
+        return None
+    fields = tuple(dict.fromkeys(field.strip() for field in value.split(',') if field.strip()))
+    return fields or None
+
+
+def encode_cursor(offset: int) -> str:
+    """Opaque cursor for the page starting at review `offset`"""
+    return base64.urlsafe_b64encode(f"o:{offset}".encode('ascii')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> int:
+    """
+    Offset of a cursor made by encode_cursor
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        decoded = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode('ascii')
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError("Invalid cursor")
+    prefix, _, offset = decoded.partition(':')
+    if prefix != 'o' or not offset.isdigit():
+        raise ValueError("Invalid cursor")
+    return int(offset)
+
+
+def shape_review_response(
+    result: Dict[str, Any],
+    fields: Optional[Sequence[str]] = None,
+    page_size: Optional[int] = None,
+    cursor: Optional[str] = None,
+    summary_only: bool = False
+) -> Dict[str, Any]:
+    """
+    Apply the response options to a scored-review response
+
+    Args:
+        result (Dict): Response with a scored_reviews list (other keys are kept)
+        fields (List[str]): Review fields to return (all by default)
+        page_size (int): Reviews per page; pagination is on when this or cursor is given
+        cursor (str): next_cursor of the previous page
+        summary_only (bool): Drop scored_reviews and return only the aggregates
+
+    Returns:
+        Dict: The shaped response; paginated responses add next_cursor
+        (None on the last page)
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    if 'scored_reviews' not in result:
+        return result
+    shaped = {key: value for key, value in result.items() if key != 'scored_reviews'}
+    if summary_only:
+        return shaped
+
+    reviews = result['scored_reviews'] or []
+    if page_size is not None or cursor:
+        start = decode_cursor(cursor) if cursor else 0
+        size = min(page_size or DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE)
+        end = start + size
+        shaped['next_cursor'] = encode_cursor(end) if end < len(reviews) else None
+        reviews = reviews[start:end]
+
+    if fields is not None:
+        reviews = [{field: review[field] for field in fields if field in review} for review in reviews]
+    shaped['scored_reviews'] = reviews
+    return shaped
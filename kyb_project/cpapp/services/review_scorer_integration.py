@@ -1,7 +1,9 @@
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, List, Any, Optional, Sequence, Tuple, Union
 import logging
-from .Google_review_out_scraper import OutscraperMapsReviewsAPI
-from .review_scoring_system import ReviewScorer
+import threading
+from .Google_review_out_scraper import ByteBudgetExceeded, get_outscraper_client
+from .review_portfolio import batch_queries, split_by_query
+from .review_scoring_system import get_review_scorer
 
 # Initialize logging
 logger = logging.getLogger(__name__)
@@ -12,32 +14,40 @@ class ReviewAnalysisService:
     analyze their authenticity using the ReviewScorer
     """
     
-    def __init__(self, api_key: str):
+    # Batches at least this large are scored through the columnar path
+    COLUMNAR_MIN_REVIEWS = 500
+    
+    def __init__(self, api_key: str, tokenizer: Optional[str] = None):
         """
         Initialize the ReviewAnalysisService
         
         Args:
             api_key: Outscraper API key
+            tokenizer: ReviewScorer tokenizer mode ('nltk' or 'fast')
         """
         self.api_key = api_key
-        self.outscraper_client = OutscraperMapsReviewsAPI(api_key)
-        self.review_scorer = ReviewScorer()
+        self.outscraper_client = get_outscraper_client(api_key)
+        # Stateless, so every service instance shares the process-wide scorer
+        self.review_scorer = get_review_scorer(tokenizer)
         
     def fetch_reviews(self, 
-                     query: str,
+                     query: Union[str, List[str]],
                      reviews_limit: int = 100,
                      sort: str = "most_relevant",
                      language: str = "en",
-                     async_request: bool = True) -> Dict[str, Any]:
+                     async_request: bool = True,
+                     webhook: Optional[str] = None) -> Dict[str, Any]:
         """
         Fetch reviews from Outscraper API
         
         Args:
-            query: Search query for Google Maps place
-            reviews_limit: Maximum number of reviews to fetch
+            query: Search query for Google Maps place, or a list of queries
+                fetched in one request
+            reviews_limit: Maximum number of reviews to fetch per place
             sort: Sort method for reviews
             language: Language code for reviews
             async_request: Whether to use async processing
+            webhook: URL Outscraper calls when an async request finishes
             
         Returns:
             Dictionary with response from Outscraper API
@@ -49,7 +59,8 @@ class ReviewAnalysisService:
                 reviews_limit=reviews_limit,
                 sort=sort,
                 language=language,
-                async_request=async_request
+                async_request=async_request,
+                webhook=webhook
             )
             return response
         except Exception as e:
@@ -74,30 +85,114 @@ class ReviewAnalysisService:
             logger.error(f"Error getting review results: {e}")
             raise
     
-    def score_reviews(self, reviews_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    @staticmethod
+    def collect_reviews(places_data: List[Dict[str, Any]], default_place: str = "") -> Tuple[List[Dict[str, Any]], List[str]]:
+        """
+        Flatten the reviews of Outscraper place results
+        
+        Args:
+            places_data: The "data" list of an Outscraper response
+            default_place: Place id for results without place_id/google_id
+            
+        Returns:
+            Reviews and the place id of each review
+        """
+        reviews_data = []
+        place_ids = []
+        for place_data in places_data:
+            if "reviews_data" in place_data and place_data["reviews_data"]:
+                place_id = str(place_data.get("place_id") or place_data.get("google_id") or default_place)
+                reviews_data.extend(place_data["reviews_data"])
+                place_ids.extend([place_id] * len(place_data["reviews_data"]))
+        return reviews_data, place_ids
+    
+    def score_reviews(self,
+                      reviews_data: List[Dict[str, Any]],
+                      place_ids: Optional[List[str]] = None,
+                      fields: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
         """
         Score reviews using the ReviewScorer
         
         Args:
             reviews_data: List of review data from Outscraper API
+            place_ids: Place id of each review; when given, reviews are checked
+                against (and added to) the cross-place fingerprint index
+            fields: Review fields copied into the scored reviews (all by default)
             
         Returns:
             List of scored reviews with authenticity scores
         """
         try:
             logger.info(f"Scoring {len(reviews_data)} reviews")
-            scored_reviews = self.review_scorer.score_reviews(reviews_data)
+            if len(reviews_data) >= self.COLUMNAR_MIN_REVIEWS:
+                scored_reviews = self.review_scorer.score_reviews_columnar(reviews_data, fields)
+            else:
+                scored_reviews = self.review_scorer.score_reviews(reviews_data, fields)
+            if place_ids is not None:
+                self.check_other_places(scored_reviews, place_ids, reviews_data)
             return scored_reviews
         except Exception as e:
             logger.error(f"Error scoring reviews: {e}")
             raise
     
+    def check_other_places(self,
+                           scored_reviews: List[Dict[str, Any]],
+                           place_ids: List[str],
+                           reviews_data: Optional[List[Dict[str, Any]]] = None):
+        """
+        Add scoring_factors['seen_at_other_places'] from the persistent fingerprint index
+        
+        Texts and ids are read from reviews_data (the unprojected reviews) when
+        given, else from the scored reviews. Fingerprint storage problems are
+        logged and leave the scores untouched.
+        """
+        sources = scored_reviews if reviews_data is None else reviews_data
+        from django.conf import settings
+        from django.db import transaction
+        from .review_fingerprints import get_fingerprint_index
+        
+        if not getattr(settings, 'REVIEW_FINGERPRINTS_ENABLED', True):
+            return
+        by_place = {}
+        for position, place_id in enumerate(place_ids):
+            by_place.setdefault(place_id, []).append(position)
+        try:
+            # A savepoint, so a storage error leaves an enclosing transaction usable
+            with transaction.atomic():
+                index = get_fingerprint_index()
+                for place_id, positions in by_place.items():
+                    reviews = [sources[i] for i in positions]
+                    normalized = [self.review_scorer._normalize_text(review.get('review_text', '')) for review in reviews]
+                    for position, count in zip(positions, index.check_and_record(place_id, reviews, normalized)):
+                        scored_reviews[position].setdefault('scoring_factors', {})['seen_at_other_places'] = count
+        except Exception as e:
+            logger.warning(f"Review fingerprint check failed: {str(e)}")
+    
+    @staticmethod
+    def summarize(scored_reviews: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Batch statistics reported alongside scored reviews"""
+        total_reviews = len(scored_reviews)
+        genuine_reviews = sum(1 for r in scored_reviews if r['review_score'] > 0)
+        avg_score = sum(r['review_score'] for r in scored_reviews) / total_reviews if total_reviews > 0 else 0
+        return {
+            "total_reviews": total_reviews,
+            "genuine_reviews": genuine_reviews,
+            "fake_reviews": total_reviews - genuine_reviews,
+            "average_score": round(avg_score, 2),
+            "reviews_seen_at_other_places": sum(
+                1 for r in scored_reviews if r.get('scoring_factors', {}).get('seen_at_other_places')
+            ),
+        }
+    
     def process_reviews(self, 
                        query: str,
                        reviews_limit: int = 100,
                        sort: str = "most_relevant",
                        language: str = "en",
-                       async_request: bool = True) -> Dict[str, Any]:
+                       async_request: bool = True,
+                       incremental: bool = False,
+                       webhook: Optional[str] = None,
+                       fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
         """
         Complete process to fetch and score reviews
         
@@ -107,17 +202,25 @@ class ReviewAnalysisService:
             sort: Sort method for reviews
             language: Language code for reviews
             async_request: Whether to use async processing
+            incremental: Use the persistent review store: fetch and score only
+                reviews newer than the stored ones (always synchronous)
+            webhook: URL Outscraper calls when an async request finishes
+            fields: Review fields copied into the scored reviews (all by default)
             
         Returns:
             Dictionary with fetched and scored reviews
         """
+        if incremental:
+            return self.refresh_place_reviews(query, reviews_limit=reviews_limit, sort=sort, language=language)
+        
         # Step 1: Fetch reviews from Outscraper
         fetch_response = self.fetch_reviews(
             query=query,
             reviews_limit=reviews_limit,
             sort=sort,
             language=language,
-            async_request=async_request
+            async_request=async_request,
+            webhook=webhook
         )
         
         # Step 2: Handle async vs sync response
@@ -131,28 +234,17 @@ class ReviewAnalysisService:
         
         # Step 3: For sync requests or completed async, get reviews
         if "data" in fetch_response and fetch_response["data"]:
-            reviews_data = []
-            for place_data in fetch_response["data"]:
-                if "reviews_data" in place_data and place_data["reviews_data"]:
-                    reviews_data.extend(place_data["reviews_data"])
+            reviews_data, place_ids = self.collect_reviews(fetch_response["data"], default_place=query)
             
             # Step 4: Score the reviews
             if reviews_data:
-                scored_reviews = self.score_reviews(reviews_data)
+                scored_reviews = self.score_reviews(reviews_data, place_ids, fields)
                 
                 # Step 5: Calculate overall statistics
-                total_reviews = len(scored_reviews)
-                genuine_reviews = sum(1 for r in scored_reviews if r['review_score'] > 0)
-                fake_reviews = total_reviews - genuine_reviews
-                avg_score = sum(r['review_score'] for r in scored_reviews) / total_reviews if total_reviews > 0 else 0
-                
                 return {
                     "status": "completed",
                     "query": query,
-                    "total_reviews": total_reviews,
-                    "genuine_reviews": genuine_reviews,
-                    "fake_reviews": fake_reviews,
-                    "average_score": round(avg_score, 2),
+                    **self.summarize(scored_reviews),
                     "scored_reviews": scored_reviews
                 }
             else:
@@ -168,3 +260,248 @@ class ReviewAnalysisService:
             "message": "Failed to retrieve reviews.",
             "response": fetch_response
         }
+    
+    def score_all_reviews(self,
+                          query: str,
+                          max_reviews: Optional[int] = None,
+                          page_size: int = 100,
+                          sort: str = "most_relevant",
+                          language: str = "en",
+                          max_bytes: Optional[int] = None,
+                          cancel: Optional[threading.Event] = None) -> Dict[str, Any]:
+        """
+        Score every review of a place, beyond a single request's reviews_limit
+        
+        Pages from the paginating fetcher are scored as they arrive
+        (score_reviews_iter) and only each review's final score is kept, so
+        memory stays proportional to one page. A fetch stopped by the byte
+        budget or cancel is scored up to its last full page and reported as
+        incomplete. Reviews are not checked against other places.
+        
+        Args:
+            query: Search query or place id
+            max_reviews: Maximum number of reviews (None = all)
+            page_size: Reviews per Outscraper request
+            sort: Sort method for reviews
+            language: Language code for reviews
+            max_bytes: Budget for the Outscraper response bytes
+            cancel: Event that stops the fetch once set
+            
+        Returns:
+            Dictionary with the place and the aggregates of its scored reviews
+        """
+        fetch = {"place": {}, "pages": 0, "bytes_read": 0, "budget_exceeded": False}
+        
+        def pages():
+            try:
+                for page in self.outscraper_client.iter_reviews(
+                    query, max_reviews=max_reviews, page_size=page_size, sort=sort,
+                    language=language, max_bytes=max_bytes, cancel=cancel
+                ):
+                    fetch.update(place=fetch["place"] or page.place, pages=page.number, bytes_read=page.bytes_read)
+                    yield page.reviews
+            except ByteBudgetExceeded as e:
+                logger.warning(f"Stopped fetching reviews for {query}: {e}")
+                fetch["budget_exceeded"] = True
+        
+        scores = []
+        for event in self.review_scorer.score_reviews_iter(pages()):
+            if event["event"] == "page":
+                scores.extend(review["review_score"] for review in event["reviews"])
+            else:
+                for index, final in event["corrections"].items():
+                    scores[index] = final["review_score"]
+        
+        place = fetch["place"]
+        return {
+            "status": "completed",
+            "query": query,
+            "place_id": place.get("place_id") or place.get("google_id"),
+            "name": place.get("name"),
+            "pages": fetch["pages"],
+            "bytes_read": fetch["bytes_read"],
+            "complete": not fetch["budget_exceeded"] and not (cancel is not None and cancel.is_set()),
+            **self.summarize([{"review_score": score} for score in scores])
+        }
+    
+    def score_portfolio(self, queries: List[str], places_data: List[Any]) -> Dict[str, Any]:
+        """
+        Score a multi-query Outscraper response per query
+        
+        Each query's places are scored as one batch, as process_reviews scores
+        a single query, and only the aggregates are kept.
+        
+        Args:
+            queries: The queries of the request, in request order
+            places_data: The "data" list of the Outscraper response
+            
+        Returns:
+            Dictionary with the aggregates of each query, in query order
+        """
+        places = []
+        for query, query_places in split_by_query(queries, places_data).items():
+            reviews_data, place_ids = self.collect_reviews(query_places, default_place=query)
+            scored_reviews = self.score_reviews(reviews_data, place_ids, fields=()) if reviews_data else []
+            places.append({
+                "query": query,
+                "status": "completed" if query_places else "not_found",
+                "place_ids": list(dict.fromkeys(
+                    str(place.get("place_id") or place.get("google_id") or query) for place in query_places
+                )),
+                "name": query_places[0].get("name") if query_places else None,
+                **self.summarize(scored_reviews)
+            })
+        return {"places": places}
+    
+    def process_portfolio(self,
+                          queries: List[str],
+                          reviews_limit: int = 20,
+                          sort: str = "most_relevant",
+                          language: str = "en",
+                          async_request: bool = True,
+                          webhook: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Fetch and score the reviews of many places in as few requests as possible
+        
+        Queries are packed into multi-query Outscraper requests (see
+        batch_queries). Synchronous batches are scored per query right away;
+        each asynchronous batch is returned with its request id, and its
+        scored result is the per-query aggregates of score_portfolio. A batch
+        that fails reports an error for each of its queries.
+        
+        Args:
+            queries: Search queries or place ids
+            reviews_limit: Maximum number of reviews to fetch per place
+            sort: Sort method for reviews
+            language: Language code for reviews
+            async_request: Whether to use async processing
+            webhook: URL Outscraper calls when an async request finishes
+            
+        Returns:
+            Dictionary with the per-place aggregates of finished batches and
+            the request id and queries of pending batches
+        """
+        from django.conf import settings
+        
+        batches = batch_queries(
+            queries,
+            max_queries=getattr(settings, 'OUTSCRAPER_BATCH_QUERIES', 250),
+            max_bytes=getattr(settings, 'OUTSCRAPER_BATCH_QUERY_BYTES', 6000)
+        )
+        logger.info(f"Fetching reviews for {sum(map(len, batches))} places in {len(batches)} requests")
+        
+        places = []
+        pending = []
+        for batch in batches:
+            try:
+                fetch_response = self.fetch_reviews(
+                    query=batch,
+                    reviews_limit=reviews_limit,
+                    sort=sort,
+                    language=language,
+                    async_request=async_request,
+                    webhook=webhook
+                )
+                if async_request and fetch_response.get("status") == "pending":
+                    pending.append({"request_id": fetch_response.get("request_id"), "queries": batch})
+                    continue
+                if "data" in fetch_response:
+                    places.extend(self.score_portfolio(batch, fetch_response["data"] or [])["places"])
+                    continue
+                error = fetch_response.get("error", "Failed to retrieve reviews.")
+            except Exception as e:
+                logger.error(f"Error processing portfolio batch of {len(batch)} queries: {e}")
+                error = str(e)
+            places.extend({"query": query, "status": "error", "error": str(error)} for query in batch)
+        
+        result = {
+            "status": "pending" if pending else "completed",
+            "total_places": sum(map(len, batches)),
+            "requests": len(batches),
+            "places": places
+        }
+        if pending:
+            result["batches"] = pending
+            result["message"] = "Review fetching in progress. Check each batch's status using its request ID."
+        return result
+    
+    def refresh_place_reviews(self,
+                              query: str,
+                              reviews_limit: int = 100,
+                              sort: str = "most_relevant",
+                              language: str = "en") -> Dict[str, Any]:
+        """
+        Fetch and score only the reviews posted since a place was last checked
+        
+        A place seen before is refetched by place id with sort="newest" and
+        cutoff set to its watermark (newest stored review), without a reviews
+        limit. The new reviews are scored against the stored batch statistics
+        and added to the stored aggregates. An unknown place is fetched with
+        reviews_limit and sort as in process_reviews, and stored.
+        
+        Args:
+            query: Search query or place id
+            reviews_limit: Maximum number of reviews on the first fetch
+            sort: Sort method on the first fetch
+            language: Language code for reviews
+            
+        Returns:
+            Dictionary with the place's stored scored reviews and aggregates
+        """
+        from .review_store import ReviewStore
+        
+        store = ReviewStore(self.review_scorer)
+        known = store.find_place(query)
+        if known is not None and known.last_review_timestamp:
+            logger.info(f"Refreshing reviews of {known.place_id} newer than {known.last_review_timestamp}")
+            fetch_response = self.outscraper_client.get_reviews(
+                query=known.place_id,
+                reviews_limit=0,
+                sort="newest",
+                cutoff=known.last_review_timestamp,
+                language=language,
+                async_request=False
+            )
+        else:
+            fetch_response = self.fetch_reviews(
+                query=query,
+                reviews_limit=reviews_limit,
+                sort=sort,
+                language=language,
+                async_request=False
+            )
+        
+        if "data" not in fetch_response:
+            return {
+                "status": "error",
+                "message": "Failed to retrieve reviews.",
+                "response": fetch_response
+            }
+        
+        places = []
+        new_reviews = 0
+        for place_data in fetch_response["data"] or []:
+            place_id = str(place_data.get("place_id") or place_data.get("google_id") or (known.place_id if known else query))
+            
+            def score(reviews, context, previous_texts, any_recent, place_id=place_id):
+                scored_reviews = self.review_scorer.score_new_reviews(
+                    reviews, context, previous_texts, any_recent=any_recent
+                )
+                self.check_other_places(scored_reviews, [place_id] * len(scored_reviews))
+                return scored_reviews
+            
+            place, scored_reviews = store.refresh(
+                place_data, place_id, query, place_data.get("reviews_data") or [], score
+            )
+            places.append(place)
+            new_reviews += len(scored_reviews)
+        
+        logger.info(f"Stored {new_reviews} new reviews for {len(places)} places")
+        return {
+            "status": "completed",
+            "query": query,
+            "incremental": True,
+            "new_reviews": new_reviews,
+            **store.summarize(places),
+            "scored_reviews": [review for place in places for review in store.stored_reviews(place)]
+        }
@@ -1,32 +1,158 @@
+import hashlib
+import os
 import re
-from typing import Dict, List, Any, Union, Optional
+import threading
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Any, NamedTuple, Sequence, Union, Optional
 from datetime import datetime, timedelta
-import nltk
-from nltk.tokenize import word_tokenize
-from nltk.corpus import stopwords
 from collections import Counter
 import logging
 
-# Initialize logging
-logging.basicConfig(level=logging.INFO)
+from .review_matcher import ReviewHits, ReviewMatcher, marker_score
+from .stopwords import ENGLISH_STOPWORDS
+
 logger = logging.getLogger(__name__)
 
-try:
-    nltk.data.find('tokenizers/punkt')
-    nltk.data.find('tokenizers/punkt_tab')
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    logger.info("Downloading NLTK resources...")
-    nltk.download('punkt')
-    nltk.download('punkt_tab')
-    nltk.download('stopwords')
-
-# Adding this fix for punkt_tab resource issue
-try:
-    nltk.data.find('tokenizers/punkt/english.pickle')
-except LookupError:
-    logger.info("Downloading additional NLTK resources...")
-    nltk.download('punkt')
+# NLTK is imported and its tokenizer data located on first use, not at import
+_nltk_tokenize = None
+_nltk_error = None
+_nltk_lock = threading.Lock()
+
+
+def _load_nltk_tokenizer():
+    """
+    Import NLTK and locate the punkt tokenizer data once per process.
+    
+    Missing data is downloaded only when NLTK_AUTO_DOWNLOAD is set to true;
+    by default word_tokenize falls back to the regex tokenizer until
+    download_nltk_resources.py has been run.
+    
+    Raises:
+        LookupError: If the tokenizer data is not available
+    """
+    global _nltk_tokenize, _nltk_error
+    if _nltk_tokenize is not None:
+        return _nltk_tokenize
+    if _nltk_error is not None:
+        raise LookupError(_nltk_error)
+    
+    with _nltk_lock:
+        if _nltk_tokenize is None and _nltk_error is None:
+            import nltk
+            from nltk.tokenize import word_tokenize
+            
+            try:
+                nltk.data.find('tokenizers/punkt_tab')
+            except LookupError:
+                if os.getenv('NLTK_AUTO_DOWNLOAD', 'false').lower() in ('1', 'true', 'yes'):
+                    logger.info("Downloading NLTK tokenizer resources...")
+                    nltk.download('punkt', quiet=True)
+                    nltk.download('punkt_tab', quiet=True)
+                try:
+                    nltk.data.find('tokenizers/punkt_tab')
+                except LookupError:
+                    _nltk_error = "NLTK punkt_tab tokenizer data is not installed"
+                    logger.warning(f"{_nltk_error}, review tokenization will use the fallback method")
+            if _nltk_error is None:
+                _nltk_tokenize = word_tokenize
+    
+    if _nltk_error is not None:
+        raise LookupError(_nltk_error)
+    return _nltk_tokenize
+
+
+def word_tokenize(text: str) -> List[str]:
+    """Tokenize with NLTK's word_tokenize, loading NLTK on first use (fast_word_tokenize without its data)"""
+    try:
+        tokenize = _load_nltk_tokenizer()
+    except LookupError:
+        return fast_word_tokenize(text)
+    return tokenize(text)
+
+
+# Word runs, keeping hyphenated compounds together as NLTK does ("check-up").
+# Apostrophes split words ("don't" -> "don", "t"), so contraction halves land
+# in the stopword list or fail isalpha() much like NLTK's "do", "n't".
+FAST_WORD_PATTERN = re.compile(r"\w+(?:-\w+)*")
+
+TOKENIZERS = ('nltk', 'fast')
+
+# Documented agreement of the fast tokenizer with NLTK on the fixture corpus
+# (cpapp/tests/fixtures/review_corpus.json): per-review content quality may
+# differ by at most FAST_TOKENIZER_MAX_QUALITY_DIFF and by
+# FAST_TOKENIZER_MEAN_QUALITY_DIFF on average.
+FAST_TOKENIZER_MAX_QUALITY_DIFF = 0.05
+FAST_TOKENIZER_MEAN_QUALITY_DIFF = 0.01
+
+# Batches smaller than this are not worth starting a process pool for
+PARALLEL_MIN_REVIEWS = 2000
+
+
+def fast_word_tokenize(text: str) -> List[str]:
+    """Tokenize with a precompiled regex word splitter (no NLTK)"""
+    return FAST_WORD_PATTERN.findall(text)
+
+
+class ReviewBatchContext:
+    """
+    Per-call state of one scoring batch.
+    
+    Keeping batch state here rather than on ReviewScorer lets one scorer be
+    shared between threads and requests.
+    """
+    
+    def __init__(self, total_reviews: int = 0, negative_keyword_prevalence: Optional[Counter] = None):
+        """
+        Args:
+            total_reviews: Number of reviews in the batch
+            negative_keyword_prevalence: Reviews in the batch containing each negative keyword
+        """
+        self.seen_reviews = Counter()
+        self.total_reviews = total_reviews
+        self.negative_keyword_prevalence = negative_keyword_prevalence if negative_keyword_prevalence is not None else Counter()
+    
+    def count_seen(self, normalized_text: str) -> bool:
+        """Count a normalized review text; True if it was already seen in this batch"""
+        self.seen_reviews[normalized_text] += 1
+        return self.seen_reviews[normalized_text] > 1
+
+
+class ReviewFeatures(NamedTuple):
+    """Features of one review that do not depend on the rest of its batch"""
+    normalized_text: str
+    generic_score: float
+    negative_keywords: FrozenSet[str]
+    is_recent: bool
+    content_quality: float
+
+
+class StreamedReview(NamedTuple):
+    """What score_reviews_iter keeps of an emitted review to reconcile it later"""
+    text_id: int
+    generic_score: float
+    negative_keywords: FrozenSet[str]
+    is_recent: bool
+    content_quality: float
+    is_duplicate: bool
+    provisional_negative_score: float
+    provisional_any_recent: bool
+
+
+def project_review(review_data: Dict[str, Any], fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    """Shallow copy of a review dict, limited to `fields` when given"""
+    if fields is None:
+        return review_data.copy()
+    return {field: review_data[field] for field in fields if field in review_data}
+
+
+def near_duplicate_flags(clusters: List[Optional[int]]) -> List[bool]:
+    """True for every review of a near-duplicate cluster after the cluster's first review"""
+    seen = set()
+    flags = []
+    for cluster in clusters:
+        flags.append(cluster is not None and cluster in seen)
+        seen.add(cluster)
+    return flags
+
 
 class ReviewScorer:
     """
@@ -37,8 +163,23 @@ class ReviewScorer:
     - Genuine (positive score: 1 to 10)
     """
     
-    def __init__(self):
-        """Initialize the ReviewScorer with necessary parameters and dictionaries."""
+    def __init__(self, tokenizer: Optional[str] = None, near_duplicate_threshold: Optional[float] = 0.7):
+        """
+        Initialize the ReviewScorer with necessary parameters and dictionaries.
+        
+        Args:
+            tokenizer: 'nltk' (NLTK word_tokenize) or 'fast' (regex word splitter,
+                scores within FAST_TOKENIZER_MAX_QUALITY_DIFF of NLTK); defaults
+                to the REVIEW_TOKENIZER environment variable, then 'nltk'
+            near_duplicate_threshold: Shingle similarity (review_lsh.shingles) at which reviews in a
+                batch are clustered as near-duplicates (None disables clustering)
+        """
+        tokenizer = tokenizer or os.getenv('REVIEW_TOKENIZER', 'nltk')
+        if tokenizer not in TOKENIZERS:
+            raise ValueError(f"Unknown tokenizer '{tokenizer}', expected one of {TOKENIZERS}")
+        self.tokenizer = tokenizer
+        self._tokenize = fast_word_tokenize if tokenizer == 'fast' else word_tokenize
+        
         # Negative keywords that indicate a bad review
         self.negative_keywords = [
             'fraud', 'scam', 'cheat', 'cheater', 'bad doctor', 'terrible', 'worst', 
@@ -57,45 +198,64 @@ class ReviewScorer:
             'excellent doctor', 'excellent treatment', 'very helpful'
         ]
         
-        # Get English stopwords
-        self.stop_words = set(stopwords.words('english'))
+        # Compiled matcher for phrases, keywords and content markers
+        self.matcher = ReviewMatcher(self.generic_phrases, self.negative_keywords)
+        
+        # English stopwords (vendored, so construction never touches NLTK data)
+        self.stop_words = ENGLISH_STOPWORDS
         
         # Threshold for review recency (in months)
         self.recency_threshold = 6
         
-        # Track seen review texts for duplicate detection
-        self.seen_reviews = Counter()
-        self.total_reviews = 0
-        self.negative_keyword_prevalence = {}
+        # MinHash LSH index for near-duplicate clusters, built on first use
+        # (it is deterministic, so threads racing to build it build the same index)
+        self.near_duplicate_threshold = near_duplicate_threshold
+        self._near_duplicate_index = None
         
-    def detect_duplicates(self, review_text: str) -> bool:
+        # Batch state (seen texts, keyword prevalence) lives in ReviewBatchContext,
+        # so the scorer itself is never mutated while scoring
+        
+    def detect_duplicates(self, review_text: str, context: Optional[ReviewBatchContext] = None) -> bool:
         """Check if a review text appears multiple times, indicating potential fake reviews."""
-        # Normalize text for comparison
-        normalized_text = self._normalize_text(review_text)
+        if context is None:
+            # A review scored on its own has nothing to duplicate
+            return False
         
-        # Count this review
-        self.seen_reviews[normalized_text] += 1
+        # Count the normalized text; seen before in this batch means it might be fake
+        return context.count_seen(self._normalize_text(review_text))
+    
+    def near_duplicate_clusters(self, normalized_texts: List[str]) -> List[Optional[int]]:
+        """
+        Cluster lightly edited copies of the same review within a batch.
         
-        # If we've seen this review more than once, it might be fake
-        return self.seen_reviews[normalized_text] > 1
+        Args:
+            normalized_texts: Review texts normalized with _normalize_text, in batch order
+        
+        Returns:
+            Cluster id per review (None for reviews without near-duplicates)
+        """
+        if self.near_duplicate_threshold is None or not normalized_texts:
+            return [None] * len(normalized_texts)
+        return self._near_duplicate_lsh().clusters(normalized_texts)
     
-    def is_generic(self, review_text: str) -> float:
+    def _near_duplicate_lsh(self):
+        """The MinHash LSH index of near_duplicate_clusters"""
+        if self._near_duplicate_index is None:
+            # numpy is imported on first use to keep this module cheap to import
+            from .review_lsh import MinHashLSH
+            self._near_duplicate_index = MinHashLSH(threshold=self.near_duplicate_threshold)
+        return self._near_duplicate_index
+    
+    def is_generic(self, review_text: str, hits: Optional[ReviewHits] = None) -> float:
         """
         Determine how generic a review is based on phrase matching.
         Returns a score from 0.0 (not generic) to 1.0 (completely generic).
         """
         if not review_text:
             return 1.0  # Empty reviews are considered generic
-            
-        # Ensure review_text is a string
-        review_text = str(review_text) if review_text is not None else ""
-        review_lower = review_text.lower()
-        generic_count = 0
         
-        # Check for generic phrases
-        for phrase in self.generic_phrases:
-            if phrase.lower() in review_lower:
-                generic_count += 1
+        hits = hits or self.matcher.scan(review_text)
+        generic_count = len(hits.generic_phrases)
                 
         # Calculate generic score
         if generic_count == 0:
@@ -103,26 +263,31 @@ class ReviewScorer:
         
         return min(generic_count / 5, 1.0)  # Cap at 1.0, consider 5+ matches as fully generic
     
-    def has_negative_keywords(self, review_text: str) -> float:
+    def has_negative_keywords(
+        self,
+        review_text: str,
+        hits: Optional[ReviewHits] = None,
+        context: Optional[ReviewBatchContext] = None
+    ) -> float:
         """
         Check if the review contains negative keywords.
         Returns a score from 0.0 (no negative keywords) to 1.0 (many negative keywords).
         """
         if not review_text:
             return 0.0
-            
-        # Ensure review_text is a string
-        review_text = str(review_text) if review_text is not None else ""
-        review_lower = review_text.lower()
-        negative_count = 0
-        common_found = False
+        
+        hits = hits or self.matcher.scan(review_text)
+        return self.negative_keyword_score(hits.negative_keywords, context)
+    
+    def negative_keyword_score(self, negative_keywords: FrozenSet[str], context: Optional[ReviewBatchContext] = None) -> float:
+        """Negative keyword score of the keywords found in one review"""
+        negative_count = len(negative_keywords)
 
-        # Check for negative keywords and determine prevalence-based penalty
-        for keyword in self.negative_keywords:
-            if keyword.lower() in review_lower:
-                negative_count += 1
-                if self.total_reviews and self.negative_keyword_prevalence.get(keyword, 0) / self.total_reviews >= 0.25:
-                    common_found = True
+        # A keyword found in at least a quarter of the batch is a full penalty
+        common_found = context is not None and bool(context.total_reviews) and any(
+            context.negative_keyword_prevalence.get(keyword, 0) / context.total_reviews >= 0.25
+            for keyword in negative_keywords
+        )
 
         if common_found:
             return 1.0
@@ -156,7 +321,7 @@ class ReviewScorer:
         
         return review_date >= cutoff_date
     
-    def analyze_content_quality(self, review_text: str) -> float:
+    def analyze_content_quality(self, review_text: str, hits: Optional[ReviewHits] = None) -> float:
         """
         Analyze the quality of the review content.
         Returns a score from 0.0 (poor quality) to 1.0 (high quality).
@@ -166,10 +331,11 @@ class ReviewScorer:
         
         # Ensure review_text is a string
         review_text = str(review_text) if review_text is not None else ""
+        review_text_lower = hits.text_lower if hits else review_text.lower()
             
         try:
             # Tokenize the review
-            words = word_tokenize(review_text.lower())
+            words = self._tokenize(review_text_lower)
             
             # Remove stopwords
             meaningful_words = [word for word in words if word not in self.stop_words and word.isalpha()]
@@ -185,37 +351,10 @@ class ReviewScorer:
             length_score = min(len(meaningful_words) / 20, 1.0)  # Cap at 1.0 for reviews with 20+ meaningful words
             
             # NEW: Check for specific details that indicate authenticity
-            specificity_indicators = [
-                r'\b(?:on|in|at|during)\s+(?:january|february|march|april|may|june|july|august|september|october|november|december|monday|tuesday|wednesday|thursday|friday|saturday|sunday)\b',  # Dates/days
-                r'\b(?:morning|afternoon|evening|night|today|yesterday|last\s+week|last\s+month|last\s+year)\b',  # Time references
-                r'\b(?:room|office|building|floor|desk|chair|waiting\s+area|lobby|bathroom)\b',  # Location details
-                r'\b(?:doctor|nurse|staff|receptionist|assistant|technician)\s+(?:\w+)\b',  # Staff references with specifics
-                r'\b(?:procedure|treatment|surgery|appointment|consultation|check-up|test|diagnosis|prescription|medication)\b',  # Medical terms
-                r'\b(?:\d+(?::\d+)?)\s*(?:am|pm|hour|minute|second)\b',  # Specific times
-                r'\$\d+(?:\.\d+)?|\d+\s+dollars',  # Cost mentions
-            ]
-            
-            specificity_score = 0.0
-            review_text_lower = review_text.lower()
-            for pattern in specificity_indicators:
-                if re.search(pattern, review_text_lower, re.IGNORECASE):
-                    specificity_score += 0.15
-            specificity_score = min(specificity_score, 1.0)  # Cap at 1.0
+            specificity_score = marker_score(self.matcher.specificity_hits(review_text_lower))
             
             # NEW: Check for emotional language and personal experience markers
-            emotional_markers = [
-                r'\b(?:i|we|my|our)\b',  # First-person pronouns
-                r'\b(?:feel|felt|feeling|experienced|noticed|saw|heard|thought)\b',  # Experiential verbs
-                r'\b(?:happy|satisfied|pleased|impressed|disappointed|frustrated|angry|upset|worried|concerned)\b',  # Emotional states
-                r'\b(?:thanks|thank\s+you|grateful|appreciate|appreciated|helped|recommend|recommended)\b',  # Gratitude/recommendation
-                r'[!?]',  # Exclamation or question marks
-            ]
-            
-            emotional_score = 0.0
-            for pattern in emotional_markers:
-                if re.search(pattern, review_text_lower, re.IGNORECASE):
-                    emotional_score += 0.15
-            emotional_score = min(emotional_score, 1.0)  # Cap at 1.0
+            emotional_score = marker_score(self.matcher.emotional_hits(review_text_lower))
             
             # NEW: Check for coherence and flow (basic implementation)
             sentences = re.split(r'[.!?]+', review_text)
@@ -241,7 +380,7 @@ class ReviewScorer:
             logger.warning(f"Error in tokenization: {str(e)}. Using fallback method.")
             
             # Simple fallback tokenization by splitting on whitespace
-            words = review_text.lower().split()
+            words = review_text_lower.split()
             
             # Basic cleaning and stopword removal
             meaningful_words = [word for word in words 
@@ -260,6 +399,17 @@ class ReviewScorer:
             
             return quality_score
     
+    def review_features(self, review_text: str, review_timestamp: Union[int, str, None]) -> ReviewFeatures:
+        """Features of one review that do not depend on the rest of its batch"""
+        hits = self.matcher.scan(review_text)
+        return ReviewFeatures(
+            normalized_text=self._normalize_text(review_text),
+            generic_score=self.is_generic(review_text, hits),
+            negative_keywords=hits.negative_keywords if review_text else frozenset(),
+            is_recent=self.is_recent(review_timestamp),
+            content_quality=self.analyze_content_quality(review_text, hits),
+        )
+    
     def _normalize_text(self, text: str) -> str:
         """Normalize text for comparison purposes."""
         if not text:
@@ -274,11 +424,24 @@ class ReviewScorer:
         
         return normalized
     
-    def calculate_review_score(self, review_data: Dict[str, Any]) -> Dict[str, Any]:
+    def calculate_review_score(
+        self,
+        review_data: Dict[str, Any],
+        hits: Optional[ReviewHits] = None,
+        duplicate_cluster: Optional[int] = None,
+        near_duplicate: bool = False,
+        context: Optional[ReviewBatchContext] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> Dict[str, Any]:
         """
         Calculate a score for a review based on various factors.
         Returns the original review data with added scoring information.
         
+        duplicate_cluster and near_duplicate come from the batch's near-duplicate
+        clustering; a near-duplicate is penalized like an exact duplicate.
+        context carries the batch state (seen texts, keyword prevalence).
+        fields limits the review data copied into the result (all by default).
+        
         Scoring range:
         - Fake/spam reviews: -10 to 0
         - Genuine reviews: 1 to 10
@@ -286,18 +449,39 @@ class ReviewScorer:
         review_text = review_data.get('review_text', '')
         review_timestamp = review_data.get('review_timestamp') or review_data.get('review_datetime_utc')
         
+        # Scan the text once for every phrase, keyword and marker feature
+        hits = hits or self.matcher.scan(review_text)
+        
         # Initialize scoring factors
-        is_duplicate = self.detect_duplicates(review_text)
-        generic_score = self.is_generic(review_text)
-        negative_score = self.has_negative_keywords(review_text)
+        is_duplicate = self.detect_duplicates(review_text, context)
+        generic_score = self.is_generic(review_text, hits)
+        negative_score = self.has_negative_keywords(review_text, hits, context)
         is_recent = self.is_recent(review_timestamp)
-        content_quality = self.analyze_content_quality(review_text)
+        content_quality = self.analyze_content_quality(review_text, hits)
         
+        return self._scored_review(
+            review_data, is_duplicate, generic_score, negative_score, is_recent,
+            content_quality, near_duplicate, duplicate_cluster, fields
+        )
+    
+    def _scored_review(
+        self,
+        review_data: Dict[str, Any],
+        is_duplicate: bool,
+        generic_score: float,
+        negative_score: float,
+        is_recent: bool,
+        content_quality: float,
+        near_duplicate: bool,
+        duplicate_cluster: Optional[int],
+        fields: Optional[Sequence[str]] = None
+    ) -> Dict[str, Any]:
+        """Apply the scoring rules to a review's factors"""
         # Start with a neutral base score
         final_score = 5.0
         
         # Apply negative factors first
-        if is_duplicate:
+        if is_duplicate or near_duplicate:
             # Heavily penalize duplicates
             final_score -= 10
         else:
@@ -334,51 +518,307 @@ class ReviewScorer:
         final_score = round(final_score, 1)
         
         # Add scoring information to the review data
-        scored_review = review_data.copy()
+        scored_review = project_review(review_data, fields)
         scored_review['review_score'] = final_score
         scored_review['scoring_factors'] = {
             'is_duplicate': is_duplicate,
             'generic_score': round(generic_score, 2),
             'negative_score': round(negative_score, 2),
             'is_recent': is_recent,
-            'content_quality': round(content_quality, 2)
+            'content_quality': round(content_quality, 2),
+            'near_duplicate': near_duplicate,
+            'duplicate_cluster': duplicate_cluster
         }
         
         return scored_review
     
-    def score_reviews(self, reviews: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Score a list of reviews."""
-        # Reset the seen reviews counter for a fresh batch
-        self.seen_reviews = Counter()
+    def score_reviews(self, reviews: List[Dict[str, Any]], fields: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Score a list of reviews.
         
-        # Precompute negative keyword prevalence across reviews
-        total_reviews = len(reviews)
-        prevalence = {}
-        for review in reviews:
-            review_text = review.get('review_text', '')
-            # Ensure review_text is a string
-            review_text = str(review_text) if review_text is not None else ""
-            review_text_lower = review_text.lower()
-            for keyword in self.negative_keywords:
-                if keyword.lower() in review_text_lower:
-                    prevalence[keyword] = prevalence.get(keyword, 0) + 1
-        self.total_reviews = total_reviews
-        self.negative_keyword_prevalence = prevalence
+        fields limits the review data copied into each scored review (all by default).
+        """
+        # Precompute negative keyword prevalence from one scan per review
+        review_hits = [self.matcher.scan(review.get('review_text', '')) for review in reviews]
+        prevalence = Counter()
+        for hits in review_hits:
+            prevalence.update(hits.negative_keywords)
+        
+        # Fresh batch state for this call only
+        context = ReviewBatchContext(len(reviews), prevalence)
+        
+        # Cluster lightly edited copies; every copy after a cluster's first is a near-duplicate
+        clusters = self.near_duplicate_clusters([self._normalize_text(review.get('review_text', '')) for review in reviews])
+        near_duplicates = near_duplicate_flags(clusters)
         
         # NEW: Check if there is any review in the batch that is recent
         any_recent = any(self.is_recent(review.get('review_timestamp') or review.get('review_datetime_utc')) for review in reviews)
         
-        scored_reviews = []
-        for review in reviews:
-            scored_review = self.calculate_review_score(review)
+        scored_reviews = [
+            self.calculate_review_score(review, hits, cluster, near_duplicate, context, fields)
+            for review, hits, cluster, near_duplicate in zip(reviews, review_hits, clusters, near_duplicates)
+        ]
+        return self._apply_global_recency(scored_reviews, any_recent)
+    
+    def score_reviews_iter(self, pages: Iterable[List[Dict[str, Any]]]) -> Iterator[Dict[str, Any]]:
+        """
+        Score reviews page by page as they are fetched.
+        
+        Each page is scored as soon as it arrives against the running batch
+        statistics (keyword prevalence, seen texts and whether any review so
+        far is recent), so its scores are provisional. Once the pages are
+        exhausted a final event reconciles the emitted reviews with the
+        statistics of the whole stream, including near-duplicate clusters.
+        Applying its corrections gives the output of score_reviews over all
+        pages, except that near-duplicate pairs are judged on their MinHash
+        estimate rather than the exact shingle similarity.
+        
+        Between pages only a small per-review record is kept, plus an 8-byte
+        hash and a MinHash signature per distinct text; neither the review
+        dicts nor their texts are.
+        
+        Args:
+            pages: Lists of review dicts, in batch order
+            
+        Yields:
+            {'event': 'page', 'page': n, 'offset': index of the page's first
+            review, 'reviews': scored reviews} per page, then
+            {'event': 'final', 'total_reviews': n, 'any_recent': bool,
+            'corrections': {review index: {'review_score', 'scoring_factors'}}}
+            for the reviews whose final score or factors differ
+        """
+        context = ReviewBatchContext()
+        # Digest of each distinct normalized text -> its id
+        text_ids = {}
+        signatures = None
+        if self.near_duplicate_threshold is not None:
+            from .review_lsh import StreamingSignatures
+            signatures = StreamingSignatures(self._near_duplicate_lsh())
+        streamed = []
+        any_recent = False
+        
+        for page_number, page in enumerate(pages, start=1):
+            features = [
+                self.review_features(review.get('review_text', ''), review.get('review_timestamp') or review.get('review_datetime_utc'))
+                for review in page
+            ]
+            for feature in features:
+                context.negative_keyword_prevalence.update(feature.negative_keywords)
+            context.total_reviews += len(page)
+            any_recent = any_recent or any(feature.is_recent for feature in features)
+            
+            offset = len(streamed)
+            scored_reviews = []
+            new_texts = []
+            for review, feature in zip(page, features):
+                digest = hashlib.blake2b(feature.normalized_text.encode('utf-8'), digest_size=8).digest()
+                is_duplicate = digest in text_ids
+                if not is_duplicate:
+                    text_ids[digest] = len(text_ids)
+                    new_texts.append(feature.normalized_text)
+                negative_score = self.negative_keyword_score(feature.negative_keywords, context)
+                scored_reviews.append(self._scored_review(
+                    review, is_duplicate, feature.generic_score, negative_score,
+                    feature.is_recent, feature.content_quality, False, None
+                ))
+                streamed.append(StreamedReview(
+                    text_ids[digest],
+                    feature.generic_score, feature.negative_keywords, feature.is_recent,
+                    feature.content_quality, is_duplicate, negative_score, any_recent
+                ))
+            if signatures is not None:
+                signatures.add(new_texts)
+            yield {
+                'event': 'page',
+                'page': page_number,
+                'offset': offset,
+                'reviews': self._apply_global_recency(scored_reviews, any_recent),
+            }
+        
+        # Reconcile with the whole stream: prevalence, recency and near-duplicates
+        if signatures is not None and streamed:
+            clusters = signatures.clusters([review.text_id for review in streamed])
+        else:
+            clusters = [None] * len(streamed)
+        corrections = {}
+        for index, (review, cluster, near_duplicate) in enumerate(zip(streamed, clusters, near_duplicate_flags(clusters))):
+            final = self._apply_global_recency([self._scored_review(
+                {}, review.is_duplicate, review.generic_score,
+                self.negative_keyword_score(review.negative_keywords, context),
+                review.is_recent, review.content_quality, near_duplicate, cluster
+            )], any_recent)[0]
+            provisional = self._apply_global_recency([self._scored_review(
+                {}, review.is_duplicate, review.generic_score, review.provisional_negative_score,
+                review.is_recent, review.content_quality, False, None
+            )], review.provisional_any_recent)[0]
+            # Scores compare by type too, so 1 and 1.0 serialize as score_reviews would
+            if final != provisional or type(final['review_score']) is not type(provisional['review_score']):
+                corrections[index] = final
+        yield {
+            'event': 'final',
+            'total_reviews': context.total_reviews,
+            'any_recent': any_recent,
+            'corrections': corrections,
+        }
+    
+    def score_new_reviews(
+        self,
+        reviews: List[Dict[str, Any]],
+        context: ReviewBatchContext,
+        previous_texts: Sequence[str],
+        any_recent: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Score reviews appended to an already scored batch.
+        
+        The new reviews are scored as if they followed the previous batch in
+        score_reviews: copies of earlier texts are duplicates, keyword
+        prevalence and global recency cover both, and near-duplicate clusters
+        span both. The previous reviews are not rescored.
+        
+        Args:
+            reviews: New reviews to score
+            context: Statistics of the previous batch (its texts already
+                counted); updated with the new reviews
+            previous_texts: Normalized texts of the previous batch, in order
+            any_recent: Whether the previous batch has a recent review
+        """
+        review_hits = [self.matcher.scan(review.get('review_text', '')) for review in reviews]
+        for hits in review_hits:
+            context.negative_keyword_prevalence.update(hits.negative_keywords)
+        context.total_reviews += len(reviews)
+        
+        normalized = [self._normalize_text(review.get('review_text', '')) for review in reviews]
+        clusters = self.near_duplicate_clusters(list(previous_texts) + normalized)
+        near_duplicates = near_duplicate_flags(clusters)[len(previous_texts):]
+        clusters = clusters[len(previous_texts):]
+        
+        any_recent = any_recent or any(
+            self.is_recent(review.get('review_timestamp') or review.get('review_datetime_utc')) for review in reviews
+        )
+        scored_reviews = [
+            self.calculate_review_score(review, hits, cluster, near_duplicate, context)
+            for review, hits, cluster, near_duplicate in zip(reviews, review_hits, clusters, near_duplicates)
+        ]
+        return self._apply_global_recency(scored_reviews, any_recent)
+    
+    @staticmethod
+    def _apply_global_recency(scored_reviews: List[Dict[str, Any]], any_recent: bool) -> List[Dict[str, Any]]:
+        """Flag every review of a batch without a single recent review"""
+        for scored_review in scored_reviews:
             if not any_recent:
                 # If no review in the batch is recent, mark as red flag
                 scored_review['review_score'] = -10
                 scored_review.setdefault('scoring_factors', {})['global_recency'] = False
             else:
                 scored_review.setdefault('scoring_factors', {})['global_recency'] = True
-            scored_reviews.append(scored_review)
-            
         return scored_reviews
+    
+    def score_reviews_parallel(
+        self,
+        reviews: List[Dict[str, Any]],
+        workers: Optional[int] = None,
+        min_reviews: int = PARALLEL_MIN_REVIEWS
+    ) -> List[Dict[str, Any]]:
+        """
+        Score a list of reviews with the per-review features computed in a process pool.
+        
+        The batch is split into shards; worker processes compute the text and
+        timestamp features of each shard (phrase scan, content quality,
+        recency, normalized text). The batch-wide passes (duplicate counts,
+        keyword prevalence, near-duplicate clusters and global recency) then
+        run over the merged features in batch order, so the output is the same
+        as score_reviews.
+        
+        Args:
+            reviews: Reviews to score
+            workers: Worker processes (defaults to the CPU count)
+            min_reviews: Smaller batches are scored in-process
+        """
+        workers = workers or os.cpu_count() or 1
+        if workers <= 1 or len(reviews) < min_reviews:
+            return self.score_reviews(reviews)
+        
+        from concurrent.futures import ProcessPoolExecutor
+        
+        shard_size = -(-len(reviews) // (workers * 4))
+        shards = [
+            [(review.get('review_text', ''), review.get('review_timestamp') or review.get('review_datetime_utc'))
+             for review in reviews[start:start + shard_size]]
+            for start in range(0, len(reviews), shard_size)
+        ]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_review_worker, initargs=(self,)) as pool:
+            features = [feature for shard in pool.map(_review_features, shards) for feature in shard]
+        
+        prevalence = Counter()
+        for feature in features:
+            prevalence.update(feature.negative_keywords)
+        context = ReviewBatchContext(len(reviews), prevalence)
+        
+        clusters = self.near_duplicate_clusters([feature.normalized_text for feature in features])
+        near_duplicates = near_duplicate_flags(clusters)
+        any_recent = any(feature.is_recent for feature in features)
+        
+        scored_reviews = [
+            self._scored_review(
+                review,
+                context.count_seen(feature.normalized_text),
+                feature.generic_score,
+                self.negative_keyword_score(feature.negative_keywords, context),
+                feature.is_recent,
+                feature.content_quality,
+                near_duplicate,
+                cluster
+            )
+            for review, feature, cluster, near_duplicate in zip(reviews, features, clusters, near_duplicates)
+        ]
+        return self._apply_global_recency(scored_reviews, any_recent)
+    
+    def score_reviews_columnar(self, reviews: List[Dict[str, Any]], fields: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Score a list of reviews through the columnar (pandas/NumPy) path.
+        
+        Returns the same output as score_reviews; faster for large batches
+        since timestamps are parsed once and the scoring rules run as array
+        expressions.
+        """
+        # pandas is imported on first use to keep this module cheap to import
+        from .review_frame import score_reviews_columnar
+        
+        return score_reviews_columnar(self, reviews, fields)
+
+
+# Scorer of a score_reviews_parallel worker process
+_worker_scorer = None
+
 
+def _init_review_worker(scorer: ReviewScorer):
+    """Process pool initializer: keep the parent's scorer for the worker's lifetime"""
+    global _worker_scorer
+    _worker_scorer = scorer
 
+
+def _review_features(shard: List[tuple]) -> List[ReviewFeatures]:
+    """Features of a shard of (review_text, review_timestamp) pairs"""
+    return [_worker_scorer.review_features(text, timestamp) for text, timestamp in shard]
+
+
+_scorers = {}
+_scorers_lock = threading.Lock()
+
+
+def get_review_scorer(tokenizer: Optional[str] = None) -> ReviewScorer:
+    """
+    Return the process-wide ReviewScorer for a tokenizer.
+    
+    The scorer keeps no per-batch state, so one instance is safely shared by
+    every request and thread.
+    """
+    tokenizer = tokenizer or os.getenv('REVIEW_TOKENIZER', 'nltk')
+    scorer = _scorers.get(tokenizer)
+    if scorer is None:
+        with _scorers_lock:
+            scorer = _scorers.get(tokenizer)
+            if scorer is None:
+                scorer = _scorers[tokenizer] = ReviewScorer(tokenizer=tokenizer)
+    return scorer
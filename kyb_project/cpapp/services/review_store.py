@@ -0,0 +1,225 @@
+"""
+Persistent per-place review store.
+
+Scored reviews are kept per Google place together with the place's batch
+statistics (negative keyword prevalence, global recency), running aggregates
+and a watermark: the timestamp of the newest stored review. A repeat check
+of the place then fetches only reviews newer than the watermark, scores just
+those against the stored statistics (ReviewScorer.score_new_reviews) and adds
+them to the aggregates, instead of refetching and rescoring every review.
+"""
+
+import logging
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from cpapp.models.review_store import ReviewPlace, StoredReview
+from .review_fingerprints import hash64
+from .review_scoring_system import ReviewBatchContext, ReviewScorer
+
+logger = logging.getLogger(__name__)
+
+# Review ids per IN (...) clause, below SQLite's variable limit
+QUERY_CHUNK_SIZE = 500
+
+
+def review_key(review: Dict[str, Any]) -> str:
+    """Outscraper review_id, or a hash of author and text for reviews without one"""
+    if review.get('review_id'):
+        return str(review['review_id'])[:255]
+    author = review.get('author_id') or review.get('author_link') or review.get('author_title') or ''
+    text = review.get('review_text') or ''
+    return f"h{hash64(f'{author}|{text}'.encode('utf-8')) & 0xFFFFFFFFFFFFFFFF:016x}"
+
+
+def review_epoch(review: Dict[str, Any]) -> Optional[int]:
+    """Epoch seconds of a review, when Outscraper provided them"""
+    timestamp = review.get('review_timestamp')
+    return timestamp if isinstance(timestamp, int) and not isinstance(timestamp, bool) and timestamp > 0 else None
+
+
+class ReviewStore:
+    """Loads and saves the stored reviews and statistics of places"""
+
+    def __init__(self, scorer: ReviewScorer, batch_size: int = 500):
+        """
+        Args:
+            scorer (ReviewScorer): Scorer used to normalize stored texts
+            batch_size (int): Rows per bulk insert
+        """
+        self.scorer = scorer
+        self.batch_size = batch_size
+
+    def find_place(self, query: str) -> Optional[ReviewPlace]:
+        """Stored place for a place id or a query it was fetched with"""
+        return ReviewPlace.objects.filter(Q(place_id=query) | Q(query=query)).order_by('-refreshed_at').first()
+
+    def load_context(self, place: Optional[ReviewPlace]) -> Tuple[ReviewBatchContext, List[str]]:
+        """
+        Batch statistics of a place's stored reviews
+
+        Returns:
+            Tuple[ReviewBatchContext, List[str]]: Context with the stored texts
+            counted, and the stored normalized texts in batch order
+        """
+        if place is None:
+            return ReviewBatchContext(), []
+        texts = [
+            self.scorer._normalize_text(text)
+            for text in place.reviews.order_by('id').values_list('review_text', flat=True)
+        ]
+        context = ReviewBatchContext(place.review_count, Counter(place.negative_keyword_prevalence))
+        for text in texts:
+            context.count_seen(text)
+        return context, texts
+
+    def new_reviews(self, place: Optional[ReviewPlace], reviews: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Reviews not stored for the place yet (and each review once)"""
+        keys = {}
+        for review in reviews:
+            keys.setdefault(review_key(review), review)
+        if place is not None:
+            wanted = list(keys)
+            for start in range(0, len(wanted), QUERY_CHUNK_SIZE):
+                stored = place.reviews.filter(review_id__in=wanted[start:start + QUERY_CHUNK_SIZE])
+                for key in stored.values_list('review_id', flat=True):
+                    keys.pop(key, None)
+        return list(keys.values())
+
+    def refresh(
+        self,
+        place_data: Dict[str, Any],
+        place_id: str,
+        query: str,
+        reviews: Sequence[Dict[str, Any]],
+        score: Callable[[List[Dict[str, Any]], ReviewBatchContext, List[str], bool], List[Dict[str, Any]]]
+    ) -> Tuple[ReviewPlace, List[Dict[str, Any]]]:
+        """
+        Score and store the reviews of a place that are not stored yet
+
+        The place row stays locked from loading its statistics until the new
+        reviews are saved, so overlapping refreshes of one place score each
+        review once, against the statistics the other refresh left.
+
+        Args:
+            place_data (Dict): Outscraper place result (name, reviews_id)
+            place_id (str): Place the reviews belong to
+            query (str): Query the place was fetched with
+            reviews (Sequence[Dict]): Fetched reviews of the place
+            score (Callable): Scores new reviews given (reviews, context,
+                previous_texts, any_recent), as ReviewScorer.score_new_reviews
+
+        Returns:
+            Tuple[ReviewPlace, List[Dict]]: The stored place and its newly scored reviews
+        """
+        with transaction.atomic():
+            place = self._lock_place(place_id, query)
+            new_reviews = self.new_reviews(place, reviews)
+            context, previous_texts = self.load_context(place)
+            scored_reviews = score(new_reviews, context, previous_texts, place.any_recent)
+            return self.save(place_data, place_id, query, scored_reviews, context), scored_reviews
+
+    @staticmethod
+    def _lock_place(place_id: str, query: str) -> ReviewPlace:
+        place, _ = ReviewPlace.objects.select_for_update().get_or_create(
+            place_id=place_id,
+            defaults={'query': query[:500]},
+        )
+        return place
+
+    def save(
+        self,
+        place_data: Dict[str, Any],
+        place_id: str,
+        query: str,
+        scored_reviews: List[Dict[str, Any]],
+        context: ReviewBatchContext
+    ) -> ReviewPlace:
+        """
+        Store newly scored reviews of a place and add them to its aggregates
+
+        Reviews already stored for the place are skipped and not counted again.
+
+        Args:
+            place_data (Dict): Outscraper place result (name, reviews_id)
+            place_id (str): Place the reviews belong to
+            query (str): Query the place was fetched with
+            scored_reviews (List[Dict]): New reviews, as scored by score_new_reviews
+            context (ReviewBatchContext): Statistics after scoring the new reviews
+        """
+        with transaction.atomic():
+            place = self._lock_place(place_id, query)
+            stored = set()
+            keys = list({review_key(review) for review in scored_reviews})
+            for start in range(0, len(keys), QUERY_CHUNK_SIZE):
+                stored.update(
+                    place.reviews.filter(review_id__in=keys[start:start + QUERY_CHUNK_SIZE]).values_list('review_id', flat=True)
+                )
+            new_reviews = []
+            for review in scored_reviews:
+                key = review_key(review)
+                if key not in stored:
+                    stored.add(key)
+                    new_reviews.append(review)
+            scored_reviews = new_reviews
+
+            rows = []
+            for review in scored_reviews:
+                review_data = {k: v for k, v in review.items() if k not in ('review_score', 'scoring_factors')}
+                rows.append(StoredReview(
+                    place=place,
+                    review_id=review_key(review),
+                    review_text=str(review.get('review_text') or ''),
+                    review_timestamp=review_epoch(review),
+                    review_data=review_data,
+                    review_score=review['review_score'],
+                    scoring_factors=review.get('scoring_factors', {}),
+                ))
+            StoredReview.objects.bulk_create(rows, batch_size=self.batch_size, ignore_conflicts=True)
+
+            place.reviews_id = str(place_data.get('reviews_id') or place.reviews_id)[:255]
+            place.name = str(place_data.get('name') or place.name)[:500]
+            place.query = place.query or query[:500]
+            epochs = [epoch for epoch in (review_epoch(review) for review in scored_reviews) if epoch]
+            if epochs:
+                place.last_review_timestamp = max(epochs + [place.last_review_timestamp or 0])
+            place.negative_keyword_prevalence = dict(context.negative_keyword_prevalence)
+            place.any_recent = place.any_recent or any(
+                review.get('scoring_factors', {}).get('global_recency') for review in scored_reviews
+            )
+            place.review_count += len(scored_reviews)
+            place.genuine_reviews += sum(1 for review in scored_reviews if review['review_score'] > 0)
+            place.score_sum += sum(review['review_score'] for review in scored_reviews)
+            place.reviews_seen_at_other_places += sum(
+                1 for review in scored_reviews if review.get('scoring_factors', {}).get('seen_at_other_places')
+            )
+            place.refreshed_at = timezone.now()
+            place.save()
+        return place
+
+    @staticmethod
+    def stored_reviews(place: ReviewPlace) -> List[Dict[str, Any]]:
+        """Scored reviews of a place, in the order they were stored"""
+        return [
+            {**review_data, 'review_score': review_score, 'scoring_factors': scoring_factors}
+            for review_data, review_score, scoring_factors in
+            place.reviews.order_by('id').values_list('review_data', 'review_score', 'scoring_factors')
+        ]
+
+    @staticmethod
+    def summarize(places: Sequence[ReviewPlace]) -> Dict[str, Any]:
+        """Batch statistics of stored places, as ReviewAnalysisService.summarize reports them"""
+        total_reviews = sum(place.review_count for place in places)
+        genuine_reviews = sum(place.genuine_reviews for place in places)
+        score_sum = sum(place.score_sum for place in places)
+        return {
+            "total_reviews": total_reviews,
+            "genuine_reviews": genuine_reviews,
+            "fake_reviews": total_reviews - genuine_reviews,
+            "average_score": round(score_sum / total_reviews, 2) if total_reviews > 0 else 0,
+            "reviews_seen_at_other_places": sum(place.reviews_seen_at_other_places for place in places),
+        }
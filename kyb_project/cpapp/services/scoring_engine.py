@@ -1,7 +1,7 @@
 import logging
 
 class DoctorScoringEngine:
-    def __init__(self):
+    def __init__(self, geoiq_priority=None):
         # Initialize scoring rules
         self.logger = logging.getLogger(__name__)
         self.location_scores = {
@@ -93,11 +93,14 @@ class DoctorScoringEngine:
             "Hematology": 3
         }
         
-        # Initialize GeoIQ service
+        # Initialize GeoIQ service (shared per process behind the request scheduler)
         self.geoiq_service = None
+        self.geoiq_scheduler = None
         try:
-            from .GeoIQ import GeoIQService
-            self.geoiq_service = GeoIQService()
+            from .geoiq_scheduler import get_geoiq_scheduler, INTERACTIVE
+            self.geoiq_priority = INTERACTIVE if geoiq_priority is None else geoiq_priority
+            self.geoiq_scheduler = get_geoiq_scheduler()
+            self.geoiq_service = self.geoiq_scheduler.service
             self.logger.info("GeoIQ service initialized successfully")
         except Exception as e:
             self.logger.error(f"GeoIQ service initialization failed: {str(e)}")
@@ -296,16 +299,105 @@ class DoctorScoringEngine:
             self.logger.error(f"Error calculating weighted rating: {str(e)}")
             return 0  # Return 0 instead of default middle value
     
-    def evaluate_location(self, address):
-        """Evaluate location quality using GeoIQ"""
-        if not self.geoiq_service or not address:
+    def get_stored_location(self, address, source=None, entity_id=None, entity_type=None):
+        """Look up a location precomputed by the precompute_locations command"""
+        from cpapp.services.location_store import get_entity_location, get_location_by_address
+        
+        try:
+            if source and entity_type and entity_id is not None:
+                location = get_entity_location(entity_type, source, entity_id)
+                if location:
+                    return location
+            if address:
+                return get_location_by_address(address)
+        except Exception as e:
+            self.logger.error(f"Stored location lookup failed: {str(e)}")
+        return None
+    
+    def get_neighbour_location(self, latitude, longitude):
+        """Find the nearest stored location within LOCATION_NEIGHBOUR_MAX_DISTANCE_M"""
+        from django.conf import settings
+        from cpapp.services.location_index import get_location_index
+        
+        max_distance = getattr(settings, 'LOCATION_NEIGHBOUR_MAX_DISTANCE_M', 200)
+        if latitude is None or longitude is None or not max_distance:
+            return None
+        try:
+            return get_location_index().nearest_location(latitude, longitude, max_distance)
+        except Exception as e:
+            self.logger.error(f"Neighbour location lookup failed: {str(e)}")
+            return None
+    
+    def evaluate_location(self, address, source=None, entity_id=None, entity_type=None, latitude=None, longitude=None):
+        """Evaluate location quality using precomputed scores, falling back to GeoIQ"""
+        return self.evaluate_location_status(address, source, entity_id, entity_type, latitude, longitude)['category']
+    
+    def location_status(self, category, location_source, degraded_reason=None, borrowed_from=None, borrowed_distance=None):
+        """Describe where a location category came from and whether it is a degraded answer"""
+        status = {
+            'category': category,
+            'source': location_source,
+            'degraded': degraded_reason is not None,
+            'degraded_reason': degraded_reason,
+            'borrowed': borrowed_from is not None,
+        }
+        if borrowed_from is not None:
+            status['borrowed_from'] = borrowed_from
+            status['borrowed_distance_m'] = round(borrowed_distance, 1)
+        return status
+    
+    def evaluate_location_status(self, address, source=None, entity_id=None, entity_type=None, latitude=None, longitude=None):
+        """
+        Evaluate location quality and report how the category was obtained
+        
+        Lookup order: stored location for the entity or address, nearest stored
+        location within LOCATION_NEIGHBOUR_MAX_DISTANCE_M of the coordinates
+        (borrowed), then GeoIQ.
+        
+        The stored and neighbour lookups are database reads made before the
+        GeoIQ circuit breaker is consulted, since they answer without GeoIQ.
+        Only the GeoIQ step fails fast while the breaker is open, so a score
+        still pays for those reads when GeoIQ is down.
+        
+        Returns:
+            dict: category, source (stored, neighbour, geoiq, cache, pincode_default,
+            default, raw_variables), degraded, degraded_reason and borrowed
+        """
+        stored_location = self.get_stored_location(address, source, entity_id, entity_type)
+        if stored_location:
+            self.logger.info(f"Using stored location score for {address}: {stored_location.category} ({stored_location.points}/30)")
+            return self.location_status(stored_location.category, 'stored')
+        
+        neighbour = self.get_neighbour_location(latitude, longitude)
+        if neighbour:
+            location, distance = neighbour
+            self.logger.info(f"Borrowing location score from {location.location_key} {distance:.0f}m away: {location.category}")
+            return self.location_status(location.category, 'neighbour', borrowed_from=location.location_key,
+                                        borrowed_distance=distance)
+        
+        has_coordinates = latitude is not None and longitude is not None
+        if not self.geoiq_service or not (address or has_coordinates):
             self.logger.warning("GeoIQ service not available or address is empty")
-            return "Poor"
+            reason = 'service_unavailable' if (address or has_coordinates) else 'no_address'
+            return self.location_status("Poor", 'default', reason)
             
         try:
             # Get location data using analyze_location instead of get_location_data_by_address
             # This provides us with the pre-calculated location_score
-            location_analysis = self.geoiq_service.analyze_location(address=address)
+            if has_coordinates:
+                location_analysis = self.geoiq_scheduler.analyze_location(
+                    latitude=latitude, longitude=longitude, priority=self.geoiq_priority
+                )
+            else:
+                location_analysis = self.geoiq_scheduler.analyze_location(address=address, priority=self.geoiq_priority)
+            
+            degraded_reason = None
+            location_source = 'geoiq'
+            if location_analysis.get("degraded"):
+                degraded_reason = location_analysis.get('degraded_reason')
+                location_source = location_analysis.get('fallback_source')
+                self.logger.warning(f"GeoIQ answer for {address} is degraded ({degraded_reason}), "
+                                    f"using {location_source} location category")
             
             # Use the pre-calculated location category if available
             if location_analysis and "location_score" in location_analysis:
@@ -313,101 +405,19 @@ class DoctorScoringEngine:
                 location_points = location_analysis["location_score"]["points"]
                 
                 self.logger.info(f"Using pre-calculated location score for {address}: {location_category} ({location_points}/30)")
-                return location_category
+                return self.location_status(location_category, location_source, degraded_reason)
             
-            # Fall back to previous calculation method if location_score is not available
-            location_data = location_analysis.get("raw_data", {})
+            # Fall back to scoring the raw variables if location_score is not available
+            from cpapp.services.location_features import score_location
+            location_score = score_location(location_analysis.get("raw_data", {}))
+            location_category = location_score["category"]
             
-            # Comprehensive location analysis using multiple factors
-            # 1. Income indicators
-            avg_income_5l = location_data.get('w_hh_income_5l_above_perc', 0)
-            avg_income_10l = location_data.get('w_hh_income_10l_above_perc', 0)
-            avg_income_20l = location_data.get('w_hh_income_20l_above_perc', 0)
-            income_tax_payers = location_data.get('secc_p_hh_pay_it_pt_r', 0)
-            
-            # 2. Commercial indicators
-            retail_density = location_data.get('p_retail_gc_np', 0)
-            restaurant_density = location_data.get('p_restaurant_rt_np', 0)
-            retail_rent = location_data.get('p_retail_rppsfa', 0)
-            
-            # 3. Lifestyle indicators
-            high_end_restaurants = location_data.get('br_restaurant_ch_nt', 0)
-            fitness_centers = (
-                location_data.get('br_anytimefitness_ct', 0) + 
-                location_data.get('br_cult_ct', 0) + 
-                location_data.get('br_goldsgym_ct', 0)
-            )
-            entertainment = (
-                location_data.get('br_pvrcinemas_ct', 0) + 
-                location_data.get('br_inoxleisurelimited_ct', 0)
-            )
-            
-            # 4. Premium retail presence
-            premium_retail = (
-                location_data.get('br_lifestyle_ct', 0) + 
-                location_data.get('br_shoppersstop_ct', 0) + 
-                location_data.get('br_zara_ct', 0) + 
-                location_data.get('br_miniso_ct', 0) + 
-                location_data.get('br_tanishq_ct', 0) + 
-                location_data.get('br_calvinklein_ct', 0) + 
-                location_data.get('br_tommyhilfiger_ct', 0)
-            )
-            
-            # 5. Healthcare indicators
-            healthcare_facilities = (
-                location_data.get('br_apollohospitals_ct', 0) + 
-                location_data.get('br_maxhealthcare_ct', 0) + 
-                location_data.get('br_fortishealthcare_ct', 0) + 
-                location_data.get('br_medantathemedicity_ct', 0)
-            )
-            
-            # Calculate location score points (max 30 points)
-            location_points = 0
-            
-            # Income indicators (0-10 points)
-            if avg_income_10l > 25 or avg_income_20l > 10:
-                location_points += 10
-            elif avg_income_10l > 15 or avg_income_5l > 30:
-                location_points += 7
-            elif avg_income_5l > 20 or income_tax_payers > 15:
-                location_points += 4
-            
-            # Commercial viability (0-7 points)
-            if retail_density > 20 or retail_rent > 150:
-                location_points += 7
-            elif retail_density > 10 or retail_rent > 100:
-                location_points += 4
-            elif retail_density > 5 or restaurant_density > 10:
-                location_points += 2
-            
-            # Premium establishments (0-8 points)
-            if premium_retail >= 5 or high_end_restaurants > 0.5:
-                location_points += 8
-            elif premium_retail >= 3 or fitness_centers >= 3:
-                location_points += 5
-            elif premium_retail >= 1 or fitness_centers >= 1:
-                location_points += 2
-            
-            # Healthcare ecosystem (0-5 points)
-            if healthcare_facilities >= 3:
-                location_points += 5
-            elif healthcare_facilities >= 1:
-                location_points += 3
-            
-            self.logger.debug(f"Location analysis for {address}: income indicators={avg_income_10l}/{avg_income_20l}, " 
-                         f"commercial={retail_density}/{retail_rent}, premium retail={premium_retail}, "
-                         f"location_points={location_points}")
-            
-            # Determine location category based on points
-            if location_points >= 20:
-                return "Prime"
-            elif location_points >= 12:
-                return "Medium"
-            else:
-                return "Poor"
+            self.logger.debug(f"Location analysis for {address}: factors={location_score['factors']}, "
+                         f"location_points={location_score['points']}")
+            return self.location_status(location_category, 'raw_variables', degraded_reason)
         except Exception as e:
             self.logger.error(f"GeoIQ evaluation failed: {str(e)}")
-            return "Poor"
+            return self.location_status("Poor", 'default', 'evaluation_error')
     
     def verify_medical_license(self, registration_no, doctor_data=None):
         """Verify if the doctor has a valid medical license"""
@@ -479,9 +489,9 @@ class DoctorScoringEngine:
             category = self.get_rating_category(normalized_rating)
             return self.rating_scores.get(category)
     
-    def calculate_location_score(self, address):
+    def calculate_location_score(self, address, source=None, entity_id=None, entity_type=None, latitude=None, longitude=None):
         """Calculate score based on location"""
-        location_category = self.evaluate_location(address)
+        location_category = self.evaluate_location(address, source, entity_id, entity_type, latitude, longitude)
         return self.location_scores.get(location_category)
     
     def calculate_specialization_score(self, specialization):
@@ -700,7 +710,10 @@ class DoctorScoringEngine:
             # Calculate weighted rating score
             scores['weighted_rating_score'] = self.calculate_weighted_rating(rating, rating_count) if rating_count else scores['rating_score']
             
-            scores['location_score'] = self.calculate_location_score(address)
+            scores['location_status'] = self.evaluate_location_status(
+                address, source, getattr(doctor_data, 'id', None), 'doctor'
+            )
+            scores['location_score'] = self.location_scores.get(scores['location_status']['category'])
             scores['specialization_score'] = self.calculate_specialization_score(specialization)
             
             # Calculate license verification score
@@ -719,6 +732,7 @@ class DoctorScoringEngine:
             scores.setdefault('rating_score', 0)
             scores.setdefault('weighted_rating_score', 0)
             scores.setdefault('location_score', 0)
+            scores.setdefault('location_status', self.location_status("Poor", 'default', 'evaluation_error'))
             scores.setdefault('specialization_score', 0)
             scores.setdefault('license_verified', False)
             scores.setdefault('license_score', 0)
@@ -795,6 +809,8 @@ class DoctorScoringEngine:
             'specialization_score': scores['specialization_score'],
             'license_score': scores['license_score'],
             'license_verified': scores['license_verified'],
+            'location_status': scores['location_status'],
+            'location_degraded': scores['location_status']['degraded'],
             'normalized_qualification_score': normalized_scores['qualification_score'],
             'normalized_experience_score': normalized_scores['experience_score'],
             'normalized_rating_score': normalized_scores['rating_score'],
@@ -854,7 +870,14 @@ class DoctorScoringEngine:
                 scores['rating_score'] = 0
                 scores['weighted_rating_score'] = 0
                 
-            scores['location_score'] = self.calculate_location_score(address)
+            # Google Maps clinics carry coordinates, which allow borrowing a nearby analysed location
+            from cpapp.services.location_store import parse_coordinate
+            latitude = parse_coordinate(getattr(clinic_data, 'latitude', None))
+            longitude = parse_coordinate(getattr(clinic_data, 'longitude', None))
+            scores['location_status'] = self.evaluate_location_status(
+                address, source, getattr(clinic_data, 'id', None), 'clinic', latitude, longitude
+            )
+            scores['location_score'] = self.location_scores.get(scores['location_status']['category'])
             scores['rating_count'] = rating_count
             
             # Check if any associated doctors are verified
@@ -882,10 +905,8 @@ class DoctorScoringEngine:
                         found_doctor = False
                         
                         # Search in JustDial
-                        doctors = JustDialDoctor.objects.filter(doctor_name__icontains=doctor_name)
-                        if doctors.exists():
-                            doctor = doctors.first()
-                            doctor.refresh_from_db()
+                        doctor = JustDialDoctor.objects.filter(doctor_name__icontains=doctor_name).first()
+                        if doctor is not None:
                             doctor_score = self.score_doctor(doctor, "justdial")
                             doctor_score_sum += doctor_score['total_score']
                             doctor_count += 1
@@ -898,10 +919,8 @@ class DoctorScoringEngine:
                                 
                         # If not found in JustDial, try Practo
                         if not found_doctor:
-                            doctors = PractoDoctor.objects.filter(name__icontains=doctor_name)
-                            if doctors.exists():
-                                doctor = doctors.first()
-                                doctor.refresh_from_db()
+                            doctor = PractoDoctor.objects.filter(name__icontains=doctor_name).first()
+                            if doctor is not None:
                                 doctor_score = self.score_doctor(doctor, "practo")
                                 doctor_score_sum += doctor_score['total_score']
                                 doctor_count += 1
@@ -914,10 +933,8 @@ class DoctorScoringEngine:
                                 
                         # If not found in Practo, try NewPracto
                         if not found_doctor:
-                            doctors = NewPractoDoctor.objects.filter(doctor_name__icontains=doctor_name)
-                            if doctors.exists():
-                                doctor = doctors.first()
-                                doctor.refresh_from_db()
+                            doctor = NewPractoDoctor.objects.filter(doctor_name__icontains=doctor_name).first()
+                            if doctor is not None:
                                 doctor_score = self.score_doctor(doctor, "new_practo")
                                 doctor_score_sum += doctor_score['total_score']
                                 doctor_count += 1
@@ -936,14 +953,12 @@ class DoctorScoringEngine:
                             last_name = name_parts[1] if len(name_parts) > 1 else ''
                             
                             # Try searching by first name + last name
-                            doctors = NMCDoctor.objects.filter(
+                            doctor = NMCDoctor.objects.filter(
                                 firstName__icontains=first_name, 
                                 lastName__icontains=last_name
-                            )
+                            ).first()
                             
-                            if doctors.exists():
-                                doctor = doctors.first()
-                                doctor.refresh_from_db()
+                            if doctor is not None:
                                 doctor_score = self.score_doctor(doctor, "nmc")
                                 doctor_score_sum += doctor_score['total_score']
                                 doctor_count += 1
@@ -977,6 +992,7 @@ class DoctorScoringEngine:
             scores.setdefault('rating_score', 0)
             scores.setdefault('weighted_rating_score', 0)
             scores.setdefault('location_score', 0)
+            scores.setdefault('location_status', self.location_status("Poor", 'default', 'evaluation_error'))
             scores.setdefault('doctors_score', 0)
             scores.setdefault('verified_doctors_bonus', 0)
             scores.setdefault('rating_count', 0)
@@ -1040,6 +1056,8 @@ class DoctorScoringEngine:
             'location_score': scores['location_score'],
             'doctors_score': scores['doctors_score'],
             'verified_doctors_bonus': scores['verified_doctors_bonus'],
+            'location_status': scores['location_status'],
+            'location_degraded': scores['location_status']['degraded'],
             'normalized_rating_score': normalized_scores['rating_score'],
             'normalized_weighted_rating_score': normalized_scores['weighted_rating_score'],
             'normalized_location_score': normalized_scores['location_score'],
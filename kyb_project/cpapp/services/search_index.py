@@ -0,0 +1,573 @@
+"""
+Unified doctor and clinic search over a denormalized, trigram-indexed table.
+
+Each source entity is stored once in SearchDocument with its searched
+columns joined and lowercased into search_text, and its search result
+precomputed. A search is then one UNION ALL statement with a branch of up to
+`per_source` matches for every source. Queries are lowercased and matched
+with a plain LIKE rather than icontains, whose UPPER(...) LIKE UPPER(...)
+the pg_trgm GIN index on search_text cannot serve.
+
+Each source is paged separately by keyset on entity_id: a cursor holds the
+last entity_id returned per source, so a page is an index range scan rather
+than an OFFSET, and sources with no more matches drop out of the cursor.
+
+With a per-source timeout the branches run concurrently instead, on a
+bounded thread pool with a database connection per thread, and a source
+that misses the deadline is left out of a partial result rather than
+holding up the search. A source's deadline starts when a pool thread picks
+it up, so time queued behind other searches never makes a result partial.
+
+Saving or deleting a source entity updates its document through the
+post_save and post_delete handlers connected in CpappConfig.ready; the
+importers batch theirs through SearchIndexWriter instead. rebuild_search_index
+rebuilds the documents from the source tables: run it once on a new
+database, and with `--source <source>` after writes that send no signals
+(QuerySet.update, bulk_create, or tables loaded outside the ORM such as the
+Bajaj, Savein, NMC dental, new Practo and Google Maps data).
+"""
+
+import base64
+import json
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import nullcontext
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple, Type
+
+from django.conf import settings
+from django.db import close_old_connections, connection, models, transaction
+from django.db.models import Value
+from django.utils import timezone
+
+from cpapp.models.bajaj_doctor import BajajDoctor
+from cpapp.models.google_map_data import GoogleMapData
+from cpapp.models.justdial import JustDialClinic, JustDialDoctor
+from cpapp.models.nmc import NMCDoctor
+from cpapp.models.nmc_dental import NMCDentalDoctor
+from cpapp.models.practo import PractoDoctor
+from cpapp.models.practor_new import NewPractoDoctor
+from cpapp.models.savein_doctor import SaveinDoctor
+from cpapp.models.search_document import SearchDocument
+from cpapp.services.query_profile import QueryProfile, current_profile
+
+logger = logging.getLogger(__name__)
+
+# Searched columns are joined with a newline so a query never matches across two columns
+FIELD_SEPARATOR = '\n'
+
+
+def _practo_result(doctor: PractoDoctor) -> Dict[str, Any]:
+    return {
+        'id': doctor.id,
+        'name': doctor.name,
+        'source': 'practo',
+        'speciality': doctor.speciality,
+        'location': doctor.location,
+        'experience': doctor.experience,
+        'qualification': doctor.detailed_qualifications,
+        'rating': doctor.recommendation_percent,
+        'url': doctor.doctor_url,
+        'address': doctor.doctor_address,
+        'phone': doctor.contact_number
+    }
+
+
+def _justdial_doctor_result(doctor: JustDialDoctor) -> Dict[str, Any]:
+    return {
+        'id': doctor.id,
+        'name': doctor.doctor_name,
+        'source': 'justdial',
+        'speciality': doctor.category,
+        'location': doctor.location,
+        'experience': doctor.experience,
+        'qualification': doctor.qualification,
+        'rating': doctor.rating,
+        'phone': doctor.phone_number,
+        'registration': doctor.registration,
+        'address': doctor.clinic_address,
+        'url': doctor.detail_url
+    }
+
+
+def _nmc_result(doctor: NMCDoctor) -> Dict[str, Any]:
+    full_name = f"{doctor.firstName} {doctor.lastName if doctor.lastName else ''}"
+    return {
+        'id': doctor.id,
+        'name': full_name.strip(),
+        'source': 'nmc',
+        'speciality': 'Verified Doctor',
+        'location': doctor.address,
+        'experience': '',
+        'qualification': doctor.doctorDegree,
+        'rating': '',
+        'registration': doctor.registrationNo,
+    }
+
+
+def _nmc_dental_result(doctor: NMCDentalDoctor) -> Dict[str, Any]:
+    return {
+        'id': doctor.id,
+        'name': doctor.full_name,
+        'source': 'nmc_dental',
+        'speciality': 'Dentist',
+        'location': (doctor.state_medical_council or '').replace(' State Dental Council', '').strip(),
+        'experience': '',
+        'qualification': doctor.qualification,
+        'rating': '',
+        'registration': doctor.registration_number,
+    }
+
+
+def _bajaj_result(doctor: BajajDoctor) -> Dict[str, Any]:
+    return {
+        'id': doctor.id,
+        'name': doctor.name,
+        'source': 'bajaj',
+        'speciality': doctor.specialities,
+        'location': doctor.clinic_address,
+        'experience': doctor.experience,
+        'qualification': doctor.qualifications,
+        'rating': doctor.rating_percent,
+        'rating_count': doctor.rating_count,
+        'address': doctor.clinic_address,
+        'clinic_name': doctor.clinic_name,
+        'hpr_id': doctor.hpr_id
+    }
+
+
+def _savein_result(doctor: SaveinDoctor) -> Dict[str, Any]:
+    return {
+        'id': doctor.id,
+        'name': doctor.doctor_name,
+        'source': 'savein',
+        'speciality': doctor.specialization,
+        'location': doctor.location,
+        'experience': doctor.experience,
+        'qualification': doctor.qualification,
+        'rating': doctor.rating,
+        'rating_count': doctor.reviews_count,
+        'address': doctor.address,
+        'consultation_fee': doctor.consultation_fee,
+        'price_category': doctor.price_category,
+        'services': doctor.services
+    }
+
+
+def _new_practo_result(doctor: NewPractoDoctor) -> Dict[str, Any]:
+    clinic_data = doctor.clinic_data
+    return {
+        'id': doctor.id,
+        'name': doctor.doctor_name,
+        'source': 'new_practo',
+        'speciality': doctor.specialization,
+        'location': doctor.location,
+        'experience': doctor.experience,
+        'qualification': doctor.qualification,
+        'rating': doctor.rating,
+        'rating_count': doctor.rating_count,
+        'address': clinic_data.get('address', '') if isinstance(clinic_data, dict) else '',
+        'services': doctor.services,
+        'education': doctor.education,
+        'registration': doctor.registration,
+    }
+
+
+def _justdial_clinic_result(clinic: JustDialClinic) -> Dict[str, Any]:
+    return {
+        'id': clinic.id,
+        'name': clinic.name,
+        'source': 'justdial',
+        'category': clinic.category,
+        'speciality': clinic.category,
+        'location': clinic.address,
+        'rating': clinic.rating,
+        'address': clinic.address
+    }
+
+
+def _googlemap_result(place: GoogleMapData) -> Dict[str, Any]:
+    return {
+        'id': place.id,
+        'name': place.name,
+        'source': 'googlemap',
+        'category': place.category,
+        'type': place.type,
+        'location': place.full_address,
+        'address': place.full_address,
+        'rating': place.rating,
+        'rating_count': place.reviews,
+        'verified': place.verified
+    }
+
+
+class SearchSource(NamedTuple):
+    """A searchable source table"""
+    entity_type: str
+    source: str
+    model: Type[models.Model]
+    fields: Tuple[str, ...]                               # Searched columns
+    result: Callable[[models.Model], Dict[str, Any]]      # Search result of an entity
+    columns: Tuple[str, ...]                              # Columns read by result
+
+    @property
+    def label(self) -> str:
+        return f"{self.source}_{self.entity_type}"
+
+    def entities(self) -> models.QuerySet:
+        """Entities of the source with only the columns the index needs loaded"""
+        return self.model.objects.only(*dict.fromkeys(self.fields + self.columns)).order_by('pk')
+
+
+# In result order
+SEARCH_SOURCES = [
+    SearchSource(
+        'doctor', 'practo', PractoDoctor, ('name', 'speciality'), _practo_result,
+        ('location', 'experience', 'detailed_qualifications', 'recommendation_percent', 'doctor_url',
+         'doctor_address', 'contact_number')
+    ),
+    SearchSource(
+        'doctor', 'justdial', JustDialDoctor, ('doctor_name', 'category'), _justdial_doctor_result,
+        ('location', 'experience', 'qualification', 'rating', 'phone_number', 'registration', 'clinic_address',
+         'detail_url')
+    ),
+    SearchSource(
+        'doctor', 'nmc', NMCDoctor, ('firstName', 'lastName'), _nmc_result,
+        ('address', 'doctorDegree', 'registrationNo')
+    ),
+    SearchSource(
+        'doctor', 'nmc_dental', NMCDentalDoctor, ('full_name', 'qualification'), _nmc_dental_result,
+        ('state_medical_council', 'registration_number')
+    ),
+    SearchSource(
+        'doctor', 'bajaj', BajajDoctor, ('name', 'specialities'), _bajaj_result,
+        ('clinic_address', 'experience', 'qualifications', 'rating_percent', 'rating_count', 'clinic_name', 'hpr_id')
+    ),
+    SearchSource(
+        'doctor', 'savein', SaveinDoctor, ('name', 'doctor_name', 'specialization'), _savein_result,
+        ('location', 'experience', 'qualification', 'rating', 'reviews_count', 'address', 'consultation_fee',
+         'price_category', 'services')
+    ),
+    SearchSource(
+        'doctor', 'new_practo', NewPractoDoctor, ('doctor_name', 'specialization'), _new_practo_result,
+        ('location', 'experience', 'qualification', 'rating', 'rating_count', 'associated_clinic_data', 'services',
+         'education', 'registration')
+    ),
+    SearchSource(
+        'clinic', 'justdial', JustDialClinic, ('name', 'category'), _justdial_clinic_result,
+        ('address', 'rating')
+    ),
+    SearchSource(
+        'clinic', 'googlemap', GoogleMapData, ('name', 'category', 'full_address'), _googlemap_result,
+        ('type', 'rating', 'reviews', 'verified')
+    ),
+]
+
+SOURCES_BY_KEY = {(source.entity_type, source.source): source for source in SEARCH_SOURCES}
+
+# (entity_type, source) of the SearchIndexWriters open in this context
+_batched = ContextVar('search_index_batched', default=frozenset())
+
+
+def search_document(source: SearchSource, entity: models.Model, now=None) -> Optional[SearchDocument]:
+    """Unsaved search document of an entity, or None when it has nothing to search"""
+    text = FIELD_SEPARATOR.join(
+        str(value) for value in (getattr(entity, field) for field in source.fields) if value not in (None, '')
+    ).lower()
+    if not text:
+        return None
+    try:
+        result = source.result(entity)
+    except Exception as e:
+        logger.error(f"Error building search result of {source.source} {source.entity_type} {entity.pk}: {str(e)}")
+        return None
+    return SearchDocument(
+        entity_type=source.entity_type,
+        source=source.source,
+        entity_id=entity.pk,
+        search_text=text,
+        result=result,
+        updated_at=now or timezone.now(),
+    )
+
+
+def index_entities(entity_type: str, source_name: str, entities: Iterable[models.Model]) -> int:
+    """
+    Insert or update the search documents of entities of one source
+
+    Returns:
+        int: Number of documents written
+    """
+    source = SOURCES_BY_KEY[(entity_type, source_name)]
+    now = timezone.now()
+    documents = [document for document in (search_document(source, entity, now) for entity in entities) if document]
+    if not documents:
+        return 0
+    SearchDocument.objects.bulk_create(
+        documents,
+        update_conflicts=True,
+        unique_fields=['entity_type', 'source', 'entity_id'],
+        update_fields=['search_text', 'result', 'updated_at'],
+    )
+    return len(documents)
+
+
+class SearchIndexWriter:
+    """
+    Buffers imported entities of one source and indexes them in batches
+
+    Use as a context manager so the last batch is written on exit.
+    """
+
+    def __init__(self, entity_type: str, source: str, batch_size: int = 500):
+        self.entity_type = entity_type
+        self.source = source
+        self.batch_size = batch_size
+        self.pending = []
+        self.written = 0
+
+    def add(self, entity: models.Model):
+        self.pending.append(entity)
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self.pending:
+            self.written += index_entities(self.entity_type, self.source, self.pending)
+            self.pending = []
+
+    def __enter__(self):
+        # Saves of this source are left to the writer rather than indexed one by one
+        self._token = _batched.set(_batched.get() | {(self.entity_type, self.source)})
+        return self
+
+    def __exit__(self, *exc_info):
+        _batched.reset(self._token)
+        self.flush()
+
+
+def _indexed_sources(model: Type[models.Model]) -> List[SearchSource]:
+    """Sources of a model whose saves are indexed by the signal handlers"""
+    batched = _batched.get()
+    return [
+        source for source in SEARCH_SOURCES
+        if source.model is model and (source.entity_type, source.source) not in batched
+    ]
+
+
+def index_saved_entity(sender, instance, raw=False, **kwargs):
+    """post_save handler that writes the search document of a saved source entity"""
+    if raw:
+        return  # Fixtures (loaddata) are indexed by rebuild_search_index
+    for source in _indexed_sources(sender):
+        if not index_entities(source.entity_type, source.source, [instance]):
+            # Nothing left to search: drop the document of its previous values
+            SearchDocument.objects.filter(
+                entity_type=source.entity_type, source=source.source, entity_id=instance.pk
+            ).delete()
+
+
+def unindex_deleted_entity(sender, instance, **kwargs):
+    """post_delete handler that removes the search document of a deleted source entity"""
+    for source in SEARCH_SOURCES:
+        if source.model is sender:
+            SearchDocument.objects.filter(
+                entity_type=source.entity_type, source=source.source, entity_id=instance.pk
+            ).delete()
+
+
+class SearchResults(NamedTuple):
+    """Results of a search"""
+    results: List[Dict[str, Any]]
+    partial: bool                       # Some sources missed the deadline or failed and were left out
+    timings: Dict[str, Optional[float]]  # Milliseconds per source (None when left out); fan-out searches only
+    next_cursor: Dict[str, int]         # Last entity_id per source with more matches (empty on the last page)
+
+
+def encode_cursor(cursor: Dict[str, int]) -> Optional[str]:
+    """Opaque URL-safe token of a search cursor, or None for an empty one"""
+    if not cursor:
+        return None
+    return base64.urlsafe_b64encode(json.dumps(cursor, separators=(',', ':')).encode()).decode().rstrip('=')
+
+
+def decode_cursor(token: str) -> Dict[str, int]:
+    """
+    Search cursor of a token made by encode_cursor
+
+    Raises:
+        ValueError: The token is not a valid cursor
+    """
+    try:
+        cursor = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {str(e)}")
+    labels = {source.label for source in SEARCH_SOURCES}
+    if not isinstance(cursor, dict) or not all(
+        label in labels and isinstance(after, int) and not isinstance(after, bool)
+        for label, after in cursor.items()
+    ):
+        raise ValueError("Invalid cursor")
+    return cursor
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Thread pool shared by the fan-out searches of this process"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'SEARCH_WORKERS', len(SEARCH_SOURCES)),
+                thread_name_prefix='search'
+            )
+        return _executor
+
+
+def _source_query(rank: int, source: SearchSource, query: str, limit: int, after: int = 0):
+    """(rank, entity_id, result) rows of one source after a keyset position, in entity_id order"""
+    return (
+        SearchDocument.objects
+        .filter(
+            entity_type=source.entity_type,
+            source=source.source,
+            entity_id__gt=after,
+            search_text__contains=query.lower()
+        )
+        .annotate(source_rank=Value(rank))
+        .order_by('entity_id')
+        .values_list('source_rank', 'entity_id', 'result')[:limit]
+    )
+
+
+def _search_source(rank: int, source: SearchSource, query: str, limit: int, after: int, timeout: float):
+    """Rows of one source and the milliseconds they took, run on a pool thread"""
+    close_old_connections()
+    try:
+        started = time.perf_counter()
+        with transaction.atomic():
+            if connection.vendor == 'postgresql':
+                # Stop the query in the database too once the search has given up on it
+                with connection.cursor() as cursor:
+                    cursor.execute('SET LOCAL statement_timeout = %s', [max(int(timeout * 1000), 1)])
+            rows = list(_source_query(rank, source, query, limit, after))
+        return rows, (time.perf_counter() - started) * 1000
+    finally:
+        close_old_connections()
+
+
+def _run_source(started: Dict[str, float], label: str, profile: Optional[QueryProfile], *args):
+    """
+    _search_source, recording when a pool thread picked it up
+
+    The queries are added to the profile of the request that ran the search.
+    """
+    started[label] = time.monotonic()
+    with connection.execute_wrapper(profile) if profile else nullcontext():
+        return _search_source(*args)
+
+
+def search(
+    query: str,
+    entity_type: str = 'all',
+    per_source: int = 10,
+    timeout: Optional[float] = None,
+    cursor: Optional[Dict[str, int]] = None
+) -> SearchResults:
+    """
+    Search results of every source matching a substring query
+
+    Args:
+        query: Text searched (case-insensitively) in the searched columns
+        entity_type: 'doctor', 'clinic' or 'all'
+        per_source: Maximum results per source
+        timeout: Seconds each source may take once it starts running;
+            sources are then searched concurrently and the late ones left
+            out. Without it all sources are searched in one statement.
+        cursor: next_cursor of the previous page; only the sources it
+            holds are searched, after their last returned entity
+
+    Returns:
+        SearchResults, with results grouped by source in SEARCH_SOURCES order
+        and by entity_id within a source
+    """
+    sources = [
+        (rank, source) for rank, source in enumerate(SEARCH_SOURCES)
+        if entity_type in ('all', source.entity_type) and (cursor is None or source.label in cursor)
+    ]
+    if not sources:
+        return SearchResults([], False, {}, {})
+    cursor = cursor or {}
+
+    # One extra row per source tells whether it has another page
+    limit = per_source + 1
+    partial = False
+    timings = {}
+    next_cursor = {}
+    if timeout:
+        started = {}
+        profile = current_profile()
+        futures = {
+            _get_executor().submit(
+                _run_source, started, source.label, profile,
+                rank, source, query, limit, cursor.get(source.label, 0), timeout
+            ): source
+            for rank, source in sources
+        }
+        pending = set(futures)
+        late = set()
+        while pending:
+            now = time.monotonic()
+            deadlines = {
+                future: started[futures[future].label] + timeout
+                for future in pending if futures[future].label in started
+            }
+            expired = {future for future, deadline in deadlines.items() if deadline <= now and not future.done()}
+            late |= expired
+            pending -= expired
+            if pending:
+                # Queued sources have no deadline yet: look again once one might have started
+                next_deadline = min((deadlines[future] for future in pending if future in deadlines), default=now + timeout)
+                _, pending = wait(pending, timeout=next_deadline - now, return_when=FIRST_COMPLETED)
+        rows = []
+        for future, source in futures.items():
+            timings[source.label] = None
+            if future in late:
+                future.cancel()
+                logger.warning(f"Search of {source.label} for '{query}' missed the {timeout}s deadline")
+            elif future.exception() is not None:
+                logger.error(f"Search of {source.label} for '{query}' failed: {str(future.exception())}")
+            else:
+                source_rows, timings[source.label] = future.result()
+                rows.extend(source_rows)
+                continue
+            # Left out: the next page retries the source from the same position
+            partial = True
+            next_cursor[source.label] = cursor.get(source.label, 0)
+    else:
+        branches = [
+            _source_query(rank, source, query, limit, cursor.get(source.label, 0))
+            for rank, source in sources
+        ]
+        if connection.features.supports_slicing_ordering_in_compound:
+            rows = list(branches[0].union(*branches[1:], all=True))
+        else:
+            rows = [row for branch in branches for row in branch]
+
+    rows.sort(key=lambda row: (row[0], row[1]))
+    results = []
+    taken = {}
+    last_ids = {}
+    for rank, entity_id, result in rows:
+        taken[rank] = taken.get(rank, 0) + 1
+        if taken[rank] > per_source:
+            next_cursor[SEARCH_SOURCES[rank].label] = last_ids[rank]
+            continue
+        last_ids[rank] = entity_id
+        results.append(result)
+    return SearchResults(results, partial, timings, next_cursor)
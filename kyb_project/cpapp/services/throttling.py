@@ -0,0 +1,106 @@
+import threading
+import time
+from typing import Optional
+
+
+class RateLimiter:
+    """
+    Thread-safe client-side rate limiter.
+
+    Spaces calls evenly so that no more than `rate` calls per second are made
+    across every thread sharing the limiter.
+    """
+
+    def __init__(self, rate: float):
+        """
+        Args:
+            rate (float): Maximum calls per second (0 or less disables limiting)
+        """
+        self.rate = rate
+        self.interval = 1.0 / rate if rate and rate > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the caller may make a call.
+
+        Args:
+            timeout (float, optional): Maximum seconds to wait for a slot
+
+        Returns:
+            bool: True if a slot was reserved, False if it would exceed the timeout
+        """
+        if not self.interval:
+            return True
+
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            wait = slot - now
+            if timeout is not None and wait > timeout:
+                return False
+            self._next_slot = slot + self.interval
+
+        if wait > 0:
+            time.sleep(wait)
+        return True
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    Holds up to `capacity` tokens and refills continuously at
+    `capacity / period` tokens per second.
+    """
+
+    def __init__(self, capacity: float, period: float):
+        """
+        Args:
+            capacity (float): Maximum tokens (the budget per period)
+            period (float): Seconds needed to refill an empty bucket
+        """
+        self.capacity = float(capacity)
+        self.refill_rate = self.capacity / period if period > 0 else float('inf')
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.refill_rate)
+            self._updated = now
+
+    @property
+    def tokens(self) -> float:
+        """Tokens currently available"""
+        with self._lock:
+            self._refill(time.monotonic())
+            return self._tokens
+
+    def wait_time(self, amount: float = 1.0) -> float:
+        """Seconds until `amount` tokens will be available (0 if available now)"""
+        with self._lock:
+            self._refill(time.monotonic())
+            missing = amount - self._tokens
+            if missing <= 0:
+                return 0.0
+            if amount > self.capacity:
+                return float('inf')
+            return missing / self.refill_rate
+
+    def try_consume(self, amount: float = 1.0) -> bool:
+        """Take `amount` tokens if available, without blocking"""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= amount:
+                self._tokens -= amount
+                return True
+            return False
+
+    def refund(self, amount: float = 1.0):
+        """Return tokens taken by a call that never happened"""
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + amount)
@@ -0,0 +1,87 @@
+import unittest
+import os
+import sys
+import time
+
+# Add the project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from cpapp.services import metrics
+from cpapp.services.circuit_breaker import CircuitBreaker, CircuitOpenError, CLOSED, OPEN, HALF_OPEN
+from cpapp.services.geoiq_scheduler import GeoIQScheduler, BATCH
+
+
+class FailingGeoIQService:
+    def __init__(self, breaker):
+        self.circuit_breaker = breaker
+        self.calls = 0
+
+    def analyze_location(self, latitude=None, longitude=None, address=None, pincode=None, radius=1000):
+        self.calls += 1
+        if not self.circuit_breaker.allow_request():
+            raise CircuitOpenError("open")
+        self.circuit_breaker.record_failure()
+        raise ConnectionError("GeoIQ timed out")
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def setUp(self):
+        metrics.reset()
+
+    def test_opens_after_threshold_and_recovers_through_half_open(self):
+        breaker = CircuitBreaker("test", failure_threshold=2, recovery_timeout=0.05)
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CLOSED)
+        breaker.record_failure()
+        self.assertEqual(breaker.state, OPEN)
+        self.assertFalse(breaker.allow_request())
+
+        time.sleep(0.06)
+        self.assertEqual(breaker.state, HALF_OPEN)
+        self.assertTrue(breaker.allow_request())
+        # Only one probe at a time while half open
+        self.assertFalse(breaker.allow_request())
+        breaker.record_success()
+        self.assertEqual(breaker.state, CLOSED)
+
+        counters = metrics.snapshot()["counters"]
+        self.assertEqual(counters['circuit_breaker_transitions_total{breaker="test",from_state="closed",to_state="open"}'], 1)
+        self.assertEqual(counters['circuit_breaker_transitions_total{breaker="test",from_state="half_open",to_state="closed"}'], 1)
+
+    def test_failed_probe_reopens(self):
+        breaker = CircuitBreaker("test", failure_threshold=1, recovery_timeout=0.05)
+        breaker.record_failure()
+        time.sleep(0.06)
+        self.assertTrue(breaker.allow_request())
+        breaker.record_failure()
+        self.assertEqual(breaker.state, OPEN)
+        self.assertEqual(metrics.snapshot()["gauges"]['circuit_breaker_state{breaker="test"}'], 2)
+
+    def test_open_circuit_answers_from_memory_without_upstream_call(self):
+        breaker = CircuitBreaker("geoiq", failure_threshold=1, recovery_timeout=60)
+        service = FailingGeoIQService(breaker)
+        scheduler = GeoIQScheduler(service, per_minute=100, stored_lookup=lambda key: None)
+        scheduler.seed_pincode_defaults({"560034": {"Medium": 3, "Poor": 1}})
+
+        first = scheduler.analyze_location(address="Koramangala, Bangalore 560034")
+        self.assertEqual(first["degraded_reason"], "upstream_error")
+        self.assertEqual(breaker.state, OPEN)
+
+        started = time.perf_counter()
+        result = scheduler.analyze_location(address="HSR Layout, Bangalore 560034")
+        elapsed = time.perf_counter() - started
+
+        self.assertLess(elapsed, 0.01)
+        self.assertEqual(service.calls, 1)
+        self.assertTrue(result["degraded"])
+        self.assertEqual(result["degraded_reason"], "circuit_open")
+        self.assertEqual(result["fallback_source"], "pincode_default")
+        self.assertEqual(result["location_score"]["category"], "Medium")
+
+        with self.assertRaises(CircuitOpenError):
+            scheduler.analyze_location(address="HSR Layout, Bangalore 560034", priority=BATCH)
+
+
+if __name__ == '__main__':
+    unittest.main()
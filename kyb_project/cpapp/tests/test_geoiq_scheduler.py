@@ -0,0 +1,138 @@
+import unittest
+import os
+import sys
+import threading
+import time
+
+# Add the project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from cpapp.services.geoiq_scheduler import GeoIQScheduler, GeoIQBudgetExceeded, BATCH
+
+
+class FakeGeoIQService:
+    def __init__(self, delay=0.0, gate=None):
+        self.delay = delay
+        self.gate = gate
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def analyze_location(self, latitude=None, longitude=None, address=None, pincode=None, radius=1000):
+        if self.gate is not None:
+            self.gate.wait()
+        with self.lock:
+            self.calls.append(address)
+        time.sleep(self.delay)
+        return {"location_score": {"points": 20, "max_points": 30, "category": "Prime"}, "raw_data": {}}
+
+
+class TestGeoIQScheduler(unittest.TestCase):
+    def make_scheduler(self, service, **kwargs):
+        kwargs.setdefault("stored_lookup", lambda key: None)
+        return GeoIQScheduler(service, **kwargs)
+
+    def test_concurrent_identical_requests_are_coalesced(self):
+        service = FakeGeoIQService(delay=0.2)
+        scheduler = self.make_scheduler(service, per_minute=100, workers=2)
+        results = []
+
+        def call():
+            results.append(scheduler.analyze_location(address="MG Road, Bangalore"))
+
+        threads = [threading.Thread(target=call) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(service.calls), 1)
+        self.assertEqual(len(results), 5)
+        self.assertTrue(all(r["location_score"]["category"] == "Prime" for r in results))
+        self.assertEqual(scheduler.stats()["counts"]["coalesced"], 4)
+
+    def test_interactive_lane_runs_before_batch(self):
+        gate = threading.Event()
+        service = FakeGeoIQService(gate=gate)
+        scheduler = self.make_scheduler(service, per_minute=1000, workers=1, batch_reserve=0)
+
+        threads = [
+            threading.Thread(target=scheduler.analyze_location,
+                             kwargs={"address": f"batch {i}", "priority": BATCH})
+            for i in range(3)
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.1)
+        interactive = threading.Thread(target=scheduler.analyze_location,
+                                       kwargs={"address": "interactive", "max_wait": 5})
+        interactive.start()
+        time.sleep(0.1)
+        self.assertEqual(scheduler.stats()["queue_depth"], {"interactive": 1, "batch": 2})
+
+        gate.set()
+        for thread in threads + [interactive]:
+            thread.join()
+
+        # The first batch job was already running; the interactive one jumps the rest
+        self.assertEqual(service.calls[1], "interactive")
+
+    def test_exhausted_budget_degrades_interactive_requests(self):
+        service = FakeGeoIQService()
+        scheduler = self.make_scheduler(service, per_minute=1, per_day=100)
+
+        first = scheduler.analyze_location(address="first")
+        self.assertNotIn("degraded", first)
+
+        degraded = scheduler.analyze_location(address="second", max_wait=0.2)
+        self.assertTrue(degraded["degraded"])
+        self.assertEqual(degraded["fallback_source"], "default")
+        self.assertEqual(degraded["location_score"]["category"], "Poor")
+
+        cached = scheduler.analyze_location(address="first", max_wait=0.2)
+        self.assertTrue(cached["degraded"])
+        self.assertEqual(cached["fallback_source"], "cache")
+        self.assertEqual(cached["location_score"]["category"], "Prime")
+        self.assertEqual(len(service.calls), 1)
+
+    def test_stored_location_used_when_degraded(self):
+        stored = {"location_score": {"points": 14, "max_points": 30, "category": "Medium"}, "raw_data": {}}
+        scheduler = self.make_scheduler(FakeGeoIQService(), per_minute=1, stored_lookup=lambda key: dict(stored))
+        scheduler.analyze_location(address="first")
+
+        result = scheduler.analyze_location(address="second", max_wait=0.2)
+        self.assertEqual(result["fallback_source"], "stored")
+        self.assertEqual(result["location_score"]["category"], "Medium")
+
+    def test_exhausted_day_budget_fails_batch_requests(self):
+        scheduler = self.make_scheduler(FakeGeoIQService(), per_minute=100, per_day=1, batch_reserve=0)
+        scheduler.analyze_location(address="first", priority=BATCH)
+        with self.assertRaises(GeoIQBudgetExceeded):
+            scheduler.analyze_location(address="second", priority=BATCH, max_wait=0.2)
+
+    def test_max_wait_does_not_cut_off_a_started_call(self):
+        scheduler = self.make_scheduler(FakeGeoIQService(delay=0.3), per_minute=100)
+        result = scheduler.analyze_location(address="slow but healthy", max_wait=0.1)
+        self.assertNotIn("degraded", result)
+        self.assertEqual(result["location_score"]["category"], "Prime")
+
+    def test_batch_caller_keeps_waiting_after_interactive_joiner_gives_up(self):
+        # 120 per minute: the next slot opens within half a second of draining the bucket
+        scheduler = self.make_scheduler(FakeGeoIQService(), per_minute=120, batch_reserve=0)
+        while scheduler.minute_bucket.try_consume():
+            pass
+        results = []
+        batch = threading.Thread(target=lambda: results.append(
+            scheduler.analyze_location(address="shared", priority=BATCH)
+        ))
+        batch.start()
+        time.sleep(0.05)
+
+        interactive = scheduler.analyze_location(address="shared", max_wait=0.1)
+        self.assertEqual(interactive["degraded_reason"], "queue_timeout")
+        batch.join(timeout=5)
+        self.assertEqual(results[0]["location_score"]["category"], "Prime")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import unittest
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+# Add the project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from cpapp.services.location_features import (
+    LOCATION_VARIABLES, LocationFeatureStore, score_location, score_matrix, to_matrix
+)
+
+
+def reference_points(raw):
+    """The scalar location rules as previously written in GeoIQService.analyze_location"""
+    g = lambda name: raw.get(name, 0)
+    fitness = g('br_anytimefitness_ct') + g('br_cult_ct') + g('br_goldsgym_ct')
+    premium = sum(g(n) for n in ('br_lifestyle_ct', 'br_shoppersstop_ct', 'br_zara_ct', 'br_miniso_ct',
+                                 'br_tanishq_ct', 'br_calvinklein_ct', 'br_tommyhilfiger_ct'))
+    healthcare = sum(g(n) for n in ('br_apollohospitals_ct', 'br_maxhealthcare_ct',
+                                    'br_fortishealthcare_ct', 'br_medantathemedicity_ct'))
+    points = 0
+    if g('w_hh_income_10l_above_perc') > 25 or g('w_hh_income_20l_above_perc') > 10:
+        points += 10
+    elif g('w_hh_income_10l_above_perc') > 15 or g('w_hh_income_5l_above_perc') > 30:
+        points += 7
+    elif g('w_hh_income_5l_above_perc') > 20 or g('secc_p_hh_pay_it_pt_r') > 15:
+        points += 4
+    if g('p_retail_gc_np') > 20 or g('p_retail_rppsfa') > 150:
+        points += 7
+    elif g('p_retail_gc_np') > 10 or g('p_retail_rppsfa') > 100:
+        points += 4
+    elif g('p_retail_gc_np') > 5 or g('p_restaurant_rt_np') > 10:
+        points += 2
+    if premium >= 5 or g('br_restaurant_ch_nt') > 0.5:
+        points += 8
+    elif premium >= 3 or fitness >= 3:
+        points += 5
+    elif premium >= 1 or fitness >= 1:
+        points += 2
+    if healthcare >= 3:
+        points += 5
+    elif healthcare >= 1:
+        points += 3
+    category = "Prime" if points >= 20 else "Medium" if points >= 12 else "Poor"
+    return points, category
+
+
+def random_locations(count, seed=7):
+    rng = np.random.default_rng(seed)
+    locations = []
+    for _ in range(count):
+        raw = {}
+        for name in LOCATION_VARIABLES:
+            if rng.random() < 0.2:
+                continue
+            if name.endswith('_ct'):
+                raw[name] = int(rng.integers(0, 4))
+            elif name == 'br_restaurant_ch_nt':
+                raw[name] = round(float(rng.random()), 2)
+            else:
+                raw[name] = round(float(rng.uniform(0, 200)), 1)
+        locations.append(raw)
+    return locations
+
+
+class TestLocationFeatures(unittest.TestCase):
+    def test_kernel_matches_scalar_rules(self):
+        locations = random_locations(2000)
+        points, categories = score_matrix(to_matrix(locations))
+        for i, raw in enumerate(locations):
+            self.assertEqual((int(points[i]), str(categories[i])), reference_points(raw))
+
+    def test_score_location_handles_missing_and_null_values(self):
+        result = score_location({'w_hh_income_20l_above_perc': 12, 'p_retail_gc_np': None, 'br_apollohospitals_ct': 3})
+        self.assertEqual(result['points'], 15)
+        self.assertEqual(result['category'], 'Medium')
+        self.assertEqual(result['factors']['healthcare_facilities'], 3)
+
+    def test_store_grows_upserts_and_reopens(self):
+        locations = random_locations(1500, seed=3)
+        with tempfile.TemporaryDirectory() as path:
+            store = LocationFeatureStore(path)
+            store.upsert_many((f'key{i}', raw) for i, raw in enumerate(locations))
+            store.upsert('key0', {'w_hh_income_20l_above_perc': 50})
+            store.flush()
+
+            reopened = LocationFeatureStore(path)
+            self.assertEqual(len(reopened), 1500)
+            keys, points, categories = reopened.score_all()
+            self.assertEqual(keys[0], 'key0')
+            self.assertEqual(int(points[0]), 10)
+            self.assertEqual((int(points[1]), str(categories[1])), reference_points(locations[1]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+import os
+import sys
+import random
+import time
+
+# Add the project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from cpapp.services.location_index import GridIndex, haversine_m
+
+
+class TestGridIndex(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(11)
+        # Clinics scattered around Bangalore
+        self.points = [(i, 12.9 + rng.random() * 0.2, 77.5 + rng.random() * 0.2) for i in range(5000)]
+        self.index = GridIndex(cell_size_m=500)
+        for location_id, lat, lng in self.points:
+            self.index.add(location_id, lat, lng)
+
+    def brute_force(self, lat, lng, max_distance):
+        best = None
+        for location_id, plat, plng in self.points:
+            distance = haversine_m(lat, lng, plat, plng)
+            if distance <= max_distance and (best is None or distance < best[1]):
+                best = (location_id, distance)
+        return best
+
+    def test_nearest_matches_brute_force(self):
+        rng = random.Random(5)
+        for _ in range(60):
+            lat, lng = 12.9 + rng.random() * 0.2, 77.5 + rng.random() * 0.2
+            for max_distance in (50, 150, 700):
+                expected = self.brute_force(lat, lng, max_distance)
+                found = self.index.nearest(lat, lng, max_distance)
+                if expected is None:
+                    self.assertIsNone(found)
+                else:
+                    self.assertEqual(found[0], expected[0])
+                    self.assertAlmostEqual(found[1], expected[1], places=6)
+
+    def test_incremental_add_and_move(self):
+        self.index.add(99999, 13.2, 77.9)
+        self.assertEqual(self.index.nearest(13.2001, 77.9, 100)[0], 99999)
+        self.index.add(99999, 13.3, 77.9)
+        self.assertIsNone(self.index.nearest(13.2001, 77.9, 100))
+        self.assertEqual(len(self.index), 5001)
+
+    def test_query_is_fast(self):
+        start = time.perf_counter()
+        for _ in range(1000):
+            self.index.nearest(12.95, 77.55, 200)
+        self.assertLess((time.perf_counter() - start) / 1000, 0.001)
+
+
+if __name__ == '__main__':
+    unittest.main()
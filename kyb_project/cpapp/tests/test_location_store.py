@@ -0,0 +1,61 @@
+import unittest
+import os
+import sys
+import time
+
+# Add the project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from cpapp.services.location_store import location_key, normalize_address, parse_coordinate
+from cpapp.services.throttling import RateLimiter
+
+
+class TestLocationKey(unittest.TestCase):
+    def test_coordinates_preferred_over_address(self):
+        key = location_key(12.9715987, 77.5945627, "MG Road, Bangalore")
+        self.assertEqual(key, "geo:12.97160,77.59456")
+
+    def test_address_spelling_variants_share_key(self):
+        key_a = location_key(address="12, MG Road,  Bangalore")
+        key_b = location_key(address="12 mg road bangalore.")
+        self.assertEqual(key_a, key_b)
+        self.assertTrue(key_a.startswith("addr:"))
+
+    def test_pincode_changes_key(self):
+        self.assertNotEqual(
+            location_key(address="MG Road", pincode="560001"),
+            location_key(address="MG Road", pincode="560002")
+        )
+
+    def test_empty_location_has_no_key(self):
+        self.assertIsNone(location_key(address="  ,  "))
+        self.assertEqual(normalize_address(None), "")
+
+    def test_parse_coordinate(self):
+        self.assertEqual(parse_coordinate(" 12.5 "), 12.5)
+        self.assertIsNone(parse_coordinate("not a number"))
+        self.assertIsNone(parse_coordinate(""))
+
+
+class TestRateLimiter(unittest.TestCase):
+    def test_spaces_calls(self):
+        limiter = RateLimiter(rate=50)
+        start = time.monotonic()
+        for _ in range(6):
+            limiter.acquire()
+        # 6 calls at 50/s need at least 5 intervals of 20ms
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+
+    def test_timeout_refuses_slot(self):
+        limiter = RateLimiter(rate=1)
+        self.assertTrue(limiter.acquire())
+        self.assertFalse(limiter.acquire(timeout=0.01))
+
+    def test_disabled(self):
+        limiter = RateLimiter(rate=0)
+        self.assertTrue(limiter.acquire(timeout=0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+import io
+import json
+import unittest
+import os
+import sys
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+import requests
+
+# Add the project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'kyb_project.settings')
+
+from cpapp.services.Google_review_out_scraper import (
+    ByteBudgetExceeded, OutscraperMapsReviewsAPI, get_outscraper_client, retry_after_seconds
+)
+from cpapp.services.throttling import RateLimiter
+
+
+def response(status_code, headers=None, body=b'{"data": []}'):
+    result = requests.Response()
+    result.status_code = status_code
+    result.headers.update(headers or {})
+    result._content = body
+    result.raw = io.BytesIO(body)
+    return result
+
+
+class TestOutscraperClient(unittest.TestCase):
+    def setUp(self):
+        self.client = OutscraperMapsReviewsAPI('key', max_retries=3, rate_limiter=RateLimiter(0))
+        self.client.backoff = 0.5
+        self.client.max_backoff = 4
+
+    def test_retries_throttled_requests_honouring_retry_after(self):
+        replies = [response(429, {'Retry-After': '2'}), response(503), response(200)]
+        with mock.patch.object(self.client.session, 'get', side_effect=replies) as get, \
+                mock.patch('cpapp.services.Google_review_out_scraper.time.sleep') as sleep:
+            result = self.client.get_reviews('clinic', async_request=False)
+        self.assertEqual(result, {'data': []})
+        self.assertEqual(get.call_count, 3)
+        self.assertEqual([c.args[0] for c in sleep.call_args_list], [2.0, 1.0])
+        self.assertEqual(get.call_args.kwargs['timeout'], self.client.timeout)
+
+    def test_retries_are_bounded(self):
+        with mock.patch.object(self.client.session, 'get', side_effect=[response(429, {'Retry-After': '60'})] * 4 + [response(200)]) as get, \
+                mock.patch('cpapp.services.Google_review_out_scraper.time.sleep') as sleep:
+            result = self.client.get_results('req-1')
+        self.assertEqual(get.call_count, 4)
+        self.assertEqual([c.args[0] for c in sleep.call_args_list], [4, 4, 4])
+        self.assertEqual(result['status'], 'error')
+        with mock.patch.object(self.client.session, 'get', return_value=response(400, body=b'{"error": "bad query"}')) as get:
+            self.assertEqual(self.client.get_results('req-1')['error'], 'bad query')
+        self.assertEqual(get.call_count, 1)
+
+    def test_retry_after_date_and_shared_client(self):
+        retry_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+        delay = retry_after_seconds(response(429, {'Retry-After': format_datetime(retry_at, usegmt=True)}))
+        self.assertTrue(25 <= delay <= 30)
+        self.assertIsNone(retry_after_seconds(response(429, {'Retry-After': 'soon'})))
+        self.assertIs(get_outscraper_client('key-a'), get_outscraper_client('key-a'))
+        self.assertIsNot(get_outscraper_client('key-a'), get_outscraper_client('key-b'))
+
+    def test_iter_reviews_follows_pagination_within_budget(self):
+        def page(start, count):
+            reviews = [{'review_text': f'review {i}', 'review_pagination_id': f'p{i}'} for i in range(start, start + count)]
+            return response(200, body=json.dumps({'status': 'Success', 'data': [{'place_id': 'P', 'reviews_data': reviews}]}).encode())
+
+        with mock.patch.object(self.client.session, 'get', side_effect=[page(0, 2), page(2, 2), page(4, 1)]) as get:
+            pages = list(self.client.iter_reviews('clinic', page_size=2))
+        self.assertEqual([len(p.reviews) for p in pages], [2, 2, 1])
+        self.assertEqual([p.pagination_id for p in pages], ['p1', 'p3', None])
+        self.assertEqual(pages[0].place, {'place_id': 'P'})
+        self.assertEqual([c.kwargs['params'].get('lastPaginationId') for c in get.call_args_list], [None, 'p1', 'p3'])
+
+        with mock.patch.object(self.client.session, 'get', side_effect=[page(0, 2), page(2, 2)]) as get:
+            pages = list(self.client.iter_reviews('clinic', max_reviews=3, page_size=2))
+        self.assertEqual([c.kwargs['params']['reviewsLimit'] for c in get.call_args_list], [2, 1])
+
+        first = page(0, 2)
+        with mock.patch.object(self.client.session, 'get', side_effect=[first, page(2, 2)]):
+            fetched = self.client.iter_reviews('clinic', page_size=2, max_bytes=len(first.content) + 10)
+            self.assertEqual(len(next(fetched).reviews), 2)
+            with self.assertRaises(ByteBudgetExceeded):
+                next(fetched)
+
+    def test_raw_proxy_streams_upstream_body_unchanged(self):
+        from cpapp.api.outscraper_reviews.views import proxy_response
+
+        body = b'{"status": "Success", "data": [' + b'{"name": "clinic"},' * 5000 + b'{}]}'
+        upstream = response(200, {'Content-Type': 'application/json'}, body)
+        with mock.patch.object(self.client.session, 'get', return_value=upstream) as get:
+            opened = self.client.open_reviews(query='clinic', reviews_limit=5, async_request=False)
+        self.assertTrue(get.call_args.kwargs['stream'])
+        self.assertEqual(get.call_args.kwargs['params']['reviewsLimit'], 5)
+
+        with mock.patch.object(upstream, 'close', wraps=upstream.close) as close:
+            proxied = proxy_response(opened)
+            self.assertTrue(proxied.streaming)
+            self.assertFalse(proxied.has_header('Content-Length'))
+            self.assertEqual(b''.join(proxied.streaming_content), body)
+            proxied.close()
+        close.assert_called_once()
+
+
+    def test_search_cache_key_keeps_the_case_of_place_ids(self):
+        from cpapp.api.outscraper_reviews.views import search_cache_key
+
+        def key(query):
+            return search_cache_key({'query': query, 'reviews_limit': 5, 'sort': 'most_relevant', 'language': 'en'})
+
+        self.assertEqual(key('Smile  Dental, Pune'), key('smile dental, pune'))
+        self.assertNotEqual(key('ChIJN1t_tDeuEmsRUsoyG83frY4'), key('ChIJN1t_tDeuEmsRUsoyG83frY4'.lower()))
+        self.assertEqual(key('ChIJN1t_tDeuEmsRUsoyG83frY4')[0], 'ChIJN1t_tDeuEmsRUsoyG83frY4')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,176 @@
+import unittest
+import os
+import re
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from unittest import mock
+
+# Add the project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'kyb_project.settings')
+
+import django
+
+django.setup()
+
+from django.db import connections
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+
+from cpapp.middleware import QueryBudgetMiddleware
+from cpapp.models.search_document import SearchDocument
+from cpapp.services import metrics, search_index
+from cpapp.services.query_profile import QueryProfile
+
+
+def execute(sql, params, many, context):
+    return sql
+
+
+class FakeConnection:
+    """Connection whose execute_wrapper exposes the installed wrappers"""
+
+    def __init__(self):
+        self.wrappers = []
+
+    @contextmanager
+    def execute_wrapper(self, wrapper):
+        self.wrappers.append(wrapper)
+        try:
+            yield
+        finally:
+            self.wrappers.pop()
+
+    def run(self, sql, params=()):
+        return self.wrappers[-1](execute, sql, params, False, {})
+
+
+class TestQueryProfile(unittest.TestCase):
+    def test_counts_duplicates_and_slowest(self):
+        profile = QueryProfile()
+        self.assertEqual(profile(execute, 'SELECT 1', (1,), False, {}), 'SELECT 1')
+        profile.record('SELECT * FROM doctor WHERE id = %s', (7,), 0.002)
+        profile.record('SELECT * FROM doctor WHERE id = %s', (7,), 0.001)
+        profile.record('SELECT * FROM doctor WHERE id = %s', (8,), 0.004)
+        self.assertEqual(profile.count, 4)
+        self.assertEqual(profile.duplicates, 1)
+        self.assertEqual(profile.duplicated(), [('SELECT * FROM doctor WHERE id = %s', 2)])
+        self.assertEqual(profile.slowest_seconds, 0.004)
+        self.assertTrue(profile.server_timing().startswith('db;dur='))
+        self.assertIn('desc="4 queries, 1 duplicate"', profile.server_timing())
+        self.assertIn('db-slowest;dur=4.0', profile.server_timing())
+
+    def test_batches_are_counted_but_not_compared(self):
+        profile = QueryProfile()
+        rows = [(i, 'name') for i in range(1000)]
+        profile(execute, 'INSERT INTO doctor VALUES (%s, %s)', rows, True, {})
+        profile(execute, 'INSERT INTO doctor VALUES (%s, %s)', rows, True, {})
+        profile.record('SELECT * FROM doctor WHERE id IN (%s)', [[1, 2]], 0.001)
+        profile.record('SELECT * FROM doctor WHERE id IN (%s)', [[1, 2]], 0.001)
+        self.assertEqual((profile.count, profile.batches, profile.duplicates), (4, 2, 1))
+        self.assertFalse(any(isinstance(params, (list, str)) for _, params in profile._statements))
+
+
+class TestQueryBudgetMiddleware(unittest.TestCase):
+    def setUp(self):
+        metrics.reset()
+        overrides = override_settings(
+            QUERY_PROFILE_ENABLED=True, QUERY_PROFILE_HEADERS=True, QUERY_PROFILE_LOG_SAMPLE_RATE=0,
+            QUERY_BUDGETS={'api-score': 2}, QUERY_BUDGET_DEFAULT=20
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        self.connection = FakeConnection()
+        patcher = mock.patch('cpapp.middleware.connections')
+        patcher.start().all.return_value = [self.connection]
+        self.addCleanup(patcher.stop)
+
+    def request(self, queries, url_name='api-score', server_timing=None):
+        def get_response(request):
+            request.resolver_match = mock.Mock(url_name=url_name)
+            for sql in queries:
+                self.connection.run(sql)
+            response = HttpResponse('ok')
+            if server_timing:
+                response['Server-Timing'] = server_timing
+            return response
+
+        return QueryBudgetMiddleware(get_response)(RequestFactory().post('/api/scoring/score/'))
+
+    def test_headers_and_budget_warning(self):
+        with self.assertLogs('cpapp.middleware', level='WARNING') as logs:
+            response = self.request(['SELECT a', 'SELECT a', 'SELECT b'], server_timing='practo_doctor;dur=3.0')
+        self.assertTrue(response['Server-Timing'].startswith('practo_doctor;dur=3.0, db;dur='))
+        self.assertIn('3 queries, 1 duplicate', response['Server-Timing'])
+        self.assertIn('ran 3 queries, budget 2', logs.output[0])
+        self.assertEqual(metrics.snapshot()['counters'], {'http_request_db_budget_exceeded_total{endpoint="api-score"}': 1})
+
+    def test_within_budget_is_quiet(self):
+        with mock.patch('cpapp.middleware.logger') as logger:
+            response = self.request(['SELECT a'], url_name='api-search')
+        logger.warning.assert_not_called()
+        self.assertIn('1 queries, 0 duplicate', response['Server-Timing'])
+        self.assertEqual(self.connection.wrappers, [])
+
+
+class TestFanOutSearchProfile(unittest.TestCase):
+    """
+    Runs against a temporary SQLite database in place of the default one
+
+    A file rather than an in-memory database, so the search pool threads
+    (which open their own connections) see the same tables.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.original_settings = connections.settings
+        cls.original = connections['default']
+        connections.settings = connections.configure_settings({
+            'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': os.path.join(cls.directory.name, 'search.db')}
+        })
+        connections['default'] = connections.create_connection('default')
+        with connections['default'].schema_editor() as editor:
+            editor.create_model(SearchDocument)
+        SearchDocument.objects.create(
+            entity_type='doctor', source='practo', entity_id=1, search_text='dr smile', result={'name': 'Dr Smile'}
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        connections['default'].close()
+        connections['default'] = cls.original
+        connections.settings = cls.original_settings
+        cls.directory.cleanup()
+
+    def test_pool_thread_queries_count_towards_the_request(self):
+        metrics.reset()
+        overrides = override_settings(
+            QUERY_PROFILE_ENABLED=True, QUERY_PROFILE_HEADERS=True, QUERY_PROFILE_LOG_SAMPLE_RATE=0,
+            QUERY_BUDGETS={'api-search': 2}
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        executor = ThreadPoolExecutor(max_workers=3)
+        self.addCleanup(executor.shutdown)
+
+        def get_response(request):
+            request.resolver_match = mock.Mock(url_name='api-search')
+            found = search_index.search('smile', timeout=5)
+            self.assertEqual([result['name'] for result in found.results], ['Dr Smile'])
+            return HttpResponse('ok')
+
+        with mock.patch.object(search_index, '_executor', executor), \
+                self.assertLogs('cpapp.middleware', level='WARNING') as logs:
+            response = QueryBudgetMiddleware(get_response)(RequestFactory().get('/api/scoring/search/'))
+        queries = int(re.search(r'(\d+) queries', response['Server-Timing']).group(1))
+        # At least the query of every source, each run on a pool thread
+        self.assertGreaterEqual(queries, len(search_index.SEARCH_SOURCES))
+        self.assertIn(f'ran {queries} queries, budget 2', logs.output[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import unittest
+import os
+import sys
+import threading
+import time
+from unittest import mock
+
+# Add the project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from cpapp.services.response_cache import ResponseCache, SingleFlight, TTLCache
+
+
+class TestResponseCache(unittest.TestCase):
+    def test_entries_expire_and_evict_least_recently_used(self):
+        cache = TTLCache(ttl=10, maxsize=2)
+        with mock.patch('cpapp.services.response_cache.time.monotonic', return_value=100.0) as now:
+            cache.set('a', 1)
+            cache.set('b', 2)
+            now.return_value = 104.0
+            self.assertEqual(cache.get('a'), (1, 4.0))
+            cache.set('c', 3)
+            self.assertIsNone(cache.get('b'))
+            now.return_value = 110.0
+            self.assertIsNone(cache.get('a'))
+            self.assertEqual(cache.get('c'), (3, 6.0))
+        disabled = TTLCache(ttl=0)
+        disabled.set('a', 1)
+        self.assertIsNone(disabled.get('a'))
+
+    def test_concurrent_calls_share_one_call(self):
+        flights = SingleFlight()
+        release = threading.Event()
+        calls = []
+        results = []
+
+        def slow():
+            calls.append(1)
+            release.wait(5)
+            return 'result'
+
+        threads = [threading.Thread(target=lambda: results.append(flights.do('key', slow))) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        while not calls:
+            time.sleep(0.001)
+        time.sleep(0.05)
+        release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(sorted(shared for _, shared in results), [False, True, True, True, True])
+        self.assertEqual({result for result, _ in results}, {'result'})
+
+        with self.assertRaises(ValueError):
+            flights.do('key', mock.Mock(side_effect=ValueError('upstream failed')))
+        self.assertEqual(flights.do('key', lambda: 'again'), ('again', False))
+
+    def test_waiting_for_a_hung_call_times_out(self):
+        flights = SingleFlight(wait_timeout=0.05)
+        release = threading.Event()
+        started = threading.Event()
+
+        def hung():
+            started.set()
+            release.wait(5)
+            return 'late'
+
+        leader = threading.Thread(target=flights.do, args=('key', hung))
+        leader.start()
+        started.wait(5)
+        with self.assertRaises(TimeoutError):
+            flights.do('key', hung)
+        release.set()
+        leader.join()
+
+    def test_get_or_fetch_reports_age_and_skips_uncacheable_results(self):
+        cache = ResponseCache(ttl=60)
+        fetch = mock.Mock(return_value={'data': [1]})
+        self.assertEqual(cache.get_or_fetch('q', fetch), ({'data': [1]}, None))
+        result, age = cache.get_or_fetch('q', fetch)
+        self.assertEqual(result, {'data': [1]})
+        self.assertGreaterEqual(age, 0.0)
+        self.assertEqual(fetch.call_count, 1)
+
+        failing = mock.Mock(return_value={'error': 'boom'})
+        cache.get_or_fetch('bad', failing, cacheable=lambda result: 'error' not in result)
+        cache.get_or_fetch('bad', failing, cacheable=lambda result: 'error' not in result)
+        self.assertEqual(failing.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import unittest
+import os
+import sys
+
+# Add the project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'kyb_project.settings')
+
+import django
+
+django.setup()
+
+from unittest import mock
+
+from django.db import connections
+from django.db.backends.sqlite3.base import DatabaseWrapper
+
+from cpapp.models.review_fingerprint import ReviewFingerprint, ReviewFingerprintBand
+from cpapp.services import review_fingerprints
+from cpapp.services.review_fingerprints import (
+    MIN_BAND_MATCHES, PARTITION_BITS, ReviewFingerprintIndex, hash_prefix, match_places
+)
+from cpapp.services.review_scorer_integration import ReviewAnalysisService
+from cpapp.services.review_scoring_system import ReviewScorer
+
+FARM_TEXT = "Dr. Rao explained the treatment patiently and called the next day to check on my son. Grateful!"
+EDITED = "dr rao explained the treatment patiently and called next day to check on my son grateful!!"
+UNRELATED = "Waited three hours for a dental cleaning and the hygienist was careless with my gums."
+
+
+class TestReviewFingerprints(unittest.TestCase):
+    def setUp(self):
+        normalize = ReviewScorer(tokenizer='fast')._normalize_text
+        self.texts = [normalize(t) for t in (FARM_TEXT, FARM_TEXT.upper(), EDITED, UNRELATED, "")]
+        self.text_hashes, self.band_hashes = ReviewFingerprintIndex().fingerprints(self.texts)
+
+    def test_exact_and_edited_copies_share_fingerprints(self):
+        farm, shouted, edited, unrelated, empty = self.text_hashes
+        self.assertEqual(farm, shouted)
+        self.assertNotEqual(farm, edited)
+        self.assertIsNone(empty)
+        self.assertEqual(self.band_hashes[4], [])
+
+        shared = len(set(self.band_hashes[0]) & set(self.band_hashes[2]))
+        self.assertGreaterEqual(shared, MIN_BAND_MATCHES)
+        self.assertLess(len(set(self.band_hashes[0]) & set(self.band_hashes[3])), MIN_BAND_MATCHES)
+        self.assertTrue(all(0 <= hash_prefix(h) < 2 ** PARTITION_BITS for h in self.band_hashes[0]))
+
+    def test_match_places_from_stored_fingerprints(self):
+        farm_hash = self.text_hashes[0]
+        exact = {farm_hash: {"clinic-a"}}
+        band_matches = {band: {(farm_hash, "clinic-a"), (farm_hash, "clinic-b")} for band in self.band_hashes[0]}
+        places = match_places(self.text_hashes, self.band_hashes, exact, band_matches)
+        self.assertEqual(places[0], {"clinic-a", "clinic-b"})
+        self.assertEqual(places[2], {"clinic-a", "clinic-b"})
+        self.assertEqual(places[3], set())
+        self.assertEqual(places[4], set())
+
+    def test_collect_reviews_keeps_place_of_each_review(self):
+        places_data = [
+            {"place_id": "A", "reviews_data": [{"review_text": "x"}, {"review_text": "y"}]},
+            {"google_id": "B", "reviews_data": []},
+            {"reviews_data": [{"review_text": "z"}]},
+        ]
+        reviews, place_ids = ReviewAnalysisService.collect_reviews(places_data, default_place="query")
+        self.assertEqual([r["review_text"] for r in reviews], ["x", "y", "z"])
+        self.assertEqual(place_ids, ["A", "A", "query"])
+
+
+class TestFingerprintLookup(unittest.TestCase):
+    """Runs against an in-memory SQLite database in place of the default one"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.original = connections['default']
+        settings_dict = connections.configure_settings({
+            'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': ':memory:'}
+        })['default']
+        connections['default'] = DatabaseWrapper(settings_dict, 'default')
+        with connections['default'].schema_editor() as editor:
+            editor.create_model(ReviewFingerprint)
+            editor.create_model(ReviewFingerprintBand)
+
+    @classmethod
+    def tearDownClass(cls):
+        connections['default'].close()
+        connections['default'] = cls.original
+
+    def setUp(self):
+        self.index = ReviewFingerprintIndex()
+        self.normalize = ReviewScorer(tokenizer='fast')._normalize_text
+
+    def check(self, place_id, texts):
+        reviews = [{'review_text': text, 'author_id': f'{place_id}-{i}'} for i, text in enumerate(texts)]
+        return self.index.check_and_record(place_id, reviews, [self.normalize(text) for text in texts])
+
+    def test_generic_short_reviews_are_not_matched_across_places(self):
+        for place in ('clinic-a', 'clinic-b'):
+            counts = self.check(place, ["Good", "Nice doctor", "Excellent", FARM_TEXT])
+        self.assertEqual(counts, [0, 0, 0, 1])
+        self.assertEqual(ReviewFingerprint.objects.filter(place_id='clinic-a').count(), 1)
+
+    def test_matches_per_hash_are_capped(self):
+        with mock.patch.object(review_fingerprints, 'MAX_PLACES_PER_HASH', 3):
+            for place in range(5):
+                self.check(f'copied-{place}', [UNRELATED])
+            self.assertEqual(self.check('copied-5', [UNRELATED]), [3])
+
+
+if __name__ == '__main__':
+    unittest.main()
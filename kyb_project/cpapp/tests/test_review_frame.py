@@ -0,0 +1,57 @@
+import unittest
+import json
+import os
+import sys
+from datetime import datetime, timedelta
+
+# Add the project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from cpapp.services.review_scoring_system import ReviewScorer
+
+FIXTURE = os.path.join(os.path.dirname(__file__), 'fixtures', 'review_corpus.json')
+
+
+def dump(scored_reviews):
+    # json keeps int and float scores apart (1 vs 1.0)
+    return json.dumps(scored_reviews)
+
+
+class TestColumnarScoring(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        now = datetime.now()
+        with open(FIXTURE, encoding='utf-8') as f:
+            corpus = json.load(f)
+        cls.reviews = []
+        for i, review in enumerate(corpus):
+            review = dict(review)
+            if i % 2:
+                review['review_timestamp'] = int((now - timedelta(days=40 * i)).timestamp())
+            else:
+                review['review_datetime_utc'] = (now - timedelta(days=25 * i)).strftime("%m/%d/%Y %H:%M:%S")
+            cls.reviews.append(review)
+        cls.reviews += [
+            dict(cls.reviews[1]),
+            {'review_text': None, 'review_timestamp': 0},
+            {'review_text': '', 'review_datetime_utc': 'not a date'},
+            {'review_text': 'None', 'review_timestamp': True},
+            {'review_text': 'Fraud! Fraud!', 'review_timestamp': 1.5e9, 'review_score': 3},
+        ]
+
+    def assert_same_output(self, reviews):
+        scorer = ReviewScorer(tokenizer='fast')
+        self.assertEqual(dump(scorer.score_reviews_columnar(reviews)), dump(scorer.score_reviews(reviews)))
+
+    def test_matches_per_review_scoring(self):
+        self.assert_same_output(self.reviews)
+
+    def test_matches_when_no_review_is_recent(self):
+        old = [dict(r, review_timestamp=1262304000) for r in self.reviews[:10]]
+        self.assert_same_output(old)
+        self.assert_same_output([])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import unittest
+import os
+import sys
+
+# Add the project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'kyb_project.settings')
+
+import django
+
+django.setup()
+
+from datetime import timedelta
+from unittest import mock
+
+from django.db import connections
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.utils import timezone
+
+from cpapp.models.review_job import ReviewScoringJob
+from cpapp.services.review_jobs import LEASE_LOST, claim_due_jobs, mark_job_due, process_job
+
+
+class TestReviewJobWebhook(unittest.TestCase):
+    """Runs against an in-memory SQLite database in place of the default one"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.original = connections['default']
+        settings_dict = connections.configure_settings({
+            'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': ':memory:'}
+        })['default']
+        connections['default'] = DatabaseWrapper(settings_dict, 'default')
+        with connections['default'].schema_editor() as editor:
+            editor.create_model(ReviewScoringJob)
+
+    @classmethod
+    def tearDownClass(cls):
+        connections['default'].close()
+        connections['default'] = cls.original
+
+    def setUp(self):
+        ReviewScoringJob.objects.all().delete()
+        self.job = ReviewScoringJob.objects.create(
+            request_id='req-1', query='clinic', webhook_token='token',
+            next_poll_at=timezone.now() - timedelta(seconds=1)
+        )
+
+    def test_webhook_does_not_release_a_leased_job(self):
+        self.assertEqual([job.request_id for job in claim_due_jobs()], ['req-1'])
+        self.assertTrue(mark_job_due('req-1', 'token'))
+        self.assertEqual(claim_due_jobs(), [])
+
+    def test_webhook_brings_forward_an_unleased_job(self):
+        ReviewScoringJob.objects.filter(pk=self.job.pk).update(next_poll_at=timezone.now() + timedelta(minutes=5))
+        self.assertEqual(claim_due_jobs(), [])
+        self.assertTrue(mark_job_due('req-1', 'token'))
+        self.assertEqual([job.request_id for job in claim_due_jobs()], ['req-1'])
+
+    def test_webhook_rejects_wrong_token(self):
+        self.assertFalse(mark_job_due('req-1', 'other'))
+
+
+    def test_only_the_current_lease_holder_saves_the_outcome(self):
+        service = mock.Mock()
+        service.get_review_results.return_value = {'status': 'Pending'}
+        stale, = claim_due_jobs()
+        # The lease ran out while the worker was busy with earlier jobs and a second worker took over
+        ReviewScoringJob.objects.filter(pk=self.job.pk).update(next_poll_at=timezone.now(), leased_until=timezone.now())
+        current, = claim_due_jobs()
+
+        self.assertEqual(process_job(stale, service), LEASE_LOST)
+        service.get_review_results.assert_not_called()
+        self.assertEqual(process_job(current, service), ReviewScoringJob.PENDING)
+        job = ReviewScoringJob.objects.get(pk=self.job.pk)
+        self.assertEqual((job.attempts, job.lease_token, job.leased_until), (1, '', None))
+
+    def test_outcome_is_discarded_when_the_lease_is_lost_mid_poll(self):
+        claimed, = claim_due_jobs()
+        service = mock.Mock()
+
+        def finish_elsewhere(request_id):
+            ReviewScoringJob.objects.filter(pk=self.job.pk).update(lease_token='other-worker')
+            return {'status': 'Pending'}
+
+        service.get_review_results.side_effect = finish_elsewhere
+        self.assertEqual(process_job(claimed, service), LEASE_LOST)
+        self.assertEqual(ReviewScoringJob.objects.get(pk=self.job.pk).attempts, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+import os
+import sys
+from datetime import datetime
+
+# Add the project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from cpapp.services.review_lsh import MinHashLSH, StreamingSignatures, jaccard, shingles
+from cpapp.services.review_scoring_system import ReviewScorer
+
+ORIGINAL = "Dr. Rao explained the treatment patiently and called the next day to check on my son. Grateful!"
+FARM_COPY = "dr rao explained the treatment patiently and called next day to check on my son grateful!!"
+UNRELATED = "Waited three hours for a dental cleaning and the hygienist was careless with my gums."
+
+
+class TestNearDuplicates(unittest.TestCase):
+    def setUp(self):
+        self.scorer = ReviewScorer(tokenizer='fast')
+        self.normalize = self.scorer._normalize_text
+
+    def test_clusters_edited_copies_only(self):
+        texts = [ORIGINAL, UNRELATED, "Best doctor in town!!", FARM_COPY, "best doctor in the town", "Good"]
+        clusters = MinHashLSH().clusters([self.normalize(t) for t in texts])
+        self.assertEqual(clusters, [1, None, 2, 1, 2, None])
+
+    def test_clusters_scale_past_pairwise_limits(self):
+        # Long enough (SHORT_REVIEW_WORDS) to be shingled by word pair
+        texts = [f"review number {i} mentions token{i} and token{i + 1} plus word{i * 7} at the clinic today" for i in range(5000)]
+        texts[4321] = texts[17] + " really"
+        clusters = MinHashLSH().clusters([self.normalize(t) for t in texts])
+        self.assertIsNotNone(clusters[17])
+        self.assertEqual(clusters[17], clusters[4321])
+        self.assertEqual(sum(1 for c in clusters if c is not None), 2)
+
+    def test_signature_estimate_tracks_jaccard(self):
+        reworded = "We were worried about our son's fever but Dr. Rao calmed us down, explained the treatment and called the next day"
+        sets = [shingles(self.normalize(t)) for t in (ORIGINAL, FARM_COPY, reworded)]
+        signatures = MinHashLSH().signatures(sets)
+        for a, b in ((0, 1), (0, 2), (1, 2)):
+            estimate = (signatures[a] == signatures[b]).mean()
+            self.assertAlmostEqual(estimate, jaccard(sets[a], sets[b]), delta=0.2)
+
+    def test_streamed_signatures_cluster_like_batch(self):
+        texts = [self.normalize(t) for t in (ORIGINAL, UNRELATED, FARM_COPY, UNRELATED)]
+        streamed = StreamingSignatures(MinHashLSH())
+        streamed.add(texts[:2])
+        streamed.add(texts[2:3])
+        self.assertEqual(streamed.clusters([0, 1, 2, 1]), MinHashLSH().clusters(texts))
+
+    def test_scoring_flags_later_copies(self):
+        timestamp = datetime.now().strftime("%m/%d/%Y %H:%M:%S")
+        reviews = [{'review_text': text, 'review_datetime_utc': timestamp} for text in (ORIGINAL, UNRELATED, FARM_COPY)]
+        for scored in (self.scorer.score_reviews(reviews), ReviewScorer(tokenizer='fast').score_reviews_columnar(reviews)):
+            factors = [review['scoring_factors'] for review in scored]
+            self.assertEqual([f['duplicate_cluster'] for f in factors], [1, None, 1])
+            self.assertEqual([f['near_duplicate'] for f in factors], [False, False, True])
+            self.assertFalse(factors[2]['is_duplicate'])
+            self.assertEqual(scored[2]['review_score'], -5.0)
+            self.assertGreater(scored[0]['review_score'], 0)
+
+        disabled = ReviewScorer(tokenizer='fast', near_duplicate_threshold=None).score_reviews(reviews)
+        self.assertIsNone(disabled[2]['scoring_factors']['duplicate_cluster'])
+
+    def test_short_copies_are_flagged_and_reworded_reviews_are_not(self):
+        timestamp = datetime.now().strftime("%m/%d/%Y %H:%M:%S")
+        texts = [
+            "Very good doctor", "Doctor is very good", "Good doctor, very nice", "Nice doctor, very good",
+            "Best doctor in town!!", "best doctor in the town"
+        ]
+        reviews = [{'review_text': text, 'review_datetime_utc': timestamp} for text in texts]
+        for scored in (self.scorer.score_reviews(reviews), ReviewScorer(tokenizer='fast').score_reviews_columnar(reviews)):
+            factors = [review['scoring_factors'] for review in scored]
+            self.assertEqual([f['duplicate_cluster'] for f in factors], [None, None, None, None, 1, 1])
+            self.assertEqual([f['near_duplicate'] for f in factors], [False] * 5 + [True])
+            self.assertTrue(all(review['review_score'] > 0 for review in scored[:5]))
+            self.assertEqual(scored[5]['review_score'], -5.0)
+
+if __name__ == '__main__':
+    unittest.main()
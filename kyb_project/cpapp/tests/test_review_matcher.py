@@ -0,0 +1,64 @@
+import unittest
+import os
+import re
+import sys
+from unittest import mock
+
+# Add the project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from cpapp.services import review_matcher
+from cpapp.services.review_matcher import (
+    EMOTIONAL_PATTERNS, SPECIFICITY_PATTERNS, ReviewMatcher, marker_score
+)
+
+GENERIC = ["great service", "highly recommend", "highly recommended", "best doctor"]
+NEGATIVE = ["cheat", "cheater", "fraud", "rude"]
+
+TEXTS = [
+    "Highly Recommended! Best doctor in town, I felt so satisfied.",
+    "He is a CHEATER and a fraud. Rude staff at 10 am on Monday.",
+    "Visited the office yesterday for a consultation, paid $40.",
+    "",
+    "nothing to see here",
+]
+
+
+class TestReviewMatcher(unittest.TestCase):
+    def assert_matches_naive(self, matcher):
+        for text in TEXTS:
+            lower = text.lower()
+            hits = matcher.scan(text)
+            self.assertEqual(hits.text_lower, lower)
+            self.assertEqual(hits.generic_phrases, {p for p in GENERIC if p in lower})
+            self.assertEqual(hits.negative_keywords, {k for k in NEGATIVE if k in lower})
+            self.assertEqual(
+                matcher.specificity_hits(lower),
+                sum(1 for p in SPECIFICITY_PATTERNS.values() if re.search(p, lower, re.IGNORECASE))
+            )
+            self.assertEqual(
+                matcher.emotional_hits(lower),
+                sum(1 for p in EMOTIONAL_PATTERNS.values() if re.search(p, lower, re.IGNORECASE))
+            )
+
+    def test_overlapping_phrases_match_substring_scan(self):
+        matcher = ReviewMatcher(GENERIC, NEGATIVE)
+        hits = matcher.scan(TEXTS[1])
+        self.assertEqual(hits.negative_keywords, {"cheat", "cheater", "fraud", "rude"})
+        self.assert_matches_naive(matcher)
+
+    def test_fallback_without_ahocorasick(self):
+        with mock.patch.object(review_matcher, "ahocorasick", None):
+            matcher = ReviewMatcher(GENERIC, NEGATIVE)
+        self.assertIsNone(matcher.phrases._automaton)
+        self.assert_matches_naive(matcher)
+
+    def test_marker_score_matches_accumulated_weights(self):
+        self.assertEqual(marker_score(0), 0.0)
+        self.assertEqual(marker_score(3), 0.15 + 0.15 + 0.15)
+        self.assertEqual(marker_score(10), 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
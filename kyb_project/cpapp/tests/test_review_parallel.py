@@ -0,0 +1,50 @@
+import unittest
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+# Add the project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from cpapp.services.review_scoring_system import ReviewScorer, get_review_scorer
+
+FIXTURE = os.path.join(os.path.dirname(__file__), 'fixtures', 'review_corpus.json')
+
+
+class TestStatelessScoring(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        now = datetime.now()
+        with open(FIXTURE, encoding='utf-8') as f:
+            corpus = json.load(f)
+        cls.reviews = [
+            dict(review, review_datetime_utc=(now - timedelta(days=20 * i)).strftime("%m/%d/%Y %H:%M:%S"))
+            for i, review in enumerate(corpus)
+        ]
+        # Exact copies spread over shards, and a keyword common to a quarter of the batch
+        cls.reviews += [dict(review) for review in cls.reviews[::7]]
+        cls.reviews += [{'review_text': f'Total scam, visit {i}', 'review_timestamp': 0} for i in range(25)]
+        cls.scorer = ReviewScorer(tokenizer='fast')
+
+    def test_parallel_matches_sequential(self):
+        expected = json.dumps(self.scorer.score_reviews(self.reviews))
+        parallel = self.scorer.score_reviews_parallel(self.reviews, workers=2, min_reviews=0)
+        self.assertEqual(json.dumps(parallel), expected)
+
+    def test_shared_scorer_is_thread_safe(self):
+        batches = [self.reviews[i:] for i in range(0, 40, 5)]
+        expected = [json.dumps(self.scorer.score_reviews(batch)) for batch in batches]
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            actual = list(pool.map(lambda batch: json.dumps(self.scorer.score_reviews(batch)), batches * 3))
+        self.assertEqual(actual, expected * 3)
+
+    def test_shared_scorer_per_tokenizer(self):
+        self.assertIs(get_review_scorer('fast'), get_review_scorer('fast'))
+        self.assertEqual(get_review_scorer('fast').tokenizer, 'fast')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+import unittest
+import os
+import sys
+
+# Add the project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from cpapp.services.review_portfolio import batch_queries, split_by_query
+
+
+class TestReviewPortfolio(unittest.TestCase):
+    def test_batches_respect_query_and_byte_limits(self):
+        queries = [f"clinic {i}" for i in range(500)] + ["clinic 3", "  ", ""]
+        batches = batch_queries(queries, max_queries=250, max_bytes=100000)
+        self.assertEqual([len(batch) for batch in batches], [250, 250])
+        self.assertEqual([q for batch in batches for q in batch], [f"clinic {i}" for i in range(500)])
+
+        batches = batch_queries(["a" * 40, "b" * 40, "c" * 40, "d" * 200], max_queries=250, max_bytes=100)
+        self.assertEqual(batches, [["a" * 40, "b" * 40], ["c" * 40], ["d" * 200]])
+
+    def test_split_by_echoed_query_position_and_nesting(self):
+        queries = ["q1", "q2", "q3"]
+        echoed = [{"query": "q3", "name": "C"}, {"query": "q1", "name": "A"}]
+        self.assertEqual(
+            {query: [place["name"] for place in places] for query, places in split_by_query(queries, echoed).items()},
+            {"q1": ["A"], "q2": [], "q3": ["C"]}
+        )
+        positional = [{"name": "A"}, {"name": "B"}, {"name": "C"}]
+        self.assertEqual(split_by_query(queries, positional)["q2"], [{"name": "B"}])
+        nested = [[{"name": "A"}], [], [{"name": "C"}, {"name": "D"}]]
+        self.assertEqual([len(places) for places in split_by_query(queries, nested).values()], [1, 0, 2])
+        self.assertEqual(split_by_query(queries, None), {"q1": [], "q2": [], "q3": []})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+import json
+import os
+import sys
+
+# Add the project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'kyb_project.settings')
+
+import django
+
+django.setup()
+
+from cpapp.api.scoring.serializers import ReviewScoringRequestSerializer
+from cpapp.services.review_response import parse_fields, shape_review_response
+from cpapp.services.review_scoring_system import ReviewScorer
+
+FIXTURE = os.path.join(os.path.dirname(__file__), 'fixtures', 'review_corpus.json')
+FIELDS = ('review_text', 'review_score', 'scoring_factors')
+
+
+class TestReviewResponse(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with open(FIXTURE, encoding='utf-8') as f:
+            cls.reviews = [
+                dict(review, review_id=f'r{i}', author_link=f'https://maps.google.com/u/{i}', review_photo_ids=['p1', 'p2'])
+                for i, review in enumerate(json.load(f))
+            ]
+        cls.result = {'status': 'completed', 'total_reviews': len(cls.reviews),
+                      'scored_reviews': ReviewScorer(tokenizer='fast').score_reviews(cls.reviews)}
+
+    def test_scoring_copies_only_requested_fields(self):
+        scorer = ReviewScorer(tokenizer='fast')
+        projected = [{field: review[field] for field in FIELDS} for review in self.result['scored_reviews']]
+        self.assertEqual(json.dumps(scorer.score_reviews(self.reviews, FIELDS)), json.dumps(projected))
+        self.assertEqual(json.dumps(scorer.score_reviews_columnar(self.reviews, FIELDS)), json.dumps(projected))
+
+    def test_cursor_pages_cover_every_review_once(self):
+        fields = parse_fields(' review_id, review_score ,,review_id')
+        self.assertEqual(fields, ('review_id', 'review_score'))
+        seen, cursor = [], None
+        while True:
+            page = shape_review_response(self.result, fields=fields, page_size=15, cursor=cursor)
+            self.assertEqual(page['total_reviews'], len(self.reviews))
+            seen += [review['review_id'] for review in page['scored_reviews']]
+            self.assertTrue(all(set(review) == set(fields) for review in page['scored_reviews']))
+            cursor = page['next_cursor']
+            if cursor is None:
+                break
+        self.assertEqual(seen, [review['review_id'] for review in self.reviews])
+        with self.assertRaises(ValueError):
+            shape_review_response(self.result, cursor='not-a-cursor')
+
+    def test_summary_only_and_passthrough(self):
+        summary = shape_review_response(self.result, summary_only=True)
+        self.assertEqual(summary, {'status': 'completed', 'total_reviews': len(self.reviews)})
+        self.assertIs(shape_review_response(self.result)['scored_reviews'], self.result['scored_reviews'])
+        error = {'status': 'error', 'message': 'Failed to retrieve review results.'}
+        self.assertIs(shape_review_response(error, summary_only=True), error)
+
+    def test_submission_pages_only_stored_results(self):
+        cursor = shape_review_response(self.result, page_size=15)['next_cursor']
+        fresh = ReviewScoringRequestSerializer(data={'query': 'clinic', 'async_request': False, 'cursor': cursor})
+        self.assertFalse(fresh.is_valid())
+        self.assertIn('cursor', fresh.errors)
+        first_page = ReviewScoringRequestSerializer(data={'query': 'clinic', 'async_request': False, 'page_size': 15})
+        self.assertTrue(first_page.is_valid())
+        stored = ReviewScoringRequestSerializer(data={'query': 'clinic', 'incremental': True, 'cursor': cursor})
+        self.assertTrue(stored.is_valid())
+
+
+if __name__ == '__main__':
+    unittest.main()
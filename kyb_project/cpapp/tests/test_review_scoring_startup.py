@@ -0,0 +1,52 @@
+import unittest
+import os
+import subprocess
+import sys
+from unittest import mock
+
+# Add the project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from cpapp.services import review_scoring_system
+from cpapp.services.review_scoring_system import ReviewScorer
+
+
+class TestReviewScoringStartup(unittest.TestCase):
+    def test_import_and_construction_do_not_load_nltk(self):
+        code = (
+            "import sys, logging; sys.path.insert(0, %r)\n"
+            "from cpapp.services.review_scoring_system import ReviewScorer\n"
+            "ReviewScorer()\n"
+            "print(int('nltk' in sys.modules), len(logging.getLogger().handlers))\n"
+        ) % project_root
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+        self.assertEqual(output.stdout.split(), ['0', '0'])
+
+    def test_content_quality_uses_vendored_stopwords(self):
+        scorer = ReviewScorer()
+        self.assertIn('the', scorer.stop_words)
+        self.assertEqual(len(scorer.stop_words), 198)
+        # Scores with NLTK's tokenizer when installed, otherwise with the fallback tokenizer
+        quality = scorer.analyze_content_quality(
+            "The doctor explained the treatment clearly during my appointment on Monday morning. Staff were helpful!"
+        )
+        self.assertGreater(quality, 0.0)
+
+    def test_missing_tokenizer_data_is_not_downloaded_by_default(self):
+        import nltk
+
+        env = {key: value for key, value in os.environ.items() if key != 'NLTK_AUTO_DOWNLOAD'}
+        with mock.patch.dict(os.environ, env, clear=True), \
+                mock.patch.object(review_scoring_system, '_nltk_tokenize', None), \
+                mock.patch.object(review_scoring_system, '_nltk_error', None), \
+                mock.patch.object(nltk.data, 'find', side_effect=LookupError), \
+                mock.patch.object(nltk, 'download') as download, \
+                self.assertLogs(review_scoring_system.logger, level='WARNING'):
+            tokens = review_scoring_system.word_tokenize("Dr. Rao's check-up was quick")
+        download.assert_not_called()
+        self.assertEqual(tokens, ['Dr', 'Rao', 's', 'check-up', 'was', 'quick'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+import os
+import sys
+
+# Add the project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'kyb_project.settings')
+
+import django
+
+django.setup()
+
+from django.db import connections
+from django.db.backends.sqlite3.base import DatabaseWrapper
+
+from cpapp.models.review_store import ReviewPlace, StoredReview
+from cpapp.services.review_scoring_system import ReviewScorer
+from cpapp.services.review_store import ReviewStore
+
+
+class TestReviewStore(unittest.TestCase):
+    """Runs against an in-memory SQLite database in place of the default one"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.original = connections['default']
+        settings_dict = connections.configure_settings({
+            'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': ':memory:'}
+        })['default']
+        connections['default'] = DatabaseWrapper(settings_dict, 'default')
+        with connections['default'].schema_editor() as editor:
+            editor.create_model(ReviewPlace)
+            editor.create_model(StoredReview)
+
+    @classmethod
+    def tearDownClass(cls):
+        connections['default'].close()
+        connections['default'] = cls.original
+
+    def setUp(self):
+        self.store = ReviewStore(ReviewScorer(tokenizer='fast'))
+        self.scored = [
+            {'review_id': 'r1', 'review_text': 'Explained everything', 'review_timestamp': 1700000000,
+             'review_score': 8.0, 'scoring_factors': {}},
+            {'review_id': 'r2', 'review_text': 'Rude staff', 'review_timestamp': 1700000100,
+             'review_score': -4.0, 'scoring_factors': {'seen_at_other_places': 1}},
+        ]
+
+    def test_saving_the_same_batch_twice_counts_it_once(self):
+        context, _ = self.store.load_context(None)
+        self.store.save({'name': 'Clinic'}, 'place-1', 'clinic', self.scored, context)
+        place = self.store.save({'name': 'Clinic'}, 'place-1', 'clinic', self.scored, context)
+        self.assertEqual(place.reviews.count(), 2)
+        self.assertEqual(
+            (place.review_count, place.genuine_reviews, place.score_sum, place.reviews_seen_at_other_places),
+            (2, 1, 4.0, 1)
+        )
+
+    def test_overlapping_refresh_scores_only_unstored_reviews(self):
+        scored_batches = []
+
+        def score(reviews, context, previous_texts, any_recent):
+            scored_batches.append([review['review_id'] for review in reviews])
+            return [dict(review, review_score=5.0, scoring_factors={}) for review in reviews]
+
+        fetched = [{key: review[key] for key in ('review_id', 'review_text', 'review_timestamp')} for review in self.scored]
+        self.store.refresh({}, 'place-2', 'clinic', fetched[:1], score)
+        place, scored = self.store.refresh({}, 'place-2', 'clinic', fetched, score)
+        self.assertEqual(scored_batches, [['r1'], ['r2']])
+        self.assertEqual([review['review_id'] for review in scored], ['r2'])
+        self.assertEqual((place.review_count, place.score_sum), (2, 10.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import unittest
+import json
+import os
+import sys
+from collections import Counter
+from datetime import datetime, timedelta
+
+# Add the project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from cpapp.services.review_scoring_system import ReviewBatchContext, ReviewScorer
+
+FIXTURE = os.path.join(os.path.dirname(__file__), 'fixtures', 'review_corpus.json')
+ORIGINAL = "Dr. Rao explained the treatment patiently and called the next day to check on my son. Grateful!"
+FARM_COPY = "dr rao explained the treatment patiently and called next day to check on my son grateful!!"
+
+
+def reconcile(events):
+    """Apply a stream's final corrections to its page results"""
+    scored = []
+    for event in events:
+        if event['event'] == 'page':
+            scored.extend(event['reviews'])
+        else:
+            for index, correction in event['corrections'].items():
+                scored[index].update(correction)
+    return scored
+
+
+class TestStreamingScoring(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        now = datetime.now()
+        with open(FIXTURE, encoding='utf-8') as f:
+            corpus = json.load(f)
+        # Old reviews first, so early pages have no recent review yet
+        cls.reviews = [dict(review, review_timestamp=1262304000) for review in corpus[:20]]
+        cls.reviews += [{'review_text': ORIGINAL, 'review_timestamp': 1262304000}]
+        cls.reviews += [
+            dict(review, review_datetime_utc=(now - timedelta(days=10 * i)).strftime("%m/%d/%Y %H:%M:%S"))
+            for i, review in enumerate(corpus[20:])
+        ]
+        # Late pages: a copy, an edited copy and a keyword that becomes common
+        cls.reviews += [dict(cls.reviews[3]), {'review_text': FARM_COPY, 'review_timestamp': 0}]
+        cls.reviews += [{'review_text': f'Scam clinic, visit {i}', 'review_timestamp': 0} for i in range(30)]
+        cls.scorer = ReviewScorer(tokenizer='fast')
+
+    def pages(self, size):
+        return [self.reviews[i:i + size] for i in range(0, len(self.reviews), size)]
+
+    def test_reconciled_stream_matches_batch(self):
+        expected = json.dumps(self.scorer.score_reviews(self.reviews))
+        for size in (1, 7, 25, len(self.reviews)):
+            events = list(self.scorer.score_reviews_iter(self.pages(size)))
+            self.assertEqual(events[-1]['total_reviews'], len(self.reviews))
+            self.assertEqual(json.dumps(reconcile(events)), expected)
+
+    def test_pages_are_scored_before_later_pages_arrive(self):
+        consumed = []
+
+        def fetch():
+            for page in self.pages(10):
+                consumed.append(len(page))
+                yield page
+
+        stream = self.scorer.score_reviews_iter(fetch())
+        first = next(stream)
+        self.assertEqual((first['page'], first['offset'], len(first['reviews'])), (1, 0, 10))
+        self.assertEqual(len(consumed), 1)
+        # Nothing recent yet, so the first page is provisionally flagged
+        self.assertTrue(all(review['review_score'] == -10 for review in first['reviews']))
+        final = list(stream)[-1]
+        self.assertTrue(final['any_recent'])
+        self.assertTrue(set(range(10)) <= set(final['corrections']))
+
+    def test_new_reviews_scored_against_previous_batch(self):
+        previous, new = self.reviews[:40], self.reviews[40:]
+        expected = self.scorer.score_reviews(self.reviews)[40:]
+        context = ReviewBatchContext(len(previous), Counter(
+            keyword for review in previous for keyword in self.scorer.matcher.scan(review.get('review_text', '')).negative_keywords
+        ))
+        previous_texts = [self.scorer._normalize_text(review.get('review_text', '')) for review in previous]
+        for text in previous_texts:
+            context.count_seen(text)
+        scored = self.scorer.score_new_reviews(new, context, previous_texts, any_recent=True)
+        self.assertEqual(json.dumps(scored), json.dumps(expected))
+        self.assertEqual(context.total_reviews, len(self.reviews))
+
+    def test_empty_stream(self):
+        events = list(self.scorer.score_reviews_iter([]))
+        self.assertEqual(events, [{'event': 'final', 'total_reviews': 0, 'any_recent': False, 'corrections': {}}])
+
+
+if __name__ == '__main__':
+    unittest.main()
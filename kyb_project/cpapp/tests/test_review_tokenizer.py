@@ -0,0 +1,69 @@
+import unittest
+import json
+import os
+import sys
+from unittest import mock
+
+# Add the project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from cpapp.services import review_scoring_system
+from cpapp.services.review_scoring_system import (
+    FAST_TOKENIZER_MAX_QUALITY_DIFF, FAST_TOKENIZER_MEAN_QUALITY_DIFF, ReviewScorer
+)
+
+FIXTURE = os.path.join(os.path.dirname(__file__), 'fixtures', 'review_corpus.json')
+
+
+def nltk_reference_tokenizer():
+    """NLTK word_tokenize, or its punkt + word tokenizer pipeline with an untrained model when data is missing"""
+    try:
+        return review_scoring_system._load_nltk_tokenizer()
+    except LookupError:
+        from nltk.tokenize import NLTKWordTokenizer
+        from nltk.tokenize.punkt import PunktSentenceTokenizer
+
+        sentences, words = PunktSentenceTokenizer(), NLTKWordTokenizer()
+        return lambda text: [w for s in sentences.tokenize(text) for w in words.tokenize(s)]
+
+
+class TestFastTokenizer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with open(FIXTURE, encoding='utf-8') as f:
+            cls.corpus = json.load(f)
+
+    def test_quality_within_documented_tolerance_of_nltk(self):
+        reference = ReviewScorer(tokenizer='nltk')
+        reference._tokenize = nltk_reference_tokenizer()
+        fast = ReviewScorer(tokenizer='fast')
+
+        diffs = [
+            abs(fast.analyze_content_quality(r['review_text']) - reference.analyze_content_quality(r['review_text']))
+            for r in self.corpus
+        ]
+        self.assertLessEqual(max(diffs), FAST_TOKENIZER_MAX_QUALITY_DIFF)
+        self.assertLessEqual(sum(diffs) / len(diffs), FAST_TOKENIZER_MEAN_QUALITY_DIFF)
+
+    def test_fast_mode_never_calls_nltk(self):
+        with mock.patch.object(review_scoring_system, 'word_tokenize', side_effect=AssertionError) as nltk_tokenize:
+            scorer = ReviewScorer(tokenizer='fast')
+            results = scorer.score_reviews(self.corpus)
+        nltk_tokenize.assert_not_called()
+        self.assertEqual(len(results), len(self.corpus))
+        self.assertEqual(
+            review_scoring_system.fast_word_tokenize("don't skip the check-up at 10am"),
+            ['don', 't', 'skip', 'the', 'check-up', 'at', '10am']
+        )
+
+    def test_tokenizer_is_selected_per_instance(self):
+        with mock.patch.dict(os.environ, {'REVIEW_TOKENIZER': 'fast'}):
+            self.assertEqual(ReviewScorer().tokenizer, 'fast')
+            self.assertEqual(ReviewScorer(tokenizer='nltk').tokenizer, 'nltk')
+        with self.assertRaises(ValueError):
+            ReviewScorer(tokenizer='spacy')
+
+
+if __name__ == '__main__':
+    unittest.main()
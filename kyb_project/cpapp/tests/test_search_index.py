@@ -0,0 +1,180 @@
+import unittest
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+# Add the project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'kyb_project.settings')
+
+import django
+
+django.setup()
+
+from django.db import connections
+from django.db.backends.sqlite3.base import DatabaseWrapper
+
+from cpapp.models.nmc import NMCDoctor
+from cpapp.models.practo import PractoDoctor
+from cpapp.models.search_document import SearchDocument
+from cpapp.services import search_index
+from cpapp.services.search_index import (
+    SEARCH_SOURCES, SOURCES_BY_KEY, SearchIndexWriter, decode_cursor, encode_cursor, search, search_document
+)
+
+
+class TestSearchDocument(unittest.TestCase):
+    def test_document_holds_lowercased_fields_and_result(self):
+        doctor = PractoDoctor(id=7, name='Dr. Asha Rao', speciality='Dentist', location='Pune', doctor_url='https://x')
+        document = search_document(SOURCES_BY_KEY[('doctor', 'practo')], doctor)
+        self.assertEqual((document.entity_type, document.source, document.entity_id), ('doctor', 'practo', 7))
+        self.assertEqual(document.search_text, 'dr. asha rao\ndentist')
+        self.assertEqual(document.result['name'], 'Dr. Asha Rao')
+        self.assertEqual(document.result['source'], 'practo')
+        self.assertEqual(document.result['url'], 'https://x')
+
+    def test_empty_fields_are_skipped(self):
+        source = SOURCES_BY_KEY[('doctor', 'nmc')]
+        document = search_document(source, NMCDoctor(id=3, firstName='Ravi', lastName=None))
+        self.assertEqual(document.search_text, 'ravi')
+        self.assertEqual(document.result['name'], 'Ravi')
+        self.assertIsNone(search_document(source, NMCDoctor(id=4, firstName='', lastName=None)))
+
+    def test_cursor_round_trip(self):
+        cursor = {'practo_doctor': 120, 'googlemap_clinic': 7}
+        self.assertEqual(decode_cursor(encode_cursor(cursor)), cursor)
+        self.assertIsNone(encode_cursor({}))
+        for token in ('garbage', encode_cursor({'unknown_doctor': 1}), encode_cursor({'practo_doctor': '1'})):
+            with self.assertRaises(ValueError):
+                decode_cursor(token)
+
+
+class TestIndexSync(unittest.TestCase):
+    """Runs against an in-memory SQLite database in place of the default one"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.original = connections['default']
+        settings_dict = connections.configure_settings({
+            'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': ':memory:'}
+        })['default']
+        connections['default'] = DatabaseWrapper(settings_dict, 'default')
+        with connections['default'].schema_editor() as editor:
+            editor.create_model(SearchDocument)
+            for model in dict.fromkeys(source.model for source in SEARCH_SOURCES):
+                editor.create_model(model)
+
+    @classmethod
+    def tearDownClass(cls):
+        connections['default'].close()
+        connections['default'] = cls.original
+
+    def setUp(self):
+        SearchDocument.objects.all().delete()
+
+    def indexed(self):
+        return list(SearchDocument.objects.values_list('source', 'entity_id', 'search_text'))
+
+    def test_saves_and_deletes_update_the_index(self):
+        doctor = PractoDoctor.objects.create(name='Dr. Asha Rao', speciality='Dentist', doctor_url='https://x')
+        self.assertEqual(self.indexed(), [('practo', doctor.pk, 'dr. asha rao\ndentist')])
+
+        doctor.speciality = 'Orthodontist'
+        doctor.save()
+        self.assertEqual(self.indexed(), [('practo', doctor.pk, 'dr. asha rao\northodontist')])
+
+        doctor.delete()
+        self.assertEqual(self.indexed(), [])
+
+    def test_entity_with_nothing_to_search_leaves_the_index(self):
+        doctor = PractoDoctor.objects.create(name='Dr. Asha Rao', speciality='Dentist', doctor_url='https://x')
+        doctor.name = doctor.speciality = ''
+        doctor.save()
+        self.assertEqual(self.indexed(), [])
+
+    def test_writer_batches_the_saves_of_its_source(self):
+        with SearchIndexWriter('doctor', 'practo') as writer:
+            doctor = PractoDoctor.objects.create(name='Dr. Ravi Kumar', speciality='Dentist', doctor_url='https://y')
+            self.assertEqual(self.indexed(), [])
+            writer.add(doctor)
+        self.assertEqual(self.indexed(), [('practo', doctor.pk, 'dr. ravi kumar\ndentist')])
+
+
+class TestFanOutSearch(unittest.TestCase):
+    def test_late_and_failing_sources_are_left_out(self):
+        def search_source(rank, source, query, limit, after, timeout):
+            if source.source == 'googlemap':
+                time.sleep(0.5)
+            if source.source == 'bajaj':
+                raise RuntimeError('canceling statement due to statement timeout')
+            return [(rank, 1, {'source': source.source, 'speciality': source.entity_type})], 1.0
+
+        with mock.patch.object(search_index, '_search_source', search_source):
+            found = search('smile', timeout=0.1)
+            self.assertTrue(found.partial)
+            self.assertEqual(
+                [result['source'] for result in found.results],
+                ['practo', 'justdial', 'nmc', 'nmc_dental', 'savein', 'new_practo', 'justdial']
+            )
+            self.assertIsNone(found.timings['googlemap_clinic'])
+            self.assertIsNone(found.timings['bajaj_doctor'])
+            self.assertEqual(found.timings['practo_doctor'], 1.0)
+            self.assertEqual(found.next_cursor, {'bajaj_doctor': 0, 'googlemap_clinic': 0})
+
+            found = search('smile', entity_type='clinic', timeout=1)
+            self.assertFalse(found.partial)
+            self.assertEqual([result['source'] for result in found.results], ['justdial', 'googlemap'])
+
+    def test_time_queued_behind_other_sources_is_not_counted(self):
+        def search_source(rank, source, query, limit, after, timeout):
+            time.sleep(0.05)
+            return [(rank, 1, {'source': source.source})], 50.0
+
+        # Nine sources through two workers queue for about four times the deadline
+        with mock.patch.object(search_index, '_search_source', search_source), \
+                mock.patch.object(search_index, '_executor', ThreadPoolExecutor(max_workers=2)):
+            found = search('smile', timeout=0.1)
+        self.assertFalse(found.partial)
+        self.assertEqual(len(found.results), len(SEARCH_SOURCES))
+
+    def test_keyset_pages_cover_every_match_once(self):
+        # Matching entity ids per source; bajaj has none and googlemap fits on one page
+        matches = {source.label: list(range(3, 3 + 2 * 12, 2)) for source in SEARCH_SOURCES}
+        matches.update(practo_doctor=list(range(1, 26)), bajaj_doctor=[], googlemap_clinic=[4, 9, 30])
+        calls = []
+
+        def search_source(rank, source, query, limit, after, timeout):
+            calls.append((source.label, limit, after))
+            ids = [entity_id for entity_id in matches[source.label] if entity_id > after][:limit]
+            return [(rank, entity_id, {'label': source.label, 'id': entity_id}) for entity_id in ids], 1.0
+
+        seen, cursor, pages = [], None, 0
+        with mock.patch.object(search_index, '_search_source', search_source):
+            while True:
+                calls.clear()
+                found = search('smile', per_source=10, timeout=1, cursor=cursor)
+                pages += 1
+                self.assertFalse(found.partial)
+                # One row beyond the page tells whether a source has more
+                self.assertTrue(all(limit == 11 for _, limit, _ in calls))
+                if cursor is not None:
+                    self.assertEqual(sorted(label for label, _, _ in calls), sorted(cursor))
+                    self.assertTrue(all(after == cursor[label] for label, _, after in calls))
+                page = [(result['label'], result['id']) for result in found.results]
+                for label, last_id in found.next_cursor.items():
+                    self.assertEqual(last_id, max(entity_id for page_label, entity_id in page if page_label == label))
+                seen += page
+                cursor = found.next_cursor
+                if not cursor:
+                    break
+
+        self.assertEqual(pages, 3)
+        self.assertEqual(len(seen), len(set(seen)))
+        self.assertEqual(sorted(seen), sorted((label, entity_id) for label, ids in matches.items() for entity_id in ids))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -44,6 +44,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'cpapp.middleware.QueryBudgetMiddleware',  # First, so it sees the queries of every other middleware
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',  # CORS middleware - add before CommonMiddleware
@@ -97,6 +98,10 @@ DATABASES = {
         'PASSWORD': os.getenv('VITE_DB_PASSWORD', 'naval@yadav@123'),  # Add your PostgreSQL password here
         'HOST': os.getenv('VITE_DB_HOST', 'aws-0-ap-southeast-1.pooler.supabase.com'), 
         'PORT': os.getenv('VITE_DB_PORT', '6543'),
+        # Keep connections between requests (and between concurrent search tasks, which
+        # would otherwise open one per source per search)
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', '60')),
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
@@ -156,6 +161,84 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [],
 }
 
+# GeoIQ request scheduler (budgets are per worker process)
+GEOIQ_BUDGET_PER_MINUTE = int(os.getenv('GEOIQ_BUDGET_PER_MINUTE', '60'))
+GEOIQ_BUDGET_PER_DAY = int(os.getenv('GEOIQ_BUDGET_PER_DAY', '5000'))
+GEOIQ_SCHEDULER_WORKERS = int(os.getenv('GEOIQ_SCHEDULER_WORKERS', '2'))
+GEOIQ_INTERACTIVE_MAX_WAIT = float(os.getenv('GEOIQ_INTERACTIVE_MAX_WAIT', '2.0'))
+GEOIQ_BATCH_RESERVE = float(os.getenv('GEOIQ_BATCH_RESERVE', '0.2'))
+GEOIQ_FALLBACK_CATEGORY = os.getenv('GEOIQ_FALLBACK_CATEGORY', 'Poor')
+
+# GeoIQ timeouts and circuit breaker
+GEOIQ_CONNECT_TIMEOUT = float(os.getenv('GEOIQ_CONNECT_TIMEOUT', '3.05'))
+GEOIQ_READ_TIMEOUT = float(os.getenv('GEOIQ_READ_TIMEOUT', '10'))
+GEOIQ_BREAKER_FAILURE_THRESHOLD = int(os.getenv('GEOIQ_BREAKER_FAILURE_THRESHOLD', '5'))
+GEOIQ_BREAKER_RECOVERY_TIMEOUT = float(os.getenv('GEOIQ_BREAKER_RECOVERY_TIMEOUT', '30'))
+
+# Reuse the nearest analysed location within this distance instead of a live GeoIQ call
+LOCATION_NEIGHBOUR_MAX_DISTANCE_M = float(os.getenv('LOCATION_NEIGHBOUR_MAX_DISTANCE_M', '200'))
+LOCATION_INDEX_CELL_SIZE_M = float(os.getenv('LOCATION_INDEX_CELL_SIZE_M', '500'))
+LOCATION_INDEX_REFRESH_SECONDS = float(os.getenv('LOCATION_INDEX_REFRESH_SECONDS', '60'))
+
+# Columnar store of GeoIQ variables used by the rescore_locations command
+LOCATION_FEATURE_STORE_PATH = os.getenv('LOCATION_FEATURE_STORE_PATH', os.path.join(BASE_DIR, 'location_features'))
+
+# Check scored reviews against the cross-place review fingerprint tables
+REVIEW_FINGERPRINTS_ENABLED = os.getenv('REVIEW_FINGERPRINTS_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+
+# Outscraper client (shared per process): timeouts, retries with backoff and rate limit
+OUTSCRAPER_CONNECT_TIMEOUT = float(os.getenv('OUTSCRAPER_CONNECT_TIMEOUT', '3.05'))
+OUTSCRAPER_READ_TIMEOUT = float(os.getenv('OUTSCRAPER_READ_TIMEOUT', '120'))
+OUTSCRAPER_MAX_RETRIES = int(os.getenv('OUTSCRAPER_MAX_RETRIES', '3'))
+OUTSCRAPER_BACKOFF_SECONDS = float(os.getenv('OUTSCRAPER_BACKOFF_SECONDS', '0.5'))
+OUTSCRAPER_MAX_BACKOFF_SECONDS = float(os.getenv('OUTSCRAPER_MAX_BACKOFF_SECONDS', '30'))
+OUTSCRAPER_RATE_LIMIT = float(os.getenv('OUTSCRAPER_RATE_LIMIT', '10'))
+OUTSCRAPER_POOL_SIZE = int(os.getenv('OUTSCRAPER_POOL_SIZE', '10'))
+# Portfolio checks pack up to this many queries (and URL-encoded query bytes) into one request
+OUTSCRAPER_BATCH_QUERIES = int(os.getenv('OUTSCRAPER_BATCH_QUERIES', '250'))
+OUTSCRAPER_BATCH_QUERY_BYTES = int(os.getenv('OUTSCRAPER_BATCH_QUERY_BYTES', '6000'))
+# Custom search results are cached per process for this many seconds (0 disables the cache)
+CUSTOM_SEARCH_CACHE_SECONDS = float(os.getenv('CUSTOM_SEARCH_CACHE_SECONDS', '900'))
+CUSTOM_SEARCH_CACHE_SIZE = int(os.getenv('CUSTOM_SEARCH_CACHE_SIZE', '256'))
+# An identical search arriving while one is in flight waits this long for its result
+# (by default one Outscraper call's connect and read timeouts) before failing with a 504
+CUSTOM_SEARCH_WAIT_SECONDS = float(os.getenv(
+    'CUSTOM_SEARCH_WAIT_SECONDS', str(OUTSCRAPER_CONNECT_TIMEOUT + OUTSCRAPER_READ_TIMEOUT)
+))
+
+# Doctor and clinic search: sources are searched concurrently and one that runs longer
+# than this many seconds is left out of a partial result, so one slow source cannot hold
+# up a search. 0 searches all sources in one statement on the request's connection and
+# waits for every source.
+SEARCH_SOURCE_TIMEOUT_SECONDS = float(os.getenv('SEARCH_SOURCE_TIMEOUT_SECONDS', '2'))
+# A concurrent search runs one task per source (9) on a pool shared by the process, so size
+# the pool for the searches a process serves at once (1 for gunicorn's default sync
+# workers, else its --threads). Each pool thread holds its own database connection,
+# reused for DB_CONN_MAX_AGE seconds.
+SEARCH_CONCURRENT_REQUESTS = int(os.getenv('SEARCH_CONCURRENT_REQUESTS', '1'))
+SEARCH_WORKERS = int(os.getenv('SEARCH_WORKERS', str(9 * SEARCH_CONCURRENT_REQUESTS)))
+
+# Per-request database query profile: Server-Timing headers, a sampled log of request
+# profiles, and a warning when an endpoint (by URL name) runs more queries than its budget
+QUERY_PROFILE_ENABLED = os.getenv('QUERY_PROFILE_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+QUERY_PROFILE_HEADERS = os.getenv('QUERY_PROFILE_HEADERS', 'true').lower() in ('1', 'true', 'yes')
+QUERY_PROFILE_LOG_SAMPLE_RATE = float(os.getenv('QUERY_PROFILE_LOG_SAMPLE_RATE', '0.01'))
+QUERY_BUDGET_DEFAULT = int(os.getenv('QUERY_BUDGET_DEFAULT', '20'))
+QUERY_BUDGETS = {
+    # Concurrent searches set a statement timeout and run a query per source
+    'api-search': 2 * 9 if SEARCH_SOURCE_TIMEOUT_SECONDS else 2,
+    # Measured: 2 for a doctor, 11 for a clinic listing three associated doctors (one per
+    # source tried for each name, then that doctor's license check)
+    'api-score': 12,
+}
+
+# Server-side review scoring jobs (run_review_jobs worker)
+REVIEW_JOB_POLL_SECONDS = float(os.getenv('REVIEW_JOB_POLL_SECONDS', '5'))
+REVIEW_JOB_MAX_POLL_SECONDS = float(os.getenv('REVIEW_JOB_MAX_POLL_SECONDS', '60'))
+REVIEW_JOB_MAX_ATTEMPTS = int(os.getenv('REVIEW_JOB_MAX_ATTEMPTS', '60'))
+# Public base URL Outscraper calls back when a job finishes (e.g. https://kyb.example.com); empty disables the webhook
+REVIEW_JOB_WEBHOOK_BASE_URL = os.getenv('REVIEW_JOB_WEBHOOK_BASE_URL', '')
+
 # Logging Configuration
 LOGGING = {
     'version': 1,
@@ -27,6 +27,7 @@ urlpatterns = [
     path('api/geoiq/', include('cpapp.api.GeoIQ.urls')),
     path('api/scoring/', include('cpapp.api.scoring.urls')),
     path('api/outscraper_reviews/', include('cpapp.api.outscraper_reviews.urls')),
+    path('api/metrics/', include('cpapp.api.metrics.urls')),
     # Handle any non-API route with our React app
     re_path(r'^(?!api/).*$', TemplateView.as_view(template_name='index.html'), name='home'),
 ]